@@ -2,7 +2,26 @@
 
 from django.contrib import admin
 
-from apps.achievements.models import Achievement, UserAchievement, UserStatistics
+from apps.achievements.models import Achievement, AchievementChain, UserAchievement, UserStatistics
+
+
+class AchievementTierInline(admin.TabularInline):
+    """Inline listing the tiers of a chain."""
+
+    model = Achievement
+    fields = ["tier", "name", "criteria_type", "criteria", "is_active"]
+    ordering = ["tier"]
+    extra = 0
+
+
+@admin.register(AchievementChain)
+class AchievementChainAdmin(admin.ModelAdmin):
+    """Admin for AchievementChain model."""
+
+    list_display = ["name", "created_at"]
+    search_fields = ["name", "description"]
+    readonly_fields = ["id", "created_at", "updated_at"]
+    inlines = [AchievementTierInline]
 
 
 @admin.register(Achievement)
@@ -16,16 +35,18 @@ class AchievementAdmin(admin.ModelAdmin):
         "reward_xp",
         "reward_coins",
         "is_active",
+        "chain",
+        "tier",
         "created_at",
     ]
-    list_filter = ["rarity", "criteria_type", "is_active"]
+    list_filter = ["rarity", "criteria_type", "is_active", "chain"]
     search_fields = ["name", "description"]
-    readonly_fields = ["id", "created_at", "updated_at"]
+    readonly_fields = ["id", "ordinal", "created_at", "updated_at"]
     fieldsets = (
         (
             "Basic Information",
             {
-                "fields": ("id", "name", "description", "icon", "rarity", "is_active"),
+                "fields": ("id", "ordinal", "name", "description", "icon", "rarity", "is_active"),
             },
         ),
         (
@@ -34,6 +55,12 @@ class AchievementAdmin(admin.ModelAdmin):
                 "fields": ("criteria_type", "criteria"),
             },
         ),
+        (
+            "Chain",
+            {
+                "fields": ("chain", "tier"),
+            },
+        ),
         (
             "Rewards",
             {
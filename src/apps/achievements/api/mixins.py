@@ -0,0 +1,39 @@
+"""Mixins for API views."""
+
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+
+from apps.achievements.db_router import is_pinned, read_from_primary, replica_reads
+
+
+class ReplicaReadMixin:
+    """
+    Serve safe requests from the read replica, outside a transaction.
+
+    The view is excluded from ``ATOMIC_REQUESTS``: GET, HEAD and OPTIONS
+    requests run their queries in autocommit mode and read from the replica
+    (see apps.achievements.db_router), unless the user wrote within the last
+    ``settings.DATABASE_REPLICA["pin_seconds"]`` seconds. Other methods run
+    in a transaction on the primary, as with ``ATOMIC_REQUESTS``.
+    """
+
+    @classmethod
+    def as_view(cls, *args, **kwargs):  # noqa: ANN206
+        """Get the view function, excluded from ATOMIC_REQUESTS."""
+        return transaction.non_atomic_requests(super().as_view(*args, **kwargs))
+
+    def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """Dispatch safe requests with replica reads and other requests in a transaction."""
+        if request.method in SAFE_METHODS:
+            with replica_reads():
+                return super().dispatch(request, *args, **kwargs)
+        with transaction.atomic():
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request: Request, *args, **kwargs) -> None:
+        """Send the reads of users who wrote recently to the primary, once they are authenticated."""
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and request.user.is_authenticated and is_pinned(request.user.id):
+            read_from_primary()
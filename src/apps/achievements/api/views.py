@@ -8,24 +8,29 @@ from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.response import Response
 
+from apps.achievements.api.mixins import ReplicaReadMixin
 from apps.achievements.models import Achievement
 from apps.achievements.serializers import (
     AchievementProgressSerializer,
     AchievementSerializer,
     AchievementUnlockRequestSerializer,
+    CohortQuerySerializer,
     SimulateTaskCompletionSerializer,
     TaskSimulationResultSerializer,
     UserAchievementListSerializer,
     UserAchievementSerializer,
+    WhatIfRequestSerializer,
+    WhatIfResultSerializer,
 )
-from apps.achievements.services.achievement_service import AchievementService
-from apps.achievements.services.task_simulation_service import TaskSimulationService
+from apps.achievements.services.achievement_service import get_achievement_service
+from apps.achievements.services.task_simulation_service import get_task_simulation_service
+from apps.achievements.services.what_if_service import get_what_if_service
 
 
 logger = logging.getLogger(__name__)
 
 
-class AchievementViewSet(viewsets.ReadOnlyModelViewSet):
+class AchievementViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Achievement CRUD operations.
 
@@ -39,6 +44,8 @@ class AchievementViewSet(viewsets.ReadOnlyModelViewSet):
         GET    /achievements/all-progress/  - Get all progress for user
         POST   /achievements/simulate-tasks/ - Simulate task completions
         GET    /achievements/user-stats/    - Get user statistics
+        POST   /achievements/what-if/       - Evaluate hypothetical statistics (staff only)
+        GET    /achievements/cohort/        - Count users unlocking at a threshold (staff only)
     """
 
     queryset = Achievement.objects.all()
@@ -51,10 +58,11 @@ class AchievementViewSet(viewsets.ReadOnlyModelViewSet):
     ordering = ["-created_at"]
 
     def __init__(self, *args, **kwargs) -> None:
-        """Initialize the viewset."""
+        """Initialize the viewset with the process-wide services (wired once, see services.warmup)."""
         super().__init__(*args, **kwargs)
-        self.achievement_service = AchievementService()
-        self.task_simulation_service = TaskSimulationService()
+        self.achievement_service = get_achievement_service()
+        self.task_simulation_service = get_task_simulation_service()
+        self.what_if_service = get_what_if_service()
 
     def get_queryset(self):
         """Get queryset - only active achievements for non-staff."""
@@ -101,9 +109,10 @@ class AchievementViewSet(viewsets.ReadOnlyModelViewSet):
         Returns:
             List of active achievements
         """
-        achievements = Achievement.objects.get_active_achievements()
-        serializer = self.get_serializer(achievements, many=True)
-        return Response(serializer.data)
+        catalog = self.achievement_service.state_cache.get_catalog(
+            lambda: list(self.get_serializer(Achievement.objects.get_active_achievements(), many=True).data),
+        )
+        return Response(catalog)
 
     @action(detail=True, methods=["get"])
     def progress(self, request, pk=None) -> Response:
@@ -329,3 +338,42 @@ class AchievementViewSet(viewsets.ReadOnlyModelViewSet):
                 {"error": "Failed to get user statistics"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+    @action(detail=False, methods=["post"], url_path="what-if", permission_classes=[permissions.IsAdminUser])
+    def what_if(self, request) -> Response:
+        """
+        Evaluate hypothetical statistics against the active catalog, without writing anything.
+
+        Request body:
+            {
+                "stats": {"total_tasks_completed": int, ...},
+                "windows": [{"window": "tasks_completed", "days": int, "total": int}, ...] (optional)
+            }
+
+        Returns:
+            Every active achievement with whether it unlocks and the progress towards it
+        """
+        serializer = WhatIfRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        windows = {(window["window"], window["days"]): window["total"] for window in serializer.validated_data["windows"]}
+        results = self.what_if_service.evaluate(serializer.validated_data["stats"], windows)
+        return Response(WhatIfResultSerializer(results, many=True).data)
+
+    @action(detail=False, methods=["get"], permission_classes=[permissions.IsAdminUser])
+    def cohort(self, request) -> Response:
+        """
+        Count the users who would unlock an achievement on a statistic at a threshold.
+
+        Query params:
+            - stat: str - UserStatistics field, e.g. total_tasks_completed
+            - threshold: int - Value of the statistic that would unlock the achievement
+            - bins: int (optional, 1-100) - Histogram bins
+
+        Returns:
+            Qualifying and total user counts, and a histogram of the statistic
+        """
+        serializer = CohortQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        return Response(self.what_if_service.cohort(**serializer.validated_data))
@@ -9,3 +9,9 @@ class AchievementsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.achievements"
     verbose_name = "Achievements"
+
+    def ready(self) -> None:
+        """Connect signal receivers."""
+        from apps.achievements import receivers  # noqa: F401, PLC0415
+        from apps.achievements.services import state_cache, warmup  # noqa: F401, PLC0415
+        from apps.achievements.utils import identity_map  # noqa: F401, PLC0415
@@ -0,0 +1,115 @@
+"""Database router sending the reads of safe API requests to a read replica."""
+
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, models
+
+
+logger = logging.getLogger(__name__)
+
+# Whether reads of the current request may go to the replica (see replica_reads)
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+
+def get_replica_alias() -> str | None:
+    """
+    Get the database alias of the read replica.
+
+    Returns:
+        Alias from ``settings.DATABASE_REPLICA["alias"]``, or None if it is not configured in DATABASES
+    """
+    alias = settings.DATABASE_REPLICA["alias"]
+    return alias if alias in settings.DATABASES else None
+
+
+def reads_from_replica() -> bool:
+    """Check whether reads currently go to the replica."""
+    return _replica_reads.get() and get_replica_alias() is not None
+
+
+@contextmanager
+def replica_reads() -> Iterator[None]:
+    """Send the reads of a block to the replica, unless they happen inside a transaction on the primary."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def primary_reads() -> Iterator[None]:
+    """Send the reads of a block to the primary, also inside a replica_reads block."""
+    token = _replica_reads.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def read_from_primary() -> None:
+    """Send the remaining reads of the current replica_reads block to the primary."""
+    _replica_reads.set(False)
+
+
+def _pin_key(user_id: int) -> str:
+    """Get the cache key pinning a user to the primary."""
+    return f"db_router:pinned:{user_id}"
+
+
+def pin_to_primary(user_id: int) -> None:
+    """
+    Send a user's reads to the primary for ``settings.DATABASE_REPLICA["pin_seconds"]`` seconds.
+
+    Called after the user writes, so their next requests read their own
+    writes even while the replica lags behind.
+
+    Args:
+        user_id: User ID
+    """
+    cache.set(_pin_key(user_id), value=True, timeout=settings.DATABASE_REPLICA["pin_seconds"])
+
+
+def is_pinned(user_id: int) -> bool:
+    """Check whether a user wrote recently enough to read from the primary."""
+    return cache.get(_pin_key(user_id), default=False)
+
+
+class ReplicaRouter:
+    """
+    Routes reads to the replica inside ``replica_reads`` blocks and everything else to the primary.
+
+    Reads stay on the primary inside a transaction on the primary (e.g. a
+    service method decorated with ``transaction.atomic``), so a request reads
+    what it wrote itself. Writes always go to the primary, including saves of
+    instances that were read from the replica. Migrations only run on the
+    primary, the replica receives them through replication.
+    """
+
+    def db_for_read(self, model: type[models.Model], **hints) -> str | None:  # noqa: ARG002
+        """Get the database to read a model from."""
+        if not _replica_reads.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return get_replica_alias()
+
+    def db_for_write(self, model: type[models.Model], **hints) -> str:  # noqa: ARG002
+        """Get the database to write a model to."""
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: models.Model, obj2: models.Model, **hints) -> bool | None:
+        """Allow relations between objects read from the primary and the replica (they hold the same data)."""
+        databases = {DEFAULT_DB_ALIAS, get_replica_alias()}
+        if obj1._state.db in databases and obj2._state.db in databases:  # noqa: SLF001
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, **hints) -> bool | None:  # noqa: ARG002
+        """Keep migrations off the replica."""
+        if db == settings.DATABASE_REPLICA["alias"]:
+            return False
+        return None
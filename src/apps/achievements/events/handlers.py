@@ -2,25 +2,52 @@
 
 import logging
 
-from apps.achievements.services.achievement_service import AchievementService
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.achievements.models import UserActivityDay, UserStatistics
+from apps.achievements.services.achievement_service import AchievementService, get_achievement_service
+from apps.achievements.utils.stats_snapshot import StatsSnapshot
+from apps.challenges.services.challenge_engine import ChallengeEngine
 
 
 logger = logging.getLogger(__name__)
 
 
+def _statistics_from_event(event_data: dict, key: str = "statistics") -> StatsSnapshot | None:
+    """Get the statistics an event carries, so the achievement check does not have to load them."""
+    if key not in event_data:
+        return None
+    return StatsSnapshot.from_event(event_data, key)
+
+
 class TaskCompletedEventHandler:
     """
     Handles TaskCompleted events from Task Service.
 
     When a task is completed, checks if any task-related achievements
-    should be unlocked.
+    should be unlocked. If the statistics before the task are known too, every
+    achievement reading a changed statistic is checked in one pass (see
+    AchievementService.stats_changed), e.g. level achievements when the task
+    levelled the user up.
     """
 
-    def __init__(self) -> None:
-        """Initialize the TaskCompletedEventHandler."""
-        self.achievement_service = AchievementService()
+    def __init__(self, achievement_service: AchievementService | None = None) -> None:
+        """
+        Initialize the TaskCompletedEventHandler.
 
-    def handle_task_completed(self, event_data: dict) -> None:
+        Args:
+            achievement_service: Service checking achievements (default: the process-wide one)
+        """
+        self.achievement_service = achievement_service or get_achievement_service()
+        self.challenge_engine = ChallengeEngine(achievement_service=self.achievement_service)
+
+    def handle_task_completed(
+        self,
+        event_data: dict,
+        user_stats: StatsSnapshot | UserStatistics | None = None,
+        previous_stats: StatsSnapshot | UserStatistics | None = None,
+    ) -> None:
         """
         Process TaskCompleted event.
 
@@ -31,8 +58,12 @@ class TaskCompletedEventHandler:
                     'task_id': str,
                     'difficulty': str,
                     'timestamp': str,
-                    'xp_earned': int
+                    'xp_earned': int,
+                    'statistics': dict,  # Optional, statistics after the task (see StatsSnapshot.to_dict)
+                    'previous_statistics': dict  # Optional, statistics before the task
                 }
+            user_stats: Statistics after the task, if the caller already has them
+            previous_stats: Statistics before the task, if the caller has them
         """
         try:
             user_id = self._extract_user_id(event_data)
@@ -40,13 +71,36 @@ class TaskCompletedEventHandler:
 
             logger.info("Handling TaskCompleted event for user %s", user_id)
 
-            # Check and unlock achievements
-            unlocked = self.achievement_service.check_and_unlock_achievements(
+            occurred_at = parse_datetime(task_info["timestamp"]) if task_info["timestamp"] else None
+
+            # Add the task to the user's running challenges
+            self.challenge_engine.record_task_completed(
                 user_id=user_id,
-                event_type="task_completed",
-                event_data=task_info,
+                xp_earned=task_info["xp_earned"],
+                occurred_at=occurred_at,
+            )
+
+            # Count the task towards time-windowed criteria
+            UserActivityDay.objects.record(
+                user_id,
+                day=timezone.localdate(occurred_at) if occurred_at and timezone.is_aware(occurred_at) else None,
+                tasks_completed=1,
+                xp_earned=task_info["xp_earned"],
             )
 
+            # Check and unlock achievements
+            user_stats = user_stats or _statistics_from_event(event_data)
+            previous_stats = previous_stats or _statistics_from_event(event_data, "previous_statistics")
+            if user_stats is not None and previous_stats is not None:
+                unlocked = self.achievement_service.stats_changed(user_id, previous_stats, user_stats)
+            else:
+                unlocked = self.achievement_service.check_and_unlock_achievements(
+                    user_id=user_id,
+                    event_type="task_completed",
+                    event_data=task_info,
+                    user_stats=user_stats,
+                )
+
             logger.info("Unlocked %d achievements for user %s", len(unlocked), user_id)
 
         except Exception:
@@ -75,7 +129,7 @@ class StreakMilestoneEventHandler:
 
     def __init__(self) -> None:
         """Initialize the StreakMilestoneEventHandler."""
-        self.achievement_service = AchievementService()
+        self.achievement_service = get_achievement_service()
 
     def handle_streak_milestone(self, event_data: dict) -> None:
         """
@@ -86,7 +140,8 @@ class StreakMilestoneEventHandler:
                 {
                     'user_id': int,
                     'streak_days': int,
-                    'timestamp': str
+                    'timestamp': str,
+                    'statistics': dict  # Optional, statistics after the milestone
                 }
         """
         try:
@@ -100,6 +155,7 @@ class StreakMilestoneEventHandler:
                 user_id=user_id,
                 event_type="streak_milestone",
                 event_data={"streak_days": streak_days},
+                user_stats=_statistics_from_event(event_data),
             )
 
             logger.info("Unlocked %d streak achievements for user %s", len(unlocked), user_id)
@@ -121,7 +177,7 @@ class LevelUpEventHandler:
 
     def __init__(self) -> None:
         """Initialize the LevelUpEventHandler."""
-        self.achievement_service = AchievementService()
+        self.achievement_service = get_achievement_service()
 
     def handle_level_up(self, event_data: dict) -> None:
         """
@@ -133,7 +189,8 @@ class LevelUpEventHandler:
                     'user_id': int,
                     'old_level': int,
                     'new_level': int,
-                    'timestamp': str
+                    'timestamp': str,
+                    'statistics': dict  # Optional, statistics after the level up
                 }
         """
         try:
@@ -147,6 +204,7 @@ class LevelUpEventHandler:
                 user_id=user_id,
                 event_type="level_up",
                 event_data={"new_level": new_level},
+                user_stats=_statistics_from_event(event_data),
             )
 
             logger.info("Unlocked %d level achievements for user %s", len(unlocked), user_id)
@@ -72,6 +72,30 @@ class EventPublisher:
 
         self._publish_to_queue("achievement.progress", event_data)
 
+    def publish_level_up(
+        self,
+        user_id: int,
+        old_level: int,
+        new_level: int,
+    ) -> None:
+        """
+        Publish LevelUp event.
+
+        Args:
+            user_id: User ID
+            old_level: Level before the change
+            new_level: Level after the change
+        """
+        event_data = {
+            "event_type": "LevelUp",
+            "user_id": user_id,
+            "old_level": old_level,
+            "new_level": new_level,
+            "timestamp": self._get_timestamp(),
+        }
+
+        self._publish_to_queue("user.level_up", event_data)
+
     def _publish_to_queue(self, routing_key: str, event_data: dict) -> None:
         """
         Publish event to message queue.
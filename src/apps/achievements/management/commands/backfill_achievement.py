@@ -0,0 +1,45 @@
+"""Management command to unlock an achievement for users who already qualify for it."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.achievements.models import Achievement
+from apps.achievements.services.backfill_service import AchievementBackfillService
+
+
+class Command(BaseCommand):
+    """Backfill a new or edited achievement for existing users."""
+
+    help = "Unlock an achievement for existing users who meet its criteria, resuming an unfinished run"
+
+    def add_arguments(self, parser) -> None:
+        """Add command arguments."""
+        parser.add_argument("achievement_id", help="Achievement UUID")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Number of users processed per chunk",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            help="Seconds to wait between chunks",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Start from the first user instead of the last checkpoint",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Handle the command to backfill an achievement."""
+        service = AchievementBackfillService(chunk_size=options["chunk_size"], pause=options["pause"])
+        try:
+            backfill = service.backfill(options["achievement_id"], restart=options["restart"])
+        except (Achievement.DoesNotExist, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backfilled {backfill.achievement.name}: {backfill.unlocked_count} unlocked, {backfill.progress_count} progress updates",
+            ),
+        )
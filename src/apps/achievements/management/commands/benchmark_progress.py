@@ -0,0 +1,55 @@
+"""Management command to benchmark achievement progress math."""
+
+import random
+import time
+from collections.abc import Callable
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from apps.achievements.utils.progress import progress_basis_points
+
+
+def decimal_progress(current: int, required: int) -> Decimal:
+    """Progress as the validators computed it before basis points, quantized as the old column stored it."""
+    if required == 0:
+        return Decimal("100.00")
+    progress = (Decimal(current) / Decimal(required)) * Decimal(100)
+    return min(progress, Decimal("100.00")).quantize(Decimal("0.01"))
+
+
+class Command(BaseCommand):
+    """Benchmark Decimal progress against integer basis points."""
+
+    help = "Measure progress calculations per second with Decimal percentages and integer basis points"
+
+    def add_arguments(self, parser) -> None:
+        """Add command arguments."""
+        parser.add_argument("--samples", type=int, default=200_000, help="Number of (current, required) pairs")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed for the samples")
+
+    def handle(self, *args, **options) -> None:
+        """Handle the command to run the benchmark."""
+        rng = random.Random(options["seed"])  # noqa: S311
+        samples = options["samples"]
+        current = [rng.randint(0, 1_000) for _ in range(samples)]
+        required = [rng.randint(1, 1_000) for _ in range(samples)]
+
+        results = {
+            "Decimal": self._time(lambda: [decimal_progress(c, r) for c, r in zip(current, required, strict=True)]),
+            "basis points": self._time(lambda: [progress_basis_points(c, r) for c, r in zip(current, required, strict=True)]),
+        }
+
+        baseline = results["Decimal"]
+        for name, elapsed in results.items():
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{name}: {samples} calculations in {elapsed:.3f}s ({samples / elapsed:,.0f}/s, {baseline / elapsed:.1f}x Decimal)",
+                ),
+            )
+
+    def _time(self, run: Callable[[], object]) -> float:
+        """Run once and return the elapsed seconds."""
+        started = time.perf_counter()
+        run()
+        return max(time.perf_counter() - started, 1e-9)
@@ -0,0 +1,68 @@
+"""Management command to recompute achievement progress for every user."""
+
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.achievements.services.progress_recompute_service import DEFAULT_CHUNK_SIZE, ProgressRecomputeService
+
+
+class Command(BaseCommand):
+    """Recompute UserAchievement progress for all users in parallel worker processes."""
+
+    help = "Recompute achievement progress for all users, resuming an unfinished run"
+
+    def add_arguments(self, parser) -> None:
+        """Add command arguments."""
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes (default: number of CPUs)",
+        )
+        parser.add_argument(
+            "--partitions",
+            type=int,
+            help="Number of user ID ranges for a new run (default: 4 per worker)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Number of users read and written per chunk",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Start a new run instead of resuming the last unfinished one",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Handle the command to recompute progress."""
+        started = time.monotonic()
+        done = {"partitions": 0, "users": 0}
+
+        def report(result: dict) -> None:
+            done["partitions"] += 1
+            done["users"] += result["users_processed"]
+            elapsed = max(time.monotonic() - started, 1e-6)
+            self.stdout.write(
+                f"Partition {result['partition_id']} done: {result['users_processed']} users, {result['rows_written']} rows "
+                f"({done['partitions']} partitions, {done['users']} users, {done['users'] / elapsed:,.0f} users/s)",
+            )
+
+        service = ProgressRecomputeService(chunk_size=options["chunk_size"])
+        summary = service.recompute_all(
+            workers=options["workers"],
+            partitions=options["partitions"],
+            restart=options["restart"],
+            on_partition_done=report,
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recomputed {summary['partitions']} partitions: "
+                f"{summary['users_processed']} users, {summary['rows_written']} rows written",
+            ),
+        )
@@ -0,0 +1,39 @@
+"""Middleware for the achievements app."""
+
+from collections.abc import Callable
+
+from django.http import HttpRequest, HttpResponse
+from rest_framework.permissions import SAFE_METHODS
+
+from apps.achievements.db_router import pin_to_primary
+from apps.achievements.utils.identity_map import unit_of_work
+
+
+class IdentityMapMiddleware:
+    """Run each request as one unit of work, so its objects are fetched once and dropped when it ends."""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        """Initialize the IdentityMapMiddleware."""
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Handle a request inside its own identity map."""
+        with unit_of_work():
+            return self.get_response(request)
+
+
+class ReadYourWritesMiddleware:
+    """Pin users to the primary database for a few seconds after any request that may have written."""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        """Initialize the ReadYourWritesMiddleware."""
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Handle a request, pinning its user afterwards if it was not a safe request."""
+        response = self.get_response(request)
+        # REST framework sets the user it authenticated on the underlying request
+        user = getattr(request, "user", None)
+        if request.method not in SAFE_METHODS and user is not None and user.is_authenticated:
+            pin_to_primary(user.id)
+        return response
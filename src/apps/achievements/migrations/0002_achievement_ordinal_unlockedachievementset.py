@@ -0,0 +1,78 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def assign_ordinals(apps, schema_editor):
+    """Number existing achievements in creation order."""
+    Achievement = apps.get_model("achievements", "Achievement")
+    for ordinal, achievement in enumerate(Achievement.objects.order_by("created_at", "id")):
+        achievement.ordinal = ordinal
+        achievement.save(update_fields=["ordinal"])
+
+
+def build_unlocked_sets(apps, schema_editor):
+    """Build the unlocked bitset of every user from their completed achievements."""
+    UserAchievement = apps.get_model("achievements", "UserAchievement")
+    UnlockedAchievementSet = apps.get_model("achievements", "UnlockedAchievementSet")
+
+    bits_by_user = {}
+    completed = UserAchievement.objects.filter(is_completed=True).values_list("user_id", "achievement__ordinal")
+    for user_id, ordinal in completed.iterator(chunk_size=2000):
+        bits_by_user[user_id] = bits_by_user.get(user_id, 0) | 1 << ordinal
+
+    UnlockedAchievementSet.objects.bulk_create(
+        [
+            UnlockedAchievementSet(
+                user_id=user_id, bits=bits.to_bytes((bits.bit_length() + 7) // 8, "little"), unlocked_count=bits.bit_count()
+            )
+            for user_id, bits in bits_by_user.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("achievements", "0001_initial"),
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UnlockedAchievementSet",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="unlocked_achievement_set",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("bits", models.BinaryField(default=bytes)),
+                ("unlocked_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Unlocked Achievement Set",
+                "verbose_name_plural": "Unlocked Achievement Sets",
+            },
+        ),
+        migrations.AddField(
+            model_name="achievement",
+            name="ordinal",
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.RunPython(assign_ordinals, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="achievement",
+            name="ordinal",
+            field=models.PositiveIntegerField(editable=False, unique=True),
+        ),
+        migrations.RunPython(build_unlocked_sets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Frozen copy of Achievement.THRESHOLD_FIELDS
+THRESHOLD_FIELDS = {
+    "task_count": ("total_tasks_completed", "required_count"),
+    "streak": ("current_streak", "required_days"),
+    "level": ("current_level", "required_level"),
+    "friend_count": ("friend_count", "required_count"),
+    "challenge": ("challenges_won", "required_wins"),
+}
+
+
+def assign_thresholds(apps, schema_editor):
+    """Derive the threshold columns of existing achievements from their criteria."""
+    Achievement = apps.get_model("achievements", "Achievement")
+    for achievement in Achievement.objects.all():
+        if achievement.criteria_type not in THRESHOLD_FIELDS:
+            continue
+        stat_field, criteria_key = THRESHOLD_FIELDS[achievement.criteria_type]
+        achievement.threshold_stat = stat_field
+        achievement.threshold = int((achievement.criteria or {}).get(criteria_key, 0))
+        achievement.save(update_fields=["threshold_stat", "threshold"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("achievements", "0002_achievement_ordinal_unlockedachievementset"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="achievement",
+            name="threshold",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="achievement",
+            name="threshold_stat",
+            field=models.CharField(blank=True, default="", editable=False, max_length=32),
+        ),
+        migrations.RunPython(assign_thresholds, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="achievement",
+            index=models.Index(
+                condition=models.Q(("is_active", True)), fields=["threshold_stat", "threshold"], name="achievement_active_threshold"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userstatistics",
+            index=models.Index(fields=["total_tasks_completed"], name="achievement_total_t_e494e9_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="userstatistics",
+            index=models.Index(fields=["current_streak"], name="achievement_current_6594be_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="userstatistics",
+            index=models.Index(fields=["current_level"], name="achievement_current_1af23e_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="userstatistics",
+            index=models.Index(fields=["friend_count"], name="achievement_friend__b021dd_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="userstatistics",
+            index=models.Index(fields=["challenges_won"], name="achievement_challen_02b8b7_idx"),
+        ),
+    ]
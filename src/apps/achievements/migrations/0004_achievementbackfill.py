@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("achievements", "0003_achievement_threshold"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AchievementBackfill",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("threshold", models.PositiveIntegerField()),
+                (
+                    "status",
+                    models.CharField(choices=[("running", "Running"), ("completed", "Completed")], default="running", max_length=20),
+                ),
+                ("last_user_id", models.PositiveBigIntegerField(default=0)),
+                ("unlocked_count", models.PositiveIntegerField(default=0)),
+                ("progress_count", models.PositiveIntegerField(default=0)),
+                ("started_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "achievement",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="backfills", to="achievements.achievement"),
+                ),
+            ],
+            options={
+                "verbose_name": "Achievement Backfill",
+                "verbose_name_plural": "Achievement Backfills",
+                "ordering": ["-started_at"],
+                "indexes": [models.Index(fields=["achievement", "status"], name="achievement_achieve_c8a426_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:45
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("achievements", "0004_achievementbackfill"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProgressRecomputePartition",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("run_id", models.UUIDField(db_index=True, default=uuid.uuid4)),
+                ("lower_user_id", models.PositiveBigIntegerField()),
+                ("upper_user_id", models.PositiveBigIntegerField()),
+                ("last_user_id", models.PositiveBigIntegerField()),
+                ("users_processed", models.PositiveIntegerField(default=0)),
+                ("rows_written", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Progress Recompute Partition",
+                "verbose_name_plural": "Progress Recompute Partitions",
+                "ordering": ["run_id", "lower_user_id"],
+            },
+        ),
+    ]
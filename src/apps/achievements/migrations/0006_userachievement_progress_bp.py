@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:52
+
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Cast
+
+
+def progress_to_basis_points(apps, schema_editor):
+    """Convert the two decimal place percentages to basis points."""
+    UserAchievement = apps.get_model("achievements", "UserAchievement")
+    UserAchievement.objects.update(progress_bp=Cast(F("progress") * 100, models.IntegerField()))
+
+
+def basis_points_to_progress(apps, schema_editor):
+    """Convert basis points back to two decimal place percentages."""
+    UserAchievement = apps.get_model("achievements", "UserAchievement")
+    UserAchievement.objects.update(progress=Cast(F("progress_bp"), models.DecimalField(max_digits=7, decimal_places=2)) / 100)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("achievements", "0005_progressrecomputepartition"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userachievement",
+            name="progress_bp",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                help_text="Progress in basis points (0 to 10000)",
+                validators=[django.core.validators.MaxValueValidator(10000)],
+            ),
+        ),
+        migrations.RunPython(progress_to_basis_points, basis_points_to_progress),
+        migrations.RemoveField(
+            model_name="userachievement",
+            name="progress",
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("achievements", "0006_userachievement_progress_bp"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="achievement",
+            name="criteria_type",
+            field=models.CharField(
+                choices=[
+                    ("task_count", "Task Count"),
+                    ("streak", "Streak"),
+                    ("level", "Level"),
+                    ("friend_count", "Friend Count"),
+                    ("challenge", "Challenge"),
+                    ("expression", "Expression"),
+                ],
+                default="task_count",
+                max_length=20,
+            ),
+        ),
+        migrations.CreateModel(
+            name="UserActivityDay",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("tasks_completed", models.PositiveIntegerField(default=0)),
+                ("xp_earned", models.PositiveIntegerField(default=0)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="activity_days", to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "User Activity Day",
+                "verbose_name_plural": "User Activity Days",
+                "indexes": [models.Index(fields=["day"], name="achievement_day_022897_idx")],
+                "constraints": [models.UniqueConstraint(fields=("user", "day"), name="user_activity_day_unique")],
+            },
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:06
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("achievements", "0007_useractivityday_expression_criteria"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AchievementChain",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("name", models.CharField(max_length=200, unique=True)),
+                ("description", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Achievement Chain",
+                "verbose_name_plural": "Achievement Chains",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.AddField(
+            model_name="achievement",
+            name="tier",
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="achievement",
+            name="chain",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="tiers",
+                to="achievements.achievementchain",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="achievement",
+            constraint=models.UniqueConstraint(fields=("chain", "tier"), name="achievement_chain_tier_unique"),
+        ),
+        migrations.AddConstraint(
+            model_name="achievement",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    models.Q(("chain__isnull", True), ("tier__isnull", True)),
+                    models.Q(("chain__isnull", False), ("tier__isnull", False)),
+                    _connector="OR",
+                ),
+                name="achievement_chain_has_tier",
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:12
+
+from django.db import migrations
+
+
+ORDINAL_SEQUENCE = "achievements_achievement_ordinal_seq"
+
+
+def create_ordinal_sequence(apps, schema_editor):
+    """Create the sequence allocating achievement ordinals, continuing after the highest ordinal in use."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Achievement = apps.get_model("achievements", "Achievement")
+    table = schema_editor.quote_name(Achievement._meta.db_table)
+    schema_editor.execute(f"CREATE SEQUENCE {ORDINAL_SEQUENCE} MINVALUE 0 START WITH 0")
+    schema_editor.execute(f"SELECT setval('{ORDINAL_SEQUENCE}', MAX(ordinal)) FROM {table} HAVING MAX(ordinal) IS NOT NULL")
+
+
+def drop_ordinal_sequence(apps, schema_editor):
+    """Drop the ordinal sequence."""
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP SEQUENCE IF EXISTS {ORDINAL_SEQUENCE}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("achievements", "0008_achievement_chains"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_ordinal_sequence, drop_ordinal_sequence),
+    ]
@@ -2,17 +2,66 @@
 
 import uuid
 from decimal import Decimal
+from typing import ClassVar
 
 from django.contrib.auth import get_user_model
+from django.core.validators import MaxValueValidator
 from django.db import models
 from django.utils import timezone
 
-from .managers import AchievementManager, UserAchievementManager
+from apps.achievements.utils.bitset import AchievementBitset
+from apps.achievements.utils.progress import BASIS_POINTS, to_basis_points, to_percentage
+
+from .managers import (
+    AchievementBackfillManager,
+    AchievementManager,
+    ProgressRecomputePartitionManager,
+    UnlockedAchievementSetManager,
+    UserAchievementManager,
+    UserActivityDayManager,
+    UserStatisticsManager,
+)
 
 
 User = get_user_model()
 
 
+class AchievementChain(models.Model):
+    """
+    An ordered ladder of achievements, such as "10/50/100/500/1000 tasks".
+
+    Users climb a chain one tier at a time: only the lowest tier they have not
+    unlocked is evaluated and stores progress, the tiers above it are reached
+    when it unlocks. Tiers of a chain share a criteria type, so every tier is
+    relevant to the same events.
+
+    Attributes:
+        id: UUID primary key
+        name: Chain name
+        description: Detailed description
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=200, unique=True)
+    description = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Achievement Chain"
+        verbose_name_plural = "Achievement Chains"
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        """
+        Represent the chain as a string.
+
+        Returns:
+            str: Chain name.
+        """
+        return self.name
+
+
 class Achievement(models.Model):
     """
     Represents an achievement that users can unlock.
@@ -28,6 +77,11 @@ class Achievement(models.Model):
         icon: URL to achievement icon
         rarity: Achievement rarity (common, rare, epic, legendary)
         is_active: Whether achievement is currently active
+        ordinal: Stable position of the achievement in unlocked-achievement bitsets, never reused
+        threshold_stat: UserStatistics field the criteria compare against (derived on save)
+        threshold: Value of threshold_stat that unlocks the achievement (derived on save)
+        chain: AchievementChain the achievement is a tier of, if any
+        tier: Position in the chain, lowest first (set exactly when chain is)
     """
 
     class Rarity(models.TextChoices):
@@ -46,6 +100,16 @@ class Achievement(models.Model):
         LEVEL = "level", "Level"
         FRIEND_COUNT = "friend_count", "Friend Count"
         CHALLENGE = "challenge", "Challenge"
+        EXPRESSION = "expression", "Expression"
+
+    # Criteria type -> (UserStatistics field, criteria key holding the required value)
+    THRESHOLD_FIELDS: ClassVar[dict[str, tuple[str, str]]] = {
+        CriteriaType.TASK_COUNT: ("total_tasks_completed", "required_count"),
+        CriteriaType.STREAK: ("current_streak", "required_days"),
+        CriteriaType.LEVEL: ("current_level", "required_level"),
+        CriteriaType.FRIEND_COUNT: ("friend_count", "required_count"),
+        CriteriaType.CHALLENGE: ("challenges_won", "required_wins"),
+    }
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=200, unique=True)
@@ -57,6 +121,11 @@ class Achievement(models.Model):
     icon = models.URLField(blank=True, default="")
     rarity = models.CharField(max_length=20, choices=Rarity.choices, default=Rarity.COMMON)
     is_active = models.BooleanField(default=True)
+    ordinal = models.PositiveIntegerField(unique=True, editable=False)
+    threshold_stat = models.CharField(max_length=32, blank=True, default="", editable=False)
+    threshold = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    chain = models.ForeignKey(AchievementChain, on_delete=models.SET_NULL, null=True, blank=True, related_name="tiers")
+    tier = models.PositiveSmallIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -69,6 +138,14 @@ class Achievement(models.Model):
         indexes = [
             models.Index(fields=["criteria_type", "is_active"]),
             models.Index(fields=["rarity"]),
+            models.Index(fields=["threshold_stat", "threshold"], condition=models.Q(is_active=True), name="achievement_active_threshold"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["chain", "tier"], name="achievement_chain_tier_unique"),
+            models.CheckConstraint(
+                condition=models.Q(chain__isnull=True, tier__isnull=True) | models.Q(chain__isnull=False, tier__isnull=False),
+                name="achievement_chain_has_tier",
+            ),
         ]
 
     def __str__(self) -> str:
@@ -80,17 +157,38 @@ class Achievement(models.Model):
         """
         return f"{self.name} ({self.get_rarity_display()})"
 
+    def save(self, *args, **kwargs) -> None:
+        """Save the achievement, allocating an ordinal to new ones and deriving its threshold."""
+        if self.ordinal is None:
+            self.ordinal = Achievement.objects.next_ordinal()
+
+        self.threshold_stat, self.threshold = self.get_threshold()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"criteria", "criteria_type"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "threshold_stat", "threshold"}
+
+        super().save(*args, **kwargs)
+
+    def get_threshold(self) -> tuple[str, int | None]:
+        """
+        Get the statistic and value that unlock this achievement.
+
+        Returns:
+            Tuple of (UserStatistics field, required value), or ("", None) if the
+            criteria type has no single threshold
+        """
+        if self.criteria_type not in self.THRESHOLD_FIELDS:
+            return "", None
+        stat_field, criteria_key = self.THRESHOLD_FIELDS[self.criteria_type]
+        return stat_field, int((self.criteria or {}).get(criteria_key, 0))
+
     def is_unlockable_by(self, user_id: int) -> bool:
         """
         Check if this achievement can be unlocked by a user.
 
         This is a placeholder - actual logic is in AchievementEvaluator.
         """
-        return not UserAchievement.objects.filter(
-            user_id=user_id,
-            achievement=self,
-            is_completed=True,
-        ).exists()
+        return self.ordinal not in UnlockedAchievementSet.objects.get_bitset(user_id)
 
     def get_rarity_display_with_emoji(self) -> str:
         """Get rarity display with emoji."""
@@ -112,7 +210,7 @@ class UserAchievement(models.Model):
         user: Foreign key to User
         achievement: Foreign key to Achievement
         unlocked_at: Timestamp when unlocked (null if in progress)
-        progress: Progress percentage (0.0 to 100.0)
+        progress_bp: Progress in basis points (0 to 10000); ``progress`` is the same as a percentage
         is_completed: Whether achievement is unlocked
     """
 
@@ -120,7 +218,11 @@ class UserAchievement(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="user_achievements")
     achievement = models.ForeignKey(Achievement, on_delete=models.CASCADE, related_name="user_achievements")
     unlocked_at = models.DateTimeField(null=True, blank=True)
-    progress = models.DecimalField(max_digits=5, decimal_places=2, default=0.00, help_text="Progress percentage (0.00 to 100.00)")
+    progress_bp = models.PositiveSmallIntegerField(
+        default=0,
+        validators=[MaxValueValidator(BASIS_POINTS)],
+        help_text="Progress in basis points (0 to 10000)",
+    )
     is_completed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -147,23 +249,41 @@ class UserAchievement(models.Model):
         status = "Unlocked" if self.is_completed else f"{self.progress}% Complete"
         return f"{self.user} - {self.achievement.name} ({status})"
 
-    def update_progress(self, new_progress: float) -> None:
+    @property
+    def progress(self) -> Decimal:
+        """Progress percentage (0.00 to 100.00)."""
+        return to_percentage(self.progress_bp)
+
+    @progress.setter
+    def progress(self, value: Decimal | float) -> None:
+        self.progress_bp = to_basis_points(value)
+
+    def update_progress(self, new_progress: Decimal | float) -> None:
         """
         Update progress percentage.
 
         Args:
             new_progress: New progress value (0-100)
         """
-        self.progress = min(Decimal("100.00"), max(Decimal("0.00"), Decimal(str(new_progress))))
-        self.save(update_fields=["progress", "updated_at"])
+        self.update_progress_bp(to_basis_points(new_progress))
+
+    def update_progress_bp(self, basis_points: int) -> None:
+        """
+        Update progress in basis points.
+
+        Args:
+            basis_points: New progress value, clamped to 0-10000
+        """
+        self.progress_bp = max(0, min(basis_points, BASIS_POINTS))
+        self.save(update_fields=["progress_bp", "updated_at"])
 
     def complete(self) -> None:
         """Mark achievement as completed."""
         if not self.is_completed:
             self.is_completed = True
-            self.progress = 100.00
+            self.progress_bp = BASIS_POINTS
             self.unlocked_at = timezone.now()
-            self.save(update_fields=["is_completed", "progress", "unlocked_at", "updated_at"])
+            self.save(update_fields=["is_completed", "progress_bp", "unlocked_at", "updated_at"])
 
 
 class UserStatistics(models.Model):
@@ -194,9 +314,20 @@ class UserStatistics(models.Model):
     challenges_won = models.PositiveIntegerField(default=0)
     last_updated = models.DateTimeField(auto_now=True)
 
+    objects = UserStatisticsManager()
+
     class Meta:
         verbose_name = "User Statistic"
         verbose_name_plural = "User Statistics"
+        # One index per statistic achievements can be unlocked by (Achievement.THRESHOLD_FIELDS),
+        # so "who qualifies for this achievement" is an index range scan
+        indexes = [
+            models.Index(fields=["total_tasks_completed"]),
+            models.Index(fields=["current_streak"]),
+            models.Index(fields=["current_level"]),
+            models.Index(fields=["friend_count"]),
+            models.Index(fields=["challenges_won"]),
+        ]
 
     def __str__(self) -> str:
         """
@@ -228,9 +359,19 @@ class UserStatistics(models.Model):
             increment: Amount to increment (default: 1)
         """
         if hasattr(self, stat_name):
-            current_value = getattr(self, stat_name)
-            setattr(self, stat_name, current_value + increment)
-            self.save(update_fields=[stat_name, "last_updated"])
+            self.increment_stats(**{stat_name: increment})
+
+    def increment_stats(self, **deltas: int) -> None:
+        """
+        Atomically increment several statistics and load their new values.
+
+        Args:
+            **deltas: Amount to add per statistic, e.g. total_tasks_completed=1, total_xp=50
+        """
+        updated = UserStatistics.objects.increment(self.user_id, **deltas)
+        for stat_name in deltas:
+            setattr(self, stat_name, getattr(updated, stat_name))
+        self.last_updated = updated.last_updated
 
     def refresh_from_sources(self) -> None:
         """
@@ -240,3 +381,182 @@ class UserStatistics(models.Model):
         For now, it's a placeholder.
         """
         # TODO: Implement calls to external services
+
+
+class UnlockedAchievementSet(models.Model):
+    """
+    Bitset of the achievements a user has unlocked, keyed by Achievement.ordinal.
+
+    Kept in step with completed UserAchievement rows by signal receivers, so
+    "already unlocked?" checks read one small row instead of querying
+    UserAchievement per achievement.
+
+    Attributes:
+        user: OneToOne relationship with User
+        bits: Little-endian bit string (see AchievementBitset)
+        unlocked_count: Number of bits set
+        updated_at: Last update timestamp
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="unlocked_achievement_set", primary_key=True)
+    bits = models.BinaryField(default=bytes)
+    unlocked_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = UnlockedAchievementSetManager()
+
+    class Meta:
+        verbose_name = "Unlocked Achievement Set"
+        verbose_name_plural = "Unlocked Achievement Sets"
+
+    def __str__(self) -> str:
+        """
+        Represent the unlocked set as a string.
+
+        Returns:
+            str: User and number of unlocked achievements.
+        """
+        return f"{self.user} ({self.unlocked_count} unlocked)"
+
+    @property
+    def bitset(self) -> AchievementBitset:
+        """Unlocked achievements as an AchievementBitset."""
+        return AchievementBitset(bytes(self.bits))
+
+
+class UserActivityDay(models.Model):
+    """
+    A user's activity on one day, the buckets that time-windowed criteria sum up.
+
+    Counters are incremented as events arrive, so "20 tasks in the last 7
+    days" reads at most 7 small rows instead of scanning task history. Days
+    older than the longest supported window are pruned.
+
+    Attributes:
+        user: User the activity belongs to
+        day: Local date of the activity
+        tasks_completed: Tasks completed that day
+        xp_earned: XP earned from tasks that day
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="activity_days")
+    day = models.DateField()
+    tasks_completed = models.PositiveIntegerField(default=0)
+    xp_earned = models.PositiveIntegerField(default=0)
+
+    objects = UserActivityDayManager()
+
+    class Meta:
+        verbose_name = "User Activity Day"
+        verbose_name_plural = "User Activity Days"
+        constraints = [
+            models.UniqueConstraint(fields=["user", "day"], name="user_activity_day_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["day"]),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Represent the activity day as a string.
+
+        Returns:
+            str: User, day and tasks completed.
+        """
+        return f"{self.user} on {self.day} ({self.tasks_completed} tasks)"
+
+
+class AchievementBackfill(models.Model):
+    """
+    Checkpoint of a run granting an achievement to every user who already qualifies.
+
+    Users are processed in user ID order; each chunk commits together with the
+    checkpoint, so an interrupted run resumes after the last committed chunk.
+
+    Attributes:
+        achievement: Achievement being backfilled
+        threshold: Achievement threshold the run was started with
+        status: Running or completed
+        last_user_id: Highest user ID processed so far
+        unlocked_count: Users the achievement was unlocked for
+        progress_count: Users whose progress was written
+        started_at: Timestamp the run started
+        updated_at: Timestamp of the last checkpoint
+        completed_at: Timestamp the run finished (null while running)
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+
+    achievement = models.ForeignKey(Achievement, on_delete=models.CASCADE, related_name="backfills")
+    threshold = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.RUNNING)
+    last_user_id = models.PositiveBigIntegerField(default=0)
+    unlocked_count = models.PositiveIntegerField(default=0)
+    progress_count = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    objects = AchievementBackfillManager()
+
+    class Meta:
+        verbose_name = "Achievement Backfill"
+        verbose_name_plural = "Achievement Backfills"
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["achievement", "status"]),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Represent the backfill as a string.
+
+        Returns:
+            str: Achievement, status and position.
+        """
+        return f"{self.achievement.name} backfill ({self.status}, after user {self.last_user_id})"
+
+
+class ProgressRecomputePartition(models.Model):
+    """
+    Checkpoint of one user ID range of a progress recompute run.
+
+    Attributes:
+        run_id: Run the partition belongs to
+        lower_user_id: Exclusive lower bound of the user ID range
+        upper_user_id: Inclusive upper bound of the user ID range
+        last_user_id: Highest user ID processed so far
+        users_processed: Users processed so far
+        rows_written: UserAchievement rows inserted or updated so far
+        created_at: Timestamp the run was planned
+        updated_at: Timestamp of the last checkpoint
+        completed_at: Timestamp the partition finished (null while pending)
+    """
+
+    run_id = models.UUIDField(default=uuid.uuid4, db_index=True)
+    lower_user_id = models.PositiveBigIntegerField()
+    upper_user_id = models.PositiveBigIntegerField()
+    last_user_id = models.PositiveBigIntegerField()
+    users_processed = models.PositiveIntegerField(default=0)
+    rows_written = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    objects = ProgressRecomputePartitionManager()
+
+    class Meta:
+        verbose_name = "Progress Recompute Partition"
+        verbose_name_plural = "Progress Recompute Partitions"
+        ordering = ["run_id", "lower_user_id"]
+
+    def __str__(self) -> str:
+        """
+        Represent the partition as a string.
+
+        Returns:
+            str: Run, user range and position.
+        """
+        return f"Run {self.run_id} users ({self.lower_user_id}, {self.upper_user_id}] at {self.last_user_id}"
@@ -1,11 +1,24 @@
 """Custom manager for Achievement model."""
 
+import uuid
+from collections.abc import Iterable
+from datetime import date, timedelta
+
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.models import Max, Subquery
+from django.utils import timezone
+
+from apps.achievements.signals import statistics_updated
+from apps.achievements.utils.bitset import AchievementBitset
+from apps.achievements.utils.identity_map import get_object
 
 
 User = get_user_model()
 
+# Sequence allocating Achievement.ordinal on PostgreSQL
+ORDINAL_SEQUENCE = "achievements_achievement_ordinal_seq"
+
 
 class AchievementManager(models.Manager):
     """Custom manager for Achievement model with useful queries."""
@@ -53,6 +66,75 @@ class AchievementManager(models.Manager):
         """
         return self.filter(name__icontains=query, is_active=True)
 
+    def get_crossed_by(self, stat_field: str, old_value: int, new_value: int) -> models.QuerySet:
+        """
+        Get active achievements whose threshold lies in (old_value, new_value].
+
+        Args:
+            stat_field: UserStatistics field that changed
+            old_value: Value before the change
+            new_value: Value after the change
+
+        Returns:
+            QuerySet of achievements unlocked by the change, lowest threshold first
+        """
+        return self.filter(
+            is_active=True,
+            threshold_stat=stat_field,
+            threshold__gt=old_value,
+            threshold__lte=new_value,
+        ).order_by("threshold")
+
+    def get_reached_by(self, stat_field: str, value: int) -> models.QuerySet:
+        """
+        Get active achievements whose threshold a statistic value meets.
+
+        Args:
+            stat_field: UserStatistics field
+            value: Current value of the statistic
+
+        Returns:
+            QuerySet of achievements with threshold <= value
+        """
+        return self.filter(is_active=True, threshold_stat=stat_field, threshold__lte=value)
+
+    def get_previous_tier(self, achievement: models.Model) -> models.Model | None:
+        """
+        Get the active tier right below an achievement in its chain.
+
+        Args:
+            achievement: Achievement
+
+        Returns:
+            Achievement, or None if the achievement is unchained or the lowest active tier
+        """
+        if achievement.chain_id is None:
+            return None
+        return self.filter(is_active=True, chain_id=achievement.chain_id, tier__lt=achievement.tier).order_by("-tier").first()
+
+    def next_ordinal(self) -> int:
+        """
+        Allocate the ordinal of a new achievement.
+
+        Ordinals are never reused: on PostgreSQL they come from a dedicated
+        sequence (created by migration 0009), so concurrent creates get distinct
+        ordinals and deleting the highest achievement does not hand its ordinal,
+        and the bits users still hold for it, to the next one. Other backends
+        (SQLite in development and tests) serialize writers and fall back to one
+        more than the highest ordinal in use.
+
+        Returns:
+            Ordinal for the new achievement, 0 for the first achievement
+        """
+        connection = connections[router.db_for_write(self.model)]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT nextval(%s)", [ORDINAL_SEQUENCE])
+                return cursor.fetchone()[0]
+
+        highest = self.using(connection.alias).aggregate(highest=Max("ordinal"))["highest"]
+        return 0 if highest is None else highest + 1
+
 
 class UserAchievementManager(models.Manager):
     """Custom manager for UserAchievement model."""
@@ -84,7 +166,7 @@ class UserAchievementManager(models.Manager):
         return self.filter(
             user_id=user_id,
             is_completed=False,
-            progress__gt=0,
+            progress_bp__gt=0,
         ).select_related("achievement")
 
     def is_unlocked(self, user_id: int, achievement_id: int) -> bool:
@@ -99,11 +181,10 @@ class UserAchievementManager(models.Manager):
             Boolean indicating if unlocked
 
         """
-        return self.filter(
-            user_id=user_id,
-            achievement_id=achievement_id,
-            is_completed=True,
-        ).exists()
+        # Import here to avoid circular imports
+        from apps.achievements.models import UnlockedAchievementSet  # noqa: PLC0415
+
+        return UnlockedAchievementSet.objects.is_unlocked(user_id, achievement_id)
 
     def get_or_create_progress(self, user_id: int, achievement_id: str) -> tuple:
         """
@@ -120,13 +201,13 @@ class UserAchievementManager(models.Manager):
         # Import here to avoid circular imports
         from apps.achievements.models import Achievement  # noqa: PLC0415
 
-        user = User.objects.get(id=user_id)
-        achievement = Achievement.objects.get(id=achievement_id)
+        user = get_object(User, user_id)
+        achievement = get_object(Achievement, achievement_id)
 
         return self.get_or_create(
             user=user,
             achievement=achievement,
-            defaults={"progress": 0.00, "is_completed": False},
+            defaults={"progress_bp": 0, "is_completed": False},
         )
 
     def bulk_update_progress(self, user_achievements: list) -> int:
@@ -142,6 +223,355 @@ class UserAchievementManager(models.Manager):
         """
         return self.bulk_update(
             user_achievements,
-            ["progress", "updated_at"],
+            ["progress_bp", "updated_at"],
             batch_size=100,
         )
+
+
+class UserStatisticsManager(models.Manager):
+    """Custom manager for UserStatistics model."""
+
+    COUNTER_FIELDS = frozenset(
+        {
+            "total_tasks_completed",
+            "current_streak",
+            "longest_streak",
+            "total_xp",
+            "current_level",
+            "friend_count",
+            "challenges_won",
+        },
+    )
+
+    def get_qualifying(self, achievement: models.Model) -> models.QuerySet:
+        """
+        Get the statistics of every user who meets an achievement's threshold.
+
+        Args:
+            achievement: Achievement with a threshold
+
+        Returns:
+            QuerySet of UserStatistics with threshold_stat >= threshold
+
+        Raises:
+            ValueError: If the achievement has no single threshold
+        """
+        if not achievement.threshold_stat or achievement.threshold is None:
+            msg = f"Achievement {achievement.id} has no threshold"
+            raise ValueError(msg)
+        return self.filter(**{f"{achievement.threshold_stat}__gte": achievement.threshold})
+
+    def increment(self, user_id: int, **deltas: int) -> models.Model:
+        """
+        Atomically add deltas to one or more statistics and return the new values.
+
+        All counters are updated by a single ``UPDATE ... SET stat = stat + delta
+        ... RETURNING`` statement, so concurrent increments never lose updates
+        and no row lock has to be taken beforehand. The statistics row is
+        created when the user has none yet.
+
+        Args:
+            user_id: User ID
+            **deltas: Amount to add per statistic, e.g. total_tasks_completed=1, total_xp=50
+
+        Returns:
+            UserStatistics instance holding the values after the increment
+
+        Raises:
+            ValueError: If no deltas are given or a statistic is not a counter
+
+        """
+        unknown = set(deltas) - self.COUNTER_FIELDS
+        if not deltas or unknown:
+            msg = f"Expected deltas for counter statistics, got {sorted(deltas)}"
+            raise ValueError(msg)
+
+        stats = self._update_returning(user_id, deltas)
+        if stats is None:
+            self.get_or_create(user_id=user_id)
+            stats = self._update_returning(user_id, deltas)
+
+        statistics_updated.send(sender=self.model, user_ids=[user_id])
+        return stats
+
+    def _update_returning(self, user_id: int, deltas: dict[str, int]) -> models.Model | None:
+        """Run the increment UPDATE and build an instance from the returned row."""
+        connection = connections[router.db_for_write(self.model)]
+        quote = connection.ops.quote_name
+        meta = self.model._meta  # noqa: SLF001
+        fields = meta.concrete_fields
+
+        assignments = [f"{quote(meta.get_field(name).column)} = {quote(meta.get_field(name).column)} + %s" for name in deltas]
+        assignments.append(f"{quote(meta.get_field('last_updated').column)} = %s")
+        sql = (
+            f"UPDATE {quote(meta.db_table)} SET {', '.join(assignments)} "  # noqa: S608
+            f"WHERE {quote(meta.pk.column)} = %s "
+            f"RETURNING {', '.join(quote(field.column) for field in fields)}"
+        )
+        params = [*deltas.values(), meta.get_field("last_updated").get_db_prep_value(timezone.now(), connection), user_id]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        values = []
+        for field, value in zip(fields, row, strict=True):
+            column = field.get_col(meta.db_table)
+            for converter in [*connection.ops.get_db_converters(column), *column.get_db_converters(connection)]:
+                value = converter(value, column, connection)  # noqa: PLW2901
+            values.append(value)
+        return self.model.from_db(self.db, [field.attname for field in fields], values)
+
+
+class UnlockedAchievementSetManager(models.Manager):
+    """Custom manager for UnlockedAchievementSet model."""
+
+    def get_bitset(self, user_id: int) -> AchievementBitset:
+        """
+        Get the unlocked achievements of a user.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            AchievementBitset of unlocked achievement ordinals (empty if the user has none)
+        """
+        bits = self.filter(user_id=user_id).values_list("bits", flat=True).first()
+        return AchievementBitset(bytes(bits) if bits is not None else b"")
+
+    def is_unlocked(self, user_id: int, achievement_id: str) -> bool:
+        """
+        Check if a user has unlocked an achievement, with a single primary key lookup.
+
+        Args:
+            user_id: User ID
+            achievement_id: Achievement UUID
+
+        Returns:
+            Boolean indicating if unlocked
+        """
+        # Import here to avoid circular imports
+        from apps.achievements.models import Achievement  # noqa: PLC0415
+
+        row = (
+            self.filter(user_id=user_id)
+            .annotate(ordinal=Subquery(Achievement.objects.filter(id=achievement_id).values("ordinal")))
+            .values_list("bits", "ordinal")
+            .first()
+        )
+        if row is None or row[1] is None:
+            return False
+        bits, ordinal = row
+        return ordinal in AchievementBitset(bytes(bits))
+
+    @transaction.atomic
+    def set_unlocked(self, user_id: int, ordinal: int, *, unlocked: bool = True) -> AchievementBitset:
+        """
+        Add an achievement to, or remove it from, a user's unlocked set.
+
+        Args:
+            user_id: User ID
+            ordinal: Achievement ordinal
+            unlocked: Whether the achievement is unlocked
+
+        Returns:
+            Updated AchievementBitset
+        """
+        if unlocked:
+            unlocked_set, _created = self.select_for_update().get_or_create(user_id=user_id)
+        else:
+            # Never create a row just to clear a bit, the user may be in the middle of being deleted
+            unlocked_set = self.select_for_update().filter(user_id=user_id).first()
+            if unlocked_set is None:
+                return AchievementBitset()
+        current = unlocked_set.bitset
+        updated = current.with_ordinal(ordinal) if unlocked else current.without_ordinal(ordinal)
+        if updated != current:
+            unlocked_set.bits = updated.to_bytes()
+            unlocked_set.unlocked_count = len(updated)
+            unlocked_set.save(update_fields=["bits", "unlocked_count", "updated_at"])
+        return updated
+
+    @transaction.atomic
+    def set_unlocked_many(self, user_ids: list[int], ordinal: int) -> int:
+        """
+        Add an achievement to the unlocked sets of many users at once.
+
+        Args:
+            user_ids: User IDs
+            ordinal: Achievement ordinal
+
+        Returns:
+            Number of sets that changed
+        """
+        self.bulk_create([self.model(user_id=user_id) for user_id in user_ids], ignore_conflicts=True)
+
+        now = timezone.now()
+        changed = []
+        for unlocked_set in self.select_for_update().filter(user_id__in=user_ids):
+            current = unlocked_set.bitset
+            if ordinal in current:
+                continue
+            updated = current.with_ordinal(ordinal)
+            unlocked_set.bits = updated.to_bytes()
+            unlocked_set.unlocked_count = len(updated)
+            unlocked_set.updated_at = now
+            changed.append(unlocked_set)
+
+        self.bulk_update(changed, ["bits", "unlocked_count", "updated_at"])
+        return len(changed)
+
+
+class UserActivityDayManager(models.Manager):
+    """Custom manager for UserActivityDay model."""
+
+    COUNTER_FIELDS = frozenset({"tasks_completed", "xp_earned"})
+
+    def record(self, user_id: int, day: date | None = None, **amounts: int) -> None:
+        """
+        Atomically add amounts to a user's activity counters for a day.
+
+        Uses a single ``INSERT ... ON CONFLICT DO UPDATE`` statement, so
+        concurrent events never lose updates.
+
+        Args:
+            user_id: User ID
+            day: Day of the activity (default: today)
+            **amounts: Amount to add per counter, e.g. tasks_completed=1, xp_earned=50
+
+        Raises:
+            ValueError: If no amounts are given or a counter is unknown
+        """
+        unknown = set(amounts) - self.COUNTER_FIELDS
+        if not amounts or unknown:
+            msg = f"Expected amounts for activity counters, got {sorted(amounts)}"
+            raise ValueError(msg)
+
+        connection = connections[router.db_for_write(self.model)]
+        quote = connection.ops.quote_name
+        meta = self.model._meta  # noqa: SLF001
+        table = quote(meta.db_table)
+        counters = sorted(self.COUNTER_FIELDS)
+        columns = {name: quote(meta.get_field(name).column) for name in ["user", "day", *counters]}
+        updates = ", ".join(f"{columns[name]} = {table}.{columns[name]} + EXCLUDED.{columns[name]}" for name in amounts)
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns.values())}) "  # noqa: S608
+            f"VALUES ({', '.join(['%s'] * len(columns))}) "
+            f"ON CONFLICT ({columns['user']}, {columns['day']}) DO UPDATE SET {updates}"
+        )
+        params = [user_id, connection.ops.adapt_datefield_value(day or timezone.localdate()), *(amounts.get(name, 0) for name in counters)]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def get_window_totals(self, user_id: int, windows: Iterable[tuple[str, int]], today: date | None = None) -> dict[tuple[str, int], int]:
+        """
+        Sum a user's counters over sliding windows ending today, with one query for all windows.
+
+        Args:
+            user_id: User ID
+            windows: (counter, days) pairs; a window of 7 days covers today and the 6 days before it
+            today: Last day of the windows (default: today)
+
+        Returns:
+            Dictionary of totals keyed by (counter, days)
+        """
+        totals = dict.fromkeys(windows, 0)
+        if not totals:
+            return totals
+        today = today or timezone.localdate()
+        counters = sorted({counter for counter, _days in totals})
+        longest = max(days for _counter, days in totals)
+
+        rows = self.filter(user_id=user_id, day__gt=today - timedelta(days=longest), day__lte=today).values_list("day", *counters)
+        for day, *values in rows:
+            age = (today - day).days
+            amounts = dict(zip(counters, values, strict=True))
+            for counter, days in totals:
+                if age < days:
+                    totals[counter, days] += amounts[counter]
+        return totals
+
+    def delete_before(self, day: date) -> int:
+        """
+        Delete activity older than a day.
+
+        Args:
+            day: First day to keep
+
+        Returns:
+            Number of rows deleted
+        """
+        deleted, _by_model = self.filter(day__lt=day).delete()
+        return deleted
+
+
+class AchievementBackfillManager(models.Manager):
+    """Custom manager for AchievementBackfill model."""
+
+    def get_or_start(self, achievement: models.Model, *, restart: bool = False) -> models.Model:
+        """
+        Get the unfinished backfill of an achievement, or start a new one.
+
+        A run started with a different threshold is abandoned, since the users
+        it already processed were judged against the old threshold.
+
+        Args:
+            achievement: Achievement to backfill
+            restart: Start over even if an unfinished run exists
+
+        Returns:
+            AchievementBackfill to continue
+        """
+        running = self.filter(achievement=achievement, status=self.model.Status.RUNNING)
+        if not restart:
+            backfill = running.filter(threshold=achievement.threshold).order_by("-started_at").first()
+            if backfill is not None:
+                return backfill
+        running.delete()
+        return self.create(achievement=achievement, threshold=achievement.threshold)
+
+
+class ProgressRecomputePartitionManager(models.Manager):
+    """Custom manager for ProgressRecomputePartition model."""
+
+    def get_unfinished_run(self) -> list[models.Model]:
+        """
+        Get the pending partitions of the most recent unfinished run.
+
+        Returns:
+            List of partitions, empty if every run finished
+        """
+        latest = self.filter(completed_at__isnull=True).order_by("-created_at").values_list("run_id", flat=True).first()
+        if latest is None:
+            return []
+        return list(self.filter(run_id=latest, completed_at__isnull=True))
+
+    @transaction.atomic
+    def plan(self, partitions: int) -> list[models.Model]:
+        """
+        Start a run by splitting the users with statistics into equal-width user ID ranges.
+
+        Args:
+            partitions: Number of ranges
+
+        Returns:
+            List of partitions of the new run (fewer than requested if there are few users)
+        """
+        from apps.achievements.models import UserStatistics  # noqa: PLC0415
+
+        bounds = UserStatistics.objects.aggregate(low=models.Min("user_id"), high=models.Max("user_id"))
+        if bounds["low"] is None:
+            return []
+
+        lower = bounds["low"] - 1
+        width = max(1, -(-(bounds["high"] - lower) // partitions))
+        run_id = uuid.uuid4()
+        ranges = []
+        while lower < bounds["high"]:
+            upper = min(lower + width, bounds["high"])
+            ranges.append(self.model(run_id=run_id, lower_user_id=lower, upper_user_id=upper, last_user_id=lower))
+            lower = upper
+        return self.bulk_create(ranges)
@@ -0,0 +1,29 @@
+"""Signal receivers keeping denormalized achievement data in step with UserAchievement."""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.achievements.models import Achievement, UnlockedAchievementSet, UserAchievement
+
+
+@receiver(post_save, sender=UserAchievement)
+def _sync_unlocked_set_on_save(*, instance: UserAchievement, created: bool, update_fields: frozenset | None, **kwargs) -> None:
+    """Set or clear the achievement's bit when a user achievement is completed or reverted."""
+    if update_fields is not None and "is_completed" not in update_fields:
+        # Progress updates cannot change the unlocked set
+        return
+    if created and not instance.is_completed:
+        return
+    UnlockedAchievementSet.objects.set_unlocked(instance.user_id, instance.achievement.ordinal, unlocked=instance.is_completed)
+
+
+@receiver(post_delete, sender=UserAchievement)
+def _sync_unlocked_set_on_delete(*, instance: UserAchievement, **kwargs) -> None:
+    """Clear the achievement's bit when a completed user achievement is deleted."""
+    if not instance.is_completed:
+        return
+    try:
+        ordinal = instance.achievement.ordinal
+    except Achievement.DoesNotExist:
+        return
+    UnlockedAchievementSet.objects.set_unlocked(instance.user_id, ordinal, unlocked=False)
@@ -3,6 +3,8 @@
 from rest_framework import serializers
 
 from apps.achievements.models import Achievement, UserAchievement
+from apps.achievements.services.criteria_compiler import MAX_WINDOW_DAYS, STATISTICS, WINDOW_COUNTERS, get_criteria_compiler
+from apps.achievements.services.what_if_service import COHORT_STATISTICS
 
 
 class AchievementSerializer(serializers.ModelSerializer):
@@ -26,6 +28,8 @@ class AchievementSerializer(serializers.ModelSerializer):
             "rarity",
             "rarity_display",
             "is_active",
+            "chain",
+            "tier",
             "created_at",
             "updated_at",
         ]
@@ -41,6 +45,22 @@ class AchievementSerializer(serializers.ModelSerializer):
         # For now, just ensure it's a dict
         return value
 
+    def validate(self, attrs: dict) -> dict:
+        """Validate the criteria compile for their criteria type, and that chain and tier are set together."""
+        criteria_type = attrs.get("criteria_type", getattr(self.instance, "criteria_type", Achievement.CriteriaType.TASK_COUNT))
+        criteria = attrs.get("criteria", getattr(self.instance, "criteria", None))
+        try:
+            get_criteria_compiler().compile(criteria_type, criteria)
+        except ValueError as exc:
+            raise serializers.ValidationError({"criteria": str(exc)}) from exc
+
+        chain = attrs.get("chain", getattr(self.instance, "chain", None))
+        tier = attrs.get("tier", getattr(self.instance, "tier", None))
+        if (chain is None) != (tier is None):
+            tier_error = "Chained achievements need a tier, and only chained achievements can have one"
+            raise serializers.ValidationError({"tier": tier_error})
+        return attrs
+
     def validate_reward_xp(self, value: int) -> int:
         """Validate reward XP is non-negative."""
         if value < 0:
@@ -61,6 +81,8 @@ class UserAchievementSerializer(serializers.ModelSerializer):
 
     achievement = AchievementSerializer(read_only=True)
     achievement_id = serializers.UUIDField(write_only=True, required=False)
+    # Stored as progress_bp; the model exposes it as a percentage
+    progress = serializers.DecimalField(max_digits=5, decimal_places=2, required=False)
 
     class Meta:
         model = UserAchievement
@@ -164,3 +186,46 @@ class TaskSimulationResultSerializer(serializers.Serializer):
     achievements_unlocked = serializers.IntegerField()
     unlocked_achievements = serializers.ListField(child=serializers.DictField())
     message = serializers.CharField()
+
+
+class WhatIfWindowSerializer(serializers.Serializer):
+    """Serializer for a hypothetical time-window total."""
+
+    window = serializers.ChoiceField(choices=sorted(WINDOW_COUNTERS))
+    days = serializers.IntegerField(min_value=1, max_value=MAX_WINDOW_DAYS)
+    total = serializers.IntegerField(min_value=0)
+
+
+class WhatIfRequestSerializer(serializers.Serializer):
+    """Serializer for evaluating hypothetical statistics against the catalog."""
+
+    stats = serializers.DictField(child=serializers.IntegerField(min_value=0), help_text="Statistic values keyed by field name")
+    windows = serializers.ListField(child=WhatIfWindowSerializer(), required=False, default=list)
+
+    def validate_stats(self, value: dict) -> dict:
+        """Validate every statistic exists."""
+        unknown = set(value) - STATISTICS
+        if unknown:
+            stats_error = f"Unknown statistics: {', '.join(sorted(unknown))}"
+            raise serializers.ValidationError(stats_error)
+        return value
+
+
+class WhatIfResultSerializer(serializers.Serializer):
+    """Serializer for an achievement evaluated against hypothetical statistics."""
+
+    achievement_id = serializers.UUIDField()
+    name = serializers.CharField()
+    criteria_type = serializers.CharField()
+    chain = serializers.UUIDField(allow_null=True)
+    tier = serializers.IntegerField(allow_null=True)
+    is_unlocked = serializers.BooleanField()
+    progress_percentage = serializers.FloatField()
+
+
+class CohortQuerySerializer(serializers.Serializer):
+    """Serializer for cohort query parameters."""
+
+    stat = serializers.ChoiceField(choices=sorted(COHORT_STATISTICS))
+    threshold = serializers.IntegerField(min_value=0)
+    bins = serializers.IntegerField(min_value=1, max_value=100, required=False)
@@ -1,13 +1,23 @@
 """AchievementEvaluator - Evaluates if a user meets achievement criteria."""
 
 import logging
+from collections.abc import Iterable, Sequence
 from decimal import Decimal
 
-from apps.achievements.models import Achievement, UserStatistics
+import numpy as np
+from django.db.models import QuerySet
+
+from apps.achievements.models import Achievement, UserActivityDay
+from apps.achievements.services.criteria_compiler import CompiledCriteria, WindowTotals, get_criteria_compiler
+from apps.achievements.services.state_cache import get_state_cache
 from apps.achievements.services.validators.base import CriteriaValidator
+from apps.achievements.services.validators.challenge_validator import ChallengeValidator
+from apps.achievements.services.validators.friend_count_validator import FriendCountValidator
 from apps.achievements.services.validators.level_validator import LevelValidator
 from apps.achievements.services.validators.streak_validator import StreakValidator
 from apps.achievements.services.validators.task_count_validator import TaskCountValidator
+from apps.achievements.utils.progress import BASIS_POINTS, to_percentage
+from apps.achievements.utils.stats_snapshot import UserStats
 
 
 logger = logging.getLogger(__name__)
@@ -17,22 +27,28 @@ class AchievementEvaluator:
     """
     Evaluates achievement criteria and calculates progress.
 
-    Uses Strategy pattern with different validators for each criteria type.
+    Single achievements are evaluated by their criteria compiled into closures
+    (see CriteriaCompiler). The batch methods use a Strategy pattern with a
+    vectorized validator per single-threshold criteria type.
     """
 
     def __init__(self) -> None:
-        """Initialize the AchievementEvaluator with validators."""
+        """Initialize the AchievementEvaluator with the criteria compiler and validators."""
+        self.compiler = get_criteria_compiler()
         self.validators: dict[str, CriteriaValidator] = {
             Achievement.CriteriaType.TASK_COUNT: TaskCountValidator(),
             Achievement.CriteriaType.STREAK: StreakValidator(),
             Achievement.CriteriaType.LEVEL: LevelValidator(),
+            Achievement.CriteriaType.FRIEND_COUNT: FriendCountValidator(),
+            Achievement.CriteriaType.CHALLENGE: ChallengeValidator(),
         }
 
     def evaluate_criteria(
         self,
         user_id: int,
         achievement: Achievement,
-        user_stats: UserStatistics,
+        user_stats: UserStats,
+        windows: WindowTotals | None = None,
     ) -> bool:
         """
         Evaluate if user meets achievement criteria.
@@ -41,18 +57,18 @@ class AchievementEvaluator:
             user_id: User ID
             achievement: Achievement to evaluate
             user_stats: User statistics
+            windows: Window totals from load_windows (loaded for this achievement if omitted)
 
         Returns:
             True if criteria are met, False otherwise
         """
-        validator = self._get_criteria_validator(achievement.criteria_type)
+        compiled = self._get_compiled_criteria(achievement)
 
-        if not validator:
-            logger.warning("No validator found for criteria type: %s", achievement.criteria_type)
+        if not compiled:
             return False
 
         try:
-            result = validator.validate(user_stats, achievement.criteria)
+            result = compiled.check(user_stats, self._get_windows(user_id, compiled, windows))
         except Exception:
             logger.exception("Error evaluating criteria for achievement %s", achievement.id)
             return False
@@ -69,7 +85,8 @@ class AchievementEvaluator:
         self,
         user_id: int,
         achievement: Achievement,
-        user_stats: UserStatistics,
+        user_stats: UserStats,
+        windows: WindowTotals | None = None,
     ) -> Decimal:
         """
         Calculate progress percentage for an achievement.
@@ -78,32 +95,123 @@ class AchievementEvaluator:
             user_id: User ID
             achievement: Achievement to calculate progress for
             user_stats: User statistics
+            windows: Window totals from load_windows (loaded for this achievement if omitted)
 
         Returns:
             Progress as Decimal (0.00 to 100.00)
         """
-        validator = self._get_criteria_validator(achievement.criteria_type)
+        return to_percentage(self.calculate_progress_bp(user_id, achievement, user_stats, windows))
+
+    def calculate_progress_bp(
+        self,
+        user_id: int,
+        achievement: Achievement,
+        user_stats: UserStats,
+        windows: WindowTotals | None = None,
+    ) -> int:
+        """
+        Calculate progress for an achievement in basis points.
+
+        Args:
+            user_id: User ID
+            achievement: Achievement to calculate progress for
+            user_stats: User statistics
+            windows: Window totals from load_windows (loaded for this achievement if omitted)
+
+        Returns:
+            Progress in basis points (0 to 10000)
+        """
+        compiled = self._get_compiled_criteria(achievement)
 
-        if not validator:
-            logger.warning("No validator found for criteria type: %s", achievement.criteria_type)
-            return Decimal("0.00")
+        if not compiled:
+            return 0
 
         try:
-            progress = validator.calculate_progress(user_stats, achievement.criteria)
+            progress = compiled.progress(user_stats, self._get_windows(user_id, compiled, windows))
         except Exception:
             logger.exception("Error calculating progress for achievement %s", achievement.id)
-            return Decimal("0.00")
+            return 0
         else:
-            # Ensure progress is between 0 and 100
-            progress = max(Decimal("0.00"), min(Decimal("100.00"), progress))
+            # Ensure progress is between 0 and 10000
+            progress = max(0, min(BASIS_POINTS, progress))
             logger.debug(
-                "Progress for achievement %s (user %s): %s%%",
+                "Progress for achievement %s (user %s): %s bp",
                 achievement.name,
                 user_id,
                 progress,
             )
             return progress
 
+    def load_windows(self, user_id: int, achievements: Iterable[Achievement]) -> WindowTotals:
+        """
+        Load the window totals every one of the achievements reads, with at most one query.
+
+        Args:
+            user_id: User ID
+            achievements: Achievements about to be evaluated for the user
+
+        Returns:
+            Window totals to pass to evaluate_criteria and calculate_progress_bp
+        """
+        windows = set()
+        for achievement in achievements:
+            compiled = self._get_compiled_criteria(achievement)
+            if compiled:
+                windows |= compiled.windows
+        return UserActivityDay.objects.get_window_totals(user_id, windows)
+
+    def evaluate_batch(self, achievements: Sequence[Achievement], columns: dict[str, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate many users against many achievements at once.
+
+        Gives the same results as evaluate_criteria and calculate_progress_bp,
+        one column per achievement.
+
+        Args:
+            achievements: Achievements to evaluate
+            columns: Statistics of the users, one array per UserStatistics field (see statistics_columns)
+
+        Returns:
+            Tuple (unlocked, progress) of (users, achievements) matrices: booleans, and
+            int64 progress in basis points (0 to 10000)
+        """
+        users = len(next(iter(columns.values()))) if columns else 0
+        unlocked = np.zeros((users, len(achievements)), dtype=bool)
+        progress = np.zeros((users, len(achievements)), dtype=np.int64)
+
+        by_type: dict[str, list[int]] = {}
+        for index, achievement in enumerate(achievements):
+            by_type.setdefault(achievement.criteria_type, []).append(index)
+
+        for criteria_type, indexes in by_type.items():
+            validator = self._get_criteria_validator(criteria_type)
+            if not validator or validator.stat_field is None:
+                logger.warning("No batch validator found for criteria type: %s", criteria_type)
+                continue
+            criteria_list = [achievements[index].criteria for index in indexes]
+            values = columns[validator.stat_field]
+            unlocked[:, indexes] = validator.validate_batch(values, validator.required_values(criteria_list))
+            progress[:, indexes] = validator.calculate_progress_bp_batch(
+                values,
+                validator.required_values(criteria_list, for_progress=True),
+            )
+
+        return unlocked, progress
+
+    def statistics_columns(self, statistics: QuerySet) -> dict[str, np.ndarray]:
+        """
+        Load user statistics as one int64 array per field, for evaluate_batch.
+
+        Args:
+            statistics: UserStatistics queryset
+
+        Returns:
+            Dictionary of arrays keyed by field name, including user_id
+        """
+        fields = ["user_id", *sorted({validator.stat_field for validator in self.validators.values() if validator.stat_field})]
+        rows = np.array(list(statistics.values_list(*fields)), dtype=np.int64).reshape(-1, len(fields))
+        return {field: rows[:, index] for index, field in enumerate(fields)}
+
     def get_user_statistics(self, user_id: int) -> dict:
         """
         Get user statistics as dictionary.
@@ -114,21 +222,47 @@ class AchievementEvaluator:
         Returns:
             Dictionary with user statistics
         """
-        try:
-            stats = UserStatistics.objects.get(user_id=user_id)
-        except UserStatistics.DoesNotExist:
+        stats = get_state_cache().get_user_statistics(user_id)
+        if stats is None:
             logger.warning("Statistics not found for user %s", user_id)
             return {}
-        else:
-            return {
-                "total_tasks_completed": stats.total_tasks_completed,
-                "current_streak": stats.current_streak,
-                "longest_streak": stats.longest_streak,
-                "total_xp": stats.total_xp,
-                "current_level": stats.current_level,
-                "friend_count": stats.friend_count,
-                "challenges_won": stats.challenges_won,
-            }
+        return {
+            "total_tasks_completed": stats.total_tasks_completed,
+            "current_streak": stats.current_streak,
+            "longest_streak": stats.longest_streak,
+            "total_xp": stats.total_xp,
+            "current_level": stats.current_level,
+            "friend_count": stats.friend_count,
+            "challenges_won": stats.challenges_won,
+        }
+
+    def reads_any(self, achievement: Achievement, stats: Iterable[str]) -> bool:
+        """
+        Check whether an achievement's criteria read any of the given statistics.
+
+        Args:
+            achievement: Achievement
+            stats: UserStatistics field names
+
+        Returns:
+            True if a change of the statistics can change the achievement's result
+        """
+        compiled = self._get_compiled_criteria(achievement)
+        return compiled is not None and not compiled.inputs.isdisjoint(stats)
+
+    def _get_compiled_criteria(self, achievement: Achievement) -> CompiledCriteria | None:
+        """Get the compiled criteria of an achievement, or None if they cannot be compiled."""
+        try:
+            return self.compiler.get(achievement)
+        except ValueError as exc:
+            logger.warning("Cannot compile criteria of achievement %s: %s", achievement.id, exc)
+            return None
+
+    def _get_windows(self, user_id: int, compiled: CompiledCriteria, windows: WindowTotals | None) -> WindowTotals:
+        """Get the window totals compiled criteria read, loading them if the caller has none."""
+        if windows is not None or not compiled.windows:
+            return windows or {}
+        return UserActivityDay.objects.get_window_totals(user_id, compiled.windows)
 
     def _get_criteria_validator(self, criteria_type: str) -> CriteriaValidator | None:
         """Get appropriate validator for criteria type."""
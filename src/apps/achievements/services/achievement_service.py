@@ -1,6 +1,7 @@
 """AchievementService - Main business logic for achievement operations."""
 
 import logging
+from operator import attrgetter
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
@@ -9,8 +10,15 @@ from django.utils import timezone
 from apps.achievements.events.publishers import EventPublisher
 from apps.achievements.models import Achievement, UserAchievement, UserStatistics
 from apps.achievements.services.achievement_evaluator import AchievementEvaluator
+from apps.achievements.services.state_cache import get_state_cache
+from apps.achievements.services.statistics_writer import get_statistics_writer
+from apps.achievements.utils.identity_map import get_object
 from apps.achievements.utils.notification_sender import NotificationSender
+from apps.achievements.utils.progress import BASIS_POINTS
+from apps.achievements.utils.singleton import process_singleton
+from apps.achievements.utils.stats_snapshot import StatsSnapshot, changed_statistics
 from apps.achievements.utils.validators import AchievementValidator
+from apps.rewards.services.ledger_service import RewardLedgerService
 
 
 User = get_user_model()
@@ -35,6 +43,9 @@ class AchievementService:
         self.validator = AchievementValidator()
         self.event_publisher = EventPublisher()
         self.notification_sender = NotificationSender()
+        self.reward_ledger = RewardLedgerService()
+        self.statistics_writer = get_statistics_writer()
+        self.state_cache = get_state_cache()
 
     @transaction.atomic
     def check_and_unlock_achievements(
@@ -42,14 +53,22 @@ class AchievementService:
         user_id: int,
         event_type: str,
         event_data: dict,
+        user_stats: StatsSnapshot | UserStatistics | None = None,
     ) -> list[UserAchievement]:
         """
-        Check all achievements and unlock those whose criteria are met.
+        Check the achievements relevant to an event and unlock those whose criteria are met.
+
+        Chained achievements are evaluated from the user's lowest locked tier
+        upwards, stopping at the first tier not met, so an event evaluates the
+        next tier plus any tiers it crossed, and only that next tier stores progress.
+        Callers that know the statistics before and after a change should use
+        stats_changed, which covers every criteria type in one pass.
 
         Args:
             user_id: User ID
             event_type: Type of event that triggered this check (e.g., 'task_completed')
             event_data: Event data containing relevant information
+            user_stats: Current statistics, if the caller already has them (skips the lookup)
 
         Returns:
             List of newly unlocked UserAchievement instances
@@ -58,48 +77,89 @@ class AchievementService:
         logger.info("Checking achievements for user %s after event %s (event_data: %s)", user_id, event_type, event_data)
 
         # Get user statistics
-        try:
-            user_stats = UserStatistics.objects.get(user_id=user_id)
-        except UserStatistics.DoesNotExist:
-            logger.warning("User statistics not found for user %s. Creating default", user_id)
-            user = User.objects.get(id=user_id)
-            user_stats = UserStatistics.objects.create(user=user)
+        if user_stats is None:
+            user_stats = self._get_or_create_statistics(user_id)
+
+            # Include increments still buffered by the write-behind writer
+            user_stats = self.statistics_writer.merge(user_stats)
 
         # Get relevant achievements based on event type
         achievements = self._get_relevant_achievements(event_type)
+        return self._evaluate_achievements(user_id, achievements, user_stats)
 
-        newly_unlocked = []
+    @transaction.atomic
+    def stats_changed(
+        self,
+        user_id: int,
+        old: StatsSnapshot | UserStatistics | None,
+        new: StatsSnapshot | UserStatistics,
+    ) -> list[UserAchievement]:
+        """
+        Check the achievements affected by a change of a user's statistics, in one pass.
 
-        for achievement in achievements:
-            # Check if already unlocked
-            if not self.validator.validate_not_already_unlocked(user_id, achievement.id):
-                logger.debug("Achievement %s already unlocked for user %s", achievement.id, user_id)
-                continue
-
-            # Evaluate criteria
-            logger.debug("Evaluating achievement %s (%s) for user %s", achievement.name, achievement.id, user_id)
-            criteria_met = self.evaluator.evaluate_criteria(
-                user_id,
-                achievement,
-                user_stats,
-            )
+        The statistics are diffed and only achievements whose criteria read a
+        changed statistic are evaluated, whatever their criteria type, so a task
+        that also levels the user up or extends a streak needs a single call
+        instead of one event per criteria type.
 
-            logger.debug("Criteria met for achievement %s: %s", achievement.name, criteria_met)
+        Args:
+            user_id: User ID
+            old: Statistics before the change (None if the user had none)
+            new: Statistics after the change
 
-            if criteria_met:
-                # Unlock achievement
-                logger.info("Unlocking achievement %s for user %s", achievement.name, user_id)
-                user_achievement = self.unlock_achievement(user_id, achievement.id)
-                newly_unlocked.append(user_achievement)
-            else:
-                # Update progress
-                progress = self.evaluator.calculate_progress(
-                    user_id,
-                    achievement,
-                    user_stats,
-                )
-                logger.debug("Updating progress for achievement %s: %s%%", achievement.name, progress)
-                self._update_progress(user_id, achievement.id, progress)
+        Returns:
+            List of newly unlocked UserAchievement instances
+        """
+        changed = changed_statistics(old, new)
+        logger.info("Statistics of user %s changed: %s", user_id, ", ".join(sorted(changed)) or "none")
+        if not changed:
+            return []
+
+        criteria_types = [
+            criteria_type for criteria_type, (stat_field, _criteria_key) in Achievement.THRESHOLD_FIELDS.items() if stat_field in changed
+        ]
+        candidates = Achievement.objects.get_active_achievements().filter(
+            criteria_type__in=[*criteria_types, Achievement.CriteriaType.EXPRESSION],
+        )
+        achievements = [achievement for achievement in candidates if self.evaluator.reads_any(achievement, changed)]
+        return self._evaluate_achievements(user_id, achievements, new)
+
+    def _evaluate_achievements(
+        self,
+        user_id: int,
+        achievements: list[Achievement],
+        user_stats: StatsSnapshot | UserStatistics,
+    ) -> list[UserAchievement]:
+        """
+        Unlock the achievements whose criteria are met and store progress on the others in one batch.
+
+        Chained achievements are evaluated from the user's lowest locked tier
+        upwards, stopping at the first tier not met, so only that next tier
+        stores progress. Unchained achievements are chains of one.
+
+        Returns:
+            List of newly unlocked UserAchievement instances
+        """
+        # Skip achievements already unlocked
+        unlocked = self.state_cache.get_unlocked_bitset(user_id)
+        locked = [achievement for achievement in achievements if achievement.ordinal not in unlocked]
+        windows = self.evaluator.load_windows(user_id, locked)
+
+        newly_unlocked = []
+        progress = {}
+        for tiers in self._group_by_chain(locked):
+            for achievement in tiers:
+                logger.debug("Evaluating achievement %s (%s) for user %s", achievement.name, achievement.id, user_id)
+                if self.evaluator.evaluate_criteria(user_id, achievement, user_stats, windows):
+                    logger.info("Unlocking achievement %s for user %s", achievement.name, user_id)
+                    newly_unlocked.append(self.unlock_achievement(user_id, achievement.id))
+                    continue
+
+                progress[achievement.id] = self.evaluator.calculate_progress_bp(user_id, achievement, user_stats, windows)
+                logger.debug("Updating progress for achievement %s: %s bp", achievement.name, progress[achievement.id])
+                break
+
+        self._save_progress(user_id, progress)
 
         logger.info("Unlocked %d achievements for user %s", len(newly_unlocked), user_id)
         return newly_unlocked
@@ -128,7 +188,7 @@ class AchievementService:
 
         # Validate user exists
         try:
-            user = User.objects.get(id=user_id)
+            user = get_object(User, user_id)
         except User.DoesNotExist as exc:
             msg = f"User {user_id} does not exist"
             raise ValueError(msg) from exc
@@ -142,21 +202,23 @@ class AchievementService:
             msg = f"Achievement {achievement_id} already unlocked for user {user_id}"
             raise ValueError(msg)
 
-        # Get achievement
-        achievement = Achievement.objects.get(id=achievement_id)
+        # Get achievement (loaded by the validator)
+        achievement = get_object(Achievement, achievement_id)
 
         # Create or update user achievement
         user_achievement, created = UserAchievement.objects.get_or_create(
             user=user,
             achievement=achievement,
             defaults={
-                "progress": 100.00,
+                "progress_bp": BASIS_POINTS,
                 "is_completed": True,
                 "unlocked_at": timezone.now(),
             },
         )
 
         if not created:
+            # Share the mapped achievement with the unlocked set sync on save
+            user_achievement.achievement = achievement
             user_achievement.complete()
 
         # Grant rewards
@@ -188,6 +250,14 @@ class AchievementService:
             List of achievement dictionaries with progress
 
         """
+        return self.state_cache.get_user_achievements(
+            user_id,
+            lambda: self._build_user_achievements(user_id, include_locked=include_locked),
+            include_locked=include_locked,
+        )
+
+    def _build_user_achievements(self, user_id: int, *, include_locked: bool) -> list[dict]:
+        """Build the achievement list returned by get_user_achievements."""
         if include_locked:
             achievements = Achievement.objects.get_active_achievements()
             user_achievements = UserAchievement.objects.filter(user_id=user_id)
@@ -234,7 +304,7 @@ class AchievementService:
             Dictionary with progress information
 
         """
-        achievement = Achievement.objects.get(id=achievement_id)
+        achievement = get_object(Achievement, achievement_id)
 
         try:
             user_achievement = UserAchievement.objects.get(
@@ -270,17 +340,18 @@ class AchievementService:
             List of progress dictionaries with full achievement details
 
         """
-        try:
-            user_stats = UserStatistics.objects.get(user_id=user_id)
-        except UserStatistics.DoesNotExist:
-            # Get User instance and create statistics
-            user = User.objects.get(id=user_id)
-            user_stats = UserStatistics.objects.create(user=user)
+        return self.state_cache.get_progress(user_id, lambda: self._calculate_all_progress(user_id))
+
+    def _calculate_all_progress(self, user_id: int) -> list[dict]:
+        """Compute the progress list returned by calculate_all_progress."""
+        user_stats = self._get_or_create_statistics(user_id)
 
-        achievements = Achievement.objects.get_active_achievements()
+        achievements = list(Achievement.objects.get_active_achievements())
 
         # Get all user achievements to check unlock status
         user_achievements = {ua.achievement_id: ua for ua in UserAchievement.objects.filter(user_id=user_id)}
+        completed = {achievement_id for achievement_id, ua in user_achievements.items() if ua.is_completed}
+        windows = self.evaluator.load_windows(user_id, [achievement for achievement in achievements if achievement.id not in completed])
 
         result = []
 
@@ -297,7 +368,7 @@ class AchievementService:
                 progress_percentage = 100.0
                 current_value = target_value
             else:
-                progress_percentage = self.evaluator.calculate_progress(user_id, achievement, user_stats)
+                progress_percentage = self.evaluator.calculate_progress_bp(user_id, achievement, user_stats, windows) / 100
 
             # Ensure criteria has target field for frontend
             criteria = achievement.criteria.copy() if achievement.criteria else {}
@@ -324,7 +395,7 @@ class AchievementService:
 
         return result
 
-    def _get_progress_values(self, achievement: Achievement, user_stats: UserStatistics) -> tuple[int, int]:
+    def _get_progress_values(self, achievement: Achievement, user_stats: StatsSnapshot) -> tuple[int, int]:
         """
         Extract current and target values based on criteria type.
 
@@ -335,25 +406,23 @@ class AchievementService:
         Returns:
             Tuple of (current_value, target_value)
         """
-        criteria = achievement.criteria or {}
-        criteria_type = achievement.criteria_type
-
-        if criteria_type == Achievement.CriteriaType.TASK_COUNT:
-            return user_stats.total_tasks_completed, criteria.get("required_count", 0)
-        if criteria_type == Achievement.CriteriaType.STREAK:
-            return user_stats.current_streak, criteria.get("required_days", 0)
-        if criteria_type == Achievement.CriteriaType.LEVEL:
-            return user_stats.current_level, criteria.get("required_level", 0)
-        if criteria_type == Achievement.CriteriaType.FRIEND_COUNT:
-            return user_stats.friend_count, criteria.get("required_count", 0)
-        if criteria_type == Achievement.CriteriaType.CHALLENGE:
-            return user_stats.challenges_won, criteria.get("required_wins", 0)
-        return 0, 100
+        if not achievement.threshold_stat:
+            return 0, 100
+        return getattr(user_stats, achievement.threshold_stat), achievement.threshold
 
     # Private helper methods
 
+    def _get_or_create_statistics(self, user_id: int) -> StatsSnapshot:
+        """Get a user's statistics from the state cache, creating them if missing."""
+        user_stats = self.state_cache.get_user_statistics(user_id)
+        if user_stats is None:
+            logger.warning("User statistics not found for user %s. Creating default", user_id)
+            user = get_object(User, user_id)
+            user_stats = StatsSnapshot.from_model(UserStatistics.objects.create(user=user))
+        return user_stats
+
     def _get_relevant_achievements(self, event_type: str) -> list[Achievement]:
-        """Get achievements relevant to the event type."""
+        """Get achievements relevant to the event type, including expressions (which may read any statistic)."""
         criteria_type_map = {
             "task_completed": Achievement.CriteriaType.TASK_COUNT,
             "streak_milestone": Achievement.CriteriaType.STREAK,
@@ -364,31 +433,54 @@ class AchievementService:
 
         criteria_type = criteria_type_map.get(event_type)
         if criteria_type:
-            return list(Achievement.objects.get_by_criteria_type(criteria_type))
+            return list(
+                Achievement.objects.get_active_achievements().filter(
+                    criteria_type__in=[criteria_type, Achievement.CriteriaType.EXPRESSION],
+                ),
+            )
 
         return list(Achievement.objects.get_active_achievements())
 
-    def _update_progress(self, user_id: int, achievement_id: str, progress: float) -> None:
-        """Update progress for an achievement."""
+    def _group_by_chain(self, achievements: list[Achievement]) -> list[list[Achievement]]:
+        """Group achievements by chain, each chain's tiers lowest first; unchained achievements form their own group."""
+        groups: dict[object, list[Achievement]] = {}
+        for achievement in achievements:
+            groups.setdefault(achievement.chain_id or achievement.id, []).append(achievement)
+        return [sorted(tiers, key=attrgetter("tier")) if len(tiers) > 1 else tiers for tiers in groups.values()]
+
+    def _save_progress(self, user_id: int, progress: dict[str, int]) -> None:
+        """Store progress (in basis points, by achievement ID) on locked achievements with one upsert."""
+        if not progress:
+            return
+        now = timezone.now()
+        UserAchievement.objects.bulk_create(
+            [
+                UserAchievement(user_id=user_id, achievement_id=achievement_id, progress_bp=progress_bp, created_at=now, updated_at=now)
+                for achievement_id, progress_bp in progress.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["user", "achievement"],
+            update_fields=["progress_bp", "updated_at"],
+        )
+        # Bulk writes send no post_save, so invalidate like the receiver would
+        self.state_cache.invalidate_on_commit("unlocked", [user_id])
+
+    def _update_progress(self, user_id: int, achievement_id: str, progress_bp: int) -> None:
+        """Update progress (in basis points) for an achievement."""
         user_achievement, _created = UserAchievement.objects.get_or_create_progress(
             user_id,
             achievement_id,
         )
-        user_achievement.update_progress(progress)
+        user_achievement.update_progress_bp(progress_bp)
 
     def _grant_achievement_rewards(self, user_id: int, achievement: Achievement) -> dict:
         """Grant rewards for unlocking achievement."""
-        # This would call RewardService in a real implementation
-        rewards = {
-            "xp": achievement.reward_xp,
-            "coins": achievement.reward_coins,
+        grant, _created = self.reward_ledger.grant_achievement_reward(user_id, achievement)
+        return {
+            "xp": grant.xp,
+            "coins": grant.coins,
         }
 
-        logger.info("Granted rewards to user %s: %s", user_id, rewards)
-        # NOTE: External Reward Service integration pending
-
-        return rewards
-
     def _publish_achievement_event(
         self,
         user_id: int,
@@ -410,3 +502,20 @@ class AchievementService:
             achievement_name=achievement.name,
             description=achievement.description,
         )
+
+
+# Settings the service and its collaborators are built from
+SERVICE_SETTINGS = ("ACHIEVEMENT_STATE_CACHE", "STATISTICS_WRITE_BEHIND", "REWARDS_BALANCE_SHARDS")
+
+
+@process_singleton(reset_on=SERVICE_SETTINGS)
+def get_achievement_service() -> AchievementService:
+    """
+    Get the process-wide achievement service, shared by views, event handlers and engines.
+
+    The service keeps no per-call state, so one instance serves every thread.
+
+    Returns:
+        AchievementService instance
+    """
+    return AchievementService()
@@ -0,0 +1,289 @@
+"""AchievementBackfillService - Grants an achievement to every user who already qualifies for it."""
+
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.achievements.events.publishers import EventPublisher
+from apps.achievements.models import Achievement, AchievementBackfill, UnlockedAchievementSet, UserAchievement, UserStatistics
+from apps.achievements.services.state_cache import get_state_cache
+from apps.achievements.utils.notification_sender import NotificationSender
+from apps.achievements.utils.progress import BASIS_POINTS
+from apps.rewards.services.ledger_service import RewardLedgerService
+
+
+logger = logging.getLogger(__name__)
+
+# Expression generating a UserAchievement primary key, in the format Django stores UUIDs in
+UUID_EXPRESSIONS = {
+    "postgresql": "gen_random_uuid()",
+    "sqlite": "lower(hex(randomblob(16)))",
+}
+
+
+class AchievementBackfillService:
+    """
+    Unlocks a new or edited achievement for existing users without waiting for their next event.
+
+    Users are processed in ranges of user IDs. For each range, one
+    ``INSERT ... SELECT`` over UserStatistics completes the achievement for
+    every user meeting its threshold, a second one writes the progress of the
+    others, and the unlocked sets and rewards of the newly unlocked users are
+    updated in bulk. The range commits together with its checkpoint, then the
+    events and notifications of the range are sent as one batch.
+
+    Runs resume from their checkpoint, and pause between ranges so a backfill
+    does not saturate the primary.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int | None = None,
+        pause: float | None = None,
+        event_publisher: EventPublisher | None = None,
+        notification_sender: NotificationSender | None = None,
+        reward_ledger: RewardLedgerService | None = None,
+    ) -> None:
+        """
+        Initialize the AchievementBackfillService.
+
+        Args:
+            chunk_size: Users per range (default: settings.ACHIEVEMENT_BACKFILL["chunk_size"])
+            pause: Seconds to sleep between ranges (default: settings.ACHIEVEMENT_BACKFILL["pause"])
+            event_publisher: Publisher for AchievementUnlocked events
+            notification_sender: Sender for unlock notifications
+            reward_ledger: Ledger recording the rewards
+        """
+        config = settings.ACHIEVEMENT_BACKFILL
+        self.chunk_size = config["chunk_size"] if chunk_size is None else chunk_size
+        self.pause = config["pause"] if pause is None else pause
+        if self.chunk_size < 1:
+            msg = f"Chunk size must be positive, got {self.chunk_size}"
+            raise ValueError(msg)
+        self.event_publisher = event_publisher or EventPublisher()
+        self.notification_sender = notification_sender or NotificationSender()
+        self.reward_ledger = reward_ledger or RewardLedgerService()
+
+    def backfill(self, achievement_id: str, *, restart: bool = False) -> AchievementBackfill:
+        """
+        Backfill an achievement, resuming an unfinished run if there is one.
+
+        Args:
+            achievement_id: Achievement UUID
+            restart: Ignore an unfinished run and start from the first user
+
+        Returns:
+            Completed AchievementBackfill with the run's counts
+
+        Raises:
+            ValueError: If the achievement is inactive or has no single threshold
+        """
+        achievement = Achievement.objects.get(id=achievement_id)
+        if not achievement.is_active:
+            msg = f"Achievement {achievement_id} is not active"
+            raise ValueError(msg)
+        if not achievement.threshold_stat or achievement.threshold is None:
+            msg = f"Achievement {achievement_id} has no threshold and cannot be backfilled"
+            raise ValueError(msg)
+
+        backfill = AchievementBackfill.objects.get_or_start(achievement, restart=restart)
+        logger.info("Backfilling achievement %s from user %s", achievement.name, backfill.last_user_id)
+
+        while (upper_user_id := self._next_upper_user_id(backfill.last_user_id)) is not None:
+            self.backfill_chunk(achievement, backfill, upper_user_id)
+            logger.debug("Backfilled achievement %s up to user %s", achievement.name, upper_user_id)
+            if self.pause:
+                time.sleep(self.pause)
+
+        backfill.status = AchievementBackfill.Status.COMPLETED
+        backfill.completed_at = timezone.now()
+        backfill.save(update_fields=["status", "completed_at", "updated_at"])
+
+        logger.info(
+            "Backfill of achievement %s complete: %d unlocked, %d progress updates",
+            achievement.name,
+            backfill.unlocked_count,
+            backfill.progress_count,
+        )
+        return backfill
+
+    @transaction.atomic
+    def backfill_chunk(self, achievement: Achievement, backfill: AchievementBackfill, upper_user_id: int) -> tuple[int, int]:
+        """
+        Backfill the users with IDs in (backfill.last_user_id, upper_user_id] and advance the checkpoint.
+
+        Args:
+            achievement: Achievement being backfilled
+            backfill: Checkpoint of the run
+            upper_user_id: Last user ID of the range
+
+        Returns:
+            Tuple (users unlocked, progress rows written)
+        """
+        lower_user_id = backfill.last_user_id
+        unlocked_ids = self._unlock_qualifying(achievement, lower_user_id, upper_user_id)
+        progressed_ids = self._write_progress(achievement, lower_user_id, upper_user_id)
+
+        rewarded_ids = []
+        if unlocked_ids:
+            UnlockedAchievementSet.objects.set_unlocked_many(unlocked_ids, achievement.ordinal)
+            rewarded_ids = self.reward_ledger.grant_achievement_rewards(unlocked_ids, achievement)
+
+        backfill.last_user_id = upper_user_id
+        backfill.unlocked_count += len(unlocked_ids)
+        backfill.progress_count += len(progressed_ids)
+        backfill.save(update_fields=["last_user_id", "unlocked_count", "progress_count", "updated_at"])
+
+        changed_ids = unlocked_ids + progressed_ids
+        if changed_ids:
+            get_state_cache().invalidate_on_commit("unlocked", changed_ids)
+        if unlocked_ids:
+            transaction.on_commit(lambda: self._announce_unlocks(achievement, unlocked_ids, rewarded_ids))
+
+        return len(unlocked_ids), len(progressed_ids)
+
+    def _next_upper_user_id(self, last_user_id: int) -> int | None:
+        """Get the last user ID of the range after last_user_id, or None once every user was processed."""
+        remaining = UserStatistics.objects.filter(user_id__gt=last_user_id)
+        upper = list(remaining.order_by("user_id").values_list("user_id", flat=True)[self.chunk_size - 1 : self.chunk_size])
+        if upper:
+            return upper[0]
+        # Fewer than chunk_size users left
+        return remaining.aggregate(upper=Max("user_id"))["upper"]
+
+    def _unlock_qualifying(self, achievement: Achievement, lower_user_id: int, upper_user_id: int) -> list[int]:
+        """
+        Complete the achievement for every user in the range meeting its threshold.
+
+        Returns:
+            IDs of the users it was completed for (excludes users who had already completed it)
+        """
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        return self._upsert_user_achievements(
+            select="%s, TRUE, %s, %s, %s",
+            select_params=[BASIS_POINTS, now, now, now],
+            condition=f"s.{self._quote(achievement.threshold_stat)} >= %s",
+            condition_params=[achievement.threshold],
+            update="progress_bp = EXCLUDED.progress_bp, is_completed = EXCLUDED.is_completed, "
+            "unlocked_at = EXCLUDED.unlocked_at, updated_at = EXCLUDED.updated_at",
+            update_condition="",
+            achievement=achievement,
+            lower_user_id=lower_user_id,
+            upper_user_id=upper_user_id,
+        )
+
+    def _write_progress(self, achievement: Achievement, lower_user_id: int, upper_user_id: int) -> list[int]:
+        """
+        Write the progress of every user in the range below the threshold.
+
+        Users with no progress at all are skipped rather than given an empty row,
+        and so are users who have not completed the tier below a chained achievement.
+
+        Returns:
+            IDs of the users whose progress changed
+        """
+        if not achievement.threshold:
+            # Everyone meets a zero threshold
+            return []
+        stat = f"s.{self._quote(achievement.threshold_stat)}"
+        condition = f"{stat} > 0 AND {stat} < %s"
+        condition_params = [achievement.threshold]
+
+        previous_tier = Achievement.objects.get_previous_tier(achievement)
+        if previous_tier is not None:
+            # Only the lowest locked tier of a chain stores progress
+            condition += (
+                f" AND EXISTS (SELECT 1 FROM {self._quote(UserAchievement._meta.db_table)} p "  # noqa: S608, SLF001
+                "WHERE p.user_id = s.user_id AND p.achievement_id = %s AND p.is_completed)"
+            )
+            condition_params.append(UserAchievement._meta.get_field("achievement").get_db_prep_value(previous_tier.id, connection))  # noqa: SLF001
+
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        return self._upsert_user_achievements(
+            # Integer division rounds down, as progress_basis_points does
+            select=f"CAST({stat} AS BIGINT) * %s / %s, FALSE, NULL, %s, %s",
+            select_params=[BASIS_POINTS, achievement.threshold, now, now],
+            condition=condition,
+            condition_params=condition_params,
+            update="progress_bp = EXCLUDED.progress_bp, updated_at = EXCLUDED.updated_at",
+            update_condition=f" AND {self._quote(UserAchievement._meta.db_table)}.progress_bp <> EXCLUDED.progress_bp",  # noqa: SLF001
+            achievement=achievement,
+            lower_user_id=lower_user_id,
+            upper_user_id=upper_user_id,
+        )
+
+    def _upsert_user_achievements(  # noqa: PLR0913
+        self,
+        *,
+        select: str,
+        select_params: list,
+        condition: str,
+        condition_params: list,
+        update: str,
+        update_condition: str,
+        achievement: Achievement,
+        lower_user_id: int,
+        upper_user_id: int,
+    ) -> list[int]:
+        """
+        Insert or update the UserAchievement rows of a range of users with one INSERT ... SELECT.
+
+        Rows that are already completed are never touched.
+
+        Args:
+            select: SQL for progress_bp, is_completed, unlocked_at, created_at and updated_at
+            select_params: Parameters of select
+            condition: SQL condition on the statistics row ``s`` selecting the users
+            condition_params: Parameters of condition
+            update: SET clause applied to existing rows
+            update_condition: Extra SQL condition for updating an existing row
+            achievement: Achievement of the rows
+            lower_user_id: Exclusive lower bound of the user range
+            upper_user_id: Inclusive upper bound of the user range
+
+        Returns:
+            IDs of the users whose row was inserted or updated
+        """
+        table = self._quote(UserAchievement._meta.db_table)  # noqa: SLF001
+        statistics_table = self._quote(UserStatistics._meta.db_table)  # noqa: SLF001
+        achievement_id = UserAchievement._meta.get_field("achievement").get_db_prep_value(achievement.id, connection)  # noqa: SLF001
+        sql = (
+            f"INSERT INTO {table} (id, user_id, achievement_id, progress_bp, is_completed, unlocked_at, created_at, updated_at) "  # noqa: S608
+            f"SELECT {UUID_EXPRESSIONS[connection.vendor]}, s.user_id, %s, {select} "
+            f"FROM {statistics_table} s "
+            f"WHERE s.user_id > %s AND s.user_id <= %s AND {condition} "
+            f"ON CONFLICT (user_id, achievement_id) DO UPDATE SET {update} "
+            f"WHERE NOT {table}.is_completed{update_condition} "
+            f"RETURNING user_id"
+        )
+        params = [achievement_id, *select_params, lower_user_id, upper_user_id, *condition_params]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def _announce_unlocks(self, achievement: Achievement, user_ids: list[int], rewarded_ids: list[int]) -> None:
+        """Publish the AchievementUnlocked events and send the notifications of a range."""
+        rewarded = set(rewarded_ids)
+        for user_id in user_ids:
+            self.event_publisher.publish_achievement_unlocked(
+                user_id=user_id,
+                achievement_id=str(achievement.id),
+                achievement_name=achievement.name,
+                rewards={
+                    "xp": achievement.reward_xp if user_id in rewarded else 0,
+                    "coins": achievement.reward_coins if user_id in rewarded else 0,
+                },
+            )
+        self.notification_sender.send_achievement_notifications(
+            user_ids=user_ids,
+            achievement_name=achievement.name,
+            description=achievement.description,
+        )
+
+    def _quote(self, name: str) -> str:
+        """Quote a table or column name."""
+        return connection.ops.quote_name(name)
@@ -0,0 +1,301 @@
+"""CriteriaCompiler - Compiles achievement criteria into Python closures."""
+
+import logging
+import operator
+from collections.abc import Callable, Mapping
+
+from apps.achievements.models import Achievement, UserActivityDay
+from apps.achievements.utils.progress import BASIS_POINTS, progress_basis_points
+from apps.achievements.utils.singleton import process_singleton
+from apps.achievements.utils.stats_snapshot import FIELDS, UserStats
+
+
+logger = logging.getLogger(__name__)
+
+OPERATORS = {
+    "gte": operator.ge,
+    "gt": operator.gt,
+    "lte": operator.le,
+    "lt": operator.lt,
+    "eq": operator.eq,
+}
+STATISTICS = frozenset(FIELDS) - {"user_id"}
+WINDOW_COUNTERS = UserActivityDay.objects.COUNTER_FIELDS
+# Statistic incremented together with each window counter, so a window can only grow when it changes
+WINDOW_STATISTICS = {"tasks_completed": "total_tasks_completed", "xp_earned": "total_xp"}
+# Activity older than the longest window is pruned (see UserActivityDayManager.delete_before)
+MAX_WINDOW_DAYS = 90
+
+# Totals of the time windows an expression reads, keyed by (counter, days)
+WindowTotals = Mapping[tuple[str, int], int]
+Value = Callable[[UserStats, WindowTotals], int]
+
+
+class CompiledCriteria:
+    """
+    Criteria compiled into closures.
+
+    Attributes:
+        check: Returns whether statistics and window totals meet the criteria
+        progress: Returns progress towards the criteria in basis points (10000 exactly when check is true)
+        windows: (counter, days) windows the closures read from the window totals
+        inputs: Statistics whose change can change the result (for windows, the statistic incremented with the counter)
+    """
+
+    __slots__ = ("check", "inputs", "progress", "windows")
+
+    def __init__(
+        self,
+        check: Callable[[UserStats, WindowTotals], bool],
+        progress: Callable[[UserStats, WindowTotals], int],
+        windows: frozenset[tuple[str, int]] = frozenset(),
+        inputs: frozenset[str] = frozenset(),
+    ) -> None:
+        """
+        Initialize the CompiledCriteria.
+
+        Args:
+            check: Criteria check
+            progress: Progress calculation in basis points
+            windows: Windows read by check and progress
+            inputs: Statistics read by check and progress
+        """
+        self.check = check
+        self.progress = progress
+        self.windows = windows
+        self.inputs = inputs
+
+
+class CriteriaCompiler:
+    """
+    Compiles the criteria of achievements into closures, once per achievement version.
+
+    Single-threshold criteria types (task_count, streak, level, friend_count,
+    challenge) compile to one comparison. The ``expression`` type holds a small
+    criteria language under ``criteria["expression"]``:
+
+        {"all": [<expr>, ...]}                        every expression holds
+        {"any": [<expr>, ...]}                        at least one expression holds
+        {"stat": "current_streak", "gte": 7}          statistic compared to a number
+        {"stat": "longest_streak", "gt": {"stat": "current_streak"}}
+                                                      statistic compared to another statistic
+        {"window": "tasks_completed", "days": 7, "gte": 20}
+                                                      counter summed over the last 7 days (today included)
+
+    Comparisons take one of gte, gt, lte, lt or eq. Progress of gte and gt
+    comparisons is how far the left side is towards the right one, other
+    comparisons are all or nothing; "all" takes the lowest progress of its
+    expressions and "any" the highest.
+
+    Compiled criteria are cached by achievement ID and invalidated when the
+    achievement's updated_at changes, so each process compiles an
+    achievement again only after it was edited.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the CriteriaCompiler."""
+        self._compiled: dict[object, tuple[tuple, CompiledCriteria]] = {}
+
+    def get(self, achievement: Achievement) -> CompiledCriteria:
+        """
+        Get the compiled criteria of an achievement, compiling them on first use.
+
+        Args:
+            achievement: Achievement
+
+        Returns:
+            CompiledCriteria instance
+
+        Raises:
+            ValueError: If the criteria are invalid
+        """
+        if achievement.updated_at is None:
+            # Unsaved achievements have no version to cache by
+            return self.compile(achievement.criteria_type, achievement.criteria)
+
+        version = (achievement.updated_at, achievement.criteria_type)
+        cached = self._compiled.get(achievement.id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        compiled = self.compile(achievement.criteria_type, achievement.criteria)
+        self._compiled[achievement.id] = (version, compiled)
+        logger.debug("Compiled criteria of achievement %s", achievement.id)
+        return compiled
+
+    def compile(self, criteria_type: str, criteria: dict | None) -> CompiledCriteria:
+        """
+        Compile criteria into closures.
+
+        Args:
+            criteria_type: Achievement.CriteriaType value
+            criteria: Criteria configuration
+
+        Returns:
+            CompiledCriteria instance
+
+        Raises:
+            ValueError: If the criteria type is unknown or the criteria are invalid
+        """
+        criteria = criteria or {}
+        if criteria_type == Achievement.CriteriaType.EXPRESSION:
+            if "expression" not in criteria:
+                msg = "Expression criteria need an 'expression'"
+                raise ValueError(msg)
+            return self._compile_expression(criteria["expression"])
+
+        if criteria_type in Achievement.THRESHOLD_FIELDS:
+            stat_field, criteria_key = Achievement.THRESHOLD_FIELDS[criteria_type]
+            # Same defaults as the validators: a missing value is met, and progress is measured against 1
+            return _threshold(stat_field, int(criteria.get(criteria_key, 0)), int(criteria.get(criteria_key, 1)))
+
+        msg = f"Unknown criteria type: {criteria_type}"
+        raise ValueError(msg)
+
+    def _compile_expression(self, expression: object) -> CompiledCriteria:
+        """Compile one node of the criteria language."""
+        if not isinstance(expression, dict):
+            msg = f"Criteria expression must be an object, got {expression!r}"
+            raise ValueError(msg)  # noqa: TRY004
+
+        if expression.keys() == {"all"} or expression.keys() == {"any"}:
+            ((kind, expressions),) = expression.items()
+            return self._compile_group(kind, expressions)
+
+        comparisons = expression.keys() & OPERATORS.keys()
+        if len(comparisons) != 1:
+            msg = f"Criteria expression needs exactly one of {sorted(OPERATORS)}, got {expression!r}"
+            raise ValueError(msg)
+        (comparison,) = comparisons
+
+        if "stat" in expression:
+            left_keys = {"stat"}
+            left = _stat(expression["stat"])
+            windows = frozenset()
+            inputs = {expression["stat"]}
+        elif "window" in expression:
+            left_keys = {"window", "days"}
+            window = _window_key(expression["window"], expression.get("days"))
+            left = _window(window)
+            windows = frozenset({window})
+            inputs = {WINDOW_STATISTICS[window[0]]}
+        else:
+            msg = f"Criteria expression needs a 'stat' or a 'window', got {expression!r}"
+            raise ValueError(msg)
+
+        extra = expression.keys() - left_keys - {comparison}
+        if extra:
+            msg = f"Unknown keys in criteria expression: {sorted(extra)}"
+            raise ValueError(msg)
+
+        operand = expression[comparison]
+        if isinstance(operand, dict):
+            inputs.add(operand.get("stat"))
+        return _comparison(left, comparison, _operand(operand), windows, frozenset(inputs))
+
+    def _compile_group(self, kind: str, expressions: object) -> CompiledCriteria:
+        """Compile an "all" or "any" node."""
+        if not isinstance(expressions, list) or not expressions:
+            msg = f"'{kind}' needs a non-empty list of expressions"
+            raise ValueError(msg)
+
+        compiled = [self._compile_expression(expression) for expression in expressions]
+        checks = [criteria.check for criteria in compiled]
+        progresses = [criteria.progress for criteria in compiled]
+        windows = frozenset().union(*(criteria.windows for criteria in compiled))
+        inputs = frozenset().union(*(criteria.inputs for criteria in compiled))
+        combine, pick = (all, min) if kind == "all" else (any, max)
+
+        def check(user_stats: UserStats, totals: WindowTotals) -> bool:
+            return combine(part(user_stats, totals) for part in checks)
+
+        def progress(user_stats: UserStats, totals: WindowTotals) -> int:
+            return pick(part(user_stats, totals) for part in progresses)
+
+        return CompiledCriteria(check, progress, windows, inputs)
+
+
+def _stat(name: object) -> Value:
+    """Compile a statistic lookup."""
+    if name not in STATISTICS:
+        msg = f"Unknown statistic: {name!r}"
+        raise ValueError(msg)
+    return lambda user_stats, _totals: getattr(user_stats, name)
+
+
+def _window_key(counter: object, days: object) -> tuple[str, int]:
+    """Validate a (counter, days) window."""
+    if counter not in WINDOW_COUNTERS:
+        msg = f"Unknown window counter: {counter!r}"
+        raise ValueError(msg)
+    if not isinstance(days, int) or not 1 <= days <= MAX_WINDOW_DAYS:
+        msg = f"Window days must be an integer from 1 to {MAX_WINDOW_DAYS}, got {days!r}"
+        raise ValueError(msg)
+    return counter, days
+
+
+def _window(window: tuple[str, int]) -> Value:
+    """Compile a window total lookup."""
+    return lambda _user_stats, totals: totals[window]
+
+
+def _operand(operand: object) -> Value:
+    """Compile the right side of a comparison: a number or another statistic."""
+    if isinstance(operand, dict) and operand.keys() == {"stat"}:
+        return _stat(operand["stat"])
+    if isinstance(operand, int) and not isinstance(operand, bool):
+        return lambda _user_stats, _totals: operand
+    msg = f"Comparison operand must be an integer or {{'stat': ...}}, got {operand!r}"
+    raise ValueError(msg)
+
+
+def _comparison(
+    left: Value,
+    comparison: str,
+    right: Value,
+    windows: frozenset[tuple[str, int]],
+    inputs: frozenset[str],
+) -> CompiledCriteria:
+    """Compile a comparison of two values."""
+    compare = OPERATORS[comparison]
+
+    def check(user_stats: UserStats, totals: WindowTotals) -> bool:
+        return compare(left(user_stats, totals), right(user_stats, totals))
+
+    if comparison in {"gte", "gt"}:
+        # "gt n" is "gte n + 1" for integers
+        offset = 1 if comparison == "gt" else 0
+
+        def progress(user_stats: UserStats, totals: WindowTotals) -> int:
+            return progress_basis_points(left(user_stats, totals), right(user_stats, totals) + offset)
+
+    else:
+
+        def progress(user_stats: UserStats, totals: WindowTotals) -> int:
+            return BASIS_POINTS if check(user_stats, totals) else 0
+
+    return CompiledCriteria(check, progress, windows, inputs)
+
+
+def _threshold(stat_field: str, required: int, progress_required: int) -> CompiledCriteria:
+    """Compile a single-threshold criteria type."""
+    value = _stat(stat_field)
+
+    def check(user_stats: UserStats, totals: WindowTotals) -> bool:
+        return value(user_stats, totals) >= required
+
+    def progress(user_stats: UserStats, totals: WindowTotals) -> int:
+        return progress_basis_points(value(user_stats, totals), progress_required)
+
+    return CompiledCriteria(check, progress, inputs=frozenset({stat_field}))
+
+
+@process_singleton()
+def get_criteria_compiler() -> CriteriaCompiler:
+    """
+    Get the process-wide criteria compiler, so compiled criteria are shared by every evaluator.
+
+    Returns:
+        CriteriaCompiler instance
+    """
+    return CriteriaCompiler()
@@ -0,0 +1,173 @@
+"""InvalidationBus - Broadcasts cache invalidations to every worker through PostgreSQL LISTEN/NOTIFY."""
+
+import logging
+import os
+import threading
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from django.db import connections
+
+
+if TYPE_CHECKING:
+    import psycopg
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "achievement_cache_invalidation"
+# NOTIFY payloads must stay under 8000 bytes
+MAX_PAYLOAD_BYTES = 7_900
+RECONNECT_DELAY = 1.0
+
+
+def encode_messages(kind: str, user_ids: list[int] | tuple[int, ...] = ()) -> list[str]:
+    """
+    Encode an invalidation as compact NOTIFY payloads.
+
+    A payload is ``<kind>`` or ``<kind>:<id>,<id>,...``; long ID lists are
+    split across several payloads.
+
+    Args:
+        kind: What changed (e.g. 'statistics', 'unlocked', 'catalog')
+        user_ids: Users whose entries changed, if the kind is per user
+
+    Returns:
+        List of payloads
+    """
+    if not user_ids:
+        return [kind]
+
+    messages, current = [], []
+    size = len(kind) + 1
+    for user_id in user_ids:
+        part = str(user_id)
+        if current and size + len(part) + 1 > MAX_PAYLOAD_BYTES:
+            messages.append(f"{kind}:{','.join(current)}")
+            current, size = [], len(kind) + 1
+        current.append(part)
+        size += len(part) + 1
+    messages.append(f"{kind}:{','.join(current)}")
+    return messages
+
+
+def decode_message(payload: str) -> tuple[str, list[int]]:
+    """
+    Decode a NOTIFY payload.
+
+    Args:
+        payload: Payload produced by encode_messages
+
+    Returns:
+        Tuple of (kind, user_ids)
+    """
+    kind, _sep, ids = payload.partition(":")
+    return kind, [int(user_id) for user_id in ids.split(",") if user_id]
+
+
+class InvalidationBus:
+    """
+    Publishes and receives cache invalidations over PostgreSQL NOTIFY.
+
+    Messages are sent on the caller's connection; inside a transaction
+    PostgreSQL delivers them only when it commits and drops them on
+    rollback. Each process runs one listener thread holding a dedicated
+    connection that waits on the socket, so invalidations reach other
+    workers within milliseconds, without polling.
+
+    A listener that loses its connection cannot know what it missed, so it
+    calls ``on_reconnect`` (typically clearing the local cache) once it is
+    listening again. On databases other than PostgreSQL the bus does nothing.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str, list[int]], None],
+        on_reconnect: Callable[[], None],
+        using: str = "default",
+    ) -> None:
+        """
+        Initialize the InvalidationBus.
+
+        Args:
+            handler: Called with (kind, user_ids) for every message received
+            on_reconnect: Called after the listener reconnects
+            using: Database alias to publish and listen on
+        """
+        self.handler = handler
+        self.on_reconnect = on_reconnect
+        self.using = using
+        self._lock = threading.Lock()
+        self._listener: threading.Thread | None = None
+        self._listener_pid: int | None = None
+        self._stopped = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the database supports LISTEN/NOTIFY."""
+        return connections[self.using].vendor == "postgresql"
+
+    def publish(self, kind: str, user_ids: list[int] | tuple[int, ...] = ()) -> None:
+        """
+        Broadcast an invalidation (at commit, if called inside a transaction).
+
+        Args:
+            kind: What changed
+            user_ids: Users whose entries changed, if the kind is per user
+        """
+        if not self.enabled:
+            return
+        with connections[self.using].cursor() as cursor:
+            for payload in encode_messages(kind, user_ids):
+                cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, payload])
+
+    def ensure_listening(self) -> None:
+        """Start the listener thread in this process if it is not running (e.g. after a fork)."""
+        pid = os.getpid()
+        if self._listener_pid == pid or not self.enabled:
+            return
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            self._stopped.clear()
+            self._listener = threading.Thread(target=self._listen_forever, name="cache-invalidation-listener", daemon=True)
+            self._listener.start()
+            self._listener_pid = pid
+
+    def stop(self) -> None:
+        """Ask the listener thread to exit after its current wait."""
+        self._stopped.set()
+
+    def dispatch(self, payload: str) -> None:
+        """Hand a received payload to the handler."""
+        try:
+            kind, user_ids = decode_message(payload)
+            self.handler(kind, user_ids)
+        except Exception:
+            logger.exception("Error handling cache invalidation %r", payload)
+
+    def _listen_forever(self) -> None:
+        """Listen for invalidations, reconnecting whenever the connection drops."""
+        first = True
+        while not self._stopped.is_set():
+            try:
+                with self._connect() as raw_connection:
+                    raw_connection.execute(f"LISTEN {CHANNEL}")
+                    if not first:
+                        self.on_reconnect()
+                    first = False
+                    logger.info("Listening for cache invalidations on %s", CHANNEL)
+                    while not self._stopped.is_set():
+                        for notify in raw_connection.notifies(timeout=RECONNECT_DELAY):
+                            self.dispatch(notify.payload)
+            except Exception:
+                logger.exception("Cache invalidation listener lost its connection, reconnecting")
+                first = False
+                self._stopped.wait(RECONNECT_DELAY)
+
+    def _connect(self) -> "psycopg.Connection":
+        """Open a dedicated autocommit connection with the settings of the database alias."""
+        wrapper = connections[self.using]
+        raw_connection = wrapper.get_new_connection(wrapper.get_connection_params())
+        raw_connection.autocommit = True
+        return raw_connection
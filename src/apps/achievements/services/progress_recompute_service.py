@@ -0,0 +1,256 @@
+"""ProgressRecomputeService - Recomputes UserAchievement progress for the whole user base in parallel."""
+
+import logging
+import multiprocessing
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from apps.achievements.models import Achievement, ProgressRecomputePartition, UserAchievement, UserStatistics
+from apps.achievements.services.achievement_evaluator import AchievementEvaluator
+from apps.achievements.services.state_cache import get_state_cache
+from apps.achievements.services.validators.base import CriteriaValidator
+from apps.achievements.utils.progress import BASIS_POINTS
+from apps.achievements.utils.stats_snapshot import FIELDS as STATISTICS_FIELDS
+from apps.achievements.utils.stats_snapshot import StatsSnapshot
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 2_000
+
+
+class ProgressRecomputeService:
+    """
+    Recomputes ``UserAchievement.progress_bp`` of every user, e.g. after a validator's math changed.
+
+    Users are split into user ID ranges (partitions) that are recomputed in
+    separate processes. Each process loads the active catalog once, streams the
+    statistics of its range as snapshots, evaluates every achievement in memory and writes
+    the rows whose progress changed with one bulk upsert per chunk. The chunk
+    commits together with the partition's checkpoint, so a run resumes where
+    it stopped.
+
+    Completed achievements are left untouched, and no row is created for an
+    achievement the user has made no progress on. Of a chain, only the user's
+    lowest locked tier keeps progress; rows of the tiers above it are deleted.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """
+        Initialize the ProgressRecomputeService.
+
+        Args:
+            chunk_size: Statistics rows read and written per chunk
+
+        Raises:
+            ValueError: If the chunk size is not positive
+        """
+        if chunk_size < 1:
+            msg = f"Chunk size must be positive, got {chunk_size}"
+            raise ValueError(msg)
+        self.chunk_size = chunk_size
+
+    def recompute_all(
+        self,
+        workers: int,
+        partitions: int | None = None,
+        *,
+        restart: bool = False,
+        on_partition_done: Callable[[dict], None] | None = None,
+    ) -> dict:
+        """
+        Recompute progress for all users, resuming the last unfinished run unless restart is set.
+
+        Args:
+            workers: Number of worker processes (1 runs in this process)
+            partitions: Number of user ID ranges for a new run (default: 4 per worker)
+            restart: Plan a new run even if an unfinished one exists
+            on_partition_done: Called with each partition's summary as it finishes
+
+        Returns:
+            Dictionary with partitions, users_processed and rows_written totals
+        """
+        pending = [] if restart else ProgressRecomputePartition.objects.get_unfinished_run()
+        if pending:
+            logger.info("Resuming progress recompute run %s (%d partitions left)", pending[0].run_id, len(pending))
+        else:
+            pending = ProgressRecomputePartition.objects.plan(partitions or workers * 4)
+
+        summary = {"partitions": len(pending), "users_processed": 0, "rows_written": 0}
+        for result in self._run(pending, workers):
+            summary["users_processed"] += result["users_processed"]
+            summary["rows_written"] += result["rows_written"]
+            if on_partition_done is not None:
+                on_partition_done(result)
+
+        logger.info(
+            "Progress recompute complete: %d users processed, %d rows written",
+            summary["users_processed"],
+            summary["rows_written"],
+        )
+        return summary
+
+    def recompute_partition(self, partition_id: int) -> dict:
+        """
+        Recompute progress for the users of one partition, from its checkpoint.
+
+        Args:
+            partition_id: ProgressRecomputePartition ID
+
+        Returns:
+            Dictionary with partition_id, users_processed and rows_written for this call
+        """
+        partition = ProgressRecomputePartition.objects.get(id=partition_id)
+        validators = AchievementEvaluator().validators
+        # Chain tiers lowest first, so a user's lowest locked tier is met before the ones above it
+        catalog = [
+            (achievement, validators[achievement.criteria_type])
+            for achievement in Achievement.objects.get_active_achievements().order_by("tier")
+            if achievement.criteria_type in validators
+        ]
+
+        result = {"partition_id": partition_id, "users_processed": 0, "rows_written": 0}
+        statistics = (
+            StatsSnapshot.from_values(values)
+            for values in UserStatistics.objects.filter(user_id__gt=partition.last_user_id, user_id__lte=partition.upper_user_id)
+            .order_by("user_id")
+            .values(*STATISTICS_FIELDS)
+            .iterator(chunk_size=self.chunk_size)
+        )
+        for chunk in self._chunks(statistics):
+            written = self.recompute_chunk(partition, chunk, catalog)
+            result["users_processed"] += len(chunk)
+            result["rows_written"] += written
+
+        partition.completed_at = timezone.now()
+        partition.save(update_fields=["completed_at", "updated_at"])
+        return result
+
+    @transaction.atomic
+    def recompute_chunk(
+        self,
+        partition: ProgressRecomputePartition,
+        chunk: list[StatsSnapshot],
+        catalog: list[tuple[Achievement, CriteriaValidator]],
+    ) -> int:
+        """
+        Recompute and persist progress for one chunk of users, then advance the checkpoint.
+
+        Args:
+            partition: Partition the chunk belongs to
+            chunk: Statistics of the users, in user ID order
+            catalog: Active achievements with the validator of their criteria type, chain tiers lowest first
+
+        Returns:
+            Number of UserAchievement rows inserted, updated or deleted
+        """
+        user_ids = [user_stats.user_id for user_stats in chunk]
+        existing = {
+            (user_id, achievement_id): (row_id, progress, is_completed)
+            for row_id, user_id, achievement_id, progress, is_completed in UserAchievement.objects.filter(user_id__in=user_ids).values_list(
+                "id",
+                "user_id",
+                "achievement_id",
+                "progress_bp",
+                "is_completed",
+            )
+        }
+
+        now = timezone.now()
+        rows = []
+        stale = {}
+        for user_stats in chunk:
+            rows.extend(self._recompute_user(user_stats, catalog, existing, stale, now))
+
+        if rows:
+            UserAchievement.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["user", "achievement"],
+                update_fields=["progress_bp", "updated_at"],
+            )
+        if stale:
+            UserAchievement.objects.filter(id__in=stale).delete()
+
+        written = len(rows) + len(stale)
+        if written:
+            changed_ids = sorted({row.user_id for row in rows} | set(stale.values()))
+            get_state_cache().invalidate_on_commit("unlocked", changed_ids)
+
+        partition.last_user_id = user_ids[-1]
+        partition.users_processed += len(chunk)
+        partition.rows_written += written
+        partition.save(update_fields=["last_user_id", "users_processed", "rows_written", "updated_at"])
+        return written
+
+    def _recompute_user(
+        self,
+        user_stats: StatsSnapshot,
+        catalog: list[tuple[Achievement, CriteriaValidator]],
+        existing: dict[tuple[int, object], tuple[object, int, bool]],
+        stale: dict[object, int],
+        now: datetime,
+    ) -> Iterator[UserAchievement]:
+        """
+        Yield the UserAchievement rows whose progress changed for one user.
+
+        Rows above the user's lowest locked tier of a chain are added to stale (row ID -> user ID) instead.
+        """
+        # Chains whose lowest locked tier was already seen
+        climbing = set()
+        for achievement, validator in catalog:
+            row_id, progress, is_completed = existing.get((user_stats.user_id, achievement.id), (None, 0, False))
+            if is_completed:
+                continue
+            if achievement.chain_id is not None:
+                if achievement.chain_id in climbing:
+                    if row_id is not None:
+                        stale[row_id] = user_stats.user_id
+                    continue
+                climbing.add(achievement.chain_id)
+            new_progress = max(0, min(validator.calculate_progress_bp(user_stats, achievement.criteria), BASIS_POINTS))
+            if new_progress != progress:
+                yield UserAchievement(
+                    user_id=user_stats.user_id,
+                    achievement_id=achievement.id,
+                    progress_bp=new_progress,
+                    created_at=now,
+                    updated_at=now,
+                )
+
+    def _run(self, partitions: list[ProgressRecomputePartition], workers: int) -> Iterator[dict]:
+        """Recompute the partitions, in worker processes unless there is a single worker."""
+        if workers <= 1:
+            for partition in partitions:
+                yield self.recompute_partition(partition.id)
+            return
+
+        # Workers are forked so they inherit the configured Django, and must not share its database connections
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as executor:
+            futures = [executor.submit(_recompute_partition, partition.id, self.chunk_size) for partition in partitions]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def _chunks(self, statistics: Iterator[StatsSnapshot]) -> Iterator[list[StatsSnapshot]]:
+        """Group streamed statistics rows into lists of chunk_size."""
+        chunk = []
+        for user_stats in statistics:
+            chunk.append(user_stats)
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _recompute_partition(partition_id: int, chunk_size: int) -> dict:
+    """Recompute one partition in a worker process."""
+    try:
+        return ProgressRecomputeService(chunk_size=chunk_size).recompute_partition(partition_id)
+    finally:
+        connections.close_all()
@@ -0,0 +1,292 @@
+"""AchievementStateCache - Caches per-user statistics and unlocked achievements."""
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+
+import redis
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.achievements.db_router import primary_reads
+from apps.achievements.models import Achievement, UnlockedAchievementSet, UserAchievement, UserStatistics
+from apps.achievements.services.invalidation_bus import InvalidationBus
+from apps.achievements.signals import statistics_updated
+from apps.achievements.utils.bitset import AchievementBitset
+from apps.achievements.utils.identity_map import get_or_load, statistics_key
+from apps.achievements.utils.singleton import process_singleton
+from apps.achievements.utils.stats_snapshot import FIELDS as STATISTICS_FIELDS
+from apps.achievements.utils.stats_snapshot import StatsSnapshot
+from apps.achievements.utils.two_tier_cache import TwoTierCache
+from apps.achievements.utils.uncommitted import UncommittedWrites
+
+
+logger = logging.getLogger(__name__)
+
+CATALOG_KEY = "catalog"
+REFRESH_WORKERS = 2
+
+
+class DatabaseRefreshExecutor(ThreadPoolExecutor):
+    """Thread pool for background cache refreshes that keeps its database connections healthy."""
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        """Schedule ``fn``, closing broken or expired connections around it like a request would."""
+
+        def run() -> object:
+            close_old_connections()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                close_old_connections()
+
+        return super().submit(run)
+
+
+class AchievementStateCache:
+    """
+    Read-through cache for the per-user state that achievement checks read.
+
+    Besides raw state it caches results derived from it (all-progress,
+    achievement lists, the serialized catalog), which are invalidated
+    together with the state they were computed from. Concurrent misses for
+    the same user are computed once (see TwoTierCache).
+
+    Cached values are always loaded from the primary database, also during
+    requests reading from a replica: a lagging replica would otherwise store
+    a value older than the version stamps it is cached under, served to
+    every worker until ``shared_ttl`` expires.
+
+    Without a backing cache every call goes to the database. Invalidation is
+    driven by model signals and ``statistics_updated`` and runs after the
+    writing transaction commits (see invalidate_on_commit). Until then the
+    writing transaction bypasses the cache for the entries it changed, and
+    values derived from them, reading its own writes from the database
+    without storing them, so neither tier ever holds uncommitted data and
+    the transaction never reads the state it replaced. With an invalidation
+    bus, every invalidation is also broadcast to the other workers, which
+    evict the keys from their local tier.
+    """
+
+    def __init__(self, cache: TwoTierCache | None = None, *, bus: bool = False) -> None:
+        """
+        Initialize the AchievementStateCache.
+
+        Args:
+            cache: Backing two-tier cache (default: no caching)
+            bus: Whether to broadcast invalidations to other workers over PostgreSQL NOTIFY
+        """
+        self.cache = cache
+        # Keys changed by the open transaction, invalidated once it commits
+        self._uncommitted = UncommittedWrites()
+        self.bus = InvalidationBus(handler=self.evict_local, on_reconnect=cache.clear_local) if bus and cache is not None else None
+
+    def get_user_statistics(self, user_id: int) -> StatsSnapshot | None:
+        """
+        Get a user's statistics.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            StatsSnapshot, or None if the user has no statistics
+        """
+
+        def load() -> dict | None:
+            return UserStatistics.objects.filter(user_id=user_id).values(*STATISTICS_FIELDS).first()
+
+        def load_snapshot() -> StatsSnapshot | None:
+            values = self._get_or_load(f"statistics:{user_id}", load)
+            return StatsSnapshot.from_values(values) if values is not None else None
+
+        # Snapshots are immutable, so one per unit of work is shared by every reader
+        return get_or_load(statistics_key(user_id), load_snapshot)
+
+    def get_unlocked_bitset(self, user_id: int) -> AchievementBitset:
+        """
+        Get the achievements a user has unlocked.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            AchievementBitset of unlocked achievement ordinals
+        """
+        return self._get_or_load(f"unlocked:{user_id}", lambda: UnlockedAchievementSet.objects.get_bitset(user_id))
+
+    def get_progress(self, user_id: int, compute: Callable[[], list[dict]]) -> list[dict]:
+        """
+        Get a user's progress on every achievement.
+
+        Args:
+            user_id: User ID
+            compute: Computes the progress list on a miss
+
+        Returns:
+            Progress list (shared, must not be mutated)
+        """
+        return self._get_or_load(
+            f"progress:{user_id}",
+            compute,
+            depends_on=(f"statistics:{user_id}", f"unlocked:{user_id}", CATALOG_KEY),
+        )
+
+    def get_user_achievements(self, user_id: int, compute: Callable[[], list[dict]], *, include_locked: bool) -> list[dict]:
+        """
+        Get a user's achievement list.
+
+        Args:
+            user_id: User ID
+            compute: Computes the list on a miss
+            include_locked: Whether the list includes locked achievements
+
+        Returns:
+            Achievement list (shared, must not be mutated)
+        """
+        return self._get_or_load(
+            f"achievements:{user_id}:{'all' if include_locked else 'unlocked'}",
+            compute,
+            depends_on=(f"unlocked:{user_id}", CATALOG_KEY),
+        )
+
+    def get_catalog(self, compute: Callable[[], list[dict]]) -> list[dict]:
+        """
+        Get the serialized catalog of active achievements.
+
+        Args:
+            compute: Serializes the catalog on a miss
+
+        Returns:
+            Serialized achievements (shared, must not be mutated)
+        """
+        return self._get_or_load(CATALOG_KEY, compute)
+
+    def invalidate_statistics(self, user_ids: list[int]) -> None:
+        """Drop cached statistics of the given users."""
+        self._invalidate("statistics", user_ids)
+
+    def invalidate_unlocked(self, user_ids: list[int]) -> None:
+        """Drop cached unlocked achievements of the given users."""
+        self._invalidate("unlocked", user_ids)
+
+    def invalidate_catalog(self) -> None:
+        """Drop the cached catalog and everything derived from it."""
+        self._invalidate(CATALOG_KEY)
+
+    def invalidate_on_commit(self, kind: str, user_ids: list[int] | tuple[int, ...] = ()) -> None:
+        """
+        Invalidate entries changed by the current transaction once it commits.
+
+        Until then the transaction reads those entries from the database, and
+        a rollback drops the invalidation together with the writes.
+
+        Args:
+            kind: 'statistics', 'unlocked' or 'catalog'
+            user_ids: Users whose entries changed
+        """
+        if self.cache is not None:
+            self._uncommitted.add(self._keys(kind, user_ids), None, partial(self._invalidate, kind, list(user_ids)))
+
+    def evict_local(self, kind: str, user_ids: list[int]) -> None:
+        """
+        Drop entries changed by another worker from this process only.
+
+        Args:
+            kind: 'statistics', 'unlocked' or 'catalog'
+            user_ids: Users whose entries changed
+        """
+        if self.cache is not None:
+            self.cache.evict_local(self._keys(kind, user_ids))
+
+    def _get_or_load(self, key: str, load: Callable[[], object], depends_on: tuple[str, ...] = ()) -> object:
+        """Read a value through the cache, loading misses from the primary, or from the database if the current transaction changed it."""
+        if self.cache is None or self._written({key, *depends_on}):
+            return load()
+        self._ensure_listening()
+
+        def load_from_primary() -> object:
+            with primary_reads():
+                return load()
+
+        return self.cache.get_or_load(key, load_from_primary, depends_on=depends_on)
+
+    def _written(self, keys: set[str]) -> bool:
+        """Check whether the current transaction changed any of the keys, i.e. their invalidation waits for its commit."""
+        return any(self._uncommitted.contains(key) for key in keys)
+
+    def _invalidate(self, kind: str, user_ids: list[int] | tuple[int, ...] = ()) -> None:
+        """Invalidate entries in both tiers, then tell the other workers to evict them."""
+        if self.cache is None:
+            return
+        self.cache.invalidate(self._keys(kind, user_ids))
+        if self.bus is not None:
+            # Runs after the write committed, and after the shared tier was invalidated, so
+            # workers evicting their local copy cannot reload the old value from Redis
+            self.bus.publish(kind, user_ids)
+
+    def _keys(self, kind: str, user_ids: list[int] | tuple[int, ...]) -> list[str]:
+        """Get the cache keys of an invalidation."""
+        if kind == CATALOG_KEY:
+            return [CATALOG_KEY]
+        return [f"{kind}:{user_id}" for user_id in user_ids]
+
+    def _ensure_listening(self) -> None:
+        """Make sure this process receives invalidations from the other workers."""
+        if self.bus is not None:
+            self.bus.ensure_listening()
+
+
+@process_singleton(reset_on=("ACHIEVEMENT_STATE_CACHE",))
+def get_state_cache() -> AchievementStateCache:
+    """
+    Get the state cache configured in ``settings.ACHIEVEMENT_STATE_CACHE``.
+
+    The cache is built once per process and reset when the setting changes.
+
+    Returns:
+        AchievementStateCache instance
+    """
+    config = settings.ACHIEVEMENT_STATE_CACHE
+    if not config["enabled"]:
+        return AchievementStateCache()
+
+    return AchievementStateCache(
+        TwoTierCache(
+            redis.Redis.from_url(settings.REDIS_URL) if config["backend"] == "redis" else None,
+            namespace="achievement_state",
+            local_max_entries=config["local_max_entries"],
+            local_ttl=config["local_ttl"],
+            shared_ttl=config["shared_ttl"],
+            stale_ttl=config["stale_ttl"],
+            lock_timeout=config["lock_timeout"],
+            refresh_executor=DatabaseRefreshExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="state-cache-refresh"),
+        ),
+        bus=config["invalidation_bus"],
+    )
+
+
+@receiver(statistics_updated)
+def _statistics_updated(*, user_ids: list[int], **kwargs) -> None:
+    """Invalidate statistics changed by UPDATE statements once they commit."""
+    get_state_cache().invalidate_on_commit("statistics", user_ids)
+
+
+@receiver([post_save, post_delete], sender=UserStatistics)
+def _statistics_saved(*, instance: UserStatistics, **kwargs) -> None:
+    """Invalidate statistics saved through the ORM once they commit."""
+    get_state_cache().invalidate_on_commit("statistics", [instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=UserAchievement)
+def _user_achievement_saved(*, instance: UserAchievement, **kwargs) -> None:
+    """Invalidate unlocked achievements once a user achievement change commits."""
+    get_state_cache().invalidate_on_commit("unlocked", [instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=Achievement)
+def _achievement_saved(**kwargs) -> None:
+    """Invalidate the catalog once an achievement change commits."""
+    get_state_cache().invalidate_on_commit(CATALOG_KEY)
@@ -0,0 +1,335 @@
+"""Statistics writers - Apply UserStatistics increments directly or through a write-behind buffer."""
+
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+from functools import partial
+
+import redis
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from apps.achievements.models import UserStatistics
+from apps.achievements.signals import statistics_updated
+from apps.achievements.utils.singleton import process_singleton
+from apps.achievements.utils.stats_snapshot import StatsSnapshot
+from apps.achievements.utils.uncommitted import UncommittedWrites
+
+
+logger = logging.getLogger(__name__)
+
+FLUSH_BATCH_SIZE = 1_000
+REDIS_KEY_PREFIX = "statistics_buffer"
+
+
+class DirectStatisticsWriter:
+    """Applies every increment to the database immediately."""
+
+    def increment(self, user_id: int, **deltas: int) -> UserStatistics:
+        """
+        Atomically increment statistics.
+
+        Args:
+            user_id: User ID
+            **deltas: Amount to add per statistic
+
+        Returns:
+            UserStatistics instance holding the values after the increment
+        """
+        return UserStatistics.objects.increment(user_id, **deltas)
+
+    def merge(self, user_stats: StatsSnapshot | UserStatistics) -> StatsSnapshot | UserStatistics:
+        """Return the statistics unchanged; nothing is ever pending."""
+        return user_stats
+
+    def flush(self) -> int:
+        """Do nothing; nothing is ever pending."""
+        return 0
+
+
+class MemoryCounterStore:
+    """Pending statistics deltas held in the memory of the current process."""
+
+    def __init__(self) -> None:
+        """Initialize the MemoryCounterStore."""
+        self._lock = threading.Lock()
+        self._pending: dict[int, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def add(self, user_id: int, deltas: dict[str, int]) -> None:
+        """Add deltas to a user's pending counters."""
+        with self._lock:
+            pending = self._pending[user_id]
+            for stat_name, delta in deltas.items():
+                pending[stat_name] += delta
+
+    def get(self, user_id: int) -> dict[str, int]:
+        """Get a user's pending deltas."""
+        with self._lock:
+            return dict(self._pending.get(user_id, {}))
+
+    def drain(self) -> dict[int, dict[str, int]]:
+        """Remove and return every pending delta."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(lambda: defaultdict(int))
+        return {user_id: dict(deltas) for user_id, deltas in pending.items()}
+
+
+class RedisCounterStore:
+    """
+    Pending statistics deltas held in Redis hashes shared by all processes.
+
+    Each user has a hash of stat -> delta updated with ``HINCRBY``, and a set
+    tracks which users have pending deltas.
+    """
+
+    def __init__(self, client: redis.Redis | None = None) -> None:
+        """
+        Initialize the RedisCounterStore.
+
+        Args:
+            client: Redis client (default: client for settings.REDIS_URL)
+        """
+        self.client = client or redis.Redis.from_url(settings.REDIS_URL)
+        self.dirty_key = f"{REDIS_KEY_PREFIX}:dirty"
+
+    def add(self, user_id: int, deltas: dict[str, int]) -> None:
+        """Add deltas to a user's pending counters."""
+        pipeline = self.client.pipeline()
+        for stat_name, delta in deltas.items():
+            pipeline.hincrby(self._key(user_id), stat_name, delta)
+        pipeline.sadd(self.dirty_key, user_id)
+        pipeline.execute()
+
+    def get(self, user_id: int) -> dict[str, int]:
+        """Get a user's pending deltas."""
+        return {stat_name.decode(): int(delta) for stat_name, delta in self.client.hgetall(self._key(user_id)).items()}
+
+    def drain(self) -> dict[int, dict[str, int]]:
+        """Remove and return every pending delta."""
+        drained = {}
+        for member in self.client.spop(self.dirty_key, self.client.scard(self.dirty_key)) or []:
+            user_id = int(member)
+            # Read and delete in one MULTI so increments racing with the drain land in a new hash
+            pipeline = self.client.pipeline(transaction=True)
+            pipeline.hgetall(self._key(user_id))
+            pipeline.delete(self._key(user_id))
+            deltas, _deleted = pipeline.execute()
+            if deltas:
+                drained[user_id] = {stat_name.decode(): int(delta) for stat_name, delta in deltas.items()}
+        return drained
+
+    def _key(self, user_id: int) -> str:
+        """Get the hash key holding a user's pending deltas."""
+        return f"{REDIS_KEY_PREFIX}:{user_id}"
+
+
+class WriteBehindStatisticsWriter:
+    """
+    Buffers statistics increments and writes them to the database in batches.
+
+    Increments are added to a counter store and flushed every
+    ``flush_interval_ms`` or once ``flush_max_increments`` increments are
+    pending, whichever comes first. A flush folds all pending deltas into one
+    ``UPDATE ... FROM (VALUES ...)`` per batch of users, so a hot user costs
+    one row update per flush instead of one per event. Reads that feed
+    achievement evaluation merge the pending deltas into the stored row.
+
+    An increment made inside a transaction is only buffered once that
+    transaction commits, so a rolled back (e.g. retried) transaction leaves
+    no delta behind. Until then it is visible to merged reads of the same
+    transaction only. Flushes never run inside the caller's transaction.
+
+    Durability: with the memory store, a crashed process loses the increments
+    buffered since its last flush, which is bounded by one flush window
+    (``flush_interval_ms``, capped at ``flush_max_increments`` increments).
+    With the Redis store increments survive process crashes and are only as
+    durable as the Redis instance. A failed flush puts the deltas back.
+    """
+
+    def __init__(
+        self,
+        store: MemoryCounterStore | RedisCounterStore | None = None,
+        flush_interval_ms: int = 500,
+        flush_max_increments: int = 1000,
+        *,
+        background_flush: bool = True,
+    ) -> None:
+        """
+        Initialize the WriteBehindStatisticsWriter.
+
+        Args:
+            store: Where pending deltas are kept (default: MemoryCounterStore)
+            flush_interval_ms: Maximum age of pending deltas before a flush
+            flush_max_increments: Number of pending increments that triggers a flush
+            background_flush: Whether to flush from a background thread every flush_interval_ms
+        """
+        self.store = store or MemoryCounterStore()
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_max_increments = flush_max_increments
+        self.background_flush = background_flush
+        self._pending_increments = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher: threading.Thread | None = None
+        self._uncommitted = UncommittedWrites()
+
+    def increment(self, user_id: int, **deltas: int) -> UserStatistics:
+        """
+        Buffer an increment and return the merged view of the user's statistics.
+
+        Args:
+            user_id: User ID
+            **deltas: Amount to add per statistic
+
+        Returns:
+            UserStatistics instance with pending deltas applied (not saved)
+
+        Raises:
+            ValueError: If no deltas are given or a statistic is not a counter
+        """
+        unknown = set(deltas) - UserStatistics.objects.COUNTER_FIELDS
+        if not deltas or unknown:
+            msg = f"Expected deltas for counter statistics, got {sorted(deltas)}"
+            raise ValueError(msg)
+
+        self._uncommitted.add([user_id], deltas, partial(self._buffer, user_id, deltas))
+        self._ensure_flusher()
+
+        user_stats = UserStatistics.objects.filter(user_id=user_id).first() or UserStatistics(user_id=user_id)
+        return self.merge(user_stats)
+
+    def merge(self, user_stats: StatsSnapshot | UserStatistics) -> StatsSnapshot | UserStatistics:
+        """
+        Apply a user's pending deltas to statistics.
+
+        Args:
+            user_stats: Statistics as stored in the database
+
+        Returns:
+            A snapshot with pending deltas added (snapshots are immutable), or
+            the same UserStatistics instance with pending deltas added
+        """
+        deltas = self.store.get(user_stats.user_id)
+        # Increments of the current transaction are visible to it before they are buffered
+        for uncommitted in self._uncommitted.get(user_stats.user_id):
+            for stat_name, delta in uncommitted.items():
+                deltas[stat_name] = deltas.get(stat_name, 0) + delta
+        pending = {stat_name: getattr(user_stats, stat_name) + delta for stat_name, delta in deltas.items()}
+        if isinstance(user_stats, StatsSnapshot):
+            return user_stats.replace(**pending) if pending else user_stats
+        for stat_name, value in pending.items():
+            setattr(user_stats, stat_name, value)
+        return user_stats
+
+    def flush(self) -> int:
+        """
+        Write every pending delta to the database.
+
+        Returns:
+            Number of users whose statistics were written
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._pending_increments = 0
+                self._last_flush = time.monotonic()
+
+            pending = self.store.drain()
+            if not pending:
+                return 0
+
+            try:
+                self._write(pending)
+            except Exception:
+                for user_id, deltas in pending.items():
+                    self.store.add(user_id, deltas)
+                raise
+
+        logger.debug("Flushed buffered statistics for %d users", len(pending))
+        return len(pending)
+
+    def _buffer(self, user_id: int, deltas: dict[str, int]) -> None:
+        """Add a committed increment to the store, flushing once enough increments are pending or the oldest is due."""
+        self.store.add(user_id, deltas)
+
+        with self._lock:
+            self._pending_increments += 1
+            due = self._pending_increments >= self.flush_max_increments or time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    @transaction.atomic
+    def _write(self, pending: dict[int, dict[str, int]]) -> None:
+        """Apply deltas with one UPDATE ... FROM (VALUES ...) per batch of users."""
+        UserStatistics.objects.bulk_create(
+            [UserStatistics(user_id=user_id) for user_id in pending],
+            ignore_conflicts=True,
+        )
+
+        quote = connection.ops.quote_name
+        meta = UserStatistics._meta  # noqa: SLF001
+        table = quote(meta.db_table)
+        stat_names = sorted({stat_name for deltas in pending.values() for stat_name in deltas})
+        columns = [quote(meta.get_field(stat_name).column) for stat_name in stat_names]
+        assignments = ", ".join(f"{column} = {table}.{column} + deltas.{column}" for column in columns)
+        row_placeholder = "(" + ", ".join(["CAST(%s AS BIGINT)"] * (len(stat_names) + 1)) + ")"
+        last_updated = meta.get_field("last_updated").get_db_prep_value(timezone.now(), connection)
+
+        items = list(pending.items())
+        for start in range(0, len(items), FLUSH_BATCH_SIZE):
+            batch = items[start : start + FLUSH_BATCH_SIZE]
+            params = [value for user_id, deltas in batch for value in (user_id, *(deltas.get(stat_name, 0) for stat_name in stat_names))]
+            sql = (
+                f"WITH deltas ({quote(meta.pk.column)}, {', '.join(columns)}) AS (VALUES {', '.join([row_placeholder] * len(batch))}) "  # noqa: S608
+                f"UPDATE {table} SET {assignments}, {quote(meta.get_field('last_updated').column)} = %s "
+                f"FROM deltas WHERE {table}.{quote(meta.pk.column)} = deltas.{quote(meta.pk.column)}"
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [*params, last_updated])
+
+        statistics_updated.send(sender=UserStatistics, user_ids=list(pending))
+
+    def _ensure_flusher(self) -> None:
+        """Start the background flush thread on first use."""
+        if not self.background_flush or self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_periodically, name="statistics-flusher", daemon=True)
+                self._flusher.start()
+                atexit.register(self.flush)
+
+    def _flush_periodically(self) -> None:
+        """Flush pending deltas every flush interval until the process exits."""
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                close_old_connections()
+                self.flush()
+            except Exception:
+                logger.exception("Error flushing buffered statistics")
+
+
+@process_singleton(reset_on=("STATISTICS_WRITE_BEHIND",))
+def get_statistics_writer() -> DirectStatisticsWriter | WriteBehindStatisticsWriter:
+    """
+    Get the statistics writer configured in ``settings.STATISTICS_WRITE_BEHIND``.
+
+    The writer is built once per process and reset when the setting changes.
+
+    Returns:
+        WriteBehindStatisticsWriter if write-behind is enabled, DirectStatisticsWriter otherwise
+    """
+    config = settings.STATISTICS_WRITE_BEHIND
+    if not config["enabled"]:
+        return DirectStatisticsWriter()
+
+    store = RedisCounterStore() if config["backend"] == "redis" else MemoryCounterStore()
+    return WriteBehindStatisticsWriter(
+        store=store,
+        flush_interval_ms=config["flush_interval_ms"],
+        flush_max_increments=config["flush_max_increments"],
+    )
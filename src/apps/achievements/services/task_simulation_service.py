@@ -4,10 +4,22 @@ import logging
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
 from apps.achievements.events.handlers import TaskCompletedEventHandler
+from apps.achievements.events.publishers import EventPublisher
 from apps.achievements.models import UserAchievement, UserStatistics
+from apps.achievements.services.achievement_service import SERVICE_SETTINGS
+from apps.achievements.services.state_cache import get_state_cache
+from apps.achievements.services.statistics_writer import get_statistics_writer
+from apps.achievements.signals import statistics_updated
+from apps.achievements.utils.identity_map import get_object
+from apps.achievements.utils.singleton import process_singleton
+from apps.achievements.utils.stats_snapshot import StatsSnapshot
+from apps.streaks.services.streak_engine import StreakEngine
+from apps.xp_management.services.level_curve import get_level_curve
 
 
 User = get_user_model()
@@ -25,6 +37,11 @@ class TaskSimulationService:
     def __init__(self) -> None:
         """Initialize the TaskSimulationService."""
         self.task_handler = TaskCompletedEventHandler()
+        self.event_publisher = EventPublisher()
+        self.level_curve = get_level_curve()
+        self.streak_engine = StreakEngine()
+        self.statistics_writer = get_statistics_writer()
+        self.state_cache = get_state_cache()
 
     @transaction.atomic
     def simulate_task_completions(
@@ -40,7 +57,7 @@ class TaskSimulationService:
         Args:
             user_id: User ID to simulate tasks for
             count: Number of tasks to simulate
-            update_streak: Whether to update streak counter
+            update_streak: Whether to record today as an active day for the user's streak
 
         Returns:
             Dictionary with simulation results including:
@@ -62,7 +79,7 @@ class TaskSimulationService:
 
         # Validate user exists
         try:
-            user = User.objects.get(id=user_id)
+            user = get_object(User, user_id)
         except User.DoesNotExist as exc:
             msg = f"User with ID {user_id} not found"
             raise ValueError(msg) from exc
@@ -86,28 +103,28 @@ class TaskSimulationService:
 
         # Track newly unlocked achievements
         newly_unlocked = []
+        previous = self.statistics_writer.merge(StatsSnapshot.from_model(stats))
+
+        # The batch counts as one activity, the streak engine derives the streak counters from it
+        if update_streak:
+            self.streak_engine.record_activity(user_id, timezone.now())
 
         # Simulate each task completion
         for i in range(count):
-            # Update statistics
-            stats.total_tasks_completed += 1
-
-            # Update streak if requested
-            if update_streak and i == 0:  # Only update streak once per simulation batch
-                stats.current_streak += 1
-                stats.longest_streak = max(stats.longest_streak, stats.current_streak)
-
             # Calculate XP (50 XP per task as default)
             xp_earned = 50
-            stats.total_xp += xp_earned
 
-            # Calculate level based on XP (simple formula: level = 1 + XP // 1000)
-            new_level = 1 + (stats.total_xp // 1000)
+            # Update statistics in one atomic statement
+            stats = self.statistics_writer.increment(user_id, total_tasks_completed=1, total_xp=xp_earned)
+
+            # Raise the level from XP using the configured level curve, without overwriting concurrent increases
+            new_level = self.level_curve.level_for_xp(stats.total_xp)
             if new_level > stats.current_level:
-                stats.current_level = new_level
                 logger.info("User %s leveled up to %d", user_id, new_level)
-
-            stats.save()
+                UserStatistics.objects.filter(user_id=user_id).update(current_level=Greatest(F("current_level"), new_level))
+                statistics_updated.send(sender=UserStatistics, user_ids=[user_id])
+                stats.current_level = new_level
+                self.event_publisher.publish_level_up(user_id=user_id, old_level=previous.current_level, new_level=new_level)
 
             # Trigger event handler to check for achievements
             event_data = {
@@ -118,8 +135,10 @@ class TaskSimulationService:
                 "xp_earned": xp_earned,
             }
 
-            # Check for unlocked achievements
-            self.task_handler.handle_task_completed(event_data)
+            # Check the achievements of every statistic the task changed (tasks, XP, streak, level) in one pass
+            current = StatsSnapshot.from_model(stats)
+            self.task_handler.handle_task_completed(event_data, user_stats=current, previous_stats=previous)
+            previous = current
 
             logger.debug("Simulated task #%d completion for user %s", i + 1, user_id)
 
@@ -210,14 +229,13 @@ class TaskSimulationService:
 
         """
         try:
-            user = User.objects.get(id=user_id)
+            user = get_object(User, user_id)
         except User.DoesNotExist as exc:
             msg = f"User with ID {user_id} not found"
             raise ValueError(msg) from exc
 
-        try:
-            stats = UserStatistics.objects.get(user=user)
-        except UserStatistics.DoesNotExist:
+        stats = self.state_cache.get_user_statistics(user.id)
+        if stats is None:
             # Return default values if no statistics exist
             return {
                 "total_tasks_completed": 0,
@@ -238,3 +256,14 @@ class TaskSimulationService:
             "friend_count": stats.friend_count,
             "challenges_won": stats.challenges_won,
         }
+
+
+@process_singleton(reset_on=(*SERVICE_SETTINGS, "XP_LEVEL_CURVE"))
+def get_task_simulation_service() -> TaskSimulationService:
+    """
+    Get the process-wide task simulation service.
+
+    Returns:
+        TaskSimulationService instance
+    """
+    return TaskSimulationService()
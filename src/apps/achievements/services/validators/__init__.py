@@ -1,13 +1,17 @@
 """Validators package for achievement criteria."""
 
 from .base import CriteriaValidator
+from .challenge_validator import ChallengeValidator
+from .friend_count_validator import FriendCountValidator
 from .level_validator import LevelValidator
 from .streak_validator import StreakValidator
 from .task_count_validator import TaskCountValidator
 
 
 __all__ = [
+    "ChallengeValidator",
     "CriteriaValidator",
+    "FriendCountValidator",
     "LevelValidator",
     "StreakValidator",
     "TaskCountValidator",
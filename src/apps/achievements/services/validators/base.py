@@ -1,9 +1,14 @@
 """Base abstract class for criteria validators."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 from decimal import Decimal
+from typing import ClassVar
 
-from apps.achievements.models import UserStatistics
+import numpy as np
+
+from apps.achievements.utils.progress import progress_basis_points_batch, to_percentage
+from apps.achievements.utils.stats_snapshot import UserStats
 
 
 class CriteriaValidator(ABC):
@@ -12,10 +17,19 @@ class CriteriaValidator(ABC):
 
     Each criteria type (task_count, streak, level, etc.)
     should have its own validator implementation.
+
+    Validators comparing one statistic against one required value set
+    ``stat_field`` and ``criteria_key``; they then also evaluate many users
+    against many achievements at once with the ``*_batch`` methods, which give
+    the same results as the scalar methods.
     """
 
+    # UserStatistics field compared against the criteria, and the criteria key holding the required value
+    stat_field: ClassVar[str | None] = None
+    criteria_key: ClassVar[str | None] = None
+
     @abstractmethod
-    def validate(self, user_stats: UserStatistics, criteria: dict) -> bool:
+    def validate(self, user_stats: UserStats, criteria: dict) -> bool:
         """
         Validate if user meets the criteria.
 
@@ -28,7 +42,19 @@ class CriteriaValidator(ABC):
         """
 
     @abstractmethod
-    def calculate_progress(self, user_stats: UserStatistics, criteria: dict) -> Decimal:
+    def calculate_progress_bp(self, user_stats: UserStats, criteria: dict) -> int:
+        """
+        Calculate progress towards meeting criteria in basis points.
+
+        Args:
+            user_stats: User statistics
+            criteria: Criteria configuration
+
+        Returns:
+            Progress in basis points (0 to 10000)
+        """
+
+    def calculate_progress(self, user_stats: UserStats, criteria: dict) -> Decimal:
         """
         Calculate progress percentage towards meeting criteria.
 
@@ -39,3 +65,55 @@ class CriteriaValidator(ABC):
         Returns:
             Progress as Decimal (0.00 to 100.00)
         """
+        return to_percentage(self.calculate_progress_bp(user_stats, criteria))
+
+    def required_values(self, criteria_list: Iterable[dict], *, for_progress: bool = False) -> np.ndarray:
+        """
+        Extract the required values of several achievements as an array.
+
+        Missing values default like the scalar methods: 0 for validation and 1 for progress.
+
+        Args:
+            criteria_list: Criteria of the achievements
+            for_progress: Whether the values are used for calculate_progress_batch
+
+        Returns:
+            int64 array with one required value per achievement
+        """
+        self._check_batch_support()
+        default = 1 if for_progress else 0
+        return np.array([criteria.get(self.criteria_key, default) for criteria in criteria_list], dtype=np.int64)
+
+    def validate_batch(self, values: np.ndarray, required: np.ndarray) -> np.ndarray:
+        """
+        Validate many users against many achievements.
+
+        Args:
+            values: stat_field of each user, shape (users,)
+            required: Required value of each achievement, shape (achievements,)
+
+        Returns:
+            Boolean matrix of shape (users, achievements), True where the criteria are met
+        """
+        self._check_batch_support()
+        return np.asarray(values)[:, np.newaxis] >= np.asarray(required)[np.newaxis, :]
+
+    def calculate_progress_bp_batch(self, values: np.ndarray, required: np.ndarray) -> np.ndarray:
+        """
+        Calculate the progress of many users towards many achievements.
+
+        Args:
+            values: stat_field of each user, shape (users,)
+            required: Required value of each achievement (see required_values), shape (achievements,)
+
+        Returns:
+            int64 matrix of shape (users, achievements) with progress in basis points (0 to 10000)
+        """
+        self._check_batch_support()
+        return progress_basis_points_batch(values, required)
+
+    def _check_batch_support(self) -> None:
+        """Raise unless the validator declares the statistic and criteria key it compares."""
+        if self.stat_field is None or self.criteria_key is None:
+            msg = f"{type(self).__name__} does not support batch evaluation"
+            raise NotImplementedError(msg)
@@ -0,0 +1,46 @@
+"""Validator for challenge criteria."""
+
+from apps.achievements.services.validators.base import CriteriaValidator
+from apps.achievements.utils.progress import progress_basis_points
+from apps.achievements.utils.stats_snapshot import UserStats
+
+
+class ChallengeValidator(CriteriaValidator):
+    """
+    Validates criteria based on number of challenges won.
+
+    Expected criteria format:
+    {
+        "required_wins": 3  # Number of challenges the user must win
+    }
+    """
+
+    stat_field = "challenges_won"
+    criteria_key = "required_wins"
+
+    def validate(self, user_stats: UserStats, criteria: dict) -> bool:
+        """
+        Check if user has won the required number of challenges.
+
+        Args:
+            user_stats: User statistics
+            criteria: Criteria with 'required_wins'
+
+        Returns:
+            True if challenges_won >= required_wins
+        """
+        required_wins = criteria.get("required_wins", 0)
+        return user_stats.challenges_won >= required_wins
+
+    def calculate_progress_bp(self, user_stats: UserStats, criteria: dict) -> int:
+        """
+        Calculate progress based on challenges won.
+
+        Args:
+            user_stats: User statistics
+            criteria: Criteria with 'required_wins'
+
+        Returns:
+            Progress in basis points (0 to 10000)
+        """
+        return progress_basis_points(user_stats.challenges_won, criteria.get("required_wins", 1))
@@ -0,0 +1,46 @@
+"""Validator for friend count criteria."""
+
+from apps.achievements.services.validators.base import CriteriaValidator
+from apps.achievements.utils.progress import progress_basis_points
+from apps.achievements.utils.stats_snapshot import UserStats
+
+
+class FriendCountValidator(CriteriaValidator):
+    """
+    Validates criteria based on number of friends.
+
+    Expected criteria format:
+    {
+        "required_count": 5  # Number of friends the user must have
+    }
+    """
+
+    stat_field = "friend_count"
+    criteria_key = "required_count"
+
+    def validate(self, user_stats: UserStats, criteria: dict) -> bool:
+        """
+        Check if user has the required number of friends.
+
+        Args:
+            user_stats: User statistics
+            criteria: Criteria with 'required_count'
+
+        Returns:
+            True if friend_count >= required_count
+        """
+        required_count = criteria.get("required_count", 0)
+        return user_stats.friend_count >= required_count
+
+    def calculate_progress_bp(self, user_stats: UserStats, criteria: dict) -> int:
+        """
+        Calculate progress based on number of friends.
+
+        Args:
+            user_stats: User statistics
+            criteria: Criteria with 'required_count'
+
+        Returns:
+            Progress in basis points (0 to 10000)
+        """
+        return progress_basis_points(user_stats.friend_count, criteria.get("required_count", 1))
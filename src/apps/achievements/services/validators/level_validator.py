@@ -1,9 +1,8 @@
 """Validator for level criteria."""
 
-from decimal import Decimal
-
-from apps.achievements.models import UserStatistics
 from apps.achievements.services.validators.base import CriteriaValidator
+from apps.achievements.utils.progress import progress_basis_points
+from apps.achievements.utils.stats_snapshot import UserStats
 
 
 class LevelValidator(CriteriaValidator):
@@ -16,7 +15,10 @@ class LevelValidator(CriteriaValidator):
     }
     """
 
-    def validate(self, user_stats: UserStatistics, criteria: dict) -> bool:
+    stat_field = "current_level"
+    criteria_key = "required_level"
+
+    def validate(self, user_stats: UserStats, criteria: dict) -> bool:
         """
         Check if user has reached required level.
 
@@ -30,7 +32,7 @@ class LevelValidator(CriteriaValidator):
         required_level = criteria.get("required_level", 0)
         return user_stats.current_level >= required_level
 
-    def calculate_progress(self, user_stats: UserStatistics, criteria: dict) -> Decimal:
+    def calculate_progress_bp(self, user_stats: UserStats, criteria: dict) -> int:
         """
         Calculate progress based on current level.
 
@@ -39,13 +41,6 @@ class LevelValidator(CriteriaValidator):
             criteria: Criteria with 'required_level'
 
         Returns:
-            Progress percentage as Decimal
+            Progress in basis points (0 to 10000)
         """
-        required_level = criteria.get("required_level", 1)
-        if required_level == 0:
-            return Decimal("100.00")
-
-        current_level = user_stats.current_level
-        progress = (Decimal(current_level) / Decimal(required_level)) * Decimal(100)
-
-        return min(progress, Decimal("100.00"))
+        return progress_basis_points(user_stats.current_level, criteria.get("required_level", 1))
@@ -1,9 +1,8 @@
 """Validator for streak criteria."""
 
-from decimal import Decimal
-
-from apps.achievements.models import UserStatistics
 from apps.achievements.services.validators.base import CriteriaValidator
+from apps.achievements.utils.progress import progress_basis_points
+from apps.achievements.utils.stats_snapshot import UserStats
 
 
 class StreakValidator(CriteriaValidator):
@@ -17,7 +16,10 @@ class StreakValidator(CriteriaValidator):
     }
     """
 
-    def validate(self, user_stats: UserStatistics, criteria: dict) -> bool:
+    stat_field = "current_streak"
+    criteria_key = "required_days"
+
+    def validate(self, user_stats: UserStats, criteria: dict) -> bool:
         """
         Check if user has achieved required streak.
 
@@ -31,7 +33,7 @@ class StreakValidator(CriteriaValidator):
         required_days = criteria.get("required_days", 0)
         return user_stats.current_streak >= required_days
 
-    def calculate_progress(self, user_stats: UserStatistics, criteria: dict) -> Decimal:
+    def calculate_progress_bp(self, user_stats: UserStats, criteria: dict) -> int:
         """
         Calculate progress based on current streak.
 
@@ -40,13 +42,6 @@ class StreakValidator(CriteriaValidator):
             criteria: Criteria with 'required_days'
 
         Returns:
-            Progress percentage as Decimal
+            Progress in basis points (0 to 10000)
         """
-        required_days = criteria.get("required_days", 1)
-        if required_days == 0:
-            return Decimal("100.00")
-
-        current_days = user_stats.current_streak
-        progress = (Decimal(current_days) / Decimal(required_days)) * Decimal(100)
-
-        return min(progress, Decimal("100.00"))
+        return progress_basis_points(user_stats.current_streak, criteria.get("required_days", 1))
@@ -1,9 +1,8 @@
 """Validator for task count criteria."""
 
-from decimal import Decimal
-
-from apps.achievements.models import UserStatistics
 from apps.achievements.services.validators.base import CriteriaValidator
+from apps.achievements.utils.progress import progress_basis_points
+from apps.achievements.utils.stats_snapshot import UserStats
 
 
 class TaskCountValidator(CriteriaValidator):
@@ -17,7 +16,10 @@ class TaskCountValidator(CriteriaValidator):
     }
     """
 
-    def validate(self, user_stats: UserStatistics, criteria: dict) -> bool:
+    stat_field = "total_tasks_completed"
+    criteria_key = "required_count"
+
+    def validate(self, user_stats: UserStats, criteria: dict) -> bool:
         """
         Check if user has completed required number of tasks.
 
@@ -31,7 +33,7 @@ class TaskCountValidator(CriteriaValidator):
         required_count = criteria.get("required_count", 0)
         return user_stats.total_tasks_completed >= required_count
 
-    def calculate_progress(self, user_stats: UserStatistics, criteria: dict) -> Decimal:
+    def calculate_progress_bp(self, user_stats: UserStats, criteria: dict) -> int:
         """
         Calculate progress based on completed tasks.
 
@@ -40,13 +42,6 @@ class TaskCountValidator(CriteriaValidator):
             criteria: Criteria with 'required_count'
 
         Returns:
-            Progress percentage as Decimal
+            Progress in basis points (0 to 10000)
         """
-        required_count = criteria.get("required_count", 1)
-        if required_count == 0:
-            return Decimal("100.00")
-
-        current_count = user_stats.total_tasks_completed
-        progress = (Decimal(current_count) / Decimal(required_count)) * Decimal(100)
-
-        return min(progress, Decimal("100.00"))
+        return progress_basis_points(user_stats.total_tasks_completed, criteria.get("required_count", 1))
@@ -0,0 +1,103 @@
+"""Warm-up - Wires services and opens connections when a worker process starts."""
+
+import logging
+import time
+from collections.abc import Callable
+
+from celery import current_app
+from celery.signals import worker_process_init
+from django.db import connections
+
+from apps.achievements.models import Achievement
+from apps.achievements.services.achievement_service import get_achievement_service
+from apps.achievements.services.criteria_compiler import get_criteria_compiler
+from apps.achievements.services.state_cache import get_state_cache
+from apps.achievements.services.statistics_writer import get_statistics_writer
+from apps.achievements.services.task_simulation_service import get_task_simulation_service
+from apps.achievements.services.what_if_service import get_what_if_service
+from apps.tasks.services.task_completion_service import get_task_completion_service
+
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up() -> dict:
+    """
+    Prepare this process to serve its first request as fast as its hundredth.
+
+    Builds the process-wide services, compiles the criteria of the active
+    catalog, opens the database and broker connections, pings Redis behind
+    the state cache and starts the invalidation bus listener if the cache
+    uses one.
+
+    Called after the fork of every gunicorn worker (see config/gunicorn.py)
+    and Celery worker process. A failing step is logged and skipped, so a
+    worker still starts when e.g. Redis is down, it just starts cold.
+
+    Returns:
+        Dictionary with the number of compiled achievements and the seconds taken by each step
+    """
+    timings = {}
+    compiled = 0
+
+    def step(name: str, run: Callable[[], object]) -> None:
+        started = time.perf_counter()
+        try:
+            run()
+        except Exception:
+            logger.exception("Warm-up step %s failed", name)
+        timings[name] = time.perf_counter() - started
+
+    def compile_catalog() -> None:
+        nonlocal compiled
+        compiler = get_criteria_compiler()
+        for achievement in Achievement.objects.get_active_achievements():
+            try:
+                compiler.get(achievement)
+            except ValueError as exc:
+                logger.warning("Skipping achievement %s with invalid criteria: %s", achievement.id, exc)
+                continue
+            compiled += 1
+
+    step("database", lambda: [connection.ensure_connection() for connection in connections.all()])
+    step("services", _build_services)
+    step("catalog", compile_catalog)
+    step("cache", _connect_cache)
+    step("broker", _connect_broker)
+
+    logger.info("Warmed up worker: %d achievements compiled in %.3fs", compiled, sum(timings.values()))
+    return {"compiled_achievements": compiled, "timings": timings}
+
+
+def _build_services() -> None:
+    """Wire the process-wide services before the first request needs them."""
+    get_achievement_service()
+    get_task_simulation_service()
+    get_what_if_service()
+    get_statistics_writer()
+    get_task_completion_service()
+
+
+def _connect_cache() -> None:
+    """Connect to the state cache's Redis and start listening for invalidations."""
+    state_cache = get_state_cache()
+    if state_cache.cache is None:
+        return
+    if state_cache.cache.client is not None:
+        state_cache.cache.client.ping()
+    if state_cache.bus is not None:
+        state_cache.bus.ensure_listening()
+
+
+def _connect_broker() -> None:
+    """Open a pooled broker connection for the events and tasks the first request publishes."""
+    if current_app.conf.task_always_eager:
+        return
+    with current_app.producer_pool.acquire(block=True) as producer:
+        producer.connection.ensure_connection(max_retries=1)
+
+
+@worker_process_init.connect
+def _warm_up_celery_worker(**kwargs) -> None:
+    """Warm up every Celery worker process after the fork."""
+    warm_up()
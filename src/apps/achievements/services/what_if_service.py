@@ -0,0 +1,160 @@
+"""WhatIfService - Answers catalog tuning questions without touching user data."""
+
+import logging
+from collections import defaultdict
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Max, Min
+
+from apps.achievements.models import Achievement, UserStatistics
+from apps.achievements.services.criteria_compiler import get_criteria_compiler
+from apps.achievements.utils.progress import BASIS_POINTS
+from apps.achievements.utils.singleton import process_singleton
+from apps.achievements.utils.stats_snapshot import StatsSnapshot
+
+
+logger = logging.getLogger(__name__)
+
+# Statistics achievements can be unlocked by, each with an index on UserStatistics
+COHORT_STATISTICS = frozenset(stat_field for stat_field, _criteria_key in Achievement.THRESHOLD_FIELDS.values())
+
+
+class WhatIfService:
+    """
+    Answers "what if" questions for designers tuning the catalog.
+
+    ``evaluate`` runs hypothetical statistics through the compiled criteria of
+    the active catalog in memory. ``cohort`` counts the users a threshold would
+    unlock with one index range count, next to a histogram of the statistic
+    that is cached for ``settings.ACHIEVEMENT_WHAT_IF["histogram_ttl"]``
+    seconds, since sliders ask for the same histogram over and over.
+
+    Nothing is written to the database.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the WhatIfService."""
+        self.compiler = get_criteria_compiler()
+
+    def evaluate(self, stats: Mapping[str, int], windows: Mapping[tuple[str, int], int] | None = None) -> list[dict]:
+        """
+        Evaluate hypothetical statistics against every active achievement.
+
+        Args:
+            stats: Statistic values keyed by UserStatistics field name (missing ones take the model defaults)
+            windows: Window totals keyed by (counter, days) (missing windows count as 0)
+
+        Returns:
+            One dictionary per achievement with achievement_id, name, criteria_type, chain, tier,
+            is_unlocked and progress_percentage, in catalog order
+
+        Raises:
+            ValueError: If a statistic is unknown
+        """
+        try:
+            user_stats = StatsSnapshot(**stats)
+        except TypeError as exc:
+            raise ValueError(str(exc)) from exc
+        totals = defaultdict(int, windows or {})
+
+        result = []
+        for achievement in Achievement.objects.get_active_achievements().order_by("chain_id", "tier", "ordinal"):
+            try:
+                compiled = self.compiler.get(achievement)
+            except ValueError as exc:
+                logger.warning("Skipping achievement %s with invalid criteria: %s", achievement.id, exc)
+                continue
+            progress = max(0, min(compiled.progress(user_stats, totals), BASIS_POINTS))
+            result.append(
+                {
+                    "achievement_id": str(achievement.id),
+                    "name": achievement.name,
+                    "criteria_type": achievement.criteria_type,
+                    "chain": str(achievement.chain_id) if achievement.chain_id else None,
+                    "tier": achievement.tier,
+                    "is_unlocked": compiled.check(user_stats, totals),
+                    "progress_percentage": progress / 100,
+                },
+            )
+        return result
+
+    def cohort(self, stat: str, threshold: int, bins: int | None = None) -> dict:
+        """
+        Count the users who would unlock an achievement on a statistic at a threshold.
+
+        Args:
+            stat: UserStatistics field (one of COHORT_STATISTICS)
+            threshold: Value of the statistic that would unlock the achievement
+            bins: Histogram bins (default: settings.ACHIEVEMENT_WHAT_IF["histogram_bins"])
+
+        Returns:
+            Dictionary with stat, threshold, qualifying_users, total_users and histogram,
+            a list of {"lower", "upper", "count"} bins with inclusive bounds
+
+        Raises:
+            ValueError: If the statistic has no index to count with
+        """
+        if stat not in COHORT_STATISTICS:
+            msg = f"Cohorts can only be counted for {sorted(COHORT_STATISTICS)}, got {stat!r}"
+            raise ValueError(msg)
+
+        histogram = self.get_histogram(stat, bins or settings.ACHIEVEMENT_WHAT_IF["histogram_bins"])
+        return {
+            "stat": stat,
+            "threshold": threshold,
+            "qualifying_users": UserStatistics.objects.filter(**{f"{stat}__gte": threshold}).count(),
+            "total_users": sum(row["count"] for row in histogram),
+            "histogram": histogram,
+        }
+
+    def get_histogram(self, stat: str, bins: int) -> list[dict]:
+        """
+        Get the distribution of a statistic over all users in equal-width bins, cached.
+
+        Args:
+            stat: UserStatistics field
+            bins: Maximum number of bins
+
+        Returns:
+            List of {"lower", "upper", "count"} bins covering the statistic's range, empty bins included
+        """
+        key = f"achievements:what_if:histogram:{stat}:{bins}"
+        histogram = cache.get(key)
+        if histogram is None:
+            histogram = self._build_histogram(stat, bins)
+            cache.set(key, histogram, settings.ACHIEVEMENT_WHAT_IF["histogram_ttl"])
+        return histogram
+
+    def _build_histogram(self, stat: str, bins: int) -> list[dict]:
+        """Build a histogram with one MIN/MAX lookup and one GROUP BY query."""
+        bounds = UserStatistics.objects.aggregate(lowest=Min(stat), highest=Max(stat))
+        lowest, highest = bounds["lowest"], bounds["highest"]
+        if lowest is None:
+            return []
+
+        # Ceiling division, so the bins cover the whole range
+        width = max(1, -(-(highest - lowest + 1) // bins))
+        counts = dict(
+            UserStatistics.objects.annotate(bucket=(F(stat) - lowest) / width)
+            .values("bucket")
+            .annotate(count=Count("pk"))
+            .order_by("bucket")
+            .values_list("bucket", "count"),
+        )
+        return [
+            {"lower": lowest + bucket * width, "upper": lowest + (bucket + 1) * width - 1, "count": counts.get(bucket, 0)}
+            for bucket in range((highest - lowest) // width + 1)
+        ]
+
+
+@process_singleton()
+def get_what_if_service() -> WhatIfService:
+    """
+    Get the process-wide what-if service.
+
+    Returns:
+        WhatIfService instance
+    """
+    return WhatIfService()
@@ -0,0 +1,8 @@
+"""Custom signals for the achievements app."""
+
+from django.dispatch import Signal
+
+
+# Sent after UserStatistics rows are changed by UPDATE statements that bypass
+# post_save (atomic increments, bulk recalculations). Provides ``user_ids``.
+statistics_updated = Signal()
@@ -0,0 +1,38 @@
+"""Celery tasks for the achievements app."""
+
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+from apps.achievements.models import UserActivityDay
+from apps.achievements.services.backfill_service import AchievementBackfillService
+from apps.achievements.services.criteria_compiler import MAX_WINDOW_DAYS
+
+
+@shared_task(ignore_result=True)
+def backfill_achievement(achievement_id: str, *, restart: bool = False) -> int:
+    """
+    Unlock an achievement for every user who already qualifies for it.
+
+    Re-running the task after a failure resumes from the last checkpoint.
+
+    Args:
+        achievement_id: Achievement UUID
+        restart: Start over instead of resuming
+
+    Returns:
+        Number of users the achievement was unlocked for
+    """
+    return AchievementBackfillService().backfill(achievement_id, restart=restart).unlocked_count
+
+
+@shared_task(ignore_result=True)
+def prune_activity_days() -> int:
+    """
+    Delete daily activity older than the longest criteria window.
+
+    Returns:
+        Number of rows deleted
+    """
+    return UserActivityDay.objects.delete_before(timezone.localdate() - timedelta(days=MAX_WINDOW_DAYS))
@@ -0,0 +1,126 @@
+"""In-memory stand-in for the subset of redis.Redis used by the caches and buffers."""
+
+import threading
+
+import redis
+
+
+def _encode(value: object) -> bytes:
+    """Encode a value the way redis-py returns it."""
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+class FakeRedis:
+    """
+    Minimal thread-safe Redis double.
+
+    Values come back as bytes, like a real client without decode_responses.
+    Expirations are accepted but never fire, so locks only go away when released. Set ``fail`` to make every
+    command raise ``redis.ConnectionError``.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty FakeRedis."""
+        self.data: dict[str, object] = {}
+        self.fail = False
+        self._lock = threading.RLock()
+
+    def _check(self) -> None:
+        if self.fail:
+            msg = "FakeRedis is unavailable"
+            raise redis.ConnectionError(msg)
+
+    def get(self, key: str) -> bytes | None:
+        self._check()
+        return self.data.get(key)
+
+    def mget(self, *keys: str) -> list[bytes | None]:
+        self._check()
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key: str, value: object, ex: int | None = None, px: int | None = None, *, nx: bool = False) -> bool | None:  # noqa: ARG002
+        self._check()
+        with self._lock:
+            if nx and key in self.data:
+                return None
+            self.data[key] = _encode(value)
+            return True
+
+    def exists(self, *keys: str) -> int:
+        self._check()
+        return sum(key in self.data for key in keys)
+
+    def delete(self, *keys: str) -> int:
+        self._check()
+        with self._lock:
+            return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        self._check()
+        with self._lock:
+            value = int(self.data.get(key, 0)) + amount
+            self.data[key] = _encode(value)
+            return value
+
+    def expire(self, key: str, seconds: int) -> bool:  # noqa: ARG002
+        self._check()
+        return key in self.data
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        self._check()
+        with self._lock:
+            hash_ = self.data.setdefault(key, {})
+            value = int(hash_.get(_encode(field), 0)) + amount
+            hash_[_encode(field)] = _encode(value)
+            return value
+
+    def hgetall(self, key: str) -> dict[bytes, bytes]:
+        self._check()
+        return dict(self.data.get(key, {}))
+
+    def sadd(self, key: str, *members: object) -> int:
+        self._check()
+        with self._lock:
+            set_ = self.data.setdefault(key, set())
+            before = len(set_)
+            set_.update(_encode(member) for member in members)
+            return len(set_) - before
+
+    def scard(self, key: str) -> int:
+        self._check()
+        return len(self.data.get(key, set()))
+
+    def spop(self, key: str, count: int | None = None) -> list[bytes] | bytes | None:
+        self._check()
+        with self._lock:
+            set_ = self.data.get(key, set())
+            popped = [set_.pop() for _ in range(min(count if count is not None else 1, len(set_)))]
+        if count is None:
+            return popped[0] if popped else None
+        return popped
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":  # noqa: ARG002, FBT002
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Queues commands and runs them in order on execute, holding the client lock."""
+
+    def __init__(self, client: FakeRedis) -> None:
+        self.client = client
+        self.commands: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs) -> "FakePipeline":
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list:
+        with self.client._lock:  # noqa: SLF001
+            results = [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        self.commands = []
+        return results
@@ -0,0 +1,127 @@
+"""Tests for backfilling achievements to users who already qualify."""
+
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from apps.achievements.models import Achievement, AchievementBackfill, UnlockedAchievementSet, UserAchievement, UserStatistics
+from apps.achievements.services.backfill_service import AchievementBackfillService
+from apps.rewards.models import RewardGrant
+from apps.rewards.services.ledger_service import RewardLedgerService
+
+
+User = get_user_model()
+
+
+@pytest.fixture
+def cohort(db):  # noqa: ARG001
+    """Create users who completed 0, 2, 5 and 9 tasks, in user ID order."""
+    users = []
+    for index, tasks in enumerate([0, 2, 5, 9]):
+        user = User.objects.create_user(username=f"backfill{index}", email=f"backfill{index}@example.com", password="pass12345")
+        UserStatistics.objects.create(user=user, total_tasks_completed=tasks)
+        users.append(user)
+    return users
+
+
+@pytest.fixture
+def achievement(db):  # noqa: ARG001
+    """Create a task count achievement requiring 5 tasks."""
+    return Achievement.objects.create(
+        name="Five Tasks",
+        description="Complete 5 tasks",
+        criteria={"required_count": 5},
+        criteria_type=Achievement.CriteriaType.TASK_COUNT,
+        reward_xp=50,
+        reward_coins=10,
+    )
+
+
+def make_service(**kwargs) -> AchievementBackfillService:
+    return AchievementBackfillService(
+        chunk_size=kwargs.pop("chunk_size", 3),
+        pause=0,
+        event_publisher=mock.Mock(),
+        notification_sender=mock.Mock(),
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+class TestAchievementBackfillService:
+    """Test set-based backfills."""
+
+    def test_unlocks_qualifying_users_and_writes_progress(self, cohort, achievement):
+        backfill = make_service().backfill(achievement.id)
+
+        rows = {row.user_id: row for row in UserAchievement.objects.filter(achievement=achievement)}
+        assert sorted(user.id for user in cohort if rows.get(user.id) and rows[user.id].is_completed) == [cohort[2].id, cohort[3].id]
+        assert rows[cohort[1].id].progress == Decimal("40.00")
+        assert not rows[cohort[1].id].is_completed
+        assert cohort[0].id not in rows
+
+        assert backfill.status == AchievementBackfill.Status.COMPLETED
+        assert backfill.last_user_id == cohort[3].id
+        assert (backfill.unlocked_count, backfill.progress_count) == (2, 1)
+
+    def test_updates_unlocked_sets_and_rewards(self, cohort, achievement):
+        make_service().backfill(achievement.id)
+
+        assert achievement.ordinal in UnlockedAchievementSet.objects.get_bitset(cohort[3].id)
+        assert achievement.ordinal not in UnlockedAchievementSet.objects.get_bitset(cohort[1].id)
+        assert RewardGrant.objects.filter(achievement=achievement).count() == 2
+        assert RewardLedgerService().get_balance(cohort[2].id) == 10
+
+    def test_skips_users_who_already_unlocked(self, cohort, achievement):
+        UserAchievement.objects.create(user=cohort[3], achievement=achievement, progress=100, is_completed=True)
+        RewardLedgerService().grant_achievement_reward(cohort[3].id, achievement)
+
+        backfill = make_service().backfill(achievement.id)
+
+        assert backfill.unlocked_count == 1
+        assert RewardLedgerService().get_balance(cohort[3].id) == 10
+
+    def test_announces_unlocks_after_commit(self, cohort, achievement, django_capture_on_commit_callbacks):
+        service = make_service()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            service.backfill(achievement.id)
+
+        announced = [call.kwargs["user_id"] for call in service.event_publisher.publish_achievement_unlocked.call_args_list]
+        assert sorted(announced) == [cohort[2].id, cohort[3].id]
+        service.notification_sender.send_achievement_notifications.assert_called()
+
+    def test_resumes_from_checkpoint(self, cohort, achievement):
+        AchievementBackfill.objects.create(achievement=achievement, threshold=achievement.threshold, last_user_id=cohort[2].id)
+
+        backfill = make_service().backfill(achievement.id)
+
+        assert backfill.unlocked_count == 1
+        assert not UserAchievement.objects.filter(user=cohort[2], achievement=achievement).exists()
+
+    def test_threshold_change_restarts(self, cohort, achievement):
+        AchievementBackfill.objects.create(achievement=achievement, threshold=8, last_user_id=cohort[2].id)
+
+        backfill = make_service().backfill(achievement.id)
+
+        assert backfill.unlocked_count == 2
+        assert AchievementBackfill.objects.filter(achievement=achievement).count() == 1
+
+    def test_inactive_achievement_is_rejected(self, achievement):
+        achievement.is_active = False
+        achievement.save()
+
+        with pytest.raises(ValueError, match="not active"):
+            make_service().backfill(achievement.id)
+
+    @pytest.mark.usefixtures("cohort")
+    def test_command(self, achievement):
+        out = StringIO()
+
+        call_command("backfill_achievement", str(achievement.id), "--pause", "0", stdout=out)
+
+        assert "2 unlocked, 1 progress updates" in out.getvalue()
@@ -0,0 +1,116 @@
+"""Tests for vectorized batch evaluation, checked against the scalar validators."""
+
+import numpy as np
+import pytest
+
+from apps.achievements.models import Achievement, UserStatistics
+from apps.achievements.services.achievement_evaluator import AchievementEvaluator
+from apps.achievements.services.validators import (
+    ChallengeValidator,
+    CriteriaValidator,
+    FriendCountValidator,
+    LevelValidator,
+    StreakValidator,
+    TaskCountValidator,
+)
+
+
+VALUES = np.arange(0, 40, dtype=np.int64)
+REQUIRED = [0, 1, 3, 7, 10, 12, 33, 1000]
+
+
+@pytest.mark.parametrize(
+    "validator",
+    [TaskCountValidator(), StreakValidator(), LevelValidator(), FriendCountValidator(), ChallengeValidator()],
+)
+class TestValidatorBatch:
+    """Test each validator's batch methods against its scalar methods."""
+
+    def criteria_list(self, validator: CriteriaValidator) -> list[dict]:
+        # The last criteria omits the required value to check the defaults
+        return [{validator.criteria_key: required} for required in REQUIRED] + [{}]
+
+    def test_validate_batch_matches_validate(self, validator):
+        criteria_list = self.criteria_list(validator)
+
+        unlocked = validator.validate_batch(VALUES, validator.required_values(criteria_list))
+
+        assert unlocked.shape == (len(VALUES), len(criteria_list))
+        for row, value in enumerate(VALUES):
+            user_stats = UserStatistics(**{validator.stat_field: int(value)})
+            for column, criteria in enumerate(criteria_list):
+                assert unlocked[row, column] == validator.validate(user_stats, criteria)
+
+    def test_calculate_progress_bp_batch_matches_calculate_progress_bp(self, validator):
+        criteria_list = self.criteria_list(validator)
+
+        progress = validator.calculate_progress_bp_batch(VALUES, validator.required_values(criteria_list, for_progress=True))
+
+        for row, value in enumerate(VALUES):
+            user_stats = UserStatistics(**{validator.stat_field: int(value)})
+            for column, criteria in enumerate(criteria_list):
+                assert progress[row, column] == validator.calculate_progress_bp(user_stats, criteria)
+
+
+class TestAchievementEvaluatorBatch:
+    """Test evaluating users against a mixed catalog."""
+
+    def test_matches_scalar_evaluation(self):
+        evaluator = AchievementEvaluator()
+        achievements = [
+            Achievement(criteria_type=Achievement.CriteriaType.TASK_COUNT, criteria={"required_count": 10}),
+            Achievement(criteria_type=Achievement.CriteriaType.STREAK, criteria={"required_days": 7}),
+            Achievement(criteria_type=Achievement.CriteriaType.LEVEL, criteria={"required_level": 5}),
+            Achievement(criteria_type=Achievement.CriteriaType.TASK_COUNT, criteria={"required_count": 3}),
+            Achievement(criteria_type=Achievement.CriteriaType.CHALLENGE, criteria={"required_wins": 2}),
+        ]
+        rng = np.random.default_rng(42)
+        statistics = [
+            UserStatistics(
+                user_id=index,
+                total_tasks_completed=int(rng.integers(0, 20)),
+                current_streak=int(rng.integers(0, 14)),
+                current_level=int(rng.integers(1, 10)),
+                challenges_won=int(rng.integers(0, 4)),
+            )
+            for index in range(50)
+        ]
+        columns = {
+            field: np.array([getattr(user_stats, field) for user_stats in statistics], dtype=np.int64)
+            for field in ["total_tasks_completed", "current_streak", "current_level", "challenges_won"]
+        }
+
+        unlocked, progress = evaluator.evaluate_batch(achievements, columns)
+
+        for row, user_stats in enumerate(statistics):
+            for column, achievement in enumerate(achievements):
+                assert unlocked[row, column] == evaluator.evaluate_criteria(user_stats.user_id, achievement, user_stats)
+                assert progress[row, column] == evaluator.calculate_progress_bp(user_stats.user_id, achievement, user_stats)
+
+    def test_unsupported_criteria_type_is_never_unlocked(self):
+        criteria = {"expression": {"stat": "friend_count", "gte": 1}}
+        achievements = [Achievement(criteria_type=Achievement.CriteriaType.EXPRESSION, criteria=criteria)]
+
+        unlocked, progress = AchievementEvaluator().evaluate_batch(achievements, {"friend_count": np.array([5, 0])})
+
+        assert not unlocked.any()
+        assert (progress == 0).all()
+
+    def test_validator_without_batch_support(self):
+        class CustomValidator(CriteriaValidator):
+            def validate(self, user_stats, criteria):
+                return user_stats.total_xp >= criteria["xp"]
+
+            def calculate_progress_bp(self, user_stats, criteria):
+                return user_stats.total_xp * 10_000 // criteria["xp"]
+
+        with pytest.raises(NotImplementedError, match="CustomValidator"):
+            CustomValidator().validate_batch(VALUES, np.array([1]))
+
+    @pytest.mark.django_db
+    def test_statistics_columns(self, user_with_stats):
+        columns = AchievementEvaluator().statistics_columns(UserStatistics.objects.all())
+
+        assert columns["user_id"].tolist() == [user_with_stats.id]
+        assert columns["total_tasks_completed"].tolist() == [5]
+        assert columns["current_level"].dtype == np.int64
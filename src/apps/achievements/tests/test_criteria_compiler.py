@@ -0,0 +1,197 @@
+"""Tests for compiled criteria expressions and time-windowed counters."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from apps.achievements.events.handlers import TaskCompletedEventHandler
+from apps.achievements.models import Achievement, UserAchievement, UserActivityDay, UserStatistics
+from apps.achievements.serializers import AchievementSerializer
+from apps.achievements.services.achievement_evaluator import AchievementEvaluator
+from apps.achievements.services.criteria_compiler import CriteriaCompiler
+from apps.achievements.utils.progress import BASIS_POINTS
+from apps.achievements.utils.stats_snapshot import StatsSnapshot
+
+
+def compile_expression(expression: dict):
+    return CriteriaCompiler().compile(Achievement.CriteriaType.EXPRESSION, {"expression": expression})
+
+
+class TestCriteriaCompiler:
+    """Test compiling criteria into closures."""
+
+    @pytest.mark.parametrize("criteria_type", list(Achievement.THRESHOLD_FIELDS))
+    def test_threshold_types_match_validators(self, criteria_type):
+        validator = AchievementEvaluator().validators[criteria_type]
+        stat_field, criteria_key = Achievement.THRESHOLD_FIELDS[criteria_type]
+        compiler = CriteriaCompiler()
+
+        for criteria in [{criteria_key: 0}, {criteria_key: 3}, {criteria_key: 7}, {}]:
+            compiled = compiler.compile(criteria_type, criteria)
+            for value in range(10):
+                user_stats = StatsSnapshot(**{stat_field: value})
+                assert compiled.check(user_stats, {}) == validator.validate(user_stats, criteria)
+                assert compiled.progress(user_stats, {}) == validator.calculate_progress_bp(user_stats, criteria)
+
+    def test_all_and_any(self):
+        compiled = compile_expression(
+            {
+                "all": [
+                    {"stat": "total_tasks_completed", "gte": 10},
+                    {"any": [{"stat": "current_streak", "gte": 7}, {"stat": "current_level", "gte": 5}]},
+                ],
+            },
+        )
+
+        assert compiled.check(StatsSnapshot(total_tasks_completed=10, current_level=5), {})
+        assert not compiled.check(StatsSnapshot(total_tasks_completed=10, current_streak=6, current_level=4), {})
+        # Lowest of 50% tasks and the best of 6/7 streak or 4/5 levels
+        assert compiled.progress(StatsSnapshot(total_tasks_completed=5, current_streak=6, current_level=4), {}) == 5000
+
+    def test_cross_stat_comparison(self):
+        compiled = compile_expression({"stat": "longest_streak", "gt": {"stat": "current_streak"}})
+
+        assert compiled.check(StatsSnapshot(longest_streak=5, current_streak=4), {})
+        assert not compiled.check(StatsSnapshot(longest_streak=5, current_streak=5), {})
+        assert compiled.progress(StatsSnapshot(longest_streak=3, current_streak=5), {}) == 5000
+
+    def test_all_or_nothing_comparison(self):
+        compiled = compile_expression({"stat": "current_level", "lte": 3})
+
+        assert compiled.progress(StatsSnapshot(current_level=3), {}) == BASIS_POINTS
+        assert compiled.progress(StatsSnapshot(current_level=4), {}) == 0
+
+    def test_window(self):
+        compiled = compile_expression({"window": "tasks_completed", "days": 7, "gte": 20})
+
+        assert compiled.windows == {("tasks_completed", 7)}
+        assert compiled.check(StatsSnapshot(), {("tasks_completed", 7): 20})
+        assert compiled.progress(StatsSnapshot(), {("tasks_completed", 7): 5}) == 2500
+
+    @pytest.mark.parametrize(
+        ("expression", "message"),
+        [
+            ([], "must be an object"),
+            ({"all": []}, "non-empty list"),
+            ({"stat": "karma", "gte": 1}, "Unknown statistic"),
+            ({"stat": "total_xp"}, "exactly one of"),
+            ({"stat": "total_xp", "gte": 1, "lt": 5}, "exactly one of"),
+            ({"stat": "total_xp", "gte": "10"}, "operand"),
+            ({"stat": "total_xp", "gte": 1, "days": 3}, "Unknown keys"),
+            ({"window": "logins", "days": 7, "gte": 1}, "Unknown window counter"),
+            ({"window": "tasks_completed", "days": 365, "gte": 1}, "Window days"),
+            ({"gte": 1}, "'stat' or a 'window'"),
+        ],
+    )
+    def test_invalid_expressions(self, expression, message):
+        with pytest.raises(ValueError, match=message):
+            compile_expression(expression)
+
+    @pytest.mark.django_db
+    def test_compiled_once_per_achievement_version(self, achievement_task_count):
+        compiler = CriteriaCompiler()
+        compiled = compiler.get(achievement_task_count)
+
+        assert compiler.get(achievement_task_count) is compiled
+
+        achievement_task_count.criteria = {"required_count": 50}
+        achievement_task_count.save()
+        recompiled = compiler.get(achievement_task_count)
+
+        assert recompiled is not compiled
+        assert not recompiled.check(StatsSnapshot(total_tasks_completed=49), {})
+
+
+@pytest.mark.django_db
+class TestUserActivityDays:
+    """Test incrementally maintained daily activity counters."""
+
+    def test_record_increments_the_day(self, user):
+        today = date(2025, 3, 10)
+        UserActivityDay.objects.record(user.id, day=today, tasks_completed=1, xp_earned=50)
+        UserActivityDay.objects.record(user.id, day=today, tasks_completed=1, xp_earned=20)
+
+        row = UserActivityDay.objects.get(user=user, day=today)
+        assert (row.tasks_completed, row.xp_earned) == (2, 70)
+
+    def test_record_rejects_unknown_counter(self, user):
+        with pytest.raises(ValueError, match="activity counters"):
+            UserActivityDay.objects.record(user.id, logins=1)
+
+    def test_window_totals(self, user, django_assert_num_queries):
+        today = date(2025, 3, 10)
+        for age, tasks in [(0, 1), (6, 2), (7, 4), (30, 8)]:
+            UserActivityDay.objects.record(user.id, day=today - timedelta(days=age), tasks_completed=tasks, xp_earned=tasks * 10)
+
+        with django_assert_num_queries(1):
+            totals = UserActivityDay.objects.get_window_totals(
+                user.id,
+                [("tasks_completed", 1), ("tasks_completed", 7), ("xp_earned", 8)],
+                today=today,
+            )
+
+        assert totals == {("tasks_completed", 1): 1, ("tasks_completed", 7): 3, ("xp_earned", 8): 70}
+
+    def test_delete_before(self, user):
+        UserActivityDay.objects.record(user.id, day=date(2025, 1, 1), tasks_completed=1)
+        UserActivityDay.objects.record(user.id, day=date(2025, 3, 1), tasks_completed=1)
+
+        assert UserActivityDay.objects.delete_before(date(2025, 2, 1)) == 1
+        assert UserActivityDay.objects.filter(user=user).count() == 1
+
+
+@pytest.mark.django_db
+class TestExpressionAchievements:
+    """Test unlocking expression achievements end to end."""
+
+    @pytest.fixture
+    def weekly_achievement(self, db):  # noqa: ARG002
+        return Achievement.objects.create(
+            name="Busy Week",
+            description="Complete 2 tasks in 7 days with a 3 day streak",
+            criteria_type=Achievement.CriteriaType.EXPRESSION,
+            criteria={
+                "expression": {
+                    "all": [
+                        {"window": "tasks_completed", "days": 7, "gte": 2},
+                        {"stat": "current_streak", "gte": 3},
+                    ],
+                },
+            },
+        )
+
+    def test_task_events_unlock_windowed_achievement(self, user_with_stats, weekly_achievement):
+        handler = TaskCompletedEventHandler()
+        event_data = {"user_id": user_with_stats.id, "task_id": "task-1", "timestamp": None, "xp_earned": 10}
+
+        handler.handle_task_completed(event_data)
+        progress = UserAchievement.objects.get(user=user_with_stats, achievement=weekly_achievement)
+        assert not progress.is_completed
+        assert progress.progress_bp == 5000
+
+        handler.handle_task_completed({**event_data, "task_id": "task-2"})
+        progress.refresh_from_db()
+        assert progress.is_completed
+
+    def test_load_windows_reads_once_for_all_achievements(self, user_with_stats, weekly_achievement, django_assert_num_queries):
+        evaluator = AchievementEvaluator()
+        user_stats = StatsSnapshot.from_model(UserStatistics.objects.get(user=user_with_stats))
+        evaluator.compiler.get(weekly_achievement)
+
+        with django_assert_num_queries(1):
+            windows = evaluator.load_windows(user_with_stats.id, [weekly_achievement])
+            evaluator.evaluate_criteria(user_with_stats.id, weekly_achievement, user_stats, windows)
+            evaluator.calculate_progress_bp(user_with_stats.id, weekly_achievement, user_stats, windows)
+
+    def test_serializer_rejects_invalid_expression(self):
+        serializer = AchievementSerializer(
+            data={
+                "name": "Broken",
+                "description": "Invalid criteria",
+                "criteria_type": Achievement.CriteriaType.EXPRESSION,
+                "criteria": {"expression": {"stat": "karma", "gte": 1}},
+            },
+        )
+
+        assert not serializer.is_valid()
+        assert "Unknown statistic" in str(serializer.errors["criteria"])
@@ -0,0 +1,163 @@
+"""Tests for read replica routing and the read-your-writes window."""
+
+from unittest import mock
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.urls import reverse
+from rest_framework import status
+
+from apps.achievements.db_router import (
+    ReplicaRouter,
+    is_pinned,
+    pin_to_primary,
+    primary_reads,
+    read_from_primary,
+    reads_from_replica,
+    replica_reads,
+)
+from apps.achievements.models import Achievement
+from apps.achievements.services.state_cache import get_state_cache
+from apps.achievements.services.task_simulation_service import TaskSimulationService
+from apps.achievements.tests.fake_redis import FakeRedis
+
+
+REPLICA = {"ENGINE": "django.db.backends.sqlite3", "NAME": "replica.sqlite3"}
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def replica():
+    """Configure a second database alias (no queries are sent to it)."""
+    with mock.patch.dict(settings.DATABASES, {"replica": REPLICA}):
+        yield "replica"
+
+
+@pytest.fixture
+def replica_is_primary():
+    """Use the primary's alias as the replica, so routed queries run against the test database."""
+    with mock.patch("apps.achievements.db_router.get_replica_alias", return_value=DEFAULT_DB_ALIAS):
+        yield
+
+
+class TestReplicaRouter:
+    """Test ReplicaRouter."""
+
+    def test_reads_go_to_replica_inside_block(self, replica):
+        router = ReplicaRouter()
+
+        assert router.db_for_read(Achievement) is None
+        with replica_reads():
+            assert router.db_for_read(Achievement) == replica
+            read_from_primary()
+            assert router.db_for_read(Achievement) is None
+        assert router.db_for_read(Achievement) is None
+
+    def test_primary_reads_inside_replica_block(self, replica):
+        router = ReplicaRouter()
+
+        with replica_reads():
+            with primary_reads():
+                assert router.db_for_read(Achievement) is None
+            assert router.db_for_read(Achievement) == replica
+
+    def test_writes_and_migrations_stay_on_primary(self, replica):
+        router = ReplicaRouter()
+
+        with replica_reads():
+            assert router.db_for_write(Achievement) == DEFAULT_DB_ALIAS
+        assert router.allow_migrate(replica, "achievements") is False
+        assert router.allow_migrate(DEFAULT_DB_ALIAS, "achievements") is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_reads_inside_transaction_stay_on_primary(self, replica):  # noqa: ARG002
+        with replica_reads():
+            assert ReplicaRouter().db_for_read(Achievement) is not None
+            with transaction.atomic():
+                assert ReplicaRouter().db_for_read(Achievement) is None
+
+    def test_without_replica(self):
+        with replica_reads():
+            assert ReplicaRouter().db_for_read(Achievement) is None
+            assert not reads_from_replica()
+
+    @pytest.mark.usefixtures("replica")
+    def test_state_cache_loads_from_primary(self, settings):
+        with mock.patch("redis.Redis.from_url", return_value=FakeRedis()):
+            settings.ACHIEVEMENT_STATE_CACHE = {**settings.ACHIEVEMENT_STATE_CACHE, "enabled": True}
+            state_cache = get_state_cache()
+        loaded_from = []
+
+        def compute() -> list[dict]:
+            loaded_from.append(reads_from_replica())
+            return []
+
+        with replica_reads():
+            state_cache.get_progress(1, compute)
+            # Reads outside the cache still use the replica
+            assert reads_from_replica()
+
+        assert loaded_from == [False]
+
+    def test_pin_expires(self, settings):
+        settings.DATABASE_REPLICA = {**settings.DATABASE_REPLICA, "pin_seconds": 60}
+        pin_to_primary(7)
+
+        assert is_pinned(7)
+        assert not is_pinned(8)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("replica_is_primary")
+class TestReplicaReadViews:
+    """Test the replica read policy of the achievement views."""
+
+    def _user_stats(self, client) -> dict:
+        """Get the user stats endpoint, recording how the request read the database."""
+        seen = {}
+        get_user_statistics = TaskSimulationService.get_user_statistics
+
+        def record(service, user_id):
+            seen.update(replica=reads_from_replica(), atomic=connection.in_atomic_block)
+            return get_user_statistics(service, user_id)
+
+        with mock.patch.object(TaskSimulationService, "get_user_statistics", record):
+            response = client.get(reverse("achievements:achievement-get-user-stats"))
+
+        assert response.status_code == status.HTTP_200_OK
+        return seen
+
+    def test_safe_requests_read_replica_outside_transaction(self, authenticated_client):
+        assert self._user_stats(authenticated_client) == {"replica": True, "atomic": False}
+
+    def test_writes_pin_the_user_to_primary(self, authenticated_client, user, achievement_task_count):
+        with mock.patch("apps.achievements.services.achievement_service.NotificationSender"):
+            response = authenticated_client.post(
+                reverse("achievements:achievement-unlock"),
+                {"achievement_id": str(achievement_task_count.id)},
+                format="json",
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert is_pinned(user.id)
+        assert self._user_stats(authenticated_client) == {"replica": False, "atomic": False}
+
+    def test_unsafe_requests_are_atomic(self, authenticated_client):
+        seen = {}
+
+        def record(service, **kwargs):  # noqa: ARG001
+            seen["atomic"] = connection.in_atomic_block
+            return {}
+
+        with mock.patch.object(TaskSimulationService, "simulate_task_completions", record):
+            authenticated_client.post(reverse("achievements:achievement-simulate-task-completions"), {"count": 1}, format="json")
+
+        assert seen == {"atomic": True}
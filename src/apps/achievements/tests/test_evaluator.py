@@ -134,14 +134,13 @@ class TestAchievementEvaluator:
 
         assert result is False
 
-    def test_evaluate_criteria_unsupported_type(
+    def test_evaluate_criteria_friend_count_not_met(
         self,
         achievement_evaluator,
         user,
         user_stats,
     ):
-        """Test evaluating unsupported criteria type returns False."""
-        # Create achievement with unsupported criteria type
+        """Test evaluating friend count criteria when not met."""
         achievement = Achievement.objects.create(
             name="Friend Achievement",
             description="Add 5 friends",
@@ -155,7 +154,7 @@ class TestAchievementEvaluator:
             user_stats,
         )
 
-        # Currently not implemented, should return False
+        # User has 2 friends, needs 5
         assert result is False
 
     def test_calculate_progress_task_count_half(
@@ -260,13 +259,13 @@ class TestAchievementEvaluator:
 
         assert progress == Decimal("100.00")
 
-    def test_calculate_progress_unsupported_type(
+    def test_calculate_progress_friend_count_partial(
         self,
         achievement_evaluator,
         user,
         user_stats,
     ):
-        """Test calculating progress for unsupported type returns 0."""
+        """Test calculating progress for friend count criteria."""
         achievement = Achievement.objects.create(
             name="Friend Achievement",
             description="Add 5 friends",
@@ -280,8 +279,8 @@ class TestAchievementEvaluator:
             user_stats,
         )
 
-        # Currently not implemented, should return 0
-        assert progress == Decimal("0.00")
+        # 2 / 5 = 40%
+        assert progress == Decimal("40.00")
 
     def test_get_user_statistics(self, achievement_evaluator, user, user_stats):
         """Test getting user statistics as dictionary."""
@@ -0,0 +1,120 @@
+"""Tests for the request- and task-scoped identity map."""
+
+from unittest import mock
+
+import pytest
+from celery.signals import task_postrun, task_prerun
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from apps.achievements.models import Achievement, UserAchievement, UserStatistics
+from apps.achievements.services.achievement_service import AchievementService
+from apps.achievements.services.state_cache import get_state_cache
+from apps.achievements.utils.identity_map import get_identity_map, get_object, unit_of_work
+
+
+User = get_user_model()
+
+
+def _selects(queries: CaptureQueriesContext, table: str) -> int:
+    """Count the SELECT statements loading rows of a table (not subqueries)."""
+    return sum(1 for query in queries.captured_queries if query["sql"].startswith(f'SELECT "{table}".'))
+
+
+@pytest.fixture
+def service():
+    with mock.patch("apps.achievements.services.achievement_service.NotificationSender"):
+        yield AchievementService()
+
+
+@pytest.mark.django_db
+class TestIdentityMap:
+    """Test fetching objects once per unit of work."""
+
+    def test_one_fetch_per_object(self, user, achievement_task_count, django_assert_num_queries):
+        with unit_of_work():
+            with django_assert_num_queries(2):
+                first_user = get_object(User, user.id)
+                first_achievement = get_object(Achievement, achievement_task_count.id)
+
+            with django_assert_num_queries(0):
+                assert get_object(User, str(user.id)) is first_user
+                assert get_object(Achievement, str(achievement_task_count.id)) is first_achievement
+
+    def test_missing_objects_are_cached(self, db, django_assert_num_queries):  # noqa: ARG002
+        with unit_of_work(), django_assert_num_queries(1):
+            for _attempt in range(2):
+                with pytest.raises(User.DoesNotExist):
+                    get_object(User, 999_999)
+
+    def test_outside_unit_of_work(self, user, django_assert_num_queries):
+        with django_assert_num_queries(2):
+            assert get_object(User, user.id) is not get_object(User, user.id)
+
+    def test_nested_units_share_the_map(self, db):  # noqa: ARG002
+        with unit_of_work() as outer, unit_of_work() as inner:
+            assert inner is outer
+        assert get_identity_map() is None
+
+    def test_save_evicts_other_instances(self, user, django_assert_num_queries):
+        with unit_of_work():
+            mapped = get_object(User, user.id)
+            User.objects.get(id=user.id).save()
+
+            with django_assert_num_queries(1):
+                assert get_object(User, user.id) is not mapped
+
+    def test_statistics_snapshot_follows_updates(self, user_with_stats, django_assert_num_queries):
+        state_cache = get_state_cache()
+
+        with unit_of_work():
+            assert state_cache.get_user_statistics(user_with_stats.id).total_tasks_completed == 5
+            with django_assert_num_queries(0):
+                state_cache.get_user_statistics(user_with_stats.id)
+
+            UserStatistics.objects.increment(user_with_stats.id, total_tasks_completed=1)
+
+            assert state_cache.get_user_statistics(user_with_stats.id).total_tasks_completed == 6
+
+    def test_unlock_fetches_user_and_achievement_once(self, service, user, achievement_task_count):
+        with CaptureQueriesContext(connection) as without_map:
+            UserAchievement.objects.get_or_create_progress(user.id, str(achievement_task_count.id))
+            service.unlock_achievement(user.id, str(achievement_task_count.id))
+        UserAchievement.objects.all().delete()
+
+        with unit_of_work(), CaptureQueriesContext(connection) as with_map:
+            UserAchievement.objects.get_or_create_progress(user.id, str(achievement_task_count.id))
+            service.unlock_achievement(user.id, str(achievement_task_count.id))
+
+        assert _selects(without_map, "users_user") == 2
+        assert _selects(with_map, "users_user") == 1
+        assert _selects(without_map, "achievements_achievement") == 3
+        assert _selects(with_map, "achievements_achievement") == 1
+
+
+@pytest.mark.django_db
+def test_request_is_one_unit_of_work(authenticated_client, achievement_task_count):
+    seen = []
+    get_achievement_progress = AchievementService.get_achievement_progress
+
+    def get_progress(self, user_id, achievement_id):
+        seen.append(get_identity_map())
+        return get_achievement_progress(self, user_id, achievement_id)
+
+    with mock.patch.object(AchievementService, "get_achievement_progress", get_progress):
+        response = authenticated_client.get(reverse("achievements:achievement-progress", args=[achievement_task_count.id]))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert seen[0] is not None
+    assert get_identity_map() is None
+
+
+def test_task_gets_its_own_map():
+    task_prerun.send(sender=None, task_id="task-1", task=None)
+    assert get_identity_map() is not None
+
+    task_postrun.send(sender=None, task_id="task-1", task=None)
+    assert get_identity_map() is None
@@ -0,0 +1,106 @@
+"""Tests for the PostgreSQL LISTEN/NOTIFY cache invalidation bus."""
+
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from django.db import connection, transaction
+
+from apps.achievements.services.invalidation_bus import MAX_PAYLOAD_BYTES, InvalidationBus, decode_message, encode_messages
+from apps.achievements.services.state_cache import AchievementStateCache
+from apps.achievements.utils.two_tier_cache import TwoTierCache
+
+
+class TestMessages:
+    """Test the compact payload format."""
+
+    def test_round_trip(self):
+        assert encode_messages("catalog") == ["catalog"]
+        assert decode_message("catalog") == ("catalog", [])
+        assert [decode_message(payload) for payload in encode_messages("statistics", [1, 22])] == [("statistics", [1, 22])]
+
+    def test_long_id_lists_are_split(self):
+        user_ids = list(range(10_000_000, 10_005_000))
+
+        payloads = encode_messages("unlocked", user_ids)
+
+        assert len(payloads) > 1
+        assert all(len(payload) <= MAX_PAYLOAD_BYTES for payload in payloads)
+        assert [user_id for payload in payloads for user_id in decode_message(payload)[1]] == user_ids
+
+
+class TestLocalEviction:
+    """Test workers evicting keys announced by other workers."""
+
+    @pytest.fixture
+    def state_cache(self):
+        return AchievementStateCache(TwoTierCache(None, "test"), bus=True)
+
+    def test_message_evicts_entry_and_derived_values(self, state_cache):
+        state_cache.cache.get_or_load("statistics:1", lambda: "old")
+        state_cache.get_progress(1, lambda: ["old"])
+
+        state_cache.bus.dispatch("statistics:1")
+
+        assert state_cache.cache.get_or_load("statistics:1", lambda: "new") == "new"
+        assert state_cache.get_progress(1, lambda: ["new"]) == ["new"]
+
+    def test_other_users_are_kept(self, state_cache):
+        state_cache.get_progress(2, lambda: ["kept"])
+
+        state_cache.bus.dispatch("unlocked:1")
+
+        assert state_cache.get_progress(2, lambda: ["unused"]) == ["kept"]
+
+    def test_load_overlapping_an_eviction_is_not_cached(self, state_cache):
+        def load():
+            state_cache.bus.dispatch("statistics:1")
+            return ["loaded before the write"]
+
+        state_cache.get_progress(1, load)
+
+        assert state_cache.get_progress(1, lambda: ["fresh"]) == ["fresh"]
+
+    def test_handler_errors_are_logged(self):
+        bus = InvalidationBus(handler=Mock(side_effect=RuntimeError), on_reconnect=Mock())
+
+        with patch("apps.achievements.services.invalidation_bus.logger") as logger:
+            bus.dispatch("catalog")
+
+        logger.exception.assert_called_once()
+
+    @pytest.mark.django_db
+    @pytest.mark.skipif(connection.vendor == "postgresql", reason="checks the no-op path")
+    def test_publish_is_a_no_op_without_postgresql(self, django_assert_num_queries):
+        bus = InvalidationBus(handler=Mock(), on_reconnect=Mock())
+
+        with django_assert_num_queries(0):
+            bus.publish("statistics", [1])
+            bus.ensure_listening()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="needs PostgreSQL LISTEN/NOTIFY")
+class TestPostgresDelivery:
+    """Test delivery between connections."""
+
+    def test_committed_invalidations_reach_listeners(self):
+        received, delivered = [], threading.Event()
+
+        def handler(kind, user_ids):
+            received.append((kind, user_ids))
+            delivered.set()
+
+        bus = InvalidationBus(handler=handler, on_reconnect=Mock())
+        bus.ensure_listening()
+        try:
+            with transaction.atomic():
+                bus.publish("statistics", [7])
+                transaction.set_rollback(True)
+            with transaction.atomic():
+                bus.publish("statistics", [8])
+
+            assert delivered.wait(timeout=5)
+            assert received == [("statistics", [8])]
+        finally:
+            bus.stop()
@@ -274,6 +274,7 @@ class TestAchievementChoices:
         assert Achievement.CriteriaType.LEVEL == "level"
         assert Achievement.CriteriaType.FRIEND_COUNT == "friend_count"
         assert Achievement.CriteriaType.CHALLENGE == "challenge"
+        assert Achievement.CriteriaType.EXPRESSION == "expression"
 
         # Check choices count
-        assert len(Achievement.CriteriaType.choices) == 5
+        assert len(Achievement.CriteriaType.choices) == 6
@@ -0,0 +1,79 @@
+"""Tests for progress stored as integer basis points."""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from apps.achievements.models import UserAchievement
+from apps.achievements.utils.progress import (
+    BASIS_POINTS,
+    progress_basis_points,
+    progress_basis_points_batch,
+    to_basis_points,
+    to_percentage,
+)
+
+
+class TestProgressBasisPoints:
+    """Test the basis point helpers."""
+
+    @pytest.mark.parametrize(
+        ("current", "required", "expected"),
+        [
+            (0, 10, 0),
+            (4, 10, 4000),
+            (3, 7, 4285),
+            (6, 7, 8571),
+            (7, 7, BASIS_POINTS),
+            (20, 7, BASIS_POINTS),
+            (5, 0, BASIS_POINTS),
+        ],
+    )
+    def test_progress_basis_points(self, current, required, expected):
+        assert progress_basis_points(current, required) == expected
+
+    def test_progress_never_completes_early(self):
+        assert progress_basis_points(99_999, 100_000) < BASIS_POINTS
+
+    def test_batch_matches_scalar(self):
+        current = np.arange(0, 25)
+        required = np.array([0, 1, 3, 7, 24])
+
+        progress = progress_basis_points_batch(current, required)
+
+        assert progress.dtype == np.int64
+        for row, value in enumerate(current):
+            for column, needed in enumerate(required):
+                assert progress[row, column] == progress_basis_points(int(value), int(needed))
+
+    @pytest.mark.parametrize(
+        ("percentage", "expected"),
+        [(Decimal("42.86"), 4286), (Decimal("100.00"), BASIS_POINTS), (50, 5000), (12.5, 1250), (-10, 0), (150, BASIS_POINTS)],
+    )
+    def test_to_basis_points(self, percentage, expected):
+        assert to_basis_points(percentage) == expected
+
+    def test_to_percentage(self):
+        assert to_percentage(4286) == Decimal("42.86")
+        assert str(to_percentage(BASIS_POINTS)) == "100.00"
+
+
+@pytest.mark.django_db
+class TestUserAchievementProgress:
+    """Test the Decimal view over progress_bp."""
+
+    def test_progress_is_stored_as_basis_points(self, user, achievement_task_count):
+        user_achievement = UserAchievement.objects.create(user=user, achievement=achievement_task_count, progress=Decimal("42.86"))
+
+        user_achievement.refresh_from_db()
+        assert user_achievement.progress_bp == 4286
+        assert user_achievement.progress == Decimal("42.86")
+
+    def test_update_progress_bp_clamps(self, user, achievement_task_count):
+        user_achievement = UserAchievement.objects.create(user=user, achievement=achievement_task_count)
+
+        user_achievement.update_progress_bp(BASIS_POINTS + 1)
+
+        user_achievement.refresh_from_db()
+        assert user_achievement.progress_bp == BASIS_POINTS
@@ -0,0 +1,104 @@
+"""Tests for recomputing achievement progress for every user."""
+
+from decimal import Decimal
+from io import StringIO
+from itertools import pairwise
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from apps.achievements.models import Achievement, ProgressRecomputePartition, UserAchievement, UserStatistics
+from apps.achievements.services.progress_recompute_service import ProgressRecomputeService
+
+
+User = get_user_model()
+
+
+@pytest.fixture
+def users(db):  # noqa: ARG001
+    """Create users who completed 0, 3, 6 and 12 tasks, in user ID order."""
+    created = []
+    for index, tasks in enumerate([0, 3, 6, 12]):
+        user = User.objects.create_user(username=f"recompute{index}", email=f"recompute{index}@example.com", password="pass12345")
+        UserStatistics.objects.create(user=user, total_tasks_completed=tasks)
+        created.append(user)
+    return created
+
+
+@pytest.fixture
+def achievement(db):  # noqa: ARG001
+    """Create a task count achievement requiring 12 tasks."""
+    return Achievement.objects.create(
+        name="Twelve Tasks",
+        description="Complete 12 tasks",
+        criteria={"required_count": 12},
+        criteria_type=Achievement.CriteriaType.TASK_COUNT,
+    )
+
+
+def progress_by_user(achievement: Achievement) -> dict[int, Decimal]:
+    return {row.user_id: row.progress for row in UserAchievement.objects.filter(achievement=achievement)}
+
+
+@pytest.mark.django_db
+class TestProgressRecomputeService:
+    """Test partitioned progress recomputes (in process)."""
+
+    def test_plan_covers_every_user(self, users):
+        partitions = ProgressRecomputePartition.objects.plan(3)
+
+        assert partitions[0].lower_user_id == users[0].id - 1
+        assert partitions[-1].upper_user_id == users[-1].id
+        for previous, current in pairwise(partitions):
+            assert current.lower_user_id == previous.upper_user_id
+
+    def test_recomputes_progress(self, users, achievement):
+        UserAchievement.objects.create(user=users[1], achievement=achievement, progress=Decimal("10.00"))
+
+        summary = ProgressRecomputeService(chunk_size=2).recompute_all(workers=1, partitions=2)
+
+        assert progress_by_user(achievement) == {
+            users[1].id: Decimal("25.00"),
+            users[2].id: Decimal("50.00"),
+            users[3].id: Decimal("100.00"),
+        }
+        assert summary["users_processed"] == 4
+        assert summary["rows_written"] == 3
+        assert not ProgressRecomputePartition.objects.filter(completed_at__isnull=True).exists()
+
+    def test_leaves_completed_achievements_alone(self, users, achievement):
+        completed = UserAchievement.objects.create(user=users[1], achievement=achievement, progress=Decimal("100.00"), is_completed=True)
+
+        ProgressRecomputeService().recompute_all(workers=1)
+
+        completed.refresh_from_db()
+        assert completed.progress == Decimal("100.00")
+
+    @pytest.mark.usefixtures("achievement")
+    def test_unchanged_progress_is_not_rewritten(self, users):
+        service = ProgressRecomputeService()
+        service.recompute_all(workers=1)
+
+        summary = service.recompute_all(workers=1)
+
+        assert summary["users_processed"] == len(users)
+        assert summary["rows_written"] == 0
+
+    def test_resumes_unfinished_run(self, users, achievement):
+        partition = ProgressRecomputePartition.objects.plan(1)[0]
+        partition.last_user_id = users[2].id
+        partition.save()
+
+        summary = ProgressRecomputeService().recompute_all(workers=1)
+
+        assert summary["users_processed"] == 1
+        assert progress_by_user(achievement) == {users[3].id: Decimal("100.00")}
+
+    @pytest.mark.usefixtures("users", "achievement")
+    def test_command(self):
+        out = StringIO()
+
+        call_command("recompute_progress", "--workers", "1", "--partitions", "2", stdout=out)
+
+        assert "Recomputed 2 partitions: 4 users, 3 rows written" in out.getvalue()
@@ -0,0 +1,141 @@
+"""Tests for request coalescing and stale-while-revalidate."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from apps.achievements.tests.fake_redis import FakeRedis
+from apps.achievements.utils.single_flight import SingleFlight
+from apps.achievements.utils.two_tier_cache import TwoTierCache
+
+
+class ImmediateExecutor:
+    """Executor running submitted work inline."""
+
+    def submit(self, fn):
+        fn()
+
+
+def _gated_loader(value, release: threading.Event, calls: list):
+    """Loader that blocks until ``release`` is set and records each call."""
+
+    def load():
+        calls.append(value)
+        release.wait(timeout=5)
+        return value
+
+    return load
+
+
+def _run_concurrently(fn, callers: int) -> list:
+    """Call ``fn`` from several threads and return the results."""
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        futures = [executor.submit(fn) for _ in range(callers)]
+        return [future.result(timeout=10) for future in futures]
+
+
+class TestSingleFlight:
+    """Test in-process coalescing."""
+
+    def test_concurrent_callers_share_one_call(self):
+        flights, release, calls = SingleFlight(), threading.Event(), []
+        load = _gated_loader("result", release, calls)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(flights.do, "k", load) for _ in range(8)]
+            while not flights.in_flight("k"):
+                pass
+            release.set()
+            results = [future.result(timeout=5) for future in futures]
+
+        assert results == ["result"] * 8
+        assert len(calls) == 1
+        assert not flights.in_flight("k")
+
+    def test_waiters_receive_the_exception(self):
+        flights, release, calls = SingleFlight(), threading.Event(), []
+
+        def fail():
+            calls.append(1)
+            release.wait(timeout=5)
+            msg = "boom"
+            raise RuntimeError(msg)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(flights.do, "k", fail) for _ in range(4)]
+            time.sleep(0.1)
+            release.set()
+            errors = [future.exception(timeout=5) for future in futures]
+
+        assert [str(error) for error in errors] == ["boom"] * 4
+        assert len(calls) == 1
+
+
+class TestTwoTierCacheStampede:
+    """Test coalescing of misses across processes and stale-while-revalidate."""
+
+    def test_processes_wait_for_the_lock_holder(self):
+        client, release, calls = FakeRedis(), threading.Event(), []
+        caches = [TwoTierCache(client, "test", lock_timeout=5) for _ in range(4)]
+        load = _gated_loader("value", release, calls)
+        results = []
+
+        def read(cache):
+            results.append(cache.get_or_load("k", load))
+
+        threads = [threading.Thread(target=read, args=(cache,)) for cache in caches]
+        for thread in threads:
+            thread.start()
+        while not calls:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert results == ["value"] * 4
+        assert len(calls) == 1
+
+    def test_waiter_loads_itself_when_lock_holder_gives_up(self):
+        client = FakeRedis()
+        cache = TwoTierCache(client, "test", lock_timeout=0.2)
+        client.set("test:lock:k", b"someone-else", nx=True)
+
+        assert cache.get_or_load("k", lambda: "value") == "value"
+
+    def test_stale_value_is_served_while_refreshing(self):
+        now = [1000.0]
+        client = FakeRedis()
+
+        def make_cache():
+            return TwoTierCache(client, "test", shared_ttl=60, stale_ttl=30, refresh_executor=ImmediateExecutor(), clock=lambda: now[0])
+
+        make_cache().get_or_load("k", lambda: "old")
+        now[0] += 61
+
+        assert make_cache().get_or_load("k", lambda: "new") == "old"
+        assert make_cache().get_or_load("k", lambda: "unused") == "new"
+
+    def test_invalidated_value_is_never_served_stale(self):
+        cache = TwoTierCache(FakeRedis(), "test", stale_ttl=30, refresh_executor=ImmediateExecutor())
+        cache.get_or_load("k", lambda: "old")
+
+        cache.invalidate(["k"])
+
+        assert cache.get_or_load("k", lambda: "new") == "new"
+
+    def test_dependency_invalidation_drops_derived_values(self):
+        client = FakeRedis()
+        cache = TwoTierCache(client, "test")
+        cache.get_or_load("progress:1", lambda: "old", depends_on=("statistics:1",))
+
+        cache.invalidate(["statistics:1"])
+
+        assert cache.get_or_load("progress:1", lambda: "new", depends_on=("statistics:1",)) == "new"
+        other_process = TwoTierCache(client, "test")
+        assert other_process.get_or_load("progress:1", lambda: "unused", depends_on=("statistics:1",)) == "new"
+
+    def test_requires_executor_for_stale_values(self):
+        with pytest.raises(ValueError, match="refresh_executor"):
+            TwoTierCache(FakeRedis(), "test", stale_ttl=30)
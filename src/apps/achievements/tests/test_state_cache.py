@@ -0,0 +1,191 @@
+"""Tests for the two-tier cache and AchievementStateCache."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from django.db import transaction
+
+from apps.achievements.models import UserAchievement, UserStatistics
+from apps.achievements.services.achievement_service import AchievementService
+from apps.achievements.services.state_cache import AchievementStateCache, get_state_cache
+from apps.achievements.services.statistics_writer import RedisCounterStore
+from apps.achievements.tests.fake_redis import FakeRedis
+from apps.achievements.utils.two_tier_cache import LocalTTLCache, TwoTierCache
+
+
+class TestLocalTTLCache:
+    """Test the per-process tier."""
+
+    def test_evicts_least_recently_used(self):
+        cache = LocalTTLCache(max_entries=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+    def test_entries_expire(self):
+        now = [100.0]
+        cache = LocalTTLCache(max_entries=10, ttl=5, clock=lambda: now[0])
+        cache.set("a", 1)
+
+        now[0] += 5
+
+        assert cache.get("a", "missing") == "missing"
+
+
+class TestTwoTierCache:
+    """Test read-through loading and version stamps."""
+
+    @pytest.fixture
+    def client(self):
+        return FakeRedis()
+
+    def test_second_process_reads_shared_tier(self, client):
+        loader = Mock(return_value={"xp": 1})
+        TwoTierCache(client, "test").get_or_load("k", loader)
+
+        assert TwoTierCache(client, "test").get_or_load("k", loader) == {"xp": 1}
+        assert loader.call_count == 1
+
+    def test_invalidate_forces_reload_everywhere(self, client):
+        first, second = TwoTierCache(client, "test"), TwoTierCache(client, "test")
+        first.get_or_load("k", lambda: "old")
+
+        first.invalidate(["k"])
+
+        assert first.get_or_load("k", lambda: "new") == "new"
+        assert TwoTierCache(client, "test").get_or_load("k", lambda: "unused") == "new"
+        assert second.get_or_load("k", lambda: "unused") == "new"
+
+    def test_value_loaded_before_a_write_is_never_served(self, client):
+        cache = TwoTierCache(client, "test")
+
+        def slow_loader():
+            # A write commits and invalidates while this reader is still loading
+            cache.invalidate(["k"])
+            return "stale"
+
+        cache.get_or_load("k", slow_loader)
+        cache.local.clear()
+
+        assert cache.get_or_load("k", lambda: "fresh") == "fresh"
+
+    def test_degrades_to_loader_when_redis_is_down(self, client):
+        client.fail = True
+        cache = TwoTierCache(client, "test")
+
+        assert cache.get_or_load("k", lambda: 42) == 42
+        cache.invalidate(["k"])
+        assert cache.get_or_load("k", lambda: 43) == 43
+
+
+# Fixtures commit their writes, entries written by an open transaction are not cached
+@pytest.mark.django_db(transaction=True)
+class TestAchievementStateCache:
+    """Test caching of statistics and unlocked achievements."""
+
+    @pytest.fixture
+    def state_cache(self, settings):
+        with patch("redis.Redis.from_url", return_value=FakeRedis()):
+            settings.ACHIEVEMENT_STATE_CACHE = {**settings.ACHIEVEMENT_STATE_CACHE, "enabled": True}
+            yield get_state_cache()
+
+    def test_statistics_are_served_from_cache(self, state_cache, user_with_stats, django_assert_num_queries):
+        state_cache.get_user_statistics(user_with_stats.id)
+
+        with django_assert_num_queries(0):
+            stats = state_cache.get_user_statistics(user_with_stats.id)
+
+        assert stats.total_tasks_completed == 5
+
+    def test_increment_invalidates_after_commit(self, state_cache, user_with_stats, django_capture_on_commit_callbacks):
+        state_cache.get_user_statistics(user_with_stats.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            UserStatistics.objects.increment(user_with_stats.id, total_tasks_completed=1)
+
+        assert state_cache.get_user_statistics(user_with_stats.id).total_tasks_completed == 6
+
+    def test_unlock_invalidates_unlocked_set(self, state_cache, user, achievement_task_count, django_capture_on_commit_callbacks):
+        assert len(state_cache.get_unlocked_bitset(user.id)) == 0
+
+        with django_capture_on_commit_callbacks(execute=True):
+            UserAchievement.objects.create(user=user, achievement=achievement_task_count, is_completed=True, progress=100)
+
+        assert achievement_task_count.ordinal in state_cache.get_unlocked_bitset(user.id)
+
+    def test_writing_transaction_reads_its_own_unlocks(self, state_cache, user, achievement_task_count):
+        assert len(state_cache.get_unlocked_bitset(user.id)) == 0
+
+        with transaction.atomic():
+            UserAchievement.objects.create(user=user, achievement=achievement_task_count, is_completed=True, progress=100)
+
+            assert achievement_task_count.ordinal in state_cache.get_unlocked_bitset(user.id)
+            # Nothing uncommitted was cached
+            assert len(state_cache.cache.local.get(f"unlocked:{user.id}")) == 0
+            transaction.set_rollback(True)
+
+        assert len(state_cache.get_unlocked_bitset(user.id)) == 0
+
+    @pytest.mark.usefixtures("state_cache", "achievement_task_count")
+    def test_repeated_checks_in_one_transaction_unlock_once(self, user_with_stats):
+        service = AchievementService()
+
+        with transaction.atomic():
+            assert len(service.check_and_unlock_achievements(user_with_stats.id, "task_completed", {})) == 1
+            assert service.check_and_unlock_achievements(user_with_stats.id, "task_completed", {}) == []
+
+    @pytest.mark.usefixtures("state_cache")
+    def test_progress_is_computed_once_and_follows_statistics(
+        self,
+        user_with_stats,
+        achievement_task_count,
+        django_capture_on_commit_callbacks,
+    ):
+        service = AchievementService()
+        service.calculate_all_progress(user_with_stats.id)
+
+        with patch.object(service, "_calculate_all_progress", wraps=service._calculate_all_progress) as compute:  # noqa: SLF001
+            service.calculate_all_progress(user_with_stats.id)
+            assert compute.call_count == 0
+
+            with django_capture_on_commit_callbacks(execute=True):
+                UserStatistics.objects.increment(user_with_stats.id, total_tasks_completed=5)
+            progress = service.calculate_all_progress(user_with_stats.id)
+
+        assert compute.call_count == 1
+        assert progress[0]["id"] == str(achievement_task_count.id)
+        assert progress[0]["progress"] == 10
+
+    def test_catalog_is_invalidated_by_achievement_changes(self, state_cache, achievement_task_count, django_capture_on_commit_callbacks):
+        assert state_cache.get_catalog(lambda: ["old"]) == ["old"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            achievement_task_count.save()
+
+        assert state_cache.get_catalog(lambda: ["new"]) == ["new"]
+
+    def test_disabled_cache_reads_database(self, user_with_stats):
+        state_cache = AchievementStateCache()
+
+        assert state_cache.get_user_statistics(user_with_stats.id).total_xp == 500
+        assert state_cache.get_user_statistics(0) is None
+
+
+class TestRedisCounterStore:
+    """Test the Redis-backed write-behind store."""
+
+    def test_add_get_and_drain(self):
+        store = RedisCounterStore(client=FakeRedis())
+        store.add(1, {"total_xp": 50, "total_tasks_completed": 1})
+        store.add(1, {"total_xp": 25})
+        store.add(2, {"challenges_won": 1})
+
+        assert store.get(1) == {"total_xp": 75, "total_tasks_completed": 1}
+        assert store.drain() == {1: {"total_xp": 75, "total_tasks_completed": 1}, 2: {"challenges_won": 1}}
+        assert store.drain() == {}
+        assert store.get(1) == {}
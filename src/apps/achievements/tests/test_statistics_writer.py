@@ -0,0 +1,140 @@
+"""Tests for the write-behind statistics writer."""
+
+from unittest.mock import patch
+
+import pytest
+from django.db import transaction
+
+from apps.achievements.models import Achievement, UserAchievement, UserStatistics
+from apps.achievements.services.achievement_service import AchievementService
+from apps.achievements.services.statistics_writer import (
+    DirectStatisticsWriter,
+    WriteBehindStatisticsWriter,
+    get_statistics_writer,
+)
+
+
+# Increments are buffered on commit, so the tests commit for real
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def writer():
+    return WriteBehindStatisticsWriter(flush_interval_ms=60_000, flush_max_increments=100, background_flush=False)
+
+
+class TestWriteBehindStatisticsWriter:
+    """Test buffering, merged reads and flushing."""
+
+    def test_increments_are_buffered_until_flush(self, writer, user_with_stats):
+        stats = writer.increment(user_with_stats.id, total_tasks_completed=1, total_xp=50)
+        writer.increment(user_with_stats.id, total_tasks_completed=1, total_xp=50)
+
+        assert stats.total_tasks_completed == 6
+        assert UserStatistics.objects.get(user=user_with_stats).total_tasks_completed == 5
+
+        assert writer.flush() == 1
+        stored = UserStatistics.objects.get(user=user_with_stats)
+        assert (stored.total_tasks_completed, stored.total_xp) == (7, 600)
+        assert writer.flush() == 0
+
+    def test_flush_writes_all_users_in_one_update(self, writer, user_with_stats, django_user_model, django_assert_num_queries):
+        newcomer = django_user_model.objects.create_user(username="newcomer", password="testpass123")
+        writer.increment(user_with_stats.id, total_xp=10)
+        writer.increment(newcomer.id, challenges_won=1)
+
+        # Missing rows are inserted first, then one UPDATE ... FROM (VALUES ...) inside a savepoint
+        with django_assert_num_queries(4):
+            writer.flush()
+
+        assert UserStatistics.objects.get(user=user_with_stats).total_xp == 510
+        assert UserStatistics.objects.get(user=newcomer).challenges_won == 1
+
+    def test_reaching_max_increments_flushes(self, user_with_stats):
+        writer = WriteBehindStatisticsWriter(flush_interval_ms=60_000, flush_max_increments=3, background_flush=False)
+
+        for _ in range(3):
+            writer.increment(user_with_stats.id, total_tasks_completed=1)
+
+        assert UserStatistics.objects.get(user=user_with_stats).total_tasks_completed == 8
+
+    def test_rolled_back_increments_are_dropped(self, writer, user_with_stats):
+        with transaction.atomic():
+            writer.increment(user_with_stats.id, total_tasks_completed=1)
+            stats = writer.increment(user_with_stats.id, total_tasks_completed=1)
+            # Visible to the transaction that made them
+            assert stats.total_tasks_completed == 7
+            transaction.set_rollback(True)
+
+        assert writer.store.get(user_with_stats.id) == {}
+        assert writer.merge(UserStatistics.objects.get(user=user_with_stats)).total_tasks_completed == 5
+
+    def test_rolled_back_savepoint_drops_only_its_increments(self, writer, user_with_stats):
+        with transaction.atomic():
+            writer.increment(user_with_stats.id, total_xp=10)
+            with transaction.atomic():
+                writer.increment(user_with_stats.id, total_xp=5)
+                transaction.set_rollback(True)
+
+            assert writer.merge(UserStatistics.objects.get(user=user_with_stats)).total_xp == 510
+
+        assert writer.store.get(user_with_stats.id) == {"total_xp": 10}
+
+    def test_increments_are_buffered_on_commit(self, writer, user_with_stats):
+        with transaction.atomic():
+            writer.increment(user_with_stats.id, total_xp=10)
+            assert writer.store.get(user_with_stats.id) == {}
+
+        assert writer.store.get(user_with_stats.id) == {"total_xp": 10}
+
+    def test_never_flushes_inside_the_callers_transaction(self, user_with_stats):
+        writer = WriteBehindStatisticsWriter(flush_interval_ms=60_000, flush_max_increments=2, background_flush=False)
+
+        with transaction.atomic():
+            for _ in range(3):
+                writer.increment(user_with_stats.id, total_tasks_completed=1)
+            with patch.object(writer, "flush") as flush:
+                writer.increment(user_with_stats.id, total_tasks_completed=1)
+            flush.assert_not_called()
+
+        assert UserStatistics.objects.get(user=user_with_stats).total_tasks_completed == 9
+
+    def test_failed_flush_keeps_deltas(self, writer, user_with_stats):
+        writer.increment(user_with_stats.id, total_xp=10)
+
+        with patch.object(writer, "_write", side_effect=RuntimeError("database unavailable")), pytest.raises(RuntimeError):
+            writer.flush()
+
+        assert writer.store.get(user_with_stats.id) == {"total_xp": 10}
+
+    def test_evaluation_reads_merged_view(self, writer, user_with_stats):
+        achievement = Achievement.objects.create(
+            name="Six Tasks",
+            description="Complete 6 tasks",
+            criteria={"required_count": 6},
+            criteria_type=Achievement.CriteriaType.TASK_COUNT,
+        )
+        service = AchievementService()
+        service.statistics_writer = writer
+        writer.increment(user_with_stats.id, total_tasks_completed=1)
+
+        service.check_and_unlock_achievements(user_with_stats.id, "task_completed", {})
+
+        assert UserAchievement.objects.get(user=user_with_stats, achievement=achievement).is_completed
+
+
+class TestGetStatisticsWriter:
+    """Test writer selection from settings."""
+
+    def test_direct_writer_by_default(self, settings):
+        settings.STATISTICS_WRITE_BEHIND = {**settings.STATISTICS_WRITE_BEHIND, "enabled": False}
+
+        assert isinstance(get_statistics_writer(), DirectStatisticsWriter)
+
+    def test_write_behind_when_enabled(self, settings):
+        settings.STATISTICS_WRITE_BEHIND = {**settings.STATISTICS_WRITE_BEHIND, "enabled": True, "flush_max_increments": 10}
+
+        writer = get_statistics_writer()
+
+        assert isinstance(writer, WriteBehindStatisticsWriter)
+        assert writer.flush_max_increments == 10
@@ -0,0 +1,110 @@
+"""Tests for evaluating achievements from a change of statistics."""
+
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.achievements.models import Achievement, UserAchievement, UserStatistics
+from apps.achievements.services.achievement_service import AchievementService
+from apps.achievements.services.task_simulation_service import TaskSimulationService
+from apps.achievements.utils.stats_snapshot import StatsSnapshot, changed_statistics
+from apps.xp_management.services.level_curve import get_level_curve
+
+
+@pytest.fixture
+def service():
+    with mock.patch("apps.achievements.services.achievement_service.NotificationSender"):
+        yield AchievementService()
+
+
+@pytest.fixture
+def before(user_with_stats):
+    return StatsSnapshot.from_model(UserStatistics.objects.get(user=user_with_stats))
+
+
+@pytest.fixture
+def achievement_level_4(db):  # noqa: ARG001
+    return Achievement.objects.create(
+        name="Level 4",
+        description="Reach level 4",
+        criteria={"required_level": 4},
+        criteria_type=Achievement.CriteriaType.LEVEL,
+    )
+
+
+def test_changed_statistics():
+    old = StatsSnapshot(user_id=1, total_tasks_completed=5, current_level=2)
+
+    assert changed_statistics(old, old.replace(total_tasks_completed=6, current_level=3)) == {"total_tasks_completed", "current_level"}
+    assert changed_statistics(old, old) == frozenset()
+    assert changed_statistics(None, StatsSnapshot(user_id=1, total_xp=10)) == {"total_xp"}
+
+
+@pytest.mark.django_db
+class TestStatsChanged:
+    """Test AchievementService.stats_changed."""
+
+    @pytest.mark.usefixtures("achievement_streak")
+    def test_evaluates_only_achievements_reading_changed_stats(self, service, user_with_stats, before, achievement_level_4):
+        after = before.replace(total_tasks_completed=6, total_xp=600, current_level=4)
+
+        with mock.patch.object(service.evaluator, "evaluate_criteria", wraps=service.evaluator.evaluate_criteria) as evaluate:
+            unlocked = service.stats_changed(user_with_stats.id, before, after)
+
+        # The streak did not change, so the streak achievement is not evaluated
+        assert [call.args[1] for call in evaluate.call_args_list] == [achievement_level_4]
+        assert [user_achievement.achievement for user_achievement in unlocked] == [achievement_level_4]
+
+    def test_expressions_follow_their_inputs(self, service, user_with_stats, before):
+        expression = Achievement.objects.create(
+            name="Streak Keeper",
+            description="Match your longest streak",
+            criteria_type=Achievement.CriteriaType.EXPRESSION,
+            criteria={"expression": {"stat": "current_streak", "gte": {"stat": "longest_streak"}}},
+        )
+
+        assert service.stats_changed(user_with_stats.id, before, before.replace(total_xp=900)) == []
+        assert not UserAchievement.objects.filter(achievement=expression).exists()
+
+        unlocked = service.stats_changed(user_with_stats.id, before, before.replace(current_streak=7))
+
+        assert [user_achievement.achievement for user_achievement in unlocked] == [expression]
+
+    def test_progress_is_written_in_one_statement(self, service, user_with_stats, before, achievement_level):
+        streak_10 = Achievement.objects.create(
+            name="Ten Day Streak",
+            description="Keep a 10 day streak",
+            criteria={"required_days": 10},
+            criteria_type=Achievement.CriteriaType.STREAK,
+        )
+        after = before.replace(current_streak=5, current_level=5)
+
+        with CaptureQueriesContext(connection) as queries:
+            assert service.stats_changed(user_with_stats.id, before, after) == []
+
+        writes = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("INSERT")]
+        assert len(writes) == 1
+        progress = dict(UserAchievement.objects.filter(user=user_with_stats).values_list("achievement_id", "progress_bp"))
+        assert progress == {achievement_level.id: 5000, streak_10.id: 5000}
+
+    def test_nothing_changed(self, service, user_with_stats, before):
+        with CaptureQueriesContext(connection) as queries:
+            assert service.stats_changed(user_with_stats.id, before, before) == []
+
+        # Only the transaction's savepoint
+        assert all(query["sql"].startswith(("SAVEPOINT", "RELEASE")) for query in queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_simulation_unlocks_level_achievements(user, achievement_level_4):
+    tasks = -(-get_level_curve().thresholds[3] // 50)
+    simulation = TaskSimulationService()
+
+    with mock.patch.object(simulation.event_publisher, "publish_level_up") as publish_level_up:
+        result = simulation.simulate_task_completions(user.id, count=tasks)
+
+    assert result["current_level"] >= 4
+    assert UserAchievement.objects.get(user=user, achievement=achievement_level_4).is_completed
+    assert publish_level_up.call_args.kwargs["new_level"] == result["current_level"]
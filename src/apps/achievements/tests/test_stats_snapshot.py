@@ -0,0 +1,112 @@
+"""Tests for the immutable statistics snapshot."""
+
+import pickle
+from unittest.mock import patch
+
+import pytest
+
+from apps.achievements.events.handlers import TaskCompletedEventHandler
+from apps.achievements.models import UserAchievement, UserStatistics
+from apps.achievements.services.achievement_evaluator import AchievementEvaluator
+from apps.achievements.services.state_cache import AchievementStateCache
+from apps.achievements.services.statistics_writer import WriteBehindStatisticsWriter
+from apps.achievements.utils.stats_snapshot import StatsSnapshot
+
+
+class TestStatsSnapshot:
+    """Test building, copying and serializing snapshots."""
+
+    def test_from_values_ignores_other_keys_and_uses_defaults(self):
+        snapshot = StatsSnapshot.from_values({"user_id": 7, "total_xp": 120, "last_updated": None})
+
+        assert snapshot.user_id == 7
+        assert snapshot.total_xp == 120
+        assert snapshot.current_level == 1
+        assert snapshot.total_tasks_completed == 0
+
+    def test_from_model(self):
+        user_stats = UserStatistics(user_id=3, total_tasks_completed=4, current_streak=2)
+
+        snapshot = StatsSnapshot.from_model(user_stats)
+
+        assert (snapshot.user_id, snapshot.total_tasks_completed, snapshot.current_streak) == (3, 4, 2)
+
+    def test_from_event(self):
+        payload = {"user_id": "9", "statistics": {"total_tasks_completed": "12", "current_level": 4}}
+
+        snapshot = StatsSnapshot.from_event(payload)
+
+        assert (snapshot.user_id, snapshot.total_tasks_completed, snapshot.current_level) == (9, 12, 4)
+
+    def test_from_event_without_statistics(self):
+        with pytest.raises(ValueError, match="no statistics"):
+            StatsSnapshot.from_event({"user_id": 9})
+
+    def test_unknown_statistic_is_rejected(self):
+        with pytest.raises(TypeError, match="karma"):
+            StatsSnapshot(karma=1)
+
+    def test_is_immutable(self):
+        snapshot = StatsSnapshot(user_id=1, total_xp=10)
+
+        with pytest.raises(AttributeError, match="immutable"):
+            snapshot.total_xp = 20
+        with pytest.raises(AttributeError):
+            snapshot.__dict__  # noqa: B018
+
+        changed = snapshot.replace(total_xp=20)
+        assert (snapshot.total_xp, changed.total_xp) == (10, 20)
+
+    def test_pickles_and_compares_by_content(self):
+        snapshot = StatsSnapshot(user_id=1, total_tasks_completed=5, challenges_won=2)
+
+        restored = pickle.loads(pickle.dumps(snapshot))
+
+        assert restored == snapshot
+        assert hash(restored) == hash(snapshot)
+        assert StatsSnapshot.from_values(snapshot.to_dict()) == snapshot
+
+
+@pytest.mark.django_db
+class TestSnapshotEvaluation:
+    """Test evaluating achievements from snapshots instead of model instances."""
+
+    def test_evaluator_accepts_snapshot(self, achievement_task_count):
+        evaluator = AchievementEvaluator()
+        model = UserStatistics(user_id=1, total_tasks_completed=7)
+        snapshot = StatsSnapshot.from_model(model)
+
+        for user_stats in (snapshot, model):
+            assert evaluator.evaluate_criteria(1, achievement_task_count, user_stats)
+            assert evaluator.calculate_progress_bp(1, achievement_task_count, user_stats) == 10_000
+
+    def test_state_cache_returns_snapshot(self, user_with_stats):
+        snapshot = AchievementStateCache().get_user_statistics(user_with_stats.id)
+
+        assert isinstance(snapshot, StatsSnapshot)
+        assert snapshot.total_tasks_completed == 5
+
+    def test_write_behind_merge_returns_new_snapshot(self, user_with_stats):
+        writer = WriteBehindStatisticsWriter(flush_interval_ms=60_000, flush_max_increments=100, background_flush=False)
+        writer.increment(user_with_stats.id, total_tasks_completed=2)
+        stored = StatsSnapshot.from_model(UserStatistics.objects.get(user=user_with_stats))
+
+        merged = writer.merge(stored)
+
+        assert merged.total_tasks_completed == stored.total_tasks_completed + 2
+
+    def test_event_statistics_are_used_for_the_check(self, user, achievement_task_count):
+        # The user has no statistics row, only the event carries them
+        handler = TaskCompletedEventHandler()
+        event_data = {
+            "user_id": user.id,
+            "task_id": "task-1",
+            "timestamp": None,
+            "statistics": {"total_tasks_completed": 10},
+        }
+
+        with patch.object(AchievementStateCache, "get_user_statistics") as get_user_statistics:
+            handler.handle_task_completed(event_data)
+
+        get_user_statistics.assert_not_called()
+        assert UserAchievement.objects.get(user=user, achievement=achievement_task_count).is_completed
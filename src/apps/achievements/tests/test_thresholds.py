@@ -0,0 +1,86 @@
+"""Tests for the denormalized achievement threshold columns."""
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.achievements.models import Achievement, UserStatistics
+from apps.achievements.services.achievement_service import AchievementService
+
+
+User = get_user_model()
+
+
+def make_achievement(name: str, criteria_type: str, criteria: dict, **kwargs) -> Achievement:
+    return Achievement.objects.create(
+        name=name,
+        description=name,
+        criteria=criteria,
+        criteria_type=criteria_type,
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+class TestAchievementThreshold:
+    """Test deriving the threshold from the criteria."""
+
+    @pytest.mark.parametrize(
+        ("criteria_type", "criteria", "expected"),
+        [
+            (Achievement.CriteriaType.TASK_COUNT, {"required_count": 10}, ("total_tasks_completed", 10)),
+            (Achievement.CriteriaType.STREAK, {"required_days": 7}, ("current_streak", 7)),
+            (Achievement.CriteriaType.LEVEL, {"required_level": 5}, ("current_level", 5)),
+            (Achievement.CriteriaType.FRIEND_COUNT, {"required_count": 3}, ("friend_count", 3)),
+            (Achievement.CriteriaType.CHALLENGE, {"required_wins": 2}, ("challenges_won", 2)),
+            (Achievement.CriteriaType.TASK_COUNT, {}, ("total_tasks_completed", 0)),
+        ],
+    )
+    def test_threshold_is_derived_on_save(self, criteria_type, criteria, expected):
+        achievement = make_achievement("Threshold", criteria_type, criteria)
+        achievement.refresh_from_db()
+
+        assert (achievement.threshold_stat, achievement.threshold) == expected
+
+    def test_update_fields_includes_threshold(self, achievement_task_count):
+        achievement_task_count.criteria = {"required_count": 25}
+        achievement_task_count.save(update_fields=["criteria"])
+        achievement_task_count.refresh_from_db()
+
+        assert achievement_task_count.threshold == 25
+
+    def test_get_crossed_by(self):
+        make_achievement("Five", Achievement.CriteriaType.TASK_COUNT, {"required_count": 5})
+        make_achievement("Ten", Achievement.CriteriaType.TASK_COUNT, {"required_count": 10})
+        make_achievement("Twenty", Achievement.CriteriaType.TASK_COUNT, {"required_count": 20})
+        make_achievement("Inactive", Achievement.CriteriaType.TASK_COUNT, {"required_count": 8}, is_active=False)
+        make_achievement("Streak", Achievement.CriteriaType.STREAK, {"required_days": 7})
+
+        crossed = Achievement.objects.get_crossed_by("total_tasks_completed", 5, 12)
+
+        assert [achievement.name for achievement in crossed] == ["Ten"]
+        assert Achievement.objects.get_reached_by("total_tasks_completed", 12).count() == 2
+
+
+@pytest.mark.django_db
+class TestQualifyingUsers:
+    """Test reverse cohort queries on UserStatistics."""
+
+    def test_get_qualifying(self, achievement_streak):
+        for index, streak in enumerate([3, 7, 12]):
+            user = User.objects.create_user(username=f"cohort{index}", email=f"cohort{index}@example.com", password="pass12345")
+            UserStatistics.objects.create(user=user, current_streak=streak)
+
+        qualifying = UserStatistics.objects.get_qualifying(achievement_streak)
+
+        assert sorted(qualifying.values_list("current_streak", flat=True)) == [7, 12]
+
+    def test_get_qualifying_without_threshold(self, achievement_task_count):
+        achievement_task_count.threshold_stat = ""
+
+        with pytest.raises(ValueError, match="has no threshold"):
+            UserStatistics.objects.get_qualifying(achievement_task_count)
+
+    def test_progress_values_use_threshold(self, user_with_stats, achievement_level):
+        user_stats = UserStatistics.objects.get(user=user_with_stats)
+
+        assert AchievementService()._get_progress_values(achievement_level, user_stats) == (3, 10)  # noqa: SLF001
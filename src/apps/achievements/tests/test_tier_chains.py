@@ -0,0 +1,136 @@
+"""Tests for achievement tier chains."""
+
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+
+from apps.achievements.models import Achievement, AchievementChain, UserAchievement, UserStatistics
+from apps.achievements.services.achievement_service import AchievementService
+from apps.achievements.services.backfill_service import AchievementBackfillService
+from apps.achievements.services.progress_recompute_service import ProgressRecomputeService
+
+
+User = get_user_model()
+
+
+@pytest.fixture
+def chain(db):  # noqa: ARG001
+    """Create a 1/10/100 tasks chain."""
+    chain = AchievementChain.objects.create(name="Task Ladder")
+    for tier, required_count in enumerate([1, 10, 100], start=1):
+        Achievement.objects.create(
+            name=f"{required_count} Tasks",
+            description=f"Complete {required_count} tasks",
+            criteria={"required_count": required_count},
+            criteria_type=Achievement.CriteriaType.TASK_COUNT,
+            chain=chain,
+            tier=tier,
+        )
+    return chain
+
+
+def tiers(chain: AchievementChain) -> list[Achievement]:
+    return list(chain.tiers.order_by("tier"))
+
+
+def rows_by_tier(user_id: int) -> dict[int, tuple[int, bool]]:
+    return {
+        row.achievement.tier: (row.progress_bp, row.is_completed)
+        for row in UserAchievement.objects.filter(user_id=user_id).select_related("achievement")
+    }
+
+
+@pytest.fixture
+def service():
+    with mock.patch("apps.achievements.services.achievement_service.NotificationSender"):
+        yield AchievementService()
+
+
+@pytest.mark.django_db
+class TestChainEvaluation:
+    """Test that events only evaluate a user's next tier."""
+
+    @pytest.mark.usefixtures("chain")
+    def test_only_next_tier_stores_progress(self, service, user_with_stats):
+        # The user completed 5 tasks
+        unlocked = service.check_and_unlock_achievements(user_with_stats.id, "task_completed", {})
+
+        assert [user_achievement.achievement.tier for user_achievement in unlocked] == [1]
+        assert rows_by_tier(user_with_stats.id) == {1: (10_000, True), 2: (5000, False)}
+
+    @pytest.mark.usefixtures("chain")
+    def test_crossing_several_tiers_unlocks_each(self, service, user_with_stats):
+        UserStatistics.objects.filter(user=user_with_stats).update(total_tasks_completed=50)
+
+        unlocked = service.check_and_unlock_achievements(user_with_stats.id, "task_completed", {})
+
+        assert [user_achievement.achievement.tier for user_achievement in unlocked] == [1, 2]
+        assert rows_by_tier(user_with_stats.id) == {1: (10_000, True), 2: (10_000, True), 3: (5000, False)}
+
+    @pytest.mark.usefixtures("chain")
+    def test_tiers_above_the_next_are_not_evaluated(self, service, user_with_stats):
+        service.check_and_unlock_achievements(user_with_stats.id, "task_completed", {})
+
+        with mock.patch.object(service.evaluator, "evaluate_criteria", wraps=service.evaluator.evaluate_criteria) as evaluate:
+            service.check_and_unlock_achievements(user_with_stats.id, "task_completed", {})
+
+        assert [call.args[1].tier for call in evaluate.call_args_list] == [2]
+
+    def test_inactive_tier_is_skipped(self, service, user_with_stats, chain):
+        Achievement.objects.filter(chain=chain, tier=2).update(is_active=False)
+
+        service.check_and_unlock_achievements(user_with_stats.id, "task_completed", {})
+
+        assert rows_by_tier(user_with_stats.id) == {1: (10_000, True), 3: (500, False)}
+
+    def test_chained_achievement_needs_tier(self, chain):
+        with pytest.raises(IntegrityError):
+            Achievement.objects.create(name="No Tier", description="", criteria={}, chain=chain)
+
+    def test_get_previous_tier(self, chain):
+        first, second, third = tiers(chain)
+
+        assert Achievement.objects.get_previous_tier(first) is None
+        assert Achievement.objects.get_previous_tier(third) == second
+
+
+@pytest.fixture
+def climbers(db):  # noqa: ARG001
+    """Create users who completed 0, 5 and 50 tasks, in user ID order."""
+    users = []
+    for index, tasks in enumerate([0, 5, 50]):
+        user = User.objects.create_user(username=f"climber{index}", email=f"climber{index}@example.com", password="pass12345")
+        UserStatistics.objects.create(user=user, total_tasks_completed=tasks)
+        users.append(user)
+    return users
+
+
+@pytest.mark.django_db
+class TestChainBulkProgress:
+    """Test that recomputes and backfills keep progress on the next tier only."""
+
+    def test_recompute_keeps_only_next_tier(self, climbers, chain):
+        first, second, third = tiers(chain)
+        UserAchievement.objects.create(user=climbers[2], achievement=first, progress_bp=10_000, is_completed=True)
+        # Stale progress above the next tier, e.g. written before the achievements were chained
+        UserAchievement.objects.create(user=climbers[1], achievement=third, progress_bp=300)
+
+        ProgressRecomputeService(chunk_size=2).recompute_all(workers=1, partitions=1)
+
+        assert rows_by_tier(climbers[0].id) == {}
+        assert rows_by_tier(climbers[1].id) == {1: (10_000, False)}
+        assert rows_by_tier(climbers[2].id) == {1: (10_000, True), 2: (10_000, False)}
+
+    def test_backfill_progress_needs_previous_tier(self, climbers, chain):
+        first, second, third = tiers(chain)
+        UserAchievement.objects.create(user=climbers[2], achievement=first, progress_bp=10_000, is_completed=True)
+        service = AchievementBackfillService(chunk_size=10, pause=0, event_publisher=mock.Mock(), notification_sender=mock.Mock())
+
+        service.backfill(str(second.id))
+        service.backfill(str(third.id))
+
+        # climbers[1] has 5 of 10 tasks but has not completed tier 1, so tier 2 stores no progress
+        assert rows_by_tier(climbers[1].id) == {}
+        assert rows_by_tier(climbers[2].id) == {1: (10_000, True), 2: (10_000, True), 3: (5000, False)}
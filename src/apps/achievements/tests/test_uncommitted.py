@@ -0,0 +1,59 @@
+"""Tests for tracking the writes of the open transaction."""
+
+import pytest
+from django.db import transaction
+
+from apps.achievements.utils.uncommitted import UncommittedWrites
+
+
+# Commit hooks only run when the transaction really commits
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def writes():
+    return UncommittedWrites()
+
+
+def test_commit_forgets_the_write_before_running_the_hook(writes):
+    seen = []
+
+    with transaction.atomic():
+        writes.add(["a"], 1, lambda: seen.append(writes.get("a")))
+        assert writes.get("a") == [1]
+
+    assert seen == [[]]
+    assert not writes.contains("a")
+
+
+def test_rollback_forgets_the_write(writes):
+    committed = []
+
+    with transaction.atomic():
+        writes.add(["a", "b"], 1, lambda: committed.append(1))
+        transaction.set_rollback(True)
+
+    assert not writes.contains("a")
+    assert not writes.contains("b")
+    assert committed == []
+
+
+def test_savepoint_rollback_forgets_only_its_writes(writes):
+    with transaction.atomic():
+        writes.add(["a"], 1, lambda: None)
+        with transaction.atomic():
+            writes.add(["a"], 2, lambda: None)
+        with transaction.atomic():
+            writes.add(["a"], 3, lambda: None)
+            transaction.set_rollback(True)
+
+        assert sorted(writes.get("a")) == [1, 2]
+
+
+def test_outside_a_transaction_nothing_is_kept(writes):
+    committed = []
+
+    writes.add(["a"], 1, lambda: committed.append(1))
+
+    assert committed == [1]
+    assert not writes.contains("a")
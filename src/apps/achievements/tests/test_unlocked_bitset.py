@@ -0,0 +1,103 @@
+"""Tests for achievement ordinals and the per-user unlocked bitset."""
+
+import pickle
+
+import pytest
+from django.db import connection
+
+from apps.achievements.models import Achievement, UnlockedAchievementSet, UserAchievement
+from apps.achievements.services.achievement_service import AchievementService
+from apps.achievements.utils.bitset import AchievementBitset
+from apps.achievements.utils.validators import AchievementValidator
+
+
+class TestAchievementBitset:
+    """Test the bitset value type."""
+
+    def test_membership_and_count(self):
+        bitset = AchievementBitset.from_ordinals([0, 9, 300])
+
+        assert 9 in bitset
+        assert 8 not in bitset
+        assert -1 not in bitset
+        assert len(bitset) == 3
+        assert bitset.ordinals() == [0, 9, 300]
+
+    def test_updates_return_new_sets(self):
+        bitset = AchievementBitset.from_ordinals([1])
+
+        assert bitset.with_ordinal(4).ordinals() == [1, 4]
+        assert bitset.without_ordinal(1) == AchievementBitset()
+        assert bitset.ordinals() == [1]
+
+    def test_serialization_is_compact(self):
+        bitset = AchievementBitset.from_ordinals(range(0, 2000, 3))
+
+        assert len(bitset.to_bytes()) == 250
+        assert AchievementBitset(bitset.to_bytes()) == bitset
+        assert pickle.loads(pickle.dumps(bitset)) == bitset
+
+
+@pytest.mark.django_db
+class TestUnlockedAchievementSet:
+    """Test ordinals and keeping the bitset in step with UserAchievement."""
+
+    def test_ordinals_are_assigned_in_creation_order(self, achievement_task_count, achievement_streak):
+        assert achievement_streak.ordinal == achievement_task_count.ordinal + 1
+        assert Achievement.objects.next_ordinal() == achievement_streak.ordinal + 1
+
+    @pytest.mark.skipif(connection.vendor != "postgresql", reason="ordinals come from a sequence on PostgreSQL only")
+    def test_ordinal_of_deleted_achievement_is_not_reused(self, achievement_task_count, achievement_streak):
+        deleted_ordinal = achievement_streak.ordinal
+        achievement_streak.delete()
+
+        replacement = Achievement.objects.create(
+            name="Replacement",
+            description="Created after the highest achievement was deleted",
+            criteria={"required_count": 2},
+            criteria_type=Achievement.CriteriaType.TASK_COUNT,
+        )
+
+        assert replacement.ordinal > deleted_ordinal > achievement_task_count.ordinal
+
+    def test_completing_sets_the_bit(self, user_achievement_unlocked, achievement_task_count):
+        unlocked_set = UnlockedAchievementSet.objects.get(user=user_achievement_unlocked.user)
+
+        assert achievement_task_count.ordinal in unlocked_set.bitset
+        assert unlocked_set.unlocked_count == 1
+
+    def test_progress_updates_do_not_touch_the_set(self, user_achievement_in_progress, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            user_achievement_in_progress.update_progress(50)
+
+        assert not UnlockedAchievementSet.objects.filter(user=user_achievement_in_progress.user).exists()
+
+    def test_complete_and_delete(self, user_achievement_in_progress, achievement_streak):
+        user = user_achievement_in_progress.user
+
+        user_achievement_in_progress.complete()
+        assert UserAchievement.objects.is_unlocked(user.id, achievement_streak.id)
+
+        user_achievement_in_progress.delete()
+        assert not UserAchievement.objects.is_unlocked(user.id, achievement_streak.id)
+        assert UnlockedAchievementSet.objects.get(user=user).unlocked_count == 0
+
+    def test_deleting_the_user_removes_the_set(self, user_achievement_unlocked):
+        user = user_achievement_unlocked.user
+
+        user.delete()
+
+        assert not UnlockedAchievementSet.objects.exists()
+
+    def test_membership_check_is_one_query(self, user_achievement_unlocked, achievement_task_count, django_assert_num_queries):
+        validator = AchievementValidator()
+
+        with django_assert_num_queries(1):
+            assert not validator.validate_not_already_unlocked(user_achievement_unlocked.user_id, achievement_task_count.id)
+
+    @pytest.mark.usefixtures("user_achievement_unlocked")
+    def test_evaluation_skips_unlocked_achievements(self, user_with_stats, achievement_task_count):
+        unlocked = AchievementService().check_and_unlock_achievements(user_with_stats.id, "task_completed", {})
+
+        assert unlocked == []
+        assert UserAchievement.objects.filter(user=user_with_stats, achievement=achievement_task_count).count() == 1
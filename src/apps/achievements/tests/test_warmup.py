@@ -0,0 +1,97 @@
+"""Tests for process-wide services and worker warm-up."""
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+
+from apps.achievements.api.views import AchievementViewSet
+from apps.achievements.events.handlers import LevelUpEventHandler, TaskCompletedEventHandler
+from apps.achievements.services.achievement_service import get_achievement_service
+from apps.achievements.services.criteria_compiler import get_criteria_compiler
+from apps.achievements.services.task_simulation_service import get_task_simulation_service
+from apps.achievements.services.warmup import warm_up
+from apps.achievements.utils.singleton import process_singleton
+from apps.tasks.api.views import TaskViewSet
+from apps.tasks.services.task_completion_service import get_task_completion_service
+
+
+@pytest.fixture
+def no_broker():
+    """Skip connecting to a broker, there is none in tests."""
+    with mock.patch("apps.achievements.services.warmup._connect_broker") as connect_broker:
+        yield connect_broker
+
+
+def test_singleton_is_built_once_across_threads():
+    built = []
+
+    @process_singleton()
+    def get_thing() -> object:
+        time.sleep(0.01)
+        built.append(object())
+        return built[-1]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(get_thing())) for _thread in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(built) == 1
+    assert all(result is built[0] for result in results)
+
+
+def test_singleton_resets_when_its_settings_change():
+    @process_singleton(reset_on=("XP_LEVEL_CURVE",))
+    def get_thing() -> object:
+        return object()
+
+    first = get_thing()
+    with override_settings(REWARDS_BALANCE_SHARDS=3):
+        assert get_thing() is first
+    with override_settings(XP_LEVEL_CURVE={"type": "linear", "xp_per_level": 10}):
+        assert get_thing() is not first
+
+
+def test_services_are_wired_once():
+    service = get_achievement_service()
+
+    assert TaskCompletedEventHandler().achievement_service is service
+    assert TaskCompletedEventHandler().challenge_engine.achievement_service is service
+    assert LevelUpEventHandler().achievement_service is service
+    assert get_task_simulation_service().task_handler.achievement_service is service
+    assert AchievementViewSet().achievement_service is service
+    assert AchievementViewSet().task_simulation_service is get_task_simulation_service()
+    assert get_task_completion_service().achievement_service is service
+    assert TaskViewSet().task_completion_service is get_task_completion_service()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("no_broker")
+def test_warm_up_compiles_the_catalog(achievement_task_count, achievement_streak):
+    get_criteria_compiler.cache_clear()
+
+    result = warm_up()
+
+    assert result["compiled_achievements"] == 2
+    assert set(result["timings"]) == {"database", "services", "catalog", "cache", "broker"}
+
+    # The first evaluation finds the criteria compiled
+    with mock.patch.object(get_criteria_compiler(), "compile") as compile_criteria:
+        get_criteria_compiler().get(achievement_task_count)
+        get_criteria_compiler().get(achievement_streak)
+    compile_criteria.assert_not_called()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("achievement_task_count")
+def test_warm_up_survives_failing_steps(no_broker):
+    with mock.patch("apps.achievements.services.warmup.get_state_cache", side_effect=ConnectionError("redis down")):
+        result = warm_up()
+
+    assert result["compiled_achievements"] == 1
+    no_broker.assert_called_once()
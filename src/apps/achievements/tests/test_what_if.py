@@ -0,0 +1,133 @@
+"""Tests for the staff "what if" API."""
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+
+from apps.achievements.models import Achievement, UserAchievement, UserStatistics
+from apps.achievements.services.what_if_service import WhatIfService
+
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def staff_client(api_client, db):  # noqa: ARG001
+    staff = User.objects.create_user(username="designer", email="designer@example.com", password="pass12345", is_staff=True)
+    api_client.force_authenticate(user=staff)
+    return api_client
+
+
+@pytest.fixture
+def population(db):  # noqa: ARG001
+    """Create users who completed 0, 4, 9, 10 and 25 tasks."""
+    for index, tasks in enumerate([0, 4, 9, 10, 25]):
+        user = User.objects.create_user(username=f"pop{index}", email=f"pop{index}@example.com", password="pass12345")
+        UserStatistics.objects.create(user=user, total_tasks_completed=tasks)
+
+
+@pytest.fixture
+def weekly_achievement(db):  # noqa: ARG001
+    return Achievement.objects.create(
+        name="Busy Week",
+        description="Complete 20 tasks in 7 days",
+        criteria_type=Achievement.CriteriaType.EXPRESSION,
+        criteria={"expression": {"window": "tasks_completed", "days": 7, "gte": 20}},
+    )
+
+
+@pytest.mark.django_db
+class TestWhatIfService:
+    """Test evaluating hypothetical statistics and counting cohorts."""
+
+    def test_evaluate_in_memory(self, achievement_task_count, achievement_streak, weekly_achievement, django_assert_num_queries):
+        service = WhatIfService()
+
+        # One query for the catalog, no writes
+        with django_assert_num_queries(1):
+            results = service.evaluate({"total_tasks_completed": 1, "current_streak": 3}, {("tasks_completed", 7): 5})
+
+        by_name = {result["name"]: result for result in results}
+        assert by_name[achievement_task_count.name]["is_unlocked"]
+        assert not by_name[achievement_streak.name]["is_unlocked"]
+        assert by_name[achievement_streak.name]["progress_percentage"] == pytest.approx(42.85)
+        assert by_name[weekly_achievement.name]["progress_percentage"] == 25.0
+        assert not UserAchievement.objects.exists()
+
+    def test_evaluate_rejects_unknown_statistic(self):
+        with pytest.raises(ValueError, match="karma"):
+            WhatIfService().evaluate({"karma": 1})
+
+    def test_cohort(self, population):  # noqa: ARG002
+        result = WhatIfService().cohort("total_tasks_completed", 10, bins=5)
+
+        assert result["qualifying_users"] == 2
+        assert result["total_users"] == 5
+        assert result["histogram"] == [
+            {"lower": 0, "upper": 5, "count": 2},
+            {"lower": 6, "upper": 11, "count": 2},
+            {"lower": 12, "upper": 17, "count": 0},
+            {"lower": 18, "upper": 23, "count": 0},
+            {"lower": 24, "upper": 29, "count": 1},
+        ]
+
+    @pytest.mark.usefixtures("population")
+    def test_cohort_reuses_cached_histogram(self, django_assert_num_queries):
+        service = WhatIfService()
+        service.cohort("total_tasks_completed", 10)
+
+        # Only the indexed count while a slider moves
+        with django_assert_num_queries(1):
+            result = service.cohort("total_tasks_completed", 5)
+
+        assert result["qualifying_users"] == 3
+
+    def test_cohort_needs_indexed_statistic(self):
+        with pytest.raises(ValueError, match="Cohorts"):
+            WhatIfService().cohort("total_xp", 10)
+
+    def test_histogram_without_users(self, db):  # noqa: ARG002
+        assert WhatIfService().cohort("current_level", 2)["histogram"] == []
+
+
+@pytest.mark.django_db
+class TestWhatIfViews:
+    """Test the staff-only what-if endpoints."""
+
+    def test_what_if(self, staff_client, achievement_task_count):
+        response = staff_client.post(
+            reverse("achievements:achievement-what-if"),
+            {"stats": {"total_tasks_completed": 1}, "windows": [{"window": "tasks_completed", "days": 7, "total": 3}]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]["achievement_id"] == str(achievement_task_count.id)
+        assert response.data[0]["is_unlocked"]
+
+    def test_what_if_rejects_unknown_statistic(self, staff_client):
+        response = staff_client.post(reverse("achievements:achievement-what-if"), {"stats": {"karma": 1}}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.usefixtures("population")
+    def test_cohort(self, staff_client):
+        response = staff_client.get(reverse("achievements:achievement-cohort"), {"stat": "total_tasks_completed", "threshold": 9})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["qualifying_users"] == 3
+
+    def test_staff_only(self, authenticated_client):
+        assert authenticated_client.post(reverse("achievements:achievement-what-if"), {"stats": {}}, format="json").status_code == (
+            status.HTTP_403_FORBIDDEN
+        )
+        assert authenticated_client.get(reverse("achievements:achievement-cohort")).status_code == status.HTTP_403_FORBIDDEN
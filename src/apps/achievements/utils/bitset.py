@@ -0,0 +1,81 @@
+"""Compact set of achievement ordinals."""
+
+from collections.abc import Iterable
+
+
+class AchievementBitset:
+    """
+    Immutable set of achievement ordinals stored as a bit string.
+
+    Bit ``n`` (byte ``n // 8``, bit ``n % 8``) is set when the achievement
+    with ordinal ``n`` is in the set, so membership is a shift and a mask and
+    a catalog of 2,000 achievements fits in 250 bytes.
+    """
+
+    __slots__ = ("_bits", "_count")
+
+    def __init__(self, data: bytes = b"") -> None:
+        """
+        Initialize the AchievementBitset.
+
+        Args:
+            data: Little-endian bit string as produced by to_bytes
+        """
+        self._bits = int.from_bytes(data, "little")
+        self._count = self._bits.bit_count()
+
+    @classmethod
+    def from_ordinals(cls, ordinals: Iterable[int]) -> "AchievementBitset":
+        """Build a bitset containing the given ordinals."""
+        bits = 0
+        for ordinal in ordinals:
+            bits |= 1 << ordinal
+        return cls._from_int(bits)
+
+    def __contains__(self, ordinal: object) -> bool:
+        """Whether an ordinal is in the set."""
+        return isinstance(ordinal, int) and ordinal >= 0 and bool(self._bits >> ordinal & 1)
+
+    def __len__(self) -> int:
+        """Count the ordinals in the set."""
+        return self._count
+
+    def __eq__(self, other: object) -> bool:
+        """Compare by content."""
+        return isinstance(other, AchievementBitset) and self._bits == other._bits
+
+    def __hash__(self) -> int:
+        """Hash by content."""
+        return hash(self._bits)
+
+    def __reduce__(self) -> tuple:
+        """Pickle as the byte string."""
+        return (AchievementBitset, (self.to_bytes(),))
+
+    def __repr__(self) -> str:
+        """Represent the bitset by its ordinals."""
+        return f"AchievementBitset({sorted(self.ordinals())})"
+
+    def with_ordinal(self, ordinal: int) -> "AchievementBitset":
+        """Return a copy with an ordinal added."""
+        return self._from_int(self._bits | 1 << ordinal)
+
+    def without_ordinal(self, ordinal: int) -> "AchievementBitset":
+        """Return a copy with an ordinal removed."""
+        return self._from_int(self._bits & ~(1 << ordinal))
+
+    def ordinals(self) -> list[int]:
+        """List the ordinals in the set."""
+        return [ordinal for ordinal in range(self._bits.bit_length()) if self._bits >> ordinal & 1]
+
+    def to_bytes(self) -> bytes:
+        """Encode the set as a little-endian bit string with no trailing zero bytes."""
+        return self._bits.to_bytes((self._bits.bit_length() + 7) // 8, "little")
+
+    @classmethod
+    def _from_int(cls, bits: int) -> "AchievementBitset":
+        """Build a bitset from its integer representation."""
+        bitset = cls.__new__(cls)
+        bitset._bits = bits  # noqa: SLF001
+        bitset._count = bits.bit_count()  # noqa: SLF001
+        return bitset
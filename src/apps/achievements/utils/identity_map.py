@@ -0,0 +1,209 @@
+"""Identity map - One fetch per object per request or Celery task."""
+
+import logging
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+
+from celery.signals import task_postrun, task_prerun
+from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.achievements.signals import statistics_updated
+
+
+logger = logging.getLogger(__name__)
+
+# Cached "does not exist" results, so a missing object is not queried again either
+_MISSING = object()
+# Model of the statistics snapshots (not imported, managers use this module)
+STATISTICS_MODEL = "achievements.UserStatistics"
+
+_current: ContextVar["IdentityMap | None"] = ContextVar("achievements_identity_map", default=None)
+# Tokens restoring the context of running Celery tasks, keyed by task ID
+_task_tokens: dict[str, Token] = {}
+
+
+class IdentityMap:
+    """
+    Objects loaded during one unit of work (a request or a Celery task), keyed by identity.
+
+    Services and managers look objects up through ``get_object`` so that a
+    user or achievement read by several steps of the same request is fetched
+    once and the steps share the instance. Entries are evicted when the object
+    is saved or deleted, and the map is dropped when the unit of work ends, so
+    nothing outlives the request that loaded it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the IdentityMap."""
+        self._entries: dict[Hashable, object] = {}
+
+    def get(self, model: type[models.Model], pk: object) -> models.Model:
+        """
+        Get an object by primary key, fetching it on first use.
+
+        Args:
+            model: Model class
+            pk: Primary key, in any form the model's primary key field accepts (e.g. a UUID string)
+
+        Returns:
+            Model instance
+
+        Raises:
+            model.DoesNotExist: If there is no such object
+        """
+        key = _key(model, pk)
+        if key not in self._entries:
+            self._entries[key] = model._default_manager.filter(pk=key[1]).first() or _MISSING  # noqa: SLF001
+        instance = self._entries[key]
+        if instance is _MISSING:
+            msg = f"{model.__name__} matching query does not exist."
+            raise model.DoesNotExist(msg)
+        return instance
+
+    def get_or_load(self, key: Hashable, load: Callable[[], object]) -> object:
+        """
+        Get a value derived from the database by key, loading it on first use.
+
+        Args:
+            key: Cache key (see the *_key helpers)
+            load: Loads the value on a miss
+
+        Returns:
+            The cached or loaded value
+        """
+        if key not in self._entries:
+            self._entries[key] = load()
+        return self._entries[key]
+
+    def add(self, instance: models.Model) -> None:
+        """Remember an instance the unit of work created or loaded by other means."""
+        self._entries[_key(type(instance), instance.pk)] = instance
+
+    def evict(self, key: Hashable) -> None:
+        """Forget an entry."""
+        self._entries.pop(key, None)
+
+    def discard(self, instance: models.Model) -> None:
+        """Forget a saved or deleted object, unless the mapped instance is the one that was saved."""
+        key = _key(type(instance), instance.pk)
+        if self._entries.get(key) is not instance:
+            self.evict(key)
+
+    def __len__(self) -> int:
+        """Get the number of entries."""
+        return len(self._entries)
+
+
+def get_identity_map() -> IdentityMap | None:
+    """
+    Get the identity map of the current unit of work.
+
+    Returns:
+        IdentityMap, or None outside a request or task
+    """
+    return _current.get()
+
+
+@contextmanager
+def unit_of_work() -> Iterator[IdentityMap]:
+    """
+    Run a block as one unit of work with its own identity map, or join the enclosing one.
+
+    Yields:
+        IdentityMap of the unit of work
+    """
+    identity_map = _current.get()
+    if identity_map is not None:
+        yield identity_map
+        return
+
+    token = _current.set(IdentityMap())
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+
+def get_object(model: type[models.Model], pk: object) -> models.Model:
+    """
+    Get an object through the current identity map, or straight from the database outside a unit of work.
+
+    Args:
+        model: Model class
+        pk: Primary key
+
+    Returns:
+        Model instance
+
+    Raises:
+        model.DoesNotExist: If there is no such object
+    """
+    identity_map = _current.get()
+    if identity_map is None:
+        return model._default_manager.get(pk=pk)  # noqa: SLF001
+    return identity_map.get(model, pk)
+
+
+def object_exists(model: type[models.Model], pk: object) -> bool:
+    """Check an object exists, loading it into the current identity map for the caller's next lookup."""
+    try:
+        get_object(model, pk)
+    except model.DoesNotExist:
+        return False
+    return True
+
+
+def get_or_load(key: Hashable, load: Callable[[], object]) -> object:
+    """Get a value through the current identity map, or load it outside a unit of work."""
+    identity_map = _current.get()
+    if identity_map is None:
+        return load()
+    return identity_map.get_or_load(key, load)
+
+
+def statistics_key(user_id: int) -> tuple:
+    """Get the identity map key of a user's statistics snapshot."""
+    return ("statistics", int(user_id))
+
+
+def _key(model: type[models.Model], pk: object) -> tuple[str, object]:
+    """Get the identity map key of an object, normalizing the primary key."""
+    return model._meta.label, model._meta.pk.to_python(pk)  # noqa: SLF001
+
+
+@receiver([post_save, post_delete])
+def _evict_saved(*, sender: type[models.Model], instance: models.Model, **kwargs) -> None:
+    """Forget objects saved or deleted during the unit of work, other than the mapped instance itself."""
+    identity_map = _current.get()
+    if identity_map is None:
+        return
+    identity_map.discard(instance)
+    if sender._meta.label == STATISTICS_MODEL:  # noqa: SLF001
+        identity_map.evict(statistics_key(instance.user_id))
+
+
+@receiver(statistics_updated)
+def _evict_statistics(*, user_ids: list[int], **kwargs) -> None:
+    """Forget statistics changed by UPDATE statements."""
+    identity_map = _current.get()
+    if identity_map is not None:
+        for user_id in user_ids:
+            identity_map.evict(statistics_key(user_id))
+
+
+@task_prerun.connect
+def _start_task(*, task_id: str, **kwargs) -> None:
+    """Give every Celery task its own identity map (eager tasks join the caller's unit of work)."""
+    if _current.get() is None:
+        _task_tokens[task_id] = _current.set(IdentityMap())
+
+
+@task_postrun.connect
+def _end_task(*, task_id: str, **kwargs) -> None:
+    """Drop the task's identity map."""
+    token = _task_tokens.pop(task_id, None)
+    if token is not None:
+        _current.reset(token)
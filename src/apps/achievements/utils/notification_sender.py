@@ -35,6 +35,30 @@ class NotificationSender:
 
         self._send_notification(payload)
 
+    def send_achievement_notifications(self, user_ids: list[int], achievement_name: str, description: str) -> None:
+        """
+        Send the achievement unlock notification to many users in one request.
+
+        Args:
+            user_ids: User IDs
+            achievement_name: Achievement name
+            description: Achievement description
+        """
+        payloads = [
+            self._build_notification_payload(
+                user_id=user_id,
+                title=f"🎉 Achievement Unlocked: {achievement_name}!",
+                body=description,
+                notification_type="achievement_unlocked",
+                extra_data={
+                    "achievement_name": achievement_name,
+                },
+            )
+            for user_id in user_ids
+        ]
+
+        self._send_notification_batch(payloads)
+
     def send_progress_notification(self, user_id: int, achievement_name: str, progress: float) -> None:
         """
         Send notification about progress update.
@@ -109,3 +133,26 @@ class NotificationSender:
 
         except Exception:
             logger.exception("Error sending notification: %s")
+
+    def _send_notification_batch(self, payloads: list[dict]) -> None:
+        """
+        Send several notifications to Notification Service in one request.
+
+        Args:
+            payloads: Notification payloads
+        """
+        try:
+            # NOTE: Implement actual HTTP call to Notification Service
+            # For now, just log
+            logger.info("Sending %d notifications", len(payloads))
+
+            # In production:
+            # response = requests.post(
+            #     f"{self.notification_service_url}/api/notifications/send-batch",
+            #     json={"notifications": payloads},
+            #     timeout=5
+            # )
+            # response.raise_for_status()
+
+        except Exception:
+            logger.exception("Error sending %d notifications", len(payloads))
@@ -0,0 +1,71 @@
+"""Achievement progress as integer basis points (1/100 of a percent)."""
+
+from decimal import Decimal
+
+import numpy as np
+
+
+BASIS_POINTS = 10_000
+
+
+def progress_basis_points(current: int, required: int) -> int:
+    """
+    Calculate progress towards a required value.
+
+    Progress is rounded down, so it only reaches 10000 once current >= required.
+
+    Args:
+        current: Current value of the statistic
+        required: Value that completes the achievement
+
+    Returns:
+        Progress in basis points (0 to 10000)
+    """
+    if required <= 0:
+        return BASIS_POINTS
+    return max(0, min(current * BASIS_POINTS // required, BASIS_POINTS))
+
+
+def progress_basis_points_batch(current: np.ndarray, required: np.ndarray) -> np.ndarray:
+    """
+    Calculate progress for every pair of current and required values.
+
+    Args:
+        current: Current values, shape (users,)
+        required: Required values, shape (achievements,)
+
+    Returns:
+        int64 matrix of shape (users, achievements) with progress in basis points,
+        equal to progress_basis_points element-wise
+    """
+    current = np.asarray(current, dtype=np.int64)[:, np.newaxis]
+    required = np.asarray(required, dtype=np.int64)[np.newaxis, :]
+    progress = current * BASIS_POINTS // np.where(required > 0, required, 1)
+    return np.where(required > 0, np.clip(progress, 0, BASIS_POINTS), BASIS_POINTS)
+
+
+def to_basis_points(percentage: Decimal | float) -> int:
+    """
+    Convert a percentage to basis points, clamped to 0-100%.
+
+    Args:
+        percentage: Progress percentage (e.g. Decimal("42.86"))
+
+    Returns:
+        Progress in basis points
+    """
+    basis_points = int((percentage * 100).to_integral_value()) if isinstance(percentage, Decimal) else round(percentage * 100)
+    return max(0, min(basis_points, BASIS_POINTS))
+
+
+def to_percentage(basis_points: int) -> Decimal:
+    """
+    Convert basis points to a percentage with two decimal places.
+
+    Args:
+        basis_points: Progress in basis points
+
+    Returns:
+        Progress percentage as Decimal (e.g. Decimal("42.86"))
+    """
+    return Decimal(basis_points).scaleb(-2)
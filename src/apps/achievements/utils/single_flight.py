@@ -0,0 +1,57 @@
+"""Single-flight - Coalesce concurrent calls for the same key into one computation."""
+
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time within a process.
+
+    The first caller for a key computes the result; callers arriving while it
+    runs block and receive the same result, or the same exception. Once the
+    call finishes the key is forgotten, so later callers compute again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the SingleFlight."""
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], object]) -> object:
+        """
+        Call ``fn`` unless a call for ``key`` is already running, then share its result.
+
+        Args:
+            key: Identifies calls that may share a result
+            fn: Computation to run
+
+        Returns:
+            Result of the call that ran for this key
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a call for ``key`` is currently running."""
+        with self._lock:
+            return key in self._calls
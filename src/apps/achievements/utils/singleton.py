@@ -0,0 +1,66 @@
+"""Process-wide singletons built once, even when several threads ask at the same time."""
+
+import threading
+from collections.abc import Callable, Iterable
+from functools import update_wrapper
+
+from django.core.signals import setting_changed
+
+
+class ProcessSingleton[T]:
+    """
+    Getter returning the one instance its factory builds in this process.
+
+    Works like a ``functools.cache`` getter (including ``cache_clear``), but
+    the factory runs under a lock, so threads racing for the first instance
+    share it instead of each wiring their own. The instance is dropped when
+    one of the settings it was built from is overridden (e.g. in tests).
+    """
+
+    def __init__(self, factory: Callable[[], T], reset_on: Iterable[str] = ()) -> None:
+        """
+        Initialize the ProcessSingleton.
+
+        Args:
+            factory: Builds the instance
+            reset_on: Settings the instance is built from
+        """
+        self.factory = factory
+        self.reset_on = frozenset(reset_on)
+        self._instance: T | None = None
+        self._lock = threading.Lock()
+        update_wrapper(self, factory)
+        setting_changed.connect(self._setting_changed, weak=False)
+
+    def __call__(self) -> T:
+        """Get the instance, building it on first use."""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self.factory()
+                instance = self._instance
+        return instance
+
+    def cache_clear(self) -> None:
+        """Drop the instance, so the next call builds a new one."""
+        with self._lock:
+            self._instance = None
+
+    def _setting_changed(self, *, setting: str, **kwargs) -> None:
+        """Drop the instance when a setting it was built from changes."""
+        if setting in self.reset_on:
+            self.cache_clear()
+
+
+def process_singleton[T](*, reset_on: Iterable[str] = ()) -> Callable[[Callable[[], T]], ProcessSingleton[T]]:
+    """
+    Turn a factory function into a process-wide singleton getter.
+
+    Args:
+        reset_on: Settings the instance is built from
+
+    Returns:
+        Decorator wrapping the factory in a ProcessSingleton
+    """
+    return lambda factory: ProcessSingleton(factory, reset_on)
@@ -0,0 +1,140 @@
+"""Immutable snapshot of a user's statistics."""
+
+from collections.abc import Mapping
+
+from apps.achievements.models import UserStatistics
+
+
+# Every UserStatistics column except the last_updated timestamp
+FIELDS = tuple(
+    field.attname
+    for field in UserStatistics._meta.concrete_fields  # noqa: SLF001
+    if field.attname != "last_updated"
+)
+DEFAULTS = {field.attname: field.get_default() for field in UserStatistics._meta.concrete_fields if field.attname in FIELDS}  # noqa: SLF001
+
+
+class StatsSnapshot:
+    """
+    Read-only copy of a user's statistics, accepted wherever validators and the evaluator take statistics.
+
+    Unlike a UserStatistics instance it needs no model machinery, so it is
+    cheap to build from a ``values()`` row, a cache entry or an event payload,
+    pickles compactly into worker processes, and cannot be saved by accident.
+    Missing statistics take the model's defaults.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, **values: int) -> None:
+        """
+        Initialize the StatsSnapshot.
+
+        Args:
+            **values: Statistic values keyed by UserStatistics field name
+
+        Raises:
+            TypeError: If a value is not a UserStatistics field
+        """
+        unknown = set(values) - set(FIELDS)
+        if unknown:
+            msg = f"Unknown statistics: {sorted(unknown)}"
+            raise TypeError(msg)
+        for name in FIELDS:
+            object.__setattr__(self, name, values.get(name, DEFAULTS[name]))
+
+    @classmethod
+    def from_model(cls, user_stats: UserStatistics) -> "StatsSnapshot":
+        """Build a snapshot of a UserStatistics instance."""
+        return cls(**{name: getattr(user_stats, name) for name in FIELDS})
+
+    @classmethod
+    def from_values(cls, values: Mapping) -> "StatsSnapshot":
+        """Build a snapshot from a ``values()`` row or a cached entry, ignoring keys that are not statistics."""
+        return cls(**{name: values[name] for name in FIELDS if name in values})
+
+    @classmethod
+    def from_event(cls, payload: Mapping, key: str = "statistics") -> "StatsSnapshot":
+        """
+        Build a snapshot from an event payload carrying the statistics after (or before) the event.
+
+        Args:
+            payload: Event payload with 'user_id' and a statistics mapping (see to_dict)
+            key: Payload key of the statistics, e.g. 'previous_statistics' for those before the event
+
+        Returns:
+            StatsSnapshot instance
+
+        Raises:
+            ValueError: If the payload has no statistics
+        """
+        statistics = payload.get(key)
+        if not statistics:
+            msg = f"Event payload has no statistics under {key!r}"
+            raise ValueError(msg)
+        values = {name: int(statistics[name]) for name in FIELDS if statistics.get(name) is not None}
+        values["user_id"] = int(payload.get("user_id", values.get("user_id")))
+        return cls(**values)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Refuse to change a statistic."""
+        msg = f"{type(self).__name__} is immutable, use replace()"
+        raise AttributeError(msg)
+
+    def __delattr__(self, name: str) -> None:
+        """Refuse to delete a statistic."""
+        msg = f"{type(self).__name__} is immutable, use replace()"
+        raise AttributeError(msg)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare by content."""
+        return isinstance(other, StatsSnapshot) and self._values() == other._values()
+
+    def __hash__(self) -> int:
+        """Hash by content."""
+        return hash(self._values())
+
+    def __reduce__(self) -> tuple:
+        """Pickle as the statistics dictionary."""
+        return (_restore, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        """Represent the snapshot by its statistics."""
+        return f"StatsSnapshot({', '.join(f'{name}={getattr(self, name)}' for name in FIELDS)})"
+
+    def replace(self, **changes: int) -> "StatsSnapshot":
+        """Return a copy with some statistics changed."""
+        return StatsSnapshot(**{**self.to_dict(), **changes})
+
+    def to_dict(self) -> dict[str, int]:
+        """Get the statistics as a dictionary keyed by field name, e.g. for a cache entry or event payload."""
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def _values(self) -> tuple:
+        """Get the statistics in field order."""
+        return tuple(getattr(self, name) for name in FIELDS)
+
+
+def _restore(values: dict) -> StatsSnapshot:
+    """Unpickle a snapshot."""
+    return StatsSnapshot(**values)
+
+
+# Statistics accepted by validators and the evaluator
+UserStats = StatsSnapshot | UserStatistics
+
+
+def changed_statistics(old: UserStats | None, new: UserStats) -> frozenset[str]:
+    """
+    Get the statistics that differ between two versions of a user's statistics.
+
+    Args:
+        old: Statistics before the change (None for a user without statistics, compared as the defaults)
+        new: Statistics after the change
+
+    Returns:
+        Names of the changed statistics (user_id is never included)
+    """
+    return frozenset(
+        name for name in FIELDS if name != "user_id" and (DEFAULTS[name] if old is None else getattr(old, name)) != getattr(new, name)
+    )
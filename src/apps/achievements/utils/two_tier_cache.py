@@ -0,0 +1,403 @@
+"""Two-tier cache: a small per-process LRU in front of a shared Redis tier."""
+
+import logging
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import Executor
+
+import redis
+
+from apps.achievements.utils.single_flight import SingleFlight
+
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+EPOCH_STRIPES = 256
+
+
+class LocalTTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a fixed time.
+
+    Attributes:
+        max_entries: Maximum number of entries before the least recently used is evicted
+        ttl: Seconds an entry stays valid
+    """
+
+    def __init__(self, max_entries: int, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize the LocalTTLCache.
+
+        Args:
+            max_entries: Maximum number of entries
+            ttl: Seconds an entry stays valid
+            clock: Monotonic time source
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: object = None) -> object:
+        """Get a live entry, or ``default`` if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: object) -> None:
+        """Store an entry, evicting the least recently used one if full."""
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+class TwoTierCache:
+    """
+    Read-through cache with a per-process LRU tier and a shared Redis tier.
+
+    Every key has a version stamp in Redis that is incremented when the
+    underlying data changes. Values are stored in Redis together with the
+    versions of their key and of the keys they depend on, as they were when
+    the value was loaded, and a value whose stamps do not match the current
+    versions is treated as a miss. A reader that loaded data just before a
+    write therefore cannot publish a stale value over the write, it only
+    produces an entry nobody will accept.
+
+    Misses are coalesced: within a process one thread loads while the others
+    wait for its result, and across processes the loader holds a short Redis
+    lock while the other processes poll for the value it stores. With
+    ``stale_ttl`` set, a value that outlived ``shared_ttl`` but is still
+    current is served for up to ``stale_ttl`` more seconds while a single
+    background refresh reloads it. Values invalidated by a write are never
+    served stale.
+
+    The local tier is invalidated immediately for writes made by this
+    process; entries changed by other processes are served for at most
+    ``local_ttl`` seconds unless something calls ``evict_local`` sooner. If
+    Redis is unavailable the cache degrades to the local tier and the
+    loader, and without a client it only ever uses the local tier.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        client: redis.Redis | None,
+        namespace: str,
+        local_max_entries: int = 1024,
+        local_ttl: float = 2.0,
+        shared_ttl: int = 300,
+        stale_ttl: int = 0,
+        lock_timeout: float = 5.0,
+        refresh_executor: Executor | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the TwoTierCache.
+
+        Args:
+            client: Redis client for the shared tier (None: local tier only)
+            namespace: Prefix for every Redis key
+            local_max_entries: Capacity of the per-process tier
+            local_ttl: Seconds an entry lives in the per-process tier
+            shared_ttl: Seconds an entry is fresh in Redis
+            stale_ttl: Seconds past shared_ttl an entry may be served while it is refreshed
+            lock_timeout: Seconds a loader holds the Redis lock, and other processes wait for it
+            refresh_executor: Runs background refreshes (required when stale_ttl is set)
+            clock: Wall-clock time source shared by all processes
+
+        Raises:
+            ValueError: If stale_ttl is set without a refresh_executor
+        """
+        if stale_ttl and refresh_executor is None:
+            msg = "A refresh_executor is required to serve stale entries"
+            raise ValueError(msg)
+
+        self.client = client
+        self.namespace = namespace
+        self.shared_ttl = shared_ttl
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        self.poll_interval = min(0.05, lock_timeout / 10)
+        self.refresh_executor = refresh_executor
+        self.local = LocalTTLCache(local_max_entries, local_ttl)
+        self._clock = clock
+        self._flights = SingleFlight()
+        self._dependents: dict[str, set[str]] = {}
+        self._dependents_lock = threading.Lock()
+        # Eviction counters striped by key hash. A load only enters the local tier if no key it
+        # involves was evicted while it ran; without Redis they also stand in for version stamps
+        self._epochs = [0] * EPOCH_STRIPES
+
+    def get_or_load(self, key: str, loader: Callable[[], object], depends_on: tuple[str, ...] = ()) -> object:
+        """
+        Get a value, loading and caching it on a miss.
+
+        Values are shared between callers and must not be mutated.
+
+        Args:
+            key: Cache key
+            loader: Callable returning the current value; None results are not cached
+            depends_on: Other keys whose invalidation also invalidates this one
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        epoch = self._epoch((key, *depends_on))
+        if self.client is None:
+            return self._flights.do((key, epoch), lambda: self._load_local(key, loader, depends_on, epoch))
+
+        try:
+            versions, payload = self._read(key, depends_on)
+        except redis.RedisError:
+            logger.warning("Shared cache unavailable, loading %s:%s from source", self.namespace, key)
+            return self._flights.do((key, None), loader)
+
+        entry = self._decode(payload, versions)
+        if entry is not None:
+            fresh_until, value = entry
+            if fresh_until <= self._clock():
+                self._refresh_in_background(key, loader, versions)
+            self._set_local(key, value, depends_on, epoch)
+            return value
+
+        # Callers that saw different versions never share a load, so nobody gets a value older than their read
+        return self._flights.do((key, versions), lambda: self._load(key, loader, versions, depends_on, epoch))
+
+    def invalidate(self, keys: list[str]) -> None:
+        """
+        Mark values as changed in both tiers.
+
+        Args:
+            keys: Cache keys whose underlying data changed
+        """
+        self.evict_local(keys)
+        if self.client is None:
+            return
+
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipeline.incr(self._version_key(key))
+                pipeline.expire(self._version_key(key), self._version_ttl)
+                pipeline.delete(self._data_key(key))
+            pipeline.execute()
+        except redis.RedisError:
+            logger.warning("Shared cache unavailable, could not invalidate %d %s keys", len(keys), self.namespace)
+
+    def evict_local(self, keys: list[str]) -> None:
+        """
+        Drop keys, and values derived from them, from this process's tier only.
+
+        Args:
+            keys: Cache keys changed elsewhere
+        """
+        with self._dependents_lock:
+            evicted = {dependent for key in keys for dependent in self._dependents.pop(key, ())}.union(keys)
+            for key in evicted:
+                self._epochs[hash(key) % EPOCH_STRIPES] += 1
+                self.local.delete(key)
+
+    def clear_local(self) -> None:
+        """Drop every entry from this process's tier."""
+        with self._dependents_lock:
+            self._epochs = [epoch + 1 for epoch in self._epochs]
+            self._dependents.clear()
+            self.local.clear()
+
+    @property
+    def _version_ttl(self) -> int:
+        """Seconds a version stamp outlives the last value stamped with it."""
+        return 2 * (self.shared_ttl + self.stale_ttl)
+
+    def _read(self, key: str, depends_on: tuple[str, ...]) -> tuple[tuple[int, ...], bytes | None]:
+        """Read the current versions of a key and its dependencies, and its stored payload."""
+        *raw_versions, payload = self.client.mget(
+            *(self._version_key(version_key) for version_key in (key, *depends_on)),
+            self._data_key(key),
+        )
+        return tuple(int(raw_version or 0) for raw_version in raw_versions), payload
+
+    def _decode(self, payload: bytes | None, versions: tuple[int, ...]) -> tuple[float, object] | None:
+        """Get (fresh_until, value) from a payload, or None if it is missing or outdated."""
+        if payload is None:
+            return None
+        stored_versions, fresh_until, value = pickle.loads(payload)  # noqa: S301
+        if stored_versions != versions:
+            return None
+        return fresh_until, value
+
+    def _epoch(self, keys: tuple[str, ...]) -> tuple[int, ...]:
+        """Snapshot the eviction counters covering ``keys``."""
+        return tuple(self._epochs[hash(key) % EPOCH_STRIPES] for key in keys)
+
+    def _load(
+        self,
+        key: str,
+        loader: Callable[[], object],
+        versions: tuple[int, ...],
+        depends_on: tuple[str, ...],
+        epoch: tuple[int, ...],
+    ) -> object:
+        """Load a missing value, or wait for the process holding the Redis lock to load it."""
+        token = self._acquire_lock(key)
+        if token is None:
+            value = self._wait_for_value(key, versions, depends_on)
+            if value is not _MISSING:
+                self._set_local(key, value, depends_on, epoch)
+                return value
+
+        try:
+            # The previous lock holder may have stored the value between our read and taking the lock
+            value = self._read_value(key, versions, depends_on)
+            if value is not _MISSING:
+                self._set_local(key, value, depends_on, epoch)
+                return value
+
+            value = loader()
+            if value is not None:
+                self._store(key, value, versions)
+                self._set_local(key, value, depends_on, epoch)
+        finally:
+            if token is not None:
+                self._release_lock(key, token)
+        return value
+
+    def _load_local(self, key: str, loader: Callable[[], object], depends_on: tuple[str, ...], epoch: tuple[int, ...]) -> object:
+        """Load a value into the local tier only."""
+        value = loader()
+        if value is not None:
+            self._set_local(key, value, depends_on, epoch)
+        return value
+
+    def _wait_for_value(self, key: str, versions: tuple[int, ...], depends_on: tuple[str, ...]) -> object:
+        """Poll Redis for the value being loaded elsewhere; _MISSING if it does not show up in time."""
+        deadline = time.monotonic() + self.lock_timeout
+        try:
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                current_versions, payload = self._read(key, depends_on)
+                if current_versions != versions:
+                    # Data changed while waiting, the value being loaded is already outdated
+                    break
+                entry = self._decode(payload, versions)
+                if entry is not None:
+                    return entry[1]
+                if not self.client.exists(self._lock_key(key)):
+                    # The loader finished without storing a value, or gave up
+                    break
+        except redis.RedisError:
+            logger.warning("Shared cache unavailable while waiting for %s:%s", self.namespace, key)
+        return _MISSING
+
+    def _read_value(self, key: str, versions: tuple[int, ...], depends_on: tuple[str, ...]) -> object:
+        """Get the stored value if it is current for ``versions``; _MISSING otherwise."""
+        try:
+            current_versions, payload = self._read(key, depends_on)
+        except redis.RedisError:
+            return _MISSING
+        entry = self._decode(payload, versions) if current_versions == versions else None
+        return _MISSING if entry is None else entry[1]
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], object], versions: tuple[int, ...]) -> None:
+        """Reload a stale value in the background unless another process is already doing it."""
+        token = self._acquire_lock(key)
+        if token is None:
+            return
+
+        def refresh() -> None:
+            try:
+                value = loader()
+                if value is not None:
+                    self._store(key, value, versions)
+                    self.local.delete(key)
+            except Exception:
+                logger.exception("Error refreshing %s:%s", self.namespace, key)
+            finally:
+                self._release_lock(key, token)
+
+        self.refresh_executor.submit(refresh)
+
+    def _store(self, key: str, value: object, versions: tuple[int, ...]) -> None:
+        """Store a value stamped with the versions it was loaded at."""
+        payload = pickle.dumps((versions, self._clock() + self.shared_ttl, value))
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            pipeline.set(self._data_key(key), payload, ex=self.shared_ttl + self.stale_ttl)
+            # Keep the version stamp alive for longer than the value stamped with it, so an
+            # expired and restarted version can never match an old value again
+            pipeline.expire(self._version_key(key), self._version_ttl)
+            pipeline.execute()
+        except redis.RedisError:
+            logger.warning("Shared cache unavailable, not storing %s:%s", self.namespace, key)
+
+    def _set_local(self, key: str, value: object, depends_on: tuple[str, ...], epoch: tuple[int, ...]) -> None:
+        """Store a value in the local tier unless it was evicted since ``epoch``, and remember which keys invalidate it."""
+        with self._dependents_lock:
+            if self._epoch((key, *depends_on)) != epoch:
+                return
+            if len(self._dependents) > self.local.max_entries:
+                # Forget dependencies of long-evicted entries instead of growing forever
+                self._dependents.clear()
+                self.local.clear()
+            for dependency in depends_on:
+                self._dependents.setdefault(dependency, set()).add(key)
+            self.local.set(key, value)
+
+    def _acquire_lock(self, key: str) -> bytes | None:
+        """Take the Redis lock for loading a key; None if another process holds it."""
+        token = uuid.uuid4().hex.encode()
+        try:
+            if self.client.set(self._lock_key(key), token, nx=True, px=int(self.lock_timeout * 1000)):
+                return token
+        except redis.RedisError:
+            logger.warning("Shared cache unavailable, loading %s:%s without a lock", self.namespace, key)
+            return token
+        return None
+
+    def _release_lock(self, key: str, token: bytes) -> None:
+        """Release the Redis lock if it is still ours; an expired lock is left to its new owner."""
+        try:
+            if self.client.get(self._lock_key(key)) == token:
+                self.client.delete(self._lock_key(key))
+        except redis.RedisError:
+            logger.warning("Shared cache unavailable, lock on %s:%s left to expire", self.namespace, key)
+
+    def _version_key(self, key: str) -> str:
+        """Get the Redis key holding a key's version stamp."""
+        return f"{self.namespace}:version:{key}"
+
+    def _data_key(self, key: str) -> str:
+        """Get the Redis key holding a key's value."""
+        return f"{self.namespace}:data:{key}"
+
+    def _lock_key(self, key: str) -> str:
+        """Get the Redis key locking a key while it is loaded."""
+        return f"{self.namespace}:lock:{key}"
@@ -0,0 +1,80 @@
+"""Uncommitted writes - What the open transaction changed, until it commits or rolls back."""
+
+import threading
+import weakref
+from collections.abc import Callable, Hashable, Iterable
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+
+class UncommittedWrites:
+    """
+    Writes made by the current thread's open transaction, looked up by key.
+
+    Each write is registered with a commit hook through ``transaction.on_commit``,
+    which holds the only strong reference to the hook. Committing forgets the
+    write and runs the hook. Rolling back the transaction, or the savepoint the
+    write was made in, makes Django discard the hook, and the write is forgotten
+    as soon as the hook is garbage collected. Outside a transaction the hook runs
+    immediately, so nothing is kept.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the UncommittedWrites."""
+        self._local = threading.local()
+
+    def add(self, keys: Iterable[Hashable], value: object, on_commit: Callable[[], None], using: str = DEFAULT_DB_ALIAS) -> None:
+        """
+        Remember a write until its transaction commits or rolls back.
+
+        Args:
+            keys: Keys the write is looked up by
+            value: Value returned by get for each of the keys
+            on_commit: Called once the transaction commits
+            using: Database alias of the transaction
+        """
+        keys = tuple(keys)
+        writes = self._writes(using)
+        hook = _CommitHook(on_commit)
+        for key in keys:
+            writes.setdefault(key, {})[id(hook)] = value
+        hook.forget = weakref.finalize(hook, _forget, writes, keys, id(hook))
+        transaction.on_commit(hook, using=using)
+
+    def get(self, key: Hashable, using: str = DEFAULT_DB_ALIAS) -> list:
+        """Get the values of the uncommitted writes to a key, in no particular order."""
+        return list(self._writes(using).get(key, {}).values())
+
+    def contains(self, key: Hashable, using: str = DEFAULT_DB_ALIAS) -> bool:
+        """Check whether the open transaction wrote a key."""
+        return key in self._writes(using)
+
+    def _writes(self, using: str) -> dict[Hashable, dict[int, object]]:
+        """Get the current thread's uncommitted writes on a connection, keyed by key and hook."""
+        return vars(self._local).setdefault(using, {})
+
+
+class _CommitHook:
+    """Commit hook of one write, forgetting the write before running the callback."""
+
+    __slots__ = ("__weakref__", "callback", "forget")
+
+    def __init__(self, callback: Callable[[], None]) -> None:
+        """Initialize the _CommitHook."""
+        self.callback = callback
+        self.forget: Callable[[], None] | None = None
+
+    def __call__(self) -> None:
+        """Forget the committed write, then run the callback."""
+        self.forget()
+        self.callback()
+
+
+def _forget(writes: dict[Hashable, dict[int, object]], keys: tuple[Hashable, ...], hook_id: int) -> None:
+    """Remove a write from the uncommitted writes, once committed or rolled back."""
+    for key in keys:
+        values = writes.get(key)
+        if values is not None:
+            values.pop(hook_id, None)
+            if not values:
+                del writes[key]
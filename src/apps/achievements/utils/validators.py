@@ -2,7 +2,8 @@
 
 import logging
 
-from apps.achievements.models import Achievement, UserAchievement
+from apps.achievements.models import Achievement, UnlockedAchievementSet
+from apps.achievements.utils.identity_map import get_object, object_exists
 
 
 logger = logging.getLogger(__name__)
@@ -21,7 +22,7 @@ class AchievementValidator:
         Returns:
             True if achievement exists
         """
-        return Achievement.objects.filter(id=achievement_id).exists()
+        return object_exists(Achievement, achievement_id)
 
     def validate_not_already_unlocked(self, user_id: int, achievement_id: str) -> bool:
         """
@@ -34,11 +35,7 @@ class AchievementValidator:
         Returns:
             True if NOT already unlocked (can be unlocked)
         """
-        return not UserAchievement.objects.filter(
-            user_id=user_id,
-            achievement_id=achievement_id,
-            is_completed=True,
-        ).exists()
+        return not UnlockedAchievementSet.objects.is_unlocked(user_id, achievement_id)
 
     def validate_criteria_format(self, criteria: dict) -> bool:
         """
@@ -71,7 +68,7 @@ class AchievementValidator:
         """
         # Check if achievement exists and is active
         try:
-            achievement = Achievement.objects.get(id=achievement_id)
+            achievement = get_object(Achievement, achievement_id)
             if not achievement.is_active:
                 logger.warning("Achievement %s is not active", achievement_id)
                 return False
@@ -0,0 +1,35 @@
+"""Django admin configuration for Challenge models."""
+
+from django.contrib import admin
+
+from apps.challenges.models import Challenge, ChallengeParticipant, ChallengeTeam
+
+
+@admin.register(Challenge)
+class ChallengeAdmin(admin.ModelAdmin):
+    """Admin for Challenge model."""
+
+    list_display = ["name", "metric", "is_team_challenge", "starts_at", "ends_at", "status", "winner", "winning_team"]
+    list_filter = ["status", "metric", "is_team_challenge"]
+    search_fields = ["name"]
+    readonly_fields = ["id", "winner", "winning_team", "closed_at", "created_at"]
+
+
+@admin.register(ChallengeTeam)
+class ChallengeTeamAdmin(admin.ModelAdmin):
+    """Admin for ChallengeTeam model."""
+
+    list_display = ["name", "challenge", "score", "last_scored_at"]
+    search_fields = ["name", "challenge__name"]
+    readonly_fields = ["score", "last_scored_at"]
+    raw_id_fields = ["challenge"]
+
+
+@admin.register(ChallengeParticipant)
+class ChallengeParticipantAdmin(admin.ModelAdmin):
+    """Admin for ChallengeParticipant model."""
+
+    list_display = ["user", "challenge", "team", "score", "last_scored_at"]
+    search_fields = ["user__username", "challenge__name"]
+    readonly_fields = ["score", "last_scored_at", "joined_at"]
+    raw_id_fields = ["challenge", "user", "team"]
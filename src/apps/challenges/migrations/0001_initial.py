@@ -0,0 +1,131 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:17
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Challenge",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("name", models.CharField(max_length=200)),
+                ("description", models.TextField(blank=True, default="")),
+                (
+                    "metric",
+                    models.CharField(
+                        choices=[("tasks_completed", "Tasks Completed"), ("xp_earned", "XP Earned")],
+                        default="tasks_completed",
+                        max_length=20,
+                    ),
+                ),
+                ("is_team_challenge", models.BooleanField(default=False)),
+                ("starts_at", models.DateTimeField()),
+                ("ends_at", models.DateTimeField()),
+                ("status", models.CharField(choices=[("open", "Open"), ("closed", "Closed")], default="open", max_length=20)),
+                ("closed_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "winner",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="won_challenges",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Challenge",
+                "verbose_name_plural": "Challenges",
+                "ordering": ["-starts_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ChallengeTeam",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=100)),
+                ("score", models.BigIntegerField(default=0)),
+                ("last_scored_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "challenge",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="teams", to="challenges.challenge"),
+                ),
+            ],
+            options={
+                "verbose_name": "Challenge Team",
+                "verbose_name_plural": "Challenge Teams",
+            },
+        ),
+        migrations.CreateModel(
+            name="ChallengeParticipant",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("score", models.BigIntegerField(default=0)),
+                ("last_scored_at", models.DateTimeField(blank=True, null=True)),
+                ("joined_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "challenge",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="participants", to="challenges.challenge"),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="challenge_participations", to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+                (
+                    "team",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="members",
+                        to="challenges.challengeteam",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Challenge Participant",
+                "verbose_name_plural": "Challenge Participants",
+            },
+        ),
+        migrations.AddField(
+            model_name="challenge",
+            name="winning_team",
+            field=models.ForeignKey(
+                blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="+", to="challenges.challengeteam"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="challengeteam",
+            index=models.Index(fields=["challenge", "-score", "last_scored_at"], name="challenge_team_ranking_idx"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="challengeteam",
+            unique_together={("challenge", "name")},
+        ),
+        migrations.AddIndex(
+            model_name="challengeparticipant",
+            index=models.Index(fields=["challenge", "-score", "last_scored_at"], name="challenge_ranking_idx"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="challengeparticipant",
+            unique_together={("challenge", "user")},
+        ),
+        migrations.AddIndex(
+            model_name="challenge",
+            index=models.Index(fields=["status", "ends_at"], name="challenges__status_fffce0_idx"),
+        ),
+    ]
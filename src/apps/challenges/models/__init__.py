@@ -0,0 +1,151 @@
+"""Challenge models package."""
+
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import models
+
+from .managers import ChallengeManager, ChallengeParticipantManager
+
+
+User = get_user_model()
+
+
+class Challenge(models.Model):
+    """
+    A time-boxed competition between users or teams.
+
+    Participant and team scores are running counters updated as task events
+    arrive, so closing a challenge only needs to read the top of the ranking.
+
+    Attributes:
+        id: UUID primary key
+        name: Challenge name
+        description: Detailed description
+        metric: What is scored (completed tasks or earned XP)
+        is_team_challenge: Whether teams compete instead of individuals
+        starts_at: Start of the scoring window
+        ends_at: End of the scoring window
+        status: Open or closed
+        winner: Winning user of an individual challenge
+        winning_team: Winning team of a team challenge
+        closed_at: When the winner was determined
+    """
+
+    class Metric(models.TextChoices):
+        """What participants compete on."""
+
+        TASKS_COMPLETED = "tasks_completed", "Tasks Completed"
+        XP_EARNED = "xp_earned", "XP Earned"
+
+    class Status(models.TextChoices):
+        """Lifecycle of a challenge."""
+
+        OPEN = "open", "Open"
+        CLOSED = "closed", "Closed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=200)
+    description = models.TextField(blank=True, default="")
+    metric = models.CharField(max_length=20, choices=Metric.choices, default=Metric.TASKS_COMPLETED)
+    is_team_challenge = models.BooleanField(default=False)
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.OPEN)
+    winner = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="won_challenges")
+    winning_team = models.ForeignKey("ChallengeTeam", on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    closed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ChallengeManager()
+
+    class Meta:
+        verbose_name = "Challenge"
+        verbose_name_plural = "Challenges"
+        ordering = ["-starts_at"]
+        indexes = [
+            models.Index(fields=["status", "ends_at"]),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Represent the challenge as a string.
+
+        Returns:
+            str: Challenge name and status.
+        """
+        return f"{self.name} ({self.get_status_display()})"
+
+
+class ChallengeTeam(models.Model):
+    """
+    A team competing in a challenge.
+
+    Attributes:
+        challenge: Foreign key to Challenge
+        name: Team name
+        score: Sum of the members' scores, kept as a running counter
+        last_scored_at: When the score last increased (breaks ties)
+    """
+
+    challenge = models.ForeignKey(Challenge, on_delete=models.CASCADE, related_name="teams")
+    name = models.CharField(max_length=100)
+    score = models.BigIntegerField(default=0)
+    last_scored_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Challenge Team"
+        verbose_name_plural = "Challenge Teams"
+        unique_together = [["challenge", "name"]]
+        indexes = [
+            models.Index(fields=["challenge", "-score", "last_scored_at"], name="challenge_team_ranking_idx"),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Represent the team as a string.
+
+        Returns:
+            str: Team name and score.
+        """
+        return f"{self.name}: {self.score}"
+
+
+class ChallengeParticipant(models.Model):
+    """
+    A user taking part in a challenge.
+
+    Attributes:
+        challenge: Foreign key to Challenge
+        user: Foreign key to User
+        team: Team the user plays for (team challenges only)
+        score: Running score within the challenge
+        last_scored_at: When the score last increased (breaks ties)
+        joined_at: When the user joined
+    """
+
+    challenge = models.ForeignKey(Challenge, on_delete=models.CASCADE, related_name="participants")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="challenge_participations")
+    team = models.ForeignKey(ChallengeTeam, on_delete=models.CASCADE, null=True, blank=True, related_name="members")
+    score = models.BigIntegerField(default=0)
+    last_scored_at = models.DateTimeField(null=True, blank=True)
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ChallengeParticipantManager()
+
+    class Meta:
+        verbose_name = "Challenge Participant"
+        verbose_name_plural = "Challenge Participants"
+        unique_together = [["challenge", "user"]]
+        indexes = [
+            models.Index(fields=["challenge", "-score", "last_scored_at"], name="challenge_ranking_idx"),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Represent the participant as a string.
+
+        Returns:
+            str: User, challenge and score.
+        """
+        return f"{self.user} in {self.challenge.name}: {self.score}"
@@ -0,0 +1,52 @@
+"""Custom managers for challenge models."""
+
+from datetime import datetime
+
+from django.db import models
+from django.db.models import F, Window
+from django.db.models.functions import Rank
+
+
+class ChallengeManager(models.Manager):
+    """Custom manager for Challenge model."""
+
+    def get_open_challenges(self) -> models.QuerySet:
+        """Get challenges that have not been closed yet."""
+        return self.filter(status=self.model.Status.OPEN)
+
+    def get_due_for_closing(self, now: datetime) -> models.QuerySet:
+        """
+        Get open challenges whose end time has passed.
+
+        Args:
+            now: Current time
+
+        Returns:
+            QuerySet of challenges
+
+        """
+        return self.filter(status=self.model.Status.OPEN, ends_at__lte=now)
+
+
+class ChallengeParticipantManager(models.Manager):
+    """Custom manager for ChallengeParticipant model."""
+
+    def get_leaderboard(self, challenge_id: str) -> models.QuerySet:
+        """
+        Get the participants of a challenge ranked by score.
+
+        Ties are ordered by who reached the score first; participants with the
+        same score share a rank.
+
+        Args:
+            challenge_id: Challenge UUID
+
+        Returns:
+            QuerySet of participants annotated with 'rank'
+
+        """
+        return (
+            self.filter(challenge_id=challenge_id)
+            .annotate(rank=Window(Rank(), order_by=F("score").desc()))
+            .order_by("-score", "last_scored_at", "id")
+        )
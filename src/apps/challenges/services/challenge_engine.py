@@ -0,0 +1,217 @@
+"""ChallengeEngine - Keeps challenge scores up to date and determines winners."""
+
+import logging
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import F, QuerySet, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from apps.achievements.models import UserStatistics
+from apps.achievements.services.achievement_service import AchievementService, get_achievement_service
+from apps.achievements.signals import statistics_updated
+from apps.challenges.models import Challenge, ChallengeParticipant, ChallengeTeam
+
+
+logger = logging.getLogger(__name__)
+
+RANKING_ORDER = ("-score", "last_scored_at", "id")
+
+
+class ChallengeEngine:
+    """
+    Maintains participant and team scores as running counters.
+
+    Each task event adds its points to the user's open participations and
+    their teams with ``score = score + n`` UPDATEs, so the cost of an event
+    does not depend on the size of the challenge. Closing a challenge reads
+    the top row of the ranking index instead of summing member activity.
+    """
+
+    def __init__(self, achievement_service: AchievementService | None = None) -> None:
+        """
+        Initialize the ChallengeEngine.
+
+        Args:
+            achievement_service: Service used to check achievements of winners (default: the process-wide one)
+        """
+        self.achievement_service = achievement_service or get_achievement_service()
+
+    def join_challenge(self, challenge: Challenge, user_id: int, team: ChallengeTeam | None = None) -> ChallengeParticipant:
+        """
+        Add a user to a challenge.
+
+        Args:
+            challenge: Challenge to join
+            user_id: User ID
+            team: Team to play for (required for team challenges)
+
+        Returns:
+            ChallengeParticipant instance
+
+        Raises:
+            ValueError: If the challenge is closed or the team does not fit the challenge
+        """
+        if challenge.status == Challenge.Status.CLOSED:
+            msg = f"Challenge {challenge.id} is closed"
+            raise ValueError(msg)
+
+        if challenge.is_team_challenge and (team is None or team.challenge_id != challenge.id):
+            msg = f"A team of challenge {challenge.id} is required"
+            raise ValueError(msg)
+
+        if not challenge.is_team_challenge and team is not None:
+            msg = f"Challenge {challenge.id} is not a team challenge"
+            raise ValueError(msg)
+
+        participant, _created = ChallengeParticipant.objects.get_or_create(
+            challenge=challenge,
+            user_id=user_id,
+            defaults={"team": team},
+        )
+        return participant
+
+    def record_task_completed(self, user_id: int, xp_earned: int, occurred_at: datetime | None = None) -> int:
+        """
+        Add a completed task to every challenge the user is scoring in.
+
+        Args:
+            user_id: User ID
+            xp_earned: XP earned with the task
+            occurred_at: When the task was completed (default: timezone.now())
+
+        Returns:
+            Number of participations updated
+        """
+        return self.record_task_completions(user_id, [(occurred_at or timezone.now(), xp_earned)])
+
+    def record_task_completions(self, user_id: int, completions: list[tuple[datetime, int]]) -> int:
+        """
+        Add a batch of completed tasks of one user to the challenges they score in.
+
+        Each completion only counts for challenges whose window contains it,
+        and each participation is updated once for the whole batch.
+
+        Args:
+            user_id: User ID
+            completions: List of (completed_at, xp_earned) tuples
+
+        Returns:
+            Number of participations updated
+        """
+        if not completions:
+            return 0
+
+        first = min(completed_at for completed_at, _xp in completions)
+        last = max(completed_at for completed_at, _xp in completions)
+        participations = ChallengeParticipant.objects.filter(
+            user_id=user_id,
+            challenge__status=Challenge.Status.OPEN,
+            challenge__starts_at__lte=last,
+            challenge__ends_at__gt=first,
+        ).values_list("id", "team_id", "challenge__metric", "challenge__starts_at", "challenge__ends_at")
+
+        updated = 0
+        with transaction.atomic():
+            for participant_id, team_id, metric, starts_at, ends_at in participations:
+                scored = [(completed_at, xp) for completed_at, xp in completions if starts_at <= completed_at < ends_at]
+                amount = len(scored) if metric == Challenge.Metric.TASKS_COMPLETED else sum(xp for _completed_at, xp in scored)
+                if not amount:
+                    continue
+
+                last_scored_at = max(completed_at for completed_at, _xp in scored)
+                updated += ChallengeParticipant.objects.filter(id=participant_id).update(
+                    score=F("score") + amount,
+                    last_scored_at=self._latest(last_scored_at),
+                )
+                if team_id is not None:
+                    ChallengeTeam.objects.filter(id=team_id).update(
+                        score=F("score") + amount,
+                        last_scored_at=self._latest(last_scored_at),
+                    )
+
+        return updated
+
+    def close_challenge(self, challenge_id: str, now: datetime | None = None) -> Challenge:
+        """
+        Close a challenge, record its winner and credit the win to the winners' statistics.
+
+        The winner is the highest score; ties go to whoever reached the score
+        first. In team challenges every member of the winning team wins.
+
+        Args:
+            challenge_id: Challenge UUID
+            now: Closing time (default: timezone.now())
+
+        Returns:
+            Closed Challenge instance
+
+        Raises:
+            ValueError: If the challenge is already closed
+        """
+        with transaction.atomic():
+            challenge = Challenge.objects.select_for_update().get(id=challenge_id)
+            if challenge.status == Challenge.Status.CLOSED:
+                msg = f"Challenge {challenge_id} is already closed"
+                raise ValueError(msg)
+
+            if challenge.is_team_challenge:
+                challenge.winning_team = ChallengeTeam.objects.filter(challenge=challenge, score__gt=0).order_by(*RANKING_ORDER).first()
+                winners = ChallengeParticipant.objects.filter(team=challenge.winning_team) if challenge.winning_team else None
+            else:
+                top = ChallengeParticipant.objects.filter(challenge=challenge, score__gt=0).order_by(*RANKING_ORDER).first()
+                challenge.winner_id = top.user_id if top else None
+                winners = ChallengeParticipant.objects.filter(id=top.id) if top else None
+
+            if winners is not None:
+                UserStatistics.objects.filter(user_id__in=winners.values("user_id")).update(challenges_won=F("challenges_won") + 1)
+                statistics_updated.send(sender=UserStatistics, user_ids=list(winners.values_list("user_id", flat=True)))
+                transaction.on_commit(lambda: self._check_winner_achievements(challenge, winners))
+
+            challenge.status = Challenge.Status.CLOSED
+            challenge.closed_at = now or timezone.now()
+            challenge.save(update_fields=["status", "closed_at", "winner", "winning_team"])
+
+        logger.info("Closed challenge %s (winner: %s, winning team: %s)", challenge.id, challenge.winner_id, challenge.winning_team_id)
+        return challenge
+
+    def close_due_challenges(self, now: datetime | None = None) -> int:
+        """
+        Close every open challenge whose end time has passed.
+
+        Challenges closed meanwhile (by an overlapping run or manually) are skipped.
+
+        Args:
+            now: Current time (default: timezone.now())
+
+        Returns:
+            Number of challenges closed
+        """
+        now = now or timezone.now()
+        closed = 0
+        for challenge_id in list(Challenge.objects.get_due_for_closing(now).values_list("id", flat=True)):
+            try:
+                self.close_challenge(challenge_id, now=now)
+            except ValueError:
+                logger.debug("Challenge %s was closed meanwhile", challenge_id)
+                continue
+            closed += 1
+        return closed
+
+    def _check_winner_achievements(self, challenge: Challenge, winners: QuerySet) -> None:
+        """Check challenge achievements for every winner of a closed challenge."""
+        for user_id in winners.values_list("user_id", flat=True).iterator():
+            self.achievement_service.check_and_unlock_achievements(
+                user_id=user_id,
+                event_type="challenge_won",
+                event_data={"challenge_id": str(challenge.id)},
+            )
+
+    def _latest(self, last_scored_at: datetime) -> Greatest:
+        """
+        Get an expression moving ``last_scored_at`` forward only, so late batches of older completions keep the tie-break.
+
+        GREATEST is NULL on some backends (e.g. SQLite) when an argument is NULL, so a first score compares against itself.
+        """
+        return Greatest(Coalesce(F("last_scored_at"), Value(last_scored_at)), Value(last_scored_at))
@@ -0,0 +1,16 @@
+"""Celery tasks for the challenges app."""
+
+from celery import shared_task
+
+from apps.challenges.services.challenge_engine import ChallengeEngine
+
+
+@shared_task(ignore_result=True)
+def close_due_challenges() -> int:
+    """
+    Close challenges whose end time has passed and record their winners.
+
+    Returns:
+        Number of challenges closed
+    """
+    return ChallengeEngine().close_due_challenges()
@@ -0,0 +1,176 @@
+"""Tests for ChallengeEngine."""
+
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.achievements.models import Achievement, UserAchievement, UserStatistics
+from apps.challenges.models import Challenge, ChallengeParticipant, ChallengeTeam
+from apps.challenges.services.challenge_engine import ChallengeEngine
+
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def engine():
+    return ChallengeEngine()
+
+
+@pytest.fixture
+def make_user():
+    def _make_user(username):
+        user = User.objects.create_user(username=username, password="testpass123")
+        UserStatistics.objects.create(user=user)
+        return user
+
+    return _make_user
+
+
+@pytest.fixture
+def make_challenge():
+    def _make_challenge(**kwargs):
+        now = timezone.now()
+        defaults = {"name": "Sprint", "starts_at": now - timedelta(days=1), "ends_at": now + timedelta(days=1)}
+        return Challenge.objects.create(**(defaults | kwargs))
+
+    return _make_challenge
+
+
+class TestChallengeEngine:
+    """Test incremental scoring and winner determination."""
+
+    def test_task_events_increment_participant_and_team_counters(self, engine, make_user, make_challenge):
+        alice = make_user("alice")
+        challenge = make_challenge(metric=Challenge.Metric.XP_EARNED, is_team_challenge=True)
+        team = ChallengeTeam.objects.create(challenge=challenge, name="Red")
+        engine.join_challenge(challenge, alice.id, team=team)
+
+        engine.record_task_completed(alice.id, xp_earned=50)
+        engine.record_task_completed(alice.id, xp_earned=30)
+
+        assert ChallengeParticipant.objects.get(user=alice).score == 80
+        team.refresh_from_db()
+        assert team.score == 80
+
+    def test_events_outside_the_window_are_ignored(self, engine, make_user, make_challenge):
+        alice = make_user("alice")
+        challenge = make_challenge()
+        engine.join_challenge(challenge, alice.id)
+
+        assert engine.record_task_completed(alice.id, xp_earned=50, occurred_at=challenge.ends_at) == 0
+        assert ChallengeParticipant.objects.get(user=alice).score == 0
+
+    def test_close_picks_top_score_and_earliest_on_tie(self, engine, make_user, make_challenge):
+        alice, bob, carol = make_user("alice"), make_user("bob"), make_user("carol")
+        challenge = make_challenge()
+        for user in (alice, bob, carol):
+            engine.join_challenge(challenge, user.id)
+
+        now = timezone.now()
+        engine.record_task_completed(bob.id, xp_earned=0, occurred_at=now - timedelta(hours=2))
+        engine.record_task_completed(alice.id, xp_earned=0, occurred_at=now - timedelta(hours=1))
+        engine.record_task_completed(carol.id, xp_earned=0, occurred_at=now)
+
+        closed = engine.close_challenge(challenge.id)
+
+        assert closed.status == Challenge.Status.CLOSED
+        assert closed.winner == bob
+        assert UserStatistics.objects.get(user=bob).challenges_won == 1
+        assert UserStatistics.objects.get(user=alice).challenges_won == 0
+
+    def test_late_older_completions_keep_the_tie_break(self, engine, make_user, make_challenge):
+        alice, bob = make_user("alice"), make_user("bob")
+        challenge = make_challenge(is_team_challenge=True)
+        red = ChallengeTeam.objects.create(challenge=challenge, name="Red")
+        blue = ChallengeTeam.objects.create(challenge=challenge, name="Blue")
+        engine.join_challenge(challenge, alice.id, team=red)
+        engine.join_challenge(challenge, bob.id, team=blue)
+
+        now = timezone.now()
+        engine.record_task_completions(alice.id, [(now - timedelta(minutes=10), 0)])
+        engine.record_task_completions(bob.id, [(now - timedelta(minutes=40), 0), (now - timedelta(minutes=30), 0)])
+        # A late sync of an older completion ties the score but must not make alice look earlier than bob
+        engine.record_task_completions(alice.id, [(now - timedelta(hours=1), 0)])
+
+        red.refresh_from_db()
+        assert ChallengeParticipant.objects.get(user=alice).last_scored_at == red.last_scored_at == now - timedelta(minutes=10)
+        assert engine.close_challenge(challenge.id).winning_team == blue
+
+    def test_team_win_is_credited_to_every_member(self, engine, make_user, make_challenge):
+        challenge = make_challenge(is_team_challenge=True)
+        red = ChallengeTeam.objects.create(challenge=challenge, name="Red")
+        blue = ChallengeTeam.objects.create(challenge=challenge, name="Blue")
+        members = {"alice": red, "bob": red, "carol": blue}
+        users = {}
+        for username, team in members.items():
+            users[username] = make_user(username)
+            engine.join_challenge(challenge, users[username].id, team=team)
+
+        engine.record_task_completed(users["alice"].id, xp_earned=0)
+        engine.record_task_completed(users["bob"].id, xp_earned=0)
+        engine.record_task_completed(users["carol"].id, xp_earned=0)
+
+        closed = engine.close_challenge(challenge.id)
+
+        assert closed.winning_team == red
+        wins = dict(UserStatistics.objects.values_list("user__username", "challenges_won"))
+        assert wins == {"alice": 1, "bob": 1, "carol": 0}
+
+    def test_closing_twice_raises(self, engine, make_challenge):
+        challenge = make_challenge()
+        engine.close_challenge(challenge.id)
+
+        with pytest.raises(ValueError, match="already closed"):
+            engine.close_challenge(challenge.id)
+
+    def test_team_challenge_requires_team(self, engine, make_user, make_challenge):
+        with pytest.raises(ValueError, match="team"):
+            engine.join_challenge(make_challenge(is_team_challenge=True), make_user("alice").id)
+
+    def test_close_due_challenges(self, engine, make_challenge):
+        now = timezone.now()
+        make_challenge(ends_at=now - timedelta(minutes=1))
+        make_challenge(ends_at=now + timedelta(minutes=1))
+
+        assert engine.close_due_challenges(now=now) == 1
+
+    def test_close_due_challenges_skips_challenges_closed_meanwhile(self, engine, make_challenge):
+        now = timezone.now()
+        first = make_challenge(ends_at=now - timedelta(minutes=2))
+        make_challenge(ends_at=now - timedelta(minutes=1))
+        close_challenge = engine.close_challenge
+
+        def close_first_twice(challenge_id, now):
+            # An overlapping run closes the first challenge before this one gets to it
+            if challenge_id == first.id and first.status == Challenge.Status.OPEN:
+                first.status = Challenge.Status.CLOSED
+                close_challenge(challenge_id, now=now)
+            return close_challenge(challenge_id, now=now)
+
+        with mock.patch.object(engine, "close_challenge", close_first_twice):
+            assert engine.close_due_challenges(now=now) == 1
+
+        assert not Challenge.objects.filter(status=Challenge.Status.OPEN).exists()
+
+    def test_winner_unlocks_challenge_achievement(self, engine, make_user, make_challenge, django_capture_on_commit_callbacks):
+        achievement = Achievement.objects.create(
+            name="Champion",
+            description="Win a challenge",
+            criteria={"required_wins": 1},
+            criteria_type=Achievement.CriteriaType.CHALLENGE,
+        )
+        alice = make_user("alice")
+        challenge = make_challenge()
+        engine.join_challenge(challenge, alice.id)
+        engine.record_task_completed(alice.id, xp_earned=0)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            engine.close_challenge(challenge.id)
+
+        assert UserAchievement.objects.get(user=alice, achievement=achievement).is_completed
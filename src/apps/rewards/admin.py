@@ -0,0 +1,25 @@
+"""Django admin configuration for Reward models."""
+
+from django.contrib import admin
+
+from apps.rewards.models import CoinBalanceShard, RewardGrant
+
+
+@admin.register(RewardGrant)
+class RewardGrantAdmin(admin.ModelAdmin):
+    """Admin for RewardGrant model."""
+
+    list_display = ["user", "achievement", "xp", "coins", "created_at"]
+    search_fields = ["user__username", "achievement__name"]
+    readonly_fields = ["created_at"]
+    raw_id_fields = ["user", "achievement"]
+
+
+@admin.register(CoinBalanceShard)
+class CoinBalanceShardAdmin(admin.ModelAdmin):
+    """Admin for CoinBalanceShard model."""
+
+    list_display = ["user", "shard", "balance", "updated_at"]
+    search_fields = ["user__username"]
+    readonly_fields = ["updated_at"]
+    raw_id_fields = ["user"]
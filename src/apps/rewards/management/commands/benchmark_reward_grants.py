@@ -0,0 +1,75 @@
+"""Management command to benchmark coin grants against a single hot user."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.rewards.models import CoinBalanceShard
+from apps.rewards.services.ledger_service import RewardLedgerService
+
+
+User = get_user_model()
+
+BENCHMARK_USERNAME = "reward_benchmark_user"
+
+
+class Command(BaseCommand):
+    """Benchmark concurrent coin grants to one user."""
+
+    help = "Measure coin grants per second when many workers credit the same user"
+
+    def add_arguments(self, parser) -> None:
+        """Add command arguments."""
+        parser.add_argument("--grants", type=int, default=5_000, help="Total number of grants")
+        parser.add_argument("--workers", type=int, default=16, help="Number of concurrent workers")
+        parser.add_argument(
+            "--shards",
+            type=int,
+            nargs="+",
+            default=[1, 8],
+            help="Shard counts to compare (1 is an unsharded balance)",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Handle the command to run the benchmark."""
+        user, _created = User.objects.get_or_create(username=BENCHMARK_USERNAME)
+        grants = options["grants"]
+        workers = options["workers"]
+
+        for shards in options["shards"]:
+            CoinBalanceShard.objects.filter(user=user).delete()
+            ledger = RewardLedgerService(shards=shards)
+
+            elapsed = self._run(ledger, user.id, grants, workers)
+
+            balance = ledger.get_balance(user.id)
+            if balance != grants:
+                self.stderr.write(self.style.ERROR(f"Lost grants with {shards} shards: balance {balance}, expected {grants}"))
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{shards} shard(s): {grants} grants by {workers} workers in {elapsed:.2f}s ({grants / elapsed:,.0f} grants/s)",
+                ),
+            )
+
+        CoinBalanceShard.objects.filter(user=user).delete()
+
+    def _run(self, ledger: RewardLedgerService, user_id: int, grants: int, workers: int) -> float:
+        """Credit one coin ``grants`` times from ``workers`` threads and return the elapsed seconds."""
+
+        def worker(count: int) -> None:
+            try:
+                for _ in range(count):
+                    ledger.credit_coins(user_id, 1)
+            finally:
+                connection.close()
+
+        shares = [grants // workers + (1 if index < grants % workers else 0) for index in range(workers)]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(worker, shares))
+        return time.perf_counter() - started
@@ -0,0 +1,16 @@
+"""Management command to fold sharded coin balances into a single row per user."""
+
+from django.core.management.base import BaseCommand
+
+from apps.rewards.services.ledger_service import RewardLedgerService
+
+
+class Command(BaseCommand):
+    """Fold sharded coin balances into a single row per user."""
+
+    help = "Fold sharded coin balances into a single row per user"
+
+    def handle(self, *args, **options) -> None:
+        """Handle the command to compact coin balances."""
+        compacted = RewardLedgerService().compact_balances()
+        self.stdout.write(self.style.SUCCESS(f"Compacted {compacted} coin balances"))
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("achievements", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CoinBalanceShard",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("shard", models.PositiveSmallIntegerField()),
+                ("balance", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="coin_balance_shards", to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Coin Balance Shard",
+                "verbose_name_plural": "Coin Balance Shards",
+                "constraints": [models.UniqueConstraint(fields=("user", "shard"), name="unique_coin_balance_shard")],
+            },
+        ),
+        migrations.CreateModel(
+            name="RewardGrant",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("xp", models.PositiveIntegerField(default=0)),
+                ("coins", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "achievement",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT, related_name="reward_grants", to="achievements.achievement"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="reward_grants", to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Reward Grant",
+                "verbose_name_plural": "Reward Grants",
+                "ordering": ["-created_at"],
+                "constraints": [models.UniqueConstraint(fields=("user", "achievement"), name="unique_reward_grant_per_achievement")],
+            },
+        ),
+    ]
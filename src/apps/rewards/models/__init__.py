@@ -0,0 +1,87 @@
+"""Reward models package."""
+
+from django.contrib.auth import get_user_model
+from django.db import models
+
+from .managers import CoinBalanceShardManager
+
+
+User = get_user_model()
+
+
+class RewardGrant(models.Model):
+    """
+    Ledger entry for a reward granted to a user.
+
+    There is at most one grant per (user, achievement), which makes granting
+    idempotent: replaying an unlock never credits the reward twice.
+
+    Attributes:
+        user: Foreign key to User
+        achievement: Achievement whose unlock produced the reward
+        xp: XP granted
+        coins: Coins granted
+        created_at: Timestamp of the grant
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="reward_grants")
+    achievement = models.ForeignKey("achievements.Achievement", on_delete=models.PROTECT, related_name="reward_grants")
+    xp = models.PositiveIntegerField(default=0)
+    coins = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Reward Grant"
+        verbose_name_plural = "Reward Grants"
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "achievement"], name="unique_reward_grant_per_achievement"),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Represent the grant as a string.
+
+        Returns:
+            str: User and granted amounts.
+        """
+        return f"{self.user} +{self.coins} coins, +{self.xp} XP"
+
+
+class CoinBalanceShard(models.Model):
+    """
+    One slice of a user's coin balance.
+
+    A balance is split across several rows so that concurrent grants to the
+    same user update different rows instead of queueing on one row lock. The
+    balance is the sum of all shards.
+
+    Attributes:
+        user: Foreign key to User
+        shard: Shard number (0 to REWARDS_BALANCE_SHARDS - 1)
+        balance: Coins held in this shard
+        updated_at: Last update timestamp
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="coin_balance_shards")
+    shard = models.PositiveSmallIntegerField()
+    balance = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = CoinBalanceShardManager()
+
+    class Meta:
+        verbose_name = "Coin Balance Shard"
+        verbose_name_plural = "Coin Balance Shards"
+        constraints = [
+            models.UniqueConstraint(fields=["user", "shard"], name="unique_coin_balance_shard"),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Represent the shard as a string.
+
+        Returns:
+            str: User, shard number and balance.
+        """
+        return f"{self.user} shard {self.shard}: {self.balance} coins"
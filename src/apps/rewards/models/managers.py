@@ -0,0 +1,31 @@
+"""Custom managers for reward models."""
+
+from django.db import models
+from django.db.models import Count, Sum
+
+
+class CoinBalanceShardManager(models.Manager):
+    """Custom manager for CoinBalanceShard model."""
+
+    def get_balance(self, user_id: int) -> int:
+        """
+        Get a user's coin balance by summing all of its shards.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Coin balance
+
+        """
+        return self.filter(user_id=user_id).aggregate(total=Sum("balance", default=0))["total"]
+
+    def get_users_to_compact(self) -> models.QuerySet:
+        """
+        Get users whose balance is spread over more than one shard.
+
+        Returns:
+            QuerySet of user IDs
+
+        """
+        return self.values("user_id").annotate(shards=Count("id")).filter(shards__gt=1).values_list("user_id", flat=True)
@@ -0,0 +1,206 @@
+"""RewardLedgerService - Records reward grants and maintains sharded coin balances."""
+
+import logging
+import random
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.achievements.models import Achievement
+from apps.rewards.models import CoinBalanceShard, RewardGrant
+
+
+logger = logging.getLogger(__name__)
+
+COMPACTED_SHARD = 0
+
+
+class RewardLedgerService:
+    """
+    Grants rewards and keeps each user's coin balance split across shards.
+
+    A grant is recorded once per (user, achievement), so replaying an unlock is
+    a no-op. Coins are added to one randomly chosen shard with a single
+    ``balance = balance + n`` UPDATE, which lets concurrent grants to the same
+    user lock different rows. Reading a balance sums the shards, and
+    ``compact_balances`` periodically folds them back into one row.
+    """
+
+    def __init__(self, shards: int | None = None) -> None:
+        """
+        Initialize the RewardLedgerService.
+
+        Args:
+            shards: Number of shards per balance (default: settings.REWARDS_BALANCE_SHARDS)
+
+        Raises:
+            ValueError: If the number of shards is not positive
+        """
+        self.shards = settings.REWARDS_BALANCE_SHARDS if shards is None else shards
+        if self.shards < 1:
+            msg = f"Balances need at least one shard, got {self.shards}"
+            raise ValueError(msg)
+
+    @transaction.atomic
+    def grant_achievement_reward(self, user_id: int, achievement: Achievement) -> tuple[RewardGrant, bool]:
+        """
+        Record the reward for an achievement and credit its coins.
+
+        Args:
+            user_id: User ID
+            achievement: Unlocked achievement
+
+        Returns:
+            Tuple (grant, created); created is False if the reward was already granted
+        """
+        grant, created = RewardGrant.objects.get_or_create(
+            user_id=user_id,
+            achievement=achievement,
+            defaults={"xp": achievement.reward_xp, "coins": achievement.reward_coins},
+        )
+
+        if not created:
+            logger.info("Reward for achievement %s was already granted to user %s", achievement.id, user_id)
+            return grant, False
+
+        if grant.coins:
+            self.credit_coins(user_id, grant.coins)
+
+        logger.info("Granted rewards to user %s: %d XP, %d coins", user_id, grant.xp, grant.coins)
+        return grant, True
+
+    @transaction.atomic
+    def grant_achievement_rewards(self, user_ids: list[int], achievement: Achievement) -> list[int]:
+        """
+        Record the reward for an achievement for many users and credit their coins.
+
+        Args:
+            user_ids: Users who unlocked the achievement
+            achievement: Unlocked achievement
+
+        Returns:
+            IDs of the users granted the reward now (excludes users already granted it)
+        """
+        # One INSERT ... ON CONFLICT DO NOTHING, so users granted the reward concurrently (e.g. by an
+        # overlapping evaluation or backfill) are skipped by the database and never credited twice
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return []
+        table = connection.ops.quote_name(RewardGrant._meta.db_table)  # noqa: SLF001
+        achievement_id = RewardGrant._meta.get_field("achievement").get_db_prep_value(achievement.id, connection)  # noqa: SLF001
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        rows = [(user_id, achievement_id, achievement.reward_xp, achievement.reward_coins, now) for user_id in user_ids]
+        placeholders = ", ".join(["(%s, %s, %s, %s, %s)"] * len(rows))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (user_id, achievement_id, xp, coins, created_at) VALUES {placeholders} "  # noqa: S608
+                f"ON CONFLICT (user_id, achievement_id) DO NOTHING RETURNING user_id",
+                [value for row in rows for value in row],
+            )
+            inserted = {row[0] for row in cursor.fetchall()}
+
+        new_user_ids = [user_id for user_id in user_ids if user_id in inserted]
+        if achievement.reward_coins:
+            self.credit_coins_many(dict.fromkeys(new_user_ids, achievement.reward_coins))
+
+        logger.info("Granted rewards for achievement %s to %d users", achievement.id, len(new_user_ids))
+        return new_user_ids
+
+    def credit_coins(self, user_id: int, amount: int) -> None:
+        """
+        Add coins to one of the user's balance shards.
+
+        Args:
+            user_id: User ID
+            amount: Number of coins to add
+        """
+        self._add_to_shard(user_id, random.randrange(self.shards), amount)  # noqa: S311
+
+    def credit_coins_many(self, amounts: dict[int, int]) -> None:
+        """
+        Add coins to one balance shard of each of many users in a single statement.
+
+        Args:
+            amounts: Coins to add, by user ID
+        """
+        if not amounts:
+            return
+        table = connection.ops.quote_name(CoinBalanceShard._meta.db_table)  # noqa: SLF001
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        rows = [(user_id, random.randrange(self.shards), amount, now) for user_id, amount in amounts.items()]  # noqa: S311
+        placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(rows))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (user_id, shard, balance, updated_at) VALUES {placeholders} "  # noqa: S608
+                f"ON CONFLICT (user_id, shard) DO UPDATE "
+                f"SET balance = {table}.balance + EXCLUDED.balance, updated_at = EXCLUDED.updated_at",
+                [value for row in rows for value in row],
+            )
+
+    def get_balance(self, user_id: int) -> int:
+        """
+        Get a user's coin balance.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Sum of all balance shards
+        """
+        return CoinBalanceShard.objects.get_balance(user_id)
+
+    def compact_balances(self) -> int:
+        """
+        Fold every multi-shard balance into a single shard.
+
+        Returns:
+            Number of balances compacted
+        """
+        compacted = 0
+        for user_id in CoinBalanceShard.objects.get_users_to_compact().iterator():
+            self.compact_user_balance(user_id)
+            compacted += 1
+
+        if compacted:
+            logger.info("Compacted %d coin balances", compacted)
+        return compacted
+
+    @transaction.atomic
+    def compact_user_balance(self, user_id: int) -> int:
+        """
+        Fold a user's balance shards into shard 0.
+
+        Only the shard rows locked here are folded: a shard a concurrent credit
+        creates meanwhile is left in place for the next compaction, and shard 0
+        is incremented rather than overwritten, so no coins are lost.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Compacted balance
+        """
+        shards = list(CoinBalanceShard.objects.select_for_update().filter(user_id=user_id).order_by("shard"))
+        folded = [shard for shard in shards if shard.shard != COMPACTED_SHARD]
+        if folded:
+            CoinBalanceShard.objects.filter(pk__in=[shard.pk for shard in folded]).delete()
+            self._add_to_shard(user_id, COMPACTED_SHARD, sum(shard.balance for shard in folded))
+        return sum(shard.balance for shard in shards)
+
+    def _add_to_shard(self, user_id: int, shard: int, amount: int) -> None:
+        """Add coins to a shard, creating it if needed."""
+        if self._increment_shard(user_id, shard, amount):
+            return
+
+        try:
+            with transaction.atomic():
+                CoinBalanceShard.objects.create(user_id=user_id, shard=shard, balance=amount)
+        except IntegrityError:
+            # Another grant created the shard first
+            self._increment_shard(user_id, shard, amount)
+
+    def _increment_shard(self, user_id: int, shard: int, amount: int) -> bool:
+        """Add coins to an existing shard; return whether the shard existed."""
+        return bool(CoinBalanceShard.objects.filter(user_id=user_id, shard=shard).update(balance=F("balance") + amount))
@@ -0,0 +1,16 @@
+"""Celery tasks for the rewards app."""
+
+from celery import shared_task
+
+from apps.rewards.services.ledger_service import RewardLedgerService
+
+
+@shared_task(ignore_result=True)
+def compact_coin_balances() -> int:
+    """
+    Fold sharded coin balances into a single row per user.
+
+    Returns:
+        Number of balances compacted
+    """
+    return RewardLedgerService().compact_balances()
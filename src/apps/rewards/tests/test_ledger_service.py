@@ -0,0 +1,115 @@
+"""Tests for RewardLedgerService."""
+
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.achievements.models import Achievement
+from apps.achievements.services.achievement_service import AchievementService
+from apps.rewards.models import CoinBalanceShard, RewardGrant
+from apps.rewards.services.ledger_service import RewardLedgerService
+
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username="rewarded", password="testpass123")
+
+
+@pytest.fixture
+def achievement():
+    return Achievement.objects.create(
+        name="Coin Collector",
+        description="Complete 5 tasks",
+        criteria={"type": "task_count", "target": 5},
+        criteria_type=Achievement.CriteriaType.TASK_COUNT,
+        reward_xp=100,
+        reward_coins=25,
+    )
+
+
+class TestRewardLedgerService:
+    """Test grants, sharded balances and compaction."""
+
+    def test_grant_is_idempotent(self, user, achievement):
+        ledger = RewardLedgerService(shards=4)
+
+        _grant, created = ledger.grant_achievement_reward(user.id, achievement)
+        _grant, created_again = ledger.grant_achievement_reward(user.id, achievement)
+
+        assert created is True
+        assert created_again is False
+        assert RewardGrant.objects.filter(user=user).count() == 1
+        assert ledger.get_balance(user.id) == 25
+
+    def test_bulk_grant_credits_only_inserted_grants(self, user, achievement):
+        ledger = RewardLedgerService(shards=4)
+        other = User.objects.create_user(username="other", password="testpass123")
+        # Granted meanwhile by a concurrent evaluation
+        ledger.grant_achievement_reward(user.id, achievement)
+
+        granted = ledger.grant_achievement_rewards([user.id, other.id, other.id], achievement)
+
+        assert granted == [other.id]
+        assert RewardGrant.objects.filter(achievement=achievement).count() == 2
+        assert ledger.get_balance(user.id) == ledger.get_balance(other.id) == 25
+
+    def test_balance_sums_all_shards(self, user):
+        ledger = RewardLedgerService(shards=4)
+
+        for _ in range(50):
+            ledger.credit_coins(user.id, 2)
+
+        assert ledger.get_balance(user.id) == 100
+        assert 1 < CoinBalanceShard.objects.filter(user=user).count() <= 4
+
+    def test_compaction_folds_shards_into_one_row(self, user):
+        other = User.objects.create_user(username="single_shard", password="testpass123")
+        CoinBalanceShard.objects.bulk_create(
+            [
+                CoinBalanceShard(user=user, shard=1, balance=10),
+                CoinBalanceShard(user=user, shard=3, balance=5),
+                CoinBalanceShard(user=other, shard=0, balance=7),
+            ],
+        )
+        ledger = RewardLedgerService()
+
+        assert ledger.compact_balances() == 1
+        assert list(CoinBalanceShard.objects.filter(user=user).values_list("shard", "balance")) == [(0, 15)]
+        assert ledger.get_balance(other.id) == 7
+
+    def test_compaction_keeps_shards_created_after_locking(self, user):
+        CoinBalanceShard.objects.bulk_create(
+            [CoinBalanceShard(user=user, shard=0, balance=3), CoinBalanceShard(user=user, shard=1, balance=10)],
+        )
+        ledger = RewardLedgerService()
+        select_for_update = CoinBalanceShard.objects.select_for_update
+
+        def lock_then_credit():
+            # A credit commits a new shard after the compaction locked the existing ones
+            locked = list(select_for_update().filter(user=user))
+            CoinBalanceShard.objects.create(user=user, shard=2, balance=4)
+            return mock.Mock(filter=lambda **kwargs: mock.Mock(order_by=lambda *args: locked))
+
+        with mock.patch.object(CoinBalanceShard.objects, "select_for_update", lock_then_credit):
+            assert ledger.compact_user_balance(user.id) == 13
+
+        assert list(CoinBalanceShard.objects.filter(user=user).order_by("shard").values_list("shard", "balance")) == [(0, 13), (2, 4)]
+        assert ledger.get_balance(user.id) == 17
+
+    def test_invalid_shard_count_raises(self):
+        with pytest.raises(ValueError, match="at least one shard"):
+            RewardLedgerService(shards=0)
+
+    def test_unlock_grants_reward_through_ledger(self, user, achievement):
+        service = AchievementService()
+
+        rewards = service._grant_achievement_rewards(user.id, achievement)  # noqa: SLF001
+
+        assert rewards == {"xp": 100, "coins": 25}
+        assert service.reward_ledger.get_balance(user.id) == 25
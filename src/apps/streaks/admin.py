@@ -0,0 +1,25 @@
+"""Django admin configuration for Streak models."""
+
+from django.contrib import admin
+
+from apps.streaks.models import ActivityYear, UserStreak
+
+
+@admin.register(UserStreak)
+class UserStreakAdmin(admin.ModelAdmin):
+    """Admin for UserStreak model."""
+
+    list_display = ["user", "timezone", "last_activity_date", "updated_at"]
+    search_fields = ["user__username"]
+    readonly_fields = ["last_activity_date", "updated_at"]
+    raw_id_fields = ["user"]
+
+
+@admin.register(ActivityYear)
+class ActivityYearAdmin(admin.ModelAdmin):
+    """Admin for ActivityYear model."""
+
+    list_display = ["user", "year"]
+    list_filter = ["year"]
+    search_fields = ["user__username"]
+    raw_id_fields = ["user"]
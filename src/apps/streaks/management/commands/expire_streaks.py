@@ -0,0 +1,41 @@
+"""Management command to reset streaks whose deadline has passed."""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.streaks.services.expiration_scheduler import DEFAULT_BATCH_SIZE, StreakExpirationScheduler
+
+
+class Command(BaseCommand):
+    """Reset streaks whose deadline has passed."""
+
+    help = "Reset streaks whose deadline has passed"
+
+    def add_arguments(self, parser) -> None:
+        """Add command arguments."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Maximum number of users expired per UPDATE",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep running and check for due deadlines every N seconds",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Handle the command to expire streaks."""
+        scheduler = StreakExpirationScheduler(batch_size=options["batch_size"])
+        interval = options["interval"]
+
+        while True:
+            expired = scheduler.process_due()
+            self.stdout.write(self.style.SUCCESS(f"Expired {expired} streaks"))
+
+            if not interval:
+                break
+            time.sleep(interval)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("streaks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userstreak",
+            name="streak_expires_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,78 @@
+"""Streak models package."""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import models
+
+from apps.streaks.utils.day_bitmap import BITMAP_SIZE
+
+from .managers import ActivityYearManager
+
+
+User = get_user_model()
+
+
+class UserStreak(models.Model):
+    """
+    Streak state for a user.
+
+    Attributes:
+        user: OneToOne relationship with User
+        timezone: IANA time zone used to decide which calendar day an activity belongs to
+        last_activity_date: Most recent active day (local to the user)
+        streak_expires_at: Instant when the current streak breaks unless the user is active again
+        updated_at: Last update timestamp
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="streak", primary_key=True)
+    timezone = models.CharField(max_length=64, default=settings.TIME_ZONE, help_text="IANA time zone, e.g. 'Europe/Madrid'")
+    last_activity_date = models.DateField(null=True, blank=True)
+    streak_expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "User Streak"
+        verbose_name_plural = "User Streaks"
+
+    def __str__(self) -> str:
+        """
+        Represent the streak state as a string.
+
+        Returns:
+            str: User and time zone.
+        """
+        return f"Streak for {self.user} ({self.timezone})"
+
+
+class ActivityYear(models.Model):
+    """
+    Active days of a user in one calendar year, stored as a bitmap.
+
+    Bit ``n`` (little-endian) is set when the user was active on day ``n`` of the
+    year (January 1st is bit 0), so a full year takes 46 bytes.
+
+    Attributes:
+        user: Foreign key to User
+        year: Calendar year
+        days: Bitmap of active days
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="activity_years")
+    year = models.PositiveSmallIntegerField()
+    days = models.BinaryField(max_length=BITMAP_SIZE, default=bytes(BITMAP_SIZE))
+
+    objects = ActivityYearManager()
+
+    class Meta:
+        verbose_name = "Activity Year"
+        verbose_name_plural = "Activity Years"
+        unique_together = [["user", "year"]]
+
+    def __str__(self) -> str:
+        """
+        Represent the activity year as a string.
+
+        Returns:
+            str: User and year.
+        """
+        return f"Activity of {self.user} in {self.year}"
@@ -0,0 +1,20 @@
+"""Custom managers for streak models."""
+
+from django.db import models
+
+
+class ActivityYearManager(models.Manager):
+    """Custom manager for ActivityYear model."""
+
+    def get_user_years(self, user_id: int) -> dict[int, bytes]:
+        """
+        Get all activity bitmaps for a user.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Dictionary mapping year to bitmap bytes
+
+        """
+        return {year: bytes(days) for year, days in self.filter(user_id=user_id).values_list("year", "days")}
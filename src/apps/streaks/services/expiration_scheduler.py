@@ -0,0 +1,117 @@
+"""StreakExpirationScheduler - Resets streaks as their deadlines come due."""
+
+import heapq
+import logging
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.achievements.models import UserStatistics
+from apps.achievements.signals import statistics_updated
+from apps.streaks.models import UserStreak
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HORIZON = timedelta(hours=1)
+DEFAULT_BATCH_SIZE = 1_000
+
+
+class StreakExpirationScheduler:
+    """
+    Min-heap of streak deadlines that expires streaks in batches.
+
+    Deadlines are persisted in the indexed ``UserStreak.streak_expires_at``
+    column when activity is recorded, so the heap is only a window over that
+    column: it is filled with deadlines up to ``now + horizon`` using index
+    range scans, and a restart reloads the window instead of scanning every
+    statistics row. The heap is only filled from the database: deadlines
+    written inside the already loaded window (e.g. for backfilled activity
+    days or after a timezone change) are not pushed onto it, so every run
+    also re-reads the overdue deadlines in the same query.
+
+    A heap entry may be stale if the user was active again after it was
+    loaded; the expiration UPDATE re-checks the stored deadline, so stale
+    entries are simply skipped.
+    """
+
+    def __init__(
+        self,
+        horizon: timedelta = DEFAULT_HORIZON,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """
+        Initialize the StreakExpirationScheduler.
+
+        Args:
+            horizon: How far ahead deadlines are loaded into memory
+            batch_size: Maximum number of users expired per UPDATE
+        """
+        self.horizon = horizon
+        self.batch_size = batch_size
+        self._heap: list[tuple[datetime, int]] = []
+        self._loaded_until: datetime | None = None
+
+    def __len__(self) -> int:
+        """Return the number of deadlines currently held in memory."""
+        return len(self._heap)
+
+    def process_due(self, now: datetime | None = None) -> int:
+        """
+        Expire every streak whose deadline has passed.
+
+        Args:
+            now: Current time (default: timezone.now())
+
+        Returns:
+            Number of streaks reset
+        """
+        now = now or timezone.now()
+        self._load_window(now, now + self.horizon)
+
+        # Overdue deadlines may be in the heap twice (loaded with the window and re-read as overdue)
+        due: set[int] = set()
+        while self._heap and self._heap[0][0] <= now:
+            due.add(heapq.heappop(self._heap)[1])
+
+        expired = 0
+        user_ids = sorted(due)
+        for start in range(0, len(user_ids), self.batch_size):
+            expired += self._expire_batch(user_ids[start : start + self.batch_size], now)
+
+        if expired:
+            logger.info("Expired %d streaks", expired)
+        return expired
+
+    def _load_window(self, now: datetime, until: datetime) -> None:
+        """Load persisted deadlines up to ``until`` that are not in memory yet, and every overdue deadline."""
+        deadlines = UserStreak.objects.filter(streak_expires_at__lte=until)
+        if self._loaded_until is not None:
+            overdue = Q(streak_expires_at__lte=now)
+            if until > self._loaded_until:
+                overdue |= Q(streak_expires_at__gt=self._loaded_until)
+            deadlines = deadlines.filter(overdue)
+
+        for user_id, deadline in deadlines.values_list("user_id", "streak_expires_at").iterator(chunk_size=self.batch_size):
+            heapq.heappush(self._heap, (deadline, user_id))
+
+        self._loaded_until = max(until, self._loaded_until or until)
+
+    @transaction.atomic
+    def _expire_batch(self, user_ids: list[int], now: datetime) -> int:
+        """
+        Reset the streaks of a batch of users whose deadline is still due.
+
+        Args:
+            user_ids: Candidate user IDs
+            now: Current time
+
+        Returns:
+            Number of streaks reset
+        """
+        due = UserStreak.objects.filter(user_id__in=user_ids, streak_expires_at__lte=now)
+        UserStatistics.objects.filter(user_id__in=due.values("user_id")).update(current_streak=0)
+        statistics_updated.send(sender=UserStatistics, user_ids=user_ids)
+        return due.update(streak_expires_at=None)
@@ -0,0 +1,213 @@
+"""StreakEngine - Derives streaks from per-year activity day bitmaps."""
+
+import logging
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.achievements.models import UserStatistics
+from apps.achievements.signals import statistics_updated
+from apps.streaks.models import ActivityYear, UserStreak
+from apps.streaks.utils import day_bitmap
+
+
+logger = logging.getLogger(__name__)
+
+
+class StreakEngine:
+    """
+    Records activity days and derives current/longest streaks from them.
+
+    Activity is bucketed into calendar days in the user's own time zone and
+    stored as one bitmap per user-year. Streaks are computed with bit
+    operations over those bitmaps, so late or backfilled events only set a
+    bit and never require rescanning task history.
+    """
+
+    def record_activity(self, user_id: int, occurred_at: datetime) -> dict:
+        """
+        Record an activity at a given instant.
+
+        Args:
+            user_id: User ID
+            occurred_at: Timezone-aware time of the activity
+
+        Returns:
+            Dictionary with activity_date, is_new_day, current_streak and longest_streak
+        """
+        streak = self._get_streak(user_id)
+        activity_date = timezone.localtime(occurred_at, ZoneInfo(streak.timezone)).date()
+        return self.record_activity_day(user_id, activity_date, streak=streak)
+
+    def record_activities(self, user_id: int, occurred_at: list[datetime]) -> dict | None:
+        """
+        Record a batch of activities, such as completions synced by an offline client.
+
+        Each local calendar day in the batch is recorded once.
+
+        Args:
+            user_id: User ID
+            occurred_at: Timezone-aware times of the activities
+
+        Returns:
+            Result of the last recorded day, or None if the batch is empty
+        """
+        streak = self._get_streak(user_id)
+        user_timezone = ZoneInfo(streak.timezone)
+        activity_dates = sorted({timezone.localtime(instant, user_timezone).date() for instant in occurred_at})
+
+        result = None
+        for activity_date in activity_dates:
+            result = self.record_activity_day(user_id, activity_date, streak=streak)
+        return result
+
+    @transaction.atomic
+    def record_activity_day(self, user_id: int, activity_date: date, streak: UserStreak | None = None) -> dict:
+        """
+        Mark a local calendar day as active and refresh the user's streak counters.
+
+        Args:
+            user_id: User ID
+            activity_date: Day of the activity in the user's time zone
+            streak: UserStreak instance, if already loaded
+
+        Returns:
+            Dictionary with activity_date, is_new_day, current_streak and longest_streak
+        """
+        streak = streak or self._get_streak(user_id)
+
+        activity_year, _created = ActivityYear.objects.select_for_update().get_or_create(
+            user_id=user_id,
+            year=activity_date.year,
+        )
+        current_days = bytes(activity_year.days)
+        updated_days = day_bitmap.set_day(current_days, activity_date)
+        is_new_day = updated_days != current_days
+
+        if is_new_day:
+            activity_year.days = updated_days
+            activity_year.save(update_fields=["days"])
+
+        if streak.last_activity_date is None or activity_date > streak.last_activity_date:
+            streak.last_activity_date = activity_date
+            streak.streak_expires_at = self.get_expiration(streak)
+            streak.save(update_fields=["last_activity_date", "streak_expires_at", "updated_at"])
+
+        current_streak, longest_streak = self.calculate_streaks(user_id, today=self._get_today(streak))
+        self._update_statistics(user_id, current_streak, longest_streak)
+
+        logger.debug(
+            "Recorded activity on %s for user %s (new day: %s, streak: %d)",
+            activity_date,
+            user_id,
+            is_new_day,
+            current_streak,
+        )
+
+        return {
+            "activity_date": activity_date,
+            "is_new_day": is_new_day,
+            "current_streak": current_streak,
+            "longest_streak": longest_streak,
+        }
+
+    def calculate_streaks(self, user_id: int, today: date) -> tuple[int, int]:
+        """
+        Calculate current and longest streaks from the stored bitmaps.
+
+        The current streak is the run of active days ending today, or ending
+        yesterday when the user has not been active yet today.
+
+        Args:
+            user_id: User ID
+            today: Current day in the user's time zone
+
+        Returns:
+            Tuple (current_streak, longest_streak)
+        """
+        years = ActivityYear.objects.get_user_years(user_id)
+        if not years:
+            return 0, 0
+
+        # Concatenate the year bitmaps into one bit string indexed by days since origin
+        origin = date(min(years), 1, 1)
+        bits = 0
+        for year, days in years.items():
+            bits |= day_bitmap.to_int(days) << (date(year, 1, 1) - origin).days
+
+        today_position = (today - origin).days
+        current_streak = day_bitmap.run_ending_at(bits, today_position) or day_bitmap.run_ending_at(bits, today_position - 1)
+
+        return current_streak, day_bitmap.longest_run(bits)
+
+    def get_expiration(self, streak: UserStreak) -> datetime | None:
+        """
+        Get the instant when a user's streak breaks if there is no new activity.
+
+        A streak survives the whole day after the last active day, so it
+        expires at local midnight two days after the last activity.
+
+        Args:
+            streak: UserStreak instance
+
+        Returns:
+            Timezone-aware expiration time, or None if the user was never active
+        """
+        if streak.last_activity_date is None:
+            return None
+        expiration_day = streak.last_activity_date + timedelta(days=2)
+        return datetime.combine(expiration_day, time.min, tzinfo=ZoneInfo(streak.timezone))
+
+    def set_timezone(self, user_id: int, timezone_name: str) -> UserStreak:
+        """
+        Set the time zone used to bucket a user's activity into days.
+
+        Args:
+            user_id: User ID
+            timezone_name: IANA time zone name
+
+        Returns:
+            Updated UserStreak instance
+
+        Raises:
+            ValueError: If the time zone is unknown
+        """
+        try:
+            ZoneInfo(timezone_name)
+        except (ZoneInfoNotFoundError, ValueError) as exc:
+            msg = f"Unknown time zone: {timezone_name}"
+            raise ValueError(msg) from exc
+
+        streak = self._get_streak(user_id)
+        streak.timezone = timezone_name
+        streak.streak_expires_at = self.get_expiration(streak)
+        streak.save(update_fields=["timezone", "streak_expires_at", "updated_at"])
+        return streak
+
+    def _get_streak(self, user_id: int) -> UserStreak:
+        """Get or create the streak state for a user."""
+        streak, _created = UserStreak.objects.get_or_create(user_id=user_id)
+        return streak
+
+    def _get_today(self, streak: UserStreak) -> date:
+        """Get the current day in the user's time zone."""
+        return timezone.localtime(timezone.now(), ZoneInfo(streak.timezone)).date()
+
+    def _update_statistics(self, user_id: int, current_streak: int, longest_streak: int) -> None:
+        """Store derived streak counters in UserStatistics."""
+        updated = UserStatistics.objects.filter(user_id=user_id).update(
+            current_streak=current_streak,
+            longest_streak=Greatest(F("longest_streak"), longest_streak),
+        )
+        if updated:
+            statistics_updated.send(sender=UserStatistics, user_ids=[user_id])
+        else:
+            UserStatistics.objects.create(
+                user_id=user_id,
+                current_streak=current_streak,
+                longest_streak=longest_streak,
+            )
@@ -0,0 +1,20 @@
+"""Celery tasks for the streaks app."""
+
+from celery import shared_task
+
+from apps.streaks.services.expiration_scheduler import StreakExpirationScheduler
+
+
+# One scheduler per worker process keeps its heap between runs
+_scheduler = StreakExpirationScheduler()
+
+
+@shared_task(ignore_result=True)
+def expire_streaks() -> int:
+    """
+    Reset streaks whose deadline has passed.
+
+    Returns:
+        Number of streaks reset
+    """
+    return _scheduler.process_due()
@@ -0,0 +1,101 @@
+"""Tests for StreakExpirationScheduler."""
+
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.achievements.models import UserStatistics
+from apps.streaks.models import UserStreak
+from apps.streaks.services.expiration_scheduler import StreakExpirationScheduler
+from apps.streaks.services.streak_engine import StreakEngine
+
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+NOW = datetime(2025, 6, 15, 12, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+def make_streak():
+    def _make_streak(username, expires_at, current_streak=5):
+        user = User.objects.create_user(username=username, password="testpass123")
+        UserStatistics.objects.create(user=user, current_streak=current_streak, longest_streak=current_streak)
+        UserStreak.objects.create(user=user, streak_expires_at=expires_at)
+        return user
+
+    return _make_streak
+
+
+class TestStreakExpirationScheduler:
+    """Test StreakExpirationScheduler batch expiration."""
+
+    def test_only_due_streaks_are_reset(self, make_streak):
+        overdue = make_streak("overdue", NOW - timedelta(hours=3))
+        due_now = make_streak("due_now", NOW)
+        later = make_streak("later", NOW + timedelta(minutes=30))
+
+        expired = StreakExpirationScheduler().process_due(now=NOW)
+
+        assert expired == 2
+        streaks = dict(UserStatistics.objects.values_list("user_id", "current_streak"))
+        assert streaks == {overdue.id: 0, due_now.id: 0, later.id: 5}
+        assert UserStreak.objects.get(user=overdue).streak_expires_at is None
+
+    def test_window_is_loaded_once_and_advanced(self, make_streak, django_assert_num_queries):
+        make_streak("soon", NOW + timedelta(minutes=30))
+        make_streak("far", NOW + timedelta(hours=5))
+        scheduler = StreakExpirationScheduler(horizon=timedelta(hours=1))
+
+        scheduler.process_due(now=NOW)
+        assert len(scheduler) == 1
+
+        # Nothing due: only the newly uncovered ten minutes of the window and the overdue deadlines are queried
+        with django_assert_num_queries(1):
+            scheduler.process_due(now=NOW + timedelta(minutes=10))
+
+        assert scheduler.process_due(now=NOW + timedelta(hours=6)) == 2
+
+    def test_batches_respect_batch_size(self, make_streak, django_assert_num_queries):
+        for index in range(5):
+            make_streak(f"user{index}", NOW - timedelta(minutes=index))
+        scheduler = StreakExpirationScheduler(batch_size=2)
+        scheduler.process_due(now=NOW - timedelta(days=1))
+
+        # One window query, then three batches of two UPDATEs inside a savepoint
+        with django_assert_num_queries(1 + 3 * 4):
+            assert scheduler.process_due(now=NOW) == 5
+
+    def test_deadline_written_inside_loaded_window_expires(self, make_streak):
+        user = make_streak("backfilled", None)
+        scheduler = StreakExpirationScheduler()
+        scheduler.process_due(now=NOW - timedelta(minutes=5))
+
+        # A backfilled activity day writes a deadline the window already covers
+        UserStreak.objects.filter(user=user).update(streak_expires_at=NOW - timedelta(minutes=30))
+
+        assert scheduler.process_due(now=NOW) == 1
+        assert UserStreak.objects.get(user=user).streak_expires_at is None
+        assert UserStatistics.objects.get(user=user).current_streak == 0
+
+    def test_stale_entry_is_skipped_after_new_activity(self, make_streak):
+        user = make_streak("active_again", NOW - timedelta(minutes=1))
+        scheduler = StreakExpirationScheduler()
+        scheduler.process_due(now=NOW - timedelta(minutes=5))
+
+        UserStreak.objects.filter(user=user).update(streak_expires_at=NOW + timedelta(days=1))
+
+        assert scheduler.process_due(now=NOW) == 0
+        assert UserStatistics.objects.get(user=user).current_streak == 5
+
+    def test_recording_activity_sets_deadline_in_user_timezone(self):
+        user = User.objects.create_user(username="tokyo", password="testpass123")
+        engine = StreakEngine()
+        engine.set_timezone(user.id, "Asia/Tokyo")
+
+        engine.record_activity_day(user.id, date(2025, 6, 15))
+
+        # Midnight at the start of June 17th in Tokyo
+        assert UserStreak.objects.get(user=user).streak_expires_at == datetime(2025, 6, 16, 15, 0, tzinfo=UTC)
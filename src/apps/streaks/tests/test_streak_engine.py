@@ -0,0 +1,122 @@
+"""Tests for the bitmap-based StreakEngine."""
+
+from datetime import UTC, date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.achievements.models import UserStatistics
+from apps.streaks.models import ActivityYear, UserStreak
+from apps.streaks.services.streak_engine import StreakEngine
+from apps.streaks.utils import day_bitmap
+
+
+User = get_user_model()
+
+
+class TestDayBitmap:
+    """Test bitmap helpers."""
+
+    def test_full_leap_year_fits_in_bitmap(self):
+        bitmap = bytes(day_bitmap.BITMAP_SIZE)
+        last_day = date(2024, 12, 31)
+
+        bitmap = day_bitmap.set_day(bitmap, last_day)
+
+        assert len(bitmap) == day_bitmap.BITMAP_SIZE
+        assert day_bitmap.to_int(bitmap) == 1 << 365
+
+    def test_run_ending_at(self):
+        bits = 0b0111_0110
+
+        assert day_bitmap.run_ending_at(bits, 6) == 3
+        assert day_bitmap.run_ending_at(bits, 2) == 2
+        assert day_bitmap.run_ending_at(bits, 3) == 0
+        assert day_bitmap.run_ending_at(0b111, 2) == 3
+
+    def test_longest_run(self):
+        assert day_bitmap.longest_run(0) == 0
+        assert day_bitmap.longest_run(0b1011_1100_1110) == 4
+
+
+@pytest.mark.django_db
+class TestStreakEngine:
+    """Test StreakEngine activity recording."""
+
+    @pytest.fixture
+    def engine(self):
+        return StreakEngine()
+
+    @pytest.fixture
+    def user(self):
+        return User.objects.create_user(username="streaker", password="testpass123")
+
+    @pytest.fixture
+    def today(self, settings):
+        return timezone.localtime(timezone.now(), ZoneInfo(settings.TIME_ZONE)).date()
+
+    def test_consecutive_days_build_streak(self, engine, user, today):
+        for offset in range(4, -1, -1):
+            result = engine.record_activity_day(user.id, today - timedelta(days=offset))
+
+        stats = UserStatistics.objects.get(user=user)
+        assert result["current_streak"] == 5
+        assert stats.current_streak == 5
+        assert stats.longest_streak == 5
+
+    def test_same_day_is_counted_once(self, engine, user, today):
+        engine.record_activity_day(user.id, today)
+        result = engine.record_activity_day(user.id, today)
+
+        assert result["is_new_day"] is False
+        assert result["current_streak"] == 1
+
+    def test_streak_survives_until_end_of_next_day(self, engine, user, today):
+        engine.record_activity_day(user.id, today - timedelta(days=2))
+        result = engine.record_activity_day(user.id, today - timedelta(days=1))
+
+        assert result["current_streak"] == 2
+
+    def test_gap_breaks_current_streak_but_keeps_longest(self, engine, user, today):
+        for offset in [10, 9, 8, 0]:
+            result = engine.record_activity_day(user.id, today - timedelta(days=offset))
+
+        assert result["current_streak"] == 1
+        assert result["longest_streak"] == 3
+
+    def test_backfilled_day_joins_two_runs(self, engine, user, today):
+        for offset in [3, 2, 0]:
+            engine.record_activity_day(user.id, today - timedelta(days=offset))
+
+        result = engine.record_activity_day(user.id, today - timedelta(days=1))
+
+        assert result["current_streak"] == 4
+        assert UserStreak.objects.get(user=user).last_activity_date == today
+
+    def test_streak_spans_year_boundary(self, engine, user):
+        for day in [date(2024, 12, 30), date(2024, 12, 31), date(2025, 1, 1)]:
+            engine.record_activity_day(user.id, day)
+
+        assert engine.calculate_streaks(user.id, today=date(2025, 1, 1)) == (3, 3)
+        assert ActivityYear.objects.filter(user=user).count() == 2
+
+    def test_activity_is_bucketed_in_user_timezone(self, engine, user):
+        engine.set_timezone(user.id, "Asia/Tokyo")
+        occurred_at = datetime(2025, 3, 10, 20, 0, tzinfo=UTC)
+
+        result = engine.record_activity(user.id, occurred_at)
+
+        assert result["activity_date"] == date(2025, 3, 11)
+
+    def test_set_unknown_timezone_raises(self, engine, user):
+        with pytest.raises(ValueError, match="Unknown time zone"):
+            engine.set_timezone(user.id, "Mars/Olympus_Mons")
+
+    def test_longest_streak_never_decreases(self, engine, user, today):
+        UserStatistics.objects.create(user=user, longest_streak=40)
+
+        engine.record_activity_day(user.id, today)
+
+        assert UserStatistics.objects.get(user=user).longest_streak == 40
@@ -0,0 +1 @@
+"""Streak utilities package."""
@@ -0,0 +1,99 @@
+"""Bit operations over per-year activity day bitmaps."""
+
+from datetime import date
+
+
+# 366 days fit in 46 bytes (368 bits)
+BITMAP_SIZE = 46
+
+
+def day_index(day: date) -> int:
+    """
+    Get the zero-based position of a day within its year.
+
+    Args:
+        day: Calendar date
+
+    Returns:
+        Day of year starting at 0 (January 1st)
+    """
+    return day.timetuple().tm_yday - 1
+
+
+def to_int(bitmap: bytes) -> int:
+    """
+    Convert a stored bitmap into an integer (bit ``n`` is day ``n``).
+
+    Args:
+        bitmap: Little-endian bitmap bytes
+
+    Returns:
+        Bitmap as integer
+    """
+    return int.from_bytes(bitmap, "little")
+
+
+def to_bytes(bits: int) -> bytes:
+    """
+    Convert an integer bitmap into its stored representation.
+
+    Args:
+        bits: Bitmap as integer
+
+    Returns:
+        Little-endian bitmap bytes of BITMAP_SIZE length
+    """
+    return bits.to_bytes(BITMAP_SIZE, "little")
+
+
+def set_day(bitmap: bytes, day: date) -> bytes:
+    """
+    Mark a day as active in a year bitmap.
+
+    Args:
+        bitmap: Year bitmap
+        day: Day to mark (must belong to the bitmap's year)
+
+    Returns:
+        Updated bitmap
+    """
+    return to_bytes(to_int(bitmap) | (1 << day_index(day)))
+
+
+def run_ending_at(bits: int, position: int) -> int:
+    """
+    Count consecutive set bits ending at ``position`` (inclusive), going backwards.
+
+    Args:
+        bits: Bitmap as integer
+        position: Bit position where the run ends
+
+    Returns:
+        Length of the run (0 if the bit at ``position`` is unset)
+    """
+    if position < 0:
+        return 0
+    window = (1 << (position + 1)) - 1
+    # The highest unset bit at or below ``position`` marks where the run starts
+    gaps = ~bits & window
+    return position + 1 - gaps.bit_length()
+
+
+def longest_run(bits: int) -> int:
+    """
+    Get the length of the longest run of consecutive set bits.
+
+    Each ``bits &= bits >> 1`` step shortens every run by one, so the number
+    of steps until the bitmap is empty equals the longest run.
+
+    Args:
+        bits: Bitmap as integer
+
+    Returns:
+        Longest run length
+    """
+    length = 0
+    while bits:
+        bits &= bits >> 1
+        length += 1
+    return length
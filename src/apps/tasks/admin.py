@@ -0,0 +1,16 @@
+"""Django admin configuration for Task models."""
+
+from django.contrib import admin
+
+from apps.tasks.models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    """Admin for Task model."""
+
+    list_display = ["title", "user", "difficulty", "xp_earned", "completed_at", "created_at"]
+    list_filter = ["difficulty"]
+    search_fields = ["title", "idempotency_key", "user__username"]
+    readonly_fields = ["id", "created_at"]
+    raw_id_fields = ["user"]
@@ -1,4 +1,16 @@
-"""API URLs for tasks app."""
+"""URL configuration for Task API."""
+
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from . import views
+
 
 app_name = "tasks"
-urlpatterns = []
+
+router = DefaultRouter()
+router.register(r"", views.TaskViewSet, basename="task")
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
@@ -0,0 +1,79 @@
+"""ViewSets for Task API endpoints."""
+
+import logging
+
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from apps.achievements.api.mixins import ReplicaReadMixin
+from apps.tasks.models import Task
+from apps.tasks.serializers import BulkTaskCompletionResultSerializer, BulkTaskCompletionSerializer, TaskSerializer
+from apps.tasks.services.task_completion_service import get_task_completion_service
+
+
+logger = logging.getLogger(__name__)
+
+
+class TaskViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for the authenticated user's completed tasks.
+
+    Endpoints:
+        GET    /tasks/                - List completed tasks
+        GET    /tasks/{id}/           - Get task detail
+        POST   /tasks/bulk-complete/  - Record up to 1,000 task completions
+    """
+
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    ordering = ["-completed_at"]
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize the viewset."""
+        super().__init__(*args, **kwargs)
+        self.task_completion_service = get_task_completion_service()
+
+    def get_queryset(self):
+        """Get queryset - only the authenticated user's tasks."""
+        return Task.objects.get_user_tasks(self.request.user.id)
+
+    @action(detail=False, methods=["post"], url_path="bulk-complete")
+    def bulk_complete(self, request) -> Response:
+        """
+        Record a batch of task completions, e.g. when a client syncs after being offline.
+
+        Completions whose idempotency key was already received are ignored, so
+        a client can safely resend a batch after a failed request.
+
+        Request body:
+            {
+                "completions": [
+                    {
+                        "idempotency_key": str,
+                        "title": str (optional),
+                        "difficulty": "easy" | "medium" | "hard" (default: "medium"),
+                        "completed_at": datetime
+                    },
+                    ...
+                ]
+            }
+
+        Returns:
+            Number of completions received, created and ignored as duplicates
+        """
+        serializer = BulkTaskCompletionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        completions = [{**completion, "user_id": request.user.id} for completion in serializer.validated_data["completions"]]
+
+        try:
+            result = self.task_completion_service.complete_tasks(completions)
+        except ValueError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        response_serializer = BulkTaskCompletionResultSerializer(result)
+        return Response(response_serializer.data, status=status.HTTP_200_OK)
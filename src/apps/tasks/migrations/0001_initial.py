@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:18
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Task",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("idempotency_key", models.CharField(max_length=64)),
+                ("title", models.CharField(blank=True, default="", max_length=200)),
+                (
+                    "difficulty",
+                    models.CharField(choices=[("easy", "Easy"), ("medium", "Medium"), ("hard", "Hard")], default="medium", max_length=10),
+                ),
+                ("xp_earned", models.PositiveIntegerField(default=0)),
+                ("completed_at", models.DateTimeField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="tasks", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "verbose_name": "Task",
+                "verbose_name_plural": "Tasks",
+                "ordering": ["-completed_at"],
+                "indexes": [models.Index(fields=["user", "-completed_at"], name="tasks_task_user_id_be4e5d_idx")],
+                "constraints": [models.UniqueConstraint(fields=("user", "idempotency_key"), name="unique_task_idempotency_key")],
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+"""Task models package."""
+
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import models
+
+from .managers import TaskManager
+
+
+User = get_user_model()
+
+
+class Task(models.Model):
+    """
+    A task completed by a user.
+
+    Clients send an idempotency key with every completion; retrying a
+    completion with the same key never counts the task twice.
+
+    Attributes:
+        id: UUID primary key
+        user: Foreign key to User
+        idempotency_key: Client-generated key, unique per user
+        title: Task title
+        difficulty: Task difficulty, which determines the XP earned
+        xp_earned: XP earned by completing the task
+        completed_at: When the task was completed on the client
+        created_at: When the completion was received
+    """
+
+    class Difficulty(models.TextChoices):
+        """Difficulty levels for tasks."""
+
+        EASY = "easy", "Easy"
+        MEDIUM = "medium", "Medium"
+        HARD = "hard", "Hard"
+
+    XP_BY_DIFFICULTY = {
+        Difficulty.EASY: 25,
+        Difficulty.MEDIUM: 50,
+        Difficulty.HARD: 100,
+    }
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="tasks")
+    idempotency_key = models.CharField(max_length=64)
+    title = models.CharField(max_length=200, blank=True, default="")
+    difficulty = models.CharField(max_length=10, choices=Difficulty.choices, default=Difficulty.MEDIUM)
+    xp_earned = models.PositiveIntegerField(default=0)
+    completed_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = TaskManager()
+
+    class Meta:
+        verbose_name = "Task"
+        verbose_name_plural = "Tasks"
+        ordering = ["-completed_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "idempotency_key"], name="unique_task_idempotency_key"),
+        ]
+        indexes = [
+            models.Index(fields=["user", "-completed_at"]),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Represent the task as a string.
+
+        Returns:
+            str: Task title and user.
+        """
+        return f"{self.title or self.idempotency_key} ({self.user})"
@@ -0,0 +1,20 @@
+"""Custom managers for task models."""
+
+from django.db import models
+
+
+class TaskManager(models.Manager):
+    """Custom manager for Task model."""
+
+    def get_user_tasks(self, user_id: int) -> models.QuerySet:
+        """
+        Get the completed tasks of a user, most recent first.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            QuerySet of tasks
+
+        """
+        return self.filter(user_id=user_id).order_by("-completed_at")
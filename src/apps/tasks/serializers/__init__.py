@@ -0,0 +1,64 @@
+"""Serializers for Task API."""
+
+from datetime import datetime
+
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.tasks.models import Task
+from apps.tasks.services.task_completion_service import MAX_BATCH_SIZE
+
+
+class TaskSerializer(serializers.ModelSerializer):
+    """Serializer for Task model."""
+
+    difficulty_display = serializers.CharField(source="get_difficulty_display", read_only=True)
+
+    class Meta:
+        model = Task
+        fields = [
+            "id",
+            "idempotency_key",
+            "title",
+            "difficulty",
+            "difficulty_display",
+            "xp_earned",
+            "completed_at",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+
+class TaskCompletionSerializer(serializers.Serializer):
+    """Serializer for a single task completion sent by a client."""
+
+    idempotency_key = serializers.CharField(max_length=64, help_text="Client-generated key; resending it never counts the task twice")
+    title = serializers.CharField(max_length=200, required=False, allow_blank=True, default="")
+    difficulty = serializers.ChoiceField(choices=Task.Difficulty.choices, default=Task.Difficulty.MEDIUM)
+    completed_at = serializers.DateTimeField()
+
+    def validate_completed_at(self, value: datetime) -> datetime:
+        """Validate completion time is not in the future."""
+        if value > timezone.now():
+            completed_at_error = "Completion time cannot be in the future"
+            raise serializers.ValidationError(completed_at_error)
+        return value
+
+
+class BulkTaskCompletionSerializer(serializers.Serializer):
+    """Serializer for a batch of task completions."""
+
+    completions = TaskCompletionSerializer(
+        many=True,
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        help_text=f"Up to {MAX_BATCH_SIZE} task completions",
+    )
+
+
+class BulkTaskCompletionResultSerializer(serializers.Serializer):
+    """Serializer for the result of a bulk completion."""
+
+    received = serializers.IntegerField()
+    created = serializers.IntegerField()
+    duplicates = serializers.IntegerField()
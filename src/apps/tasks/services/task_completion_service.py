@@ -0,0 +1,154 @@
+"""TaskCompletionService - Ingests batches of task completions."""
+
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+from django.db import transaction
+
+from apps.achievements.models import UserStatistics
+from apps.achievements.services.achievement_service import SERVICE_SETTINGS, get_achievement_service
+from apps.achievements.services.statistics_writer import get_statistics_writer
+from apps.achievements.utils.singleton import process_singleton
+from apps.achievements.utils.stats_snapshot import StatsSnapshot
+from apps.challenges.services.challenge_engine import ChallengeEngine
+from apps.streaks.services.streak_engine import StreakEngine
+from apps.tasks.models import Task
+from apps.xp_management.services.level_recalculation_service import LevelRecalculationService
+
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = 1_000
+
+
+class TaskCompletionService:
+    """
+    Records task completions in bulk and applies their effects once per user.
+
+    Completions are inserted with a single ``INSERT ... ON CONFLICT DO NOTHING``
+    keyed by (user, idempotency_key), so retried or duplicated completions are
+    dropped by the database. Only the rows that were actually inserted count
+    towards statistics, streaks and challenges, and achievements are evaluated
+    once per affected user after the batch commits, against the change of their
+    statistics over the whole batch.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the TaskCompletionService."""
+        self.achievement_service = get_achievement_service()
+        self.challenge_engine = ChallengeEngine(achievement_service=self.achievement_service)
+        self.streak_engine = StreakEngine()
+        self.level_service = LevelRecalculationService()
+        self.statistics_writer = get_statistics_writer()
+
+    @transaction.atomic
+    def complete_tasks(self, completions: list[dict]) -> dict:
+        """
+        Record a batch of task completions.
+
+        Args:
+            completions: List of completion dictionaries
+                {
+                    'user_id': int,
+                    'idempotency_key': str,
+                    'completed_at': datetime,
+                    'title': str (optional),
+                    'difficulty': str (optional, default: 'medium')
+                }
+
+        Returns:
+            Dictionary with received, created and duplicates counts
+
+        Raises:
+            ValueError: If the batch is larger than MAX_BATCH_SIZE
+        """
+        if len(completions) > MAX_BATCH_SIZE:
+            msg = f"Cannot complete more than {MAX_BATCH_SIZE} tasks at once, got {len(completions)}"
+            raise ValueError(msg)
+
+        tasks = [self._build_task(completion) for completion in completions]
+        Task.objects.bulk_create(tasks, ignore_conflicts=True)
+
+        # Conflicting rows keep the ID of the original completion, so only the
+        # IDs generated here that exist now were inserted by this batch
+        created = Task.objects.filter(id__in=[task.id for task in tasks]).values_list("user_id", "completed_at", "xp_earned")
+
+        completed_by_user: dict[int, list[tuple[datetime, int]]] = defaultdict(list)
+        for user_id, completed_at, xp_earned in created:
+            completed_by_user[user_id].append((completed_at, xp_earned))
+
+        if completed_by_user:
+            previous = self._load_statistics(list(completed_by_user))
+            self._apply_statistics(completed_by_user)
+            for user_id, user_completions in completed_by_user.items():
+                self.streak_engine.record_activities(user_id, [completed_at for completed_at, _xp in user_completions])
+                self.challenge_engine.record_task_completions(user_id, user_completions)
+
+            transaction.on_commit(lambda: self._evaluate_achievements(previous))
+
+        created_count = sum(len(user_completions) for user_completions in completed_by_user.values())
+        logger.info(
+            "Recorded %d task completions for %d users (%d duplicates)",
+            created_count,
+            len(completed_by_user),
+            len(tasks) - created_count,
+        )
+
+        return {
+            "received": len(tasks),
+            "created": created_count,
+            "duplicates": len(tasks) - created_count,
+        }
+
+    def _build_task(self, completion: dict) -> Task:
+        """Build an unsaved Task with a pre-generated ID from a completion dictionary."""
+        difficulty = completion.get("difficulty", Task.Difficulty.MEDIUM)
+        return Task(
+            id=uuid.uuid4(),
+            user_id=completion["user_id"],
+            idempotency_key=completion["idempotency_key"],
+            title=completion.get("title", ""),
+            difficulty=difficulty,
+            xp_earned=Task.XP_BY_DIFFICULTY[difficulty],
+            completed_at=completion["completed_at"],
+        )
+
+    def _apply_statistics(self, completed_by_user: dict[int, list[tuple[datetime, int]]]) -> None:
+        """Add task and XP deltas to each user's statistics with one UPDATE per user."""
+        rows = []
+        for user_id, user_completions in completed_by_user.items():
+            stats = self.statistics_writer.increment(
+                user_id,
+                total_tasks_completed=len(user_completions),
+                total_xp=sum(xp for _completed_at, xp in user_completions),
+            )
+            rows.append((user_id, stats.total_xp, stats.current_level))
+
+        # Without a row lock (write-behind) an older total may commit last, so levels are only raised
+        self.level_service.recalculate_chunk(rows, raise_only=True)
+
+    def _load_statistics(self, user_ids: list[int]) -> dict[int, StatsSnapshot]:
+        """Get the statistics of users, including increments buffered by the write-behind writer."""
+        stored = {
+            user_stats.user_id: StatsSnapshot.from_model(user_stats) for user_stats in UserStatistics.objects.filter(user_id__in=user_ids)
+        }
+        return {user_id: self.statistics_writer.merge(stored.get(user_id, StatsSnapshot(user_id=user_id))) for user_id in user_ids}
+
+    def _evaluate_achievements(self, previous: dict[int, StatsSnapshot]) -> None:
+        """Run one achievement evaluation per affected user, covering every statistic the batch changed."""
+        current = self._load_statistics(list(previous))
+        for user_id, old in previous.items():
+            self.achievement_service.stats_changed(user_id, old, current[user_id])
+
+
+@process_singleton(reset_on=(*SERVICE_SETTINGS, "XP_LEVEL_CURVE"))
+def get_task_completion_service() -> TaskCompletionService:
+    """
+    Get the process-wide task completion service.
+
+    Returns:
+        TaskCompletionService instance
+    """
+    return TaskCompletionService()
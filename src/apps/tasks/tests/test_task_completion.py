@@ -0,0 +1,132 @@
+"""Tests for bulk task completion ingestion."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.achievements.models import UserStatistics
+from apps.tasks.models import Task
+from apps.tasks.services.task_completion_service import MAX_BATCH_SIZE, TaskCompletionService
+
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username="offline", password="testpass123")
+
+
+@pytest.fixture
+def service():
+    return TaskCompletionService()
+
+
+def make_completions(user_id, keys, difficulty="medium"):
+    completed_at = timezone.now() - timedelta(hours=1)
+    return [{"user_id": user_id, "idempotency_key": key, "difficulty": difficulty, "completed_at": completed_at} for key in keys]
+
+
+class TestTaskCompletionService:
+    """Test TaskCompletionService.complete_tasks."""
+
+    def test_batch_updates_statistics_once(self, service, user):
+        result = service.complete_tasks(make_completions(user.id, ["a", "b", "c"], difficulty="hard"))
+
+        stats = UserStatistics.objects.get(user=user)
+        assert result == {"received": 3, "created": 3, "duplicates": 0}
+        assert stats.total_tasks_completed == 3
+        assert stats.total_xp == 300
+
+    def test_resent_keys_are_not_counted_twice(self, service, user):
+        service.complete_tasks(make_completions(user.id, ["a", "b"]))
+
+        result = service.complete_tasks(make_completions(user.id, ["b", "c", "c"]))
+
+        assert result == {"received": 3, "created": 1, "duplicates": 2}
+        assert Task.objects.filter(user=user).count() == 3
+        assert UserStatistics.objects.get(user=user).total_tasks_completed == 3
+
+    def test_level_is_recalculated_from_new_xp(self, service, user):
+        UserStatistics.objects.create(user=user, total_xp=980, current_level=1)
+
+        service.complete_tasks(make_completions(user.id, ["a"]))
+
+        assert UserStatistics.objects.get(user=user).current_level == 2
+
+    def test_stale_totals_never_lower_the_level(self, service, user):
+        # A concurrent batch already stored a higher total and level
+        UserStatistics.objects.create(user=user, total_xp=5000, current_level=5)
+
+        service.level_service.recalculate_chunk([(user.id, 1000, 1)], raise_only=True)
+
+        assert UserStatistics.objects.get(user=user).current_level == 5
+
+    def test_one_evaluation_per_user(self, service, user, django_capture_on_commit_callbacks):
+        other = User.objects.create_user(username="other", password="testpass123")
+        completions = make_completions(user.id, ["a", "b", "c"]) + make_completions(other.id, ["a"])
+
+        with (
+            patch.object(service.achievement_service, "stats_changed") as stats_changed,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            service.complete_tasks(completions)
+
+        assert sorted(call.args[0] for call in stats_changed.call_args_list) == [user.id, other.id]
+
+    def test_evaluation_diffs_statistics_over_the_batch(self, service, user, django_capture_on_commit_callbacks):
+        UserStatistics.objects.create(user=user, total_tasks_completed=2, total_xp=100)
+
+        with (
+            patch.object(service.achievement_service, "stats_changed") as stats_changed,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            service.complete_tasks(make_completions(user.id, ["a", "b"]))
+
+        _user_id, old, new = stats_changed.call_args.args
+        assert (old.total_tasks_completed, old.total_xp) == (2, 100)
+        assert (new.total_tasks_completed, new.total_xp) == (4, 200)
+
+    def test_oversized_batch_raises(self, service, user):
+        with pytest.raises(ValueError, match="Cannot complete more than"):
+            service.complete_tasks(make_completions(user.id, [str(i) for i in range(MAX_BATCH_SIZE + 1)]))
+
+
+class TestBulkCompleteEndpoint:
+    """Test POST /tasks/bulk-complete/."""
+
+    @pytest.fixture
+    def client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def test_bulk_complete(self, client, user):
+        completed_at = (timezone.now() - timedelta(days=1)).isoformat()
+        payload = {"completions": [{"idempotency_key": key, "completed_at": completed_at} for key in ["a", "b"]]}
+
+        response = client.post(reverse("tasks:task-bulk-complete"), payload, format="json")
+
+        assert response.status_code == 200
+        assert response.data == {"received": 2, "created": 2, "duplicates": 0}
+        assert UserStatistics.objects.get(user=user).total_tasks_completed == 2
+
+    def test_rejects_more_than_max_batch_size(self, client):
+        completed_at = timezone.now().isoformat()
+        payload = {"completions": [{"idempotency_key": str(i), "completed_at": completed_at} for i in range(MAX_BATCH_SIZE + 1)]}
+
+        response = client.post(reverse("tasks:task-bulk-complete"), payload, format="json")
+
+        assert response.status_code == 400
+
+    def test_requires_authentication(self):
+        response = APIClient().post(reverse("tasks:task-bulk-complete"), {"completions": []}, format="json")
+
+        assert response.status_code == 403
@@ -0,0 +1 @@
+"""Management commands for the xp_management app."""
@@ -0,0 +1,31 @@
+"""Management command to recalculate user levels against the configured level curve."""
+
+from django.core.management.base import BaseCommand
+
+from apps.xp_management.services.level_recalculation_service import DEFAULT_CHUNK_SIZE, LevelRecalculationService
+
+
+class Command(BaseCommand):
+    """Recalculate current_level for all users after a level curve change."""
+
+    help = "Recalculate current_level for all users after a level curve change"
+
+    def add_arguments(self, parser) -> None:
+        """Add command arguments."""
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Number of users processed per chunk",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Handle the command to recalculate levels."""
+        service = LevelRecalculationService()
+        summary = service.recalculate_all(chunk_size=options["chunk_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Scanned {summary['users_scanned']} users: {summary['levels_changed']} levels changed, {summary['level_ups']} level ups",
+            ),
+        )
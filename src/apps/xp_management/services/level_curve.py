@@ -0,0 +1,181 @@
+"""LevelCurve - Precomputed XP thresholds for XP to level conversion."""
+
+from bisect import bisect_right
+from itertools import pairwise
+
+import numpy as np
+from django.conf import settings
+
+from apps.achievements.utils.singleton import process_singleton
+
+
+class LevelCurve:
+    """
+    Cumulative XP threshold table used to convert XP into levels.
+
+    ``thresholds[i]`` is the total XP required to reach level ``i + 1``, so the
+    first threshold is always 0 (level 1). Lookups are a binary search over the
+    table, and batches of XP values are converted with ``numpy.searchsorted``.
+
+    Attributes:
+        thresholds: Tuple of cumulative XP thresholds, strictly increasing
+        max_level: Highest level reachable on this curve
+    """
+
+    def __init__(self, thresholds: list[int] | tuple[int, ...]) -> None:
+        """
+        Initialize the curve from a cumulative threshold table.
+
+        Args:
+            thresholds: Cumulative XP required for each level, starting at 0
+
+        Raises:
+            ValueError: If the table is empty, does not start at 0 or is not strictly increasing
+        """
+        if not thresholds or thresholds[0] != 0:
+            msg = "Level curve thresholds must start at 0"
+            raise ValueError(msg)
+
+        if any(current >= following for current, following in pairwise(thresholds)):
+            msg = "Level curve thresholds must be strictly increasing"
+            raise ValueError(msg)
+
+        self.thresholds = tuple(int(threshold) for threshold in thresholds)
+        self._threshold_array = np.asarray(self.thresholds, dtype=np.int64)
+
+    @property
+    def max_level(self) -> int:
+        """Highest level reachable on this curve."""
+        return len(self.thresholds)
+
+    @classmethod
+    def linear(cls, xp_per_level: int, max_level: int) -> "LevelCurve":
+        """
+        Build a curve where every level costs the same amount of XP.
+
+        Args:
+            xp_per_level: XP required for each level
+            max_level: Highest level on the curve
+
+        Returns:
+            LevelCurve instance
+        """
+        return cls([xp_per_level * level for level in range(max_level)])
+
+    @classmethod
+    def polynomial(cls, base_xp: int, exponent: float, max_level: int) -> "LevelCurve":
+        """
+        Build a curve where reaching level ``n`` requires ``base_xp * (n - 1) ** exponent`` XP.
+
+        Args:
+            base_xp: XP required for level 2
+            exponent: Growth exponent (1.0 is linear)
+            max_level: Highest level on the curve
+
+        Returns:
+            LevelCurve instance
+        """
+        levels = np.arange(max_level, dtype=np.float64)
+        return cls(np.rint(base_xp * levels**exponent).astype(np.int64).tolist())
+
+    @classmethod
+    def from_config(cls, config: dict) -> "LevelCurve":
+        """
+        Build a curve from a configuration dictionary.
+
+        Supported formats:
+            {"type": "linear", "xp_per_level": 1000, "max_level": 1000}
+            {"type": "polynomial", "base_xp": 1000, "exponent": 1.5, "max_level": 100}
+            {"type": "table", "thresholds": [0, 100, 300, 600]}
+
+        Args:
+            config: Curve configuration (see ``settings.XP_LEVEL_CURVE``)
+
+        Returns:
+            LevelCurve instance
+
+        Raises:
+            ValueError: If the curve type is unknown
+        """
+        curve_type = config.get("type", "linear")
+
+        if curve_type == "linear":
+            return cls.linear(config["xp_per_level"], config["max_level"])
+        if curve_type == "polynomial":
+            return cls.polynomial(config["base_xp"], config["exponent"], config["max_level"])
+        if curve_type == "table":
+            return cls(config["thresholds"])
+
+        msg = f"Unknown level curve type: {curve_type}"
+        raise ValueError(msg)
+
+    def level_for_xp(self, total_xp: int) -> int:
+        """
+        Get the level for a total XP amount.
+
+        Args:
+            total_xp: Total XP accumulated
+
+        Returns:
+            Level (1 to max_level)
+        """
+        return max(1, bisect_right(self.thresholds, total_xp))
+
+    def levels_for_xp(self, total_xp: np.ndarray) -> np.ndarray:
+        """
+        Get the levels for an array of total XP amounts.
+
+        Args:
+            total_xp: Array of total XP values
+
+        Returns:
+            Array of levels with the same shape as ``total_xp``
+        """
+        levels = np.searchsorted(self._threshold_array, total_xp, side="right")
+        return np.maximum(levels, 1)
+
+    def xp_for_level(self, level: int) -> int:
+        """
+        Get the total XP required to reach a level.
+
+        Args:
+            level: Target level
+
+        Returns:
+            Cumulative XP required
+
+        Raises:
+            ValueError: If the level is outside the curve
+        """
+        if not 1 <= level <= self.max_level:
+            msg = f"Level {level} is outside the curve (1-{self.max_level})"
+            raise ValueError(msg)
+        return self.thresholds[level - 1]
+
+    def xp_to_next_level(self, total_xp: int) -> int | None:
+        """
+        Get the XP still missing to reach the next level.
+
+        Args:
+            total_xp: Total XP accumulated
+
+        Returns:
+            Remaining XP, or None if the user is already at max level
+        """
+        level = self.level_for_xp(total_xp)
+        if level >= self.max_level:
+            return None
+        return self.thresholds[level] - total_xp
+
+
+@process_singleton(reset_on=("XP_LEVEL_CURVE",))
+def get_level_curve() -> LevelCurve:
+    """
+    Get the level curve configured in ``settings.XP_LEVEL_CURVE``.
+
+    The curve is built once per process and reset when the setting changes.
+
+    Returns:
+        LevelCurve instance
+    """
+    return LevelCurve.from_config(settings.XP_LEVEL_CURVE)
@@ -0,0 +1,134 @@
+"""LevelRecalculationService - Recomputes user levels after a level curve change."""
+
+import logging
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from apps.achievements.events.publishers import EventPublisher
+from apps.achievements.models import UserStatistics
+from apps.achievements.signals import statistics_updated
+from apps.xp_management.services.level_curve import LevelCurve, get_level_curve
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+class LevelRecalculationService:
+    """
+    Recomputes ``UserStatistics.current_level`` for every user against a level curve.
+
+    Users are read in primary key order, one chunk at a time, and each chunk is
+    converted with a single vectorized lookup. Only rows whose level changed are
+    written, and a ``level_up`` event is published for users that moved up.
+    """
+
+    def __init__(
+        self,
+        curve: LevelCurve | None = None,
+        event_publisher: EventPublisher | None = None,
+    ) -> None:
+        """
+        Initialize the LevelRecalculationService.
+
+        Args:
+            curve: Level curve to apply (default: configured curve)
+            event_publisher: Publisher for level_up events
+        """
+        self.curve = curve or get_level_curve()
+        self.event_publisher = event_publisher or EventPublisher()
+
+    def recalculate_all(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+        """
+        Recalculate levels for all users.
+
+        Args:
+            chunk_size: Number of statistics rows processed per chunk
+
+        Returns:
+            Dictionary with users_scanned, levels_changed and level_ups counts
+        """
+        summary = {"users_scanned": 0, "levels_changed": 0, "level_ups": 0}
+        last_user_id = 0
+
+        while True:
+            rows = list(
+                UserStatistics.objects.filter(user_id__gt=last_user_id)
+                .order_by("user_id")
+                .values_list("user_id", "total_xp", "current_level")[:chunk_size],
+            )
+            if not rows:
+                break
+
+            changed, level_ups = self.recalculate_chunk(rows)
+
+            summary["users_scanned"] += len(rows)
+            summary["levels_changed"] += changed
+            summary["level_ups"] += level_ups
+            last_user_id = rows[-1][0]
+
+            logger.debug("Recalculated levels up to user %s (%d changed)", last_user_id, changed)
+
+        logger.info(
+            "Level recalculation complete: %d users scanned, %d levels changed, %d level ups",
+            summary["users_scanned"],
+            summary["levels_changed"],
+            summary["level_ups"],
+        )
+        return summary
+
+    @transaction.atomic
+    def recalculate_chunk(self, rows: list[tuple[int, int, int]], *, raise_only: bool = False) -> tuple[int, int]:
+        """
+        Recalculate and persist levels for one chunk of users.
+
+        Args:
+            rows: List of (user_id, total_xp, current_level) tuples
+            raise_only: Only raise levels, never below the stored level (for XP just earned, where a
+                concurrent writer may have stored a higher total and level first)
+
+        Returns:
+            Tuple (number of levels changed, number of level ups)
+        """
+        data = np.asarray(rows, dtype=np.int64)
+        user_ids, total_xp, old_levels = data[:, 0], data[:, 1], data[:, 2]
+
+        new_levels = self.curve.levels_for_xp(total_xp)
+        changed = new_levels > old_levels if raise_only else new_levels != old_levels
+        if not changed.any():
+            return 0, 0
+
+        user_ids, old_levels, new_levels = user_ids[changed], old_levels[changed], new_levels[changed]
+
+        # One set-based UPDATE per distinct target level in the chunk
+        for level in np.unique(new_levels):
+            current_level = Greatest(F("current_level"), int(level)) if raise_only else int(level)
+            UserStatistics.objects.filter(user_id__in=user_ids[new_levels == level].tolist()).update(current_level=current_level)
+        statistics_updated.send(sender=UserStatistics, user_ids=user_ids.tolist())
+
+        leveled_up = new_levels > old_levels
+        level_ups = [
+            (int(user_id), int(old_level), int(new_level))
+            for user_id, old_level, new_level in zip(
+                user_ids[leveled_up],
+                old_levels[leveled_up],
+                new_levels[leveled_up],
+                strict=True,
+            )
+        ]
+        transaction.on_commit(lambda: self._publish_level_ups(level_ups))
+
+        return int(changed.sum()), len(level_ups)
+
+    def _publish_level_ups(self, level_ups: list[tuple[int, int, int]]) -> None:
+        """Publish a level_up event for each (user_id, old_level, new_level)."""
+        for user_id, old_level, new_level in level_ups:
+            self.event_publisher.publish_level_up(
+                user_id=user_id,
+                old_level=old_level,
+                new_level=new_level,
+            )
@@ -0,0 +1,109 @@
+"""Tests for LevelCurve and LevelRecalculationService."""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.achievements.models import UserStatistics
+from apps.xp_management.services.level_curve import LevelCurve, get_level_curve
+from apps.xp_management.services.level_recalculation_service import LevelRecalculationService
+
+
+User = get_user_model()
+
+
+class TestLevelCurve:
+    """Test LevelCurve lookups."""
+
+    def test_linear_curve_matches_legacy_formula(self):
+        curve = LevelCurve.linear(xp_per_level=1000, max_level=100)
+
+        for total_xp in [0, 1, 999, 1000, 1001, 4999, 5000, 98_999]:
+            assert curve.level_for_xp(total_xp) == 1 + total_xp // 1000
+
+    def test_level_is_capped_at_max_level(self):
+        curve = LevelCurve.linear(xp_per_level=100, max_level=5)
+
+        assert curve.level_for_xp(10_000) == 5
+        assert curve.xp_to_next_level(10_000) is None
+
+    def test_table_curve(self):
+        curve = LevelCurve.from_config({"type": "table", "thresholds": [0, 100, 300, 600]})
+
+        assert curve.level_for_xp(99) == 1
+        assert curve.level_for_xp(100) == 2
+        assert curve.level_for_xp(599) == 3
+        assert curve.level_for_xp(600) == 4
+        assert curve.xp_for_level(3) == 300
+        assert curve.xp_to_next_level(150) == 150
+
+    def test_polynomial_curve_is_non_linear(self):
+        curve = LevelCurve.polynomial(base_xp=100, exponent=2, max_level=10)
+
+        assert curve.thresholds[:4] == (0, 100, 400, 900)
+
+    def test_batch_lookup_matches_scalar_lookup(self):
+        curve = LevelCurve.polynomial(base_xp=250, exponent=1.5, max_level=200)
+        total_xp = np.random.default_rng(42).integers(0, 1_000_000, size=5_000)
+
+        batch_levels = curve.levels_for_xp(total_xp)
+
+        assert batch_levels.tolist() == [curve.level_for_xp(int(xp)) for xp in total_xp]
+
+    @pytest.mark.parametrize("thresholds", [[], [10, 20], [0, 100, 100], [0, 200, 100]])
+    def test_invalid_thresholds_raise(self, thresholds):
+        with pytest.raises(ValueError, match="Level curve thresholds"):
+            LevelCurve(thresholds)
+
+    def test_unknown_curve_type_raises(self):
+        with pytest.raises(ValueError, match="Unknown level curve type"):
+            LevelCurve.from_config({"type": "exponential"})
+
+    def test_get_level_curve_follows_settings(self, settings):
+        settings.XP_LEVEL_CURVE = {"type": "table", "thresholds": [0, 10]}
+
+        assert get_level_curve().thresholds == (0, 10)
+
+
+@pytest.mark.django_db
+class TestLevelRecalculationService:
+    """Test LevelRecalculationService batch recalculation."""
+
+    @pytest.fixture
+    def stats_rows(self):
+        rows = []
+        for index, (total_xp, current_level) in enumerate([(0, 1), (1500, 2), (2500, 3), (9000, 2)]):
+            user = User.objects.create_user(username=f"player{index}", password="testpass123")
+            rows.append(UserStatistics.objects.create(user=user, total_xp=total_xp, current_level=current_level))
+        return rows
+
+    def test_recalculate_all_updates_only_changed_levels(self, stats_rows, django_capture_on_commit_callbacks):
+        publisher = Mock()
+        curve = LevelCurve.from_config({"type": "table", "thresholds": [0, 1000, 2000, 4000, 8000]})
+        service = LevelRecalculationService(curve=curve, event_publisher=publisher)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            summary = service.recalculate_all(chunk_size=2)
+
+        levels = dict(UserStatistics.objects.values_list("user_id", "current_level"))
+        assert [levels[stats.user_id] for stats in stats_rows] == [1, 2, 3, 5]
+        assert summary == {"users_scanned": 4, "levels_changed": 1, "level_ups": 1}
+        publisher.publish_level_up.assert_called_once_with(
+            user_id=stats_rows[3].user_id,
+            old_level=2,
+            new_level=5,
+        )
+
+    def test_level_down_is_persisted_without_event(self, stats_rows, django_capture_on_commit_callbacks):
+        publisher = Mock()
+        service = LevelRecalculationService(curve=LevelCurve.linear(xp_per_level=5000, max_level=10), event_publisher=publisher)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            summary = service.recalculate_all()
+
+        assert summary["levels_changed"] == 2
+        assert summary["level_ups"] == 0
+        publisher.publish_level_up.assert_not_called()
+        assert UserStatistics.objects.get(user_id=stats_rows[2].user_id).current_level == 1
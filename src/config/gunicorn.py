@@ -0,0 +1,22 @@
+"""
+Gunicorn configuration for gamify.
+
+Run with ``gunicorn -c config/gunicorn.py config.wsgi`` from the ``src`` directory.
+"""
+
+from importlib import import_module
+
+from decouple import config
+
+
+bind = config("GUNICORN_BIND", default="0.0.0.0:8000")
+workers = config("GUNICORN_WORKERS", default=4, cast=int)
+threads = config("GUNICORN_THREADS", default=1, cast=int)
+
+
+def post_fork(server, worker) -> None:  # noqa: ANN001, ARG001
+    """Load the application and warm up each worker before it accepts requests."""
+    from config.wsgi import application  # noqa: F401, PLC0415
+
+    # Imported once the application has set up Django
+    import_module("apps.achievements.services.warmup").warm_up()
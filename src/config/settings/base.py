@@ -40,7 +40,27 @@ DATABASES = {
         "PORT": config("DB_PORT", default="5432", cast=int),
     },
 }
+# Read replica serving safe API requests (see apps.achievements.db_router). Pointing DB_REPLICA_HOST at the
+# primary exercises the routing locally with two aliases; replica sessions are read-only either way.
+if config("DB_REPLICA_HOST", default=""):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": config("DB_REPLICA_HOST"),
+        "PORT": config("DB_REPLICA_PORT", default=DATABASES["default"]["PORT"], cast=int),
+        # Keeps the primary's connection options, appending to its libpq options if it sets any
+        "OPTIONS": {
+            **DATABASES["default"].get("OPTIONS", {}),
+            "options": f"{DATABASES['default'].get('OPTIONS', {}).get('options', '')} -c default_transaction_read_only=on".lstrip(),
+        },
+        "TEST": {"MIRROR": "default"},
+    }
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+DATABASE_ROUTERS = ["apps.achievements.db_router.ReplicaRouter"]
+# Users are pinned to the primary for pin_seconds after they write, so they read their own writes
+DATABASE_REPLICA = {
+    "alias": "replica",
+    "pin_seconds": config("DB_REPLICA_PIN_SECONDS", default=5, cast=int),
+}
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # URLS
@@ -112,6 +132,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "apps.achievements.middleware.IdentityMapMiddleware",
+    "apps.achievements.middleware.ReadYourWritesMiddleware",
 ]
 
 # STATIC
@@ -194,6 +216,80 @@ SPECTACULAR_SETTINGS = {
     "SCHEMA_PATH_PREFIX": "/api/",
 }
 
+# REDIS
+# ------------------------------------------------------------------------------
+REDIS_URL = config("REDIS_URL", default="redis://localhost:6379/0")
+
+# CELERY
+# ------------------------------------------------------------------------------
+# https://docs.celeryq.dev/en/stable/userguide/periodic-tasks.html
+CELERY_BEAT_SCHEDULE = {
+    "expire-streaks": {
+        "task": "apps.streaks.tasks.expire_streaks",
+        "schedule": 60.0,
+    },
+    "compact-coin-balances": {
+        "task": "apps.rewards.tasks.compact_coin_balances",
+        "schedule": 15 * 60.0,
+    },
+    "close-due-challenges": {
+        "task": "apps.challenges.tasks.close_due_challenges",
+        "schedule": 60.0,
+    },
+    "prune-activity-days": {
+        "task": "apps.achievements.tasks.prune_activity_days",
+        "schedule": 60 * 60.0,
+    },
+}
+
+# GAMIFICATION
+# ------------------------------------------------------------------------------
+# Cumulative XP curve used to derive levels (see apps.xp_management.services.level_curve)
+XP_LEVEL_CURVE = {
+    "type": "linear",
+    "xp_per_level": 1000,
+    "max_level": 1000,
+}
+# Number of rows each coin balance is split across (see apps.rewards.services.ledger_service)
+REWARDS_BALANCE_SHARDS = config("REWARDS_BALANCE_SHARDS", default=8, cast=int)
+# Per-user statistics and unlocked achievements cached in a per-process LRU in front of Redis
+# (see apps.achievements.services.state_cache). Entries changed by other processes live locally for local_ttl seconds.
+# Expensive results (progress, catalog) are served up to stale_ttl seconds past shared_ttl while one worker
+# recomputes them; concurrent misses wait up to lock_timeout seconds for that worker instead of recomputing.
+# With invalidation_bus, writes are broadcast over PostgreSQL NOTIFY and every worker evicts its local copy
+# immediately; the "local" backend then needs no Redis at all, local_ttl only bounds staleness after a lost message.
+ACHIEVEMENT_STATE_CACHE = {
+    "enabled": config("ACHIEVEMENT_STATE_CACHE", default=False, cast=bool),
+    "backend": config("ACHIEVEMENT_STATE_CACHE_BACKEND", default="redis"),
+    "invalidation_bus": config("ACHIEVEMENT_CACHE_INVALIDATION_BUS", default=False, cast=bool),
+    "local_max_entries": 10_000,
+    "local_ttl": 2.0,
+    "shared_ttl": 300,
+    "stale_ttl": 30,
+    "lock_timeout": 5.0,
+}
+# Backfilling an achievement for users who already qualify (see apps.achievements.services.backfill_service).
+# Users are processed chunk_size at a time with a pause (seconds) between chunks to throttle load on the primary.
+ACHIEVEMENT_BACKFILL = {
+    "chunk_size": config("ACHIEVEMENT_BACKFILL_CHUNK_SIZE", default=5_000, cast=int),
+    "pause": config("ACHIEVEMENT_BACKFILL_PAUSE", default=0.1, cast=float),
+}
+# Staff "what if" API for tuning the catalog (see apps.achievements.services.what_if_service).
+# Statistic histograms are cached for histogram_ttl seconds; cohort counts are always live.
+ACHIEVEMENT_WHAT_IF = {
+    "histogram_bins": 20,
+    "histogram_ttl": 60,
+}
+# Opt-in write-behind buffering of UserStatistics counters (see apps.achievements.services.statistics_writer).
+# With the "memory" backend a crashed process loses the increments buffered since its last flush,
+# i.e. at most flush_interval_ms worth of increments and never more than flush_max_increments.
+STATISTICS_WRITE_BEHIND = {
+    "enabled": config("STATISTICS_WRITE_BEHIND", default=False, cast=bool),
+    "backend": config("STATISTICS_WRITE_BEHIND_BACKEND", default="memory"),
+    "flush_interval_ms": 500,
+    "flush_max_increments": 1000,
+}
+
 # LOGGING
 # ------------------------------------------------------------------------------
 LOGGING = {
@@ -1,5 +1,5 @@
 from .base import *
-from .base import DATABASES, INSTALLED_APPS, SPECTACULAR_SETTINGS, env
+from .base import ACHIEVEMENT_STATE_CACHE, DATABASES, INSTALLED_APPS, REDIS_URL, SPECTACULAR_SETTINGS, env
 
 
 # GENERAL
@@ -12,21 +12,25 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["https://github.com/ca
 # DATABASES
 # ------------------------------------------------------------------------------
 DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+if "replica" in DATABASES:
+    DATABASES["replica"]["CONN_MAX_AGE"] = DATABASES["default"]["CONN_MAX_AGE"]
 
 # CACHES
 # ------------------------------------------------------------------------------
-# CACHES = {
-#     "default": {
-#         "BACKEND": "django_redis.cache.RedisCache",
-#         "LOCATION": REDIS_URL,
-#         "OPTIONS": {
-#             "CLIENT_CLASS": "django_redis.client.DefaultClient",
-#             # Mimicking memcache behavior.
-#             # https://github.com/jazzband/django-redis#memcached-exceptions-behavior
-#             "IGNORE_EXCEPTIONS": True,
-#         },
-#     },
-# }
+CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": REDIS_URL,
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            # Mimicking memcache behavior.
+            # https://github.com/jazzband/django-redis#memcached-exceptions-behavior
+            "IGNORE_EXCEPTIONS": True,
+        },
+    },
+}
+ACHIEVEMENT_STATE_CACHE["enabled"] = env("ACHIEVEMENT_STATE_CACHE", default=True, cast=bool)
+ACHIEVEMENT_STATE_CACHE["invalidation_bus"] = env("ACHIEVEMENT_CACHE_INVALIDATION_BUS", default=True, cast=bool)
 
 # SECURITY
 # ------------------------------------------------------------------------------